@@ -276,13 +276,22 @@ class PriorWeekAnalyzer:
 
 def main():
     """Test the prior week analyzer"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Analyze prior week results")
+    parser.add_argument("--year", type=int, default=2025)
+    parser.add_argument("--week", type=int, default=1)
+    parser.add_argument("--retrain", action="store_true",
+                        help="Warm-start the retrained model on the newly settled picks afterwards")
+    args = parser.parse_args()
+    
     analyzer = PriorWeekAnalyzer()
     
-    # Analyze Week 1 (since we're in Week 2)
-    analysis = analyzer.analyze_week(2025, 1)
+    # Analyze the prior week (Week 1 by default, since we're in Week 2)
+    analysis = analyzer.analyze_week(args.year, args.week)
     
     if analysis:
-        print("\n📊 Week 1 Analysis Results:")
+        print(f"\n📊 Week {args.week} Analysis Results:")
         print("=" * 40)
         print(f"Overall Accuracy: {analysis['overall_accuracy']:.1%}")
         print(f"Correct Picks: {analysis['correct_picks']}/{analysis['total_picks']}")
@@ -293,12 +302,22 @@ def main():
             data = analysis['confidence_accuracy'][conf_points]
             print(f"  {conf_points:2d} points: {data['accuracy']:.1%} ({data['correct']}/{data['total']})")
         
-        # Get adjustments for Week 2
-        adjustments = analyzer.get_accuracy_adjustments(2)
+        # Get adjustments for the next week
+        adjustments = analyzer.get_accuracy_adjustments(args.week + 1)
         if adjustments:
-            print("\nConfidence Adjustments for Week 2:")
+            print(f"\nConfidence Adjustments for Week {args.week + 1}:")
             for conf_points, factor in sorted(adjustments.items()):
                 print(f"  {conf_points:2d} points: {factor:.2f}x adjustment")
+    
+    if args.retrain:
+        # Only the newly settled week is featurized and fit (see incremental_retrainer.py)
+        from database_manager import DatabaseManager
+        from elo_ratings import EloRatingEngine
+        from incremental_retrainer import IncrementalRetrainer
+        db_manager = DatabaseManager(version="v2")
+        IncrementalRetrainer(db_manager).update()
+        # The settled results also move the Elo ratings the no-odds fallback reads
+        EloRatingEngine(db_manager).update()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Benchmark vectorized pool-sheet parsing against the old per-cell loop.
+Builds synthetic 16-game results sheets with thousands of entrants (random
+confidence orders, signs, blanks and odd cells) and times parse_pick_grid,
+plus the full ingestion of the parsed week into a copy of the database.
+"""
+
+import argparse
+import os
+import re
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from database_manager import DatabaseManager
+from pool_results_ingestion import PoolResultsIngestor, detect_layout, parse_pick_grid
+
+WEEK1_GAMES = ["DAL @ PHI", "KC @ LAC", "TB @ ATL", "PIT @ NYJ", "MIA @ IND", "CAR @ JAX",
+               "NYG @ WAS", "ARI @ NO", "CIN @ CLE", "LV @ NE", "SF @ SEA", "TEN @ DEN",
+               "DET @ GB", "HOU @ LAR", "BAL @ BUF", "MIN @ CHI"]
+
+def make_sheet(n_entrants: int, seed: int = 42) -> pd.DataFrame:
+    """Pool results sheet laid out like data/results/week<N>.csv"""
+    
+    rng = np.random.default_rng(seed)
+    n_games = len(WEEK1_GAMES)
+    teams = np.array([game.split(" @ ") for game in WEEK1_GAMES])
+    
+    confidence = rng.permuted(np.tile(np.arange(1, n_games + 1), (n_entrants, 1)), axis=1)
+    side = rng.integers(0, 2, size=(n_entrants, n_games))
+    picked = teams[np.arange(n_games), side]
+    wrong = rng.random((n_entrants, n_games)) < 0.35
+    
+    picked, points = picked.astype(object), confidence.astype(str).astype(object)
+    cells = picked + " (" + np.where(wrong, "-", "").astype(object) + points + ")"
+    
+    # Sheet quirks: sign outside the parentheses, missed picks, penalty-only and junk cells
+    quirks = rng.random((n_entrants, n_games))
+    outside = quirks < 0.01
+    cells[outside] = (picked + " -(" + points + ")")[outside]
+    cells[(quirks >= 0.01) & (quirks < 0.015)] = ""
+    cells[(quirks >= 0.015) & (quirks < 0.018)] = "-16"
+    cells[(quirks >= 0.018) & (quirks < 0.019)] = "??"
+    
+    sheet = pd.DataFrame(cells, columns=WEEK1_GAMES)
+    sheet.insert(0, "Week 1", [f"Entrant {i}" for i in range(n_entrants)])
+    sheet["TIE PTS"] = rng.integers(20, 60, size=n_entrants).astype(str)
+    return sheet
+
+def parse_per_cell(df: pd.DataFrame) -> list:
+    """The previous parse_csv_pool_results loop: iterrows + re.match per cell"""
+    
+    participant_col = df.columns[0]
+    game_cols = df.columns[1:-1]
+    picks = []
+    for index, row in df.iterrows():
+        participant_name = row[participant_col]
+        if pd.isna(participant_name):
+            continue
+        for game_col in game_cols:
+            pick_str = str(row[game_col])
+            if pd.isna(pick_str) or pick_str.strip() == '' or pick_str == 'nan':
+                picks.append((participant_name, game_col, None, 16, False))
+                continue
+            match = re.match(r"([A-Z]{2,4})\s*\(?\s*(-?\d+)\s*\)?", pick_str)
+            if match:
+                confidence = int(match.group(2))
+                picks.append((participant_name, game_col, match.group(1), abs(confidence), confidence > 0))
+    return picks
+
+def run_benchmark(db_path: str, sizes: list, per_cell_limit: int):
+    """Time both parsers (and vectorized ingestion) for each sheet size"""
+    
+    ingestor = PoolResultsIngestor(DatabaseManager(db_path=db_path))
+    # The first write to a fresh copy pays one-off file setup; keep it out of the timings
+    warmup = make_sheet(1)
+    ingestor.ingest_frame(2025, 1, parse_pick_grid(warmup, detect_layout(warmup)), replace_existing=True)
+    
+    results = []
+    for n_entrants in sizes:
+        sheet = make_sheet(n_entrants, seed=n_entrants)
+        
+        start = time.perf_counter()
+        picks = parse_pick_grid(sheet, detect_layout(sheet))
+        vectorized_seconds = time.perf_counter() - start
+        
+        summary = ingestor.ingest_frame(2025, 1, picks, replace_existing=True)
+        
+        # The per-cell loop is linear in N; time a prefix and extrapolate for huge sheets
+        timed = sheet.iloc[:per_cell_limit]
+        start = time.perf_counter()
+        old_picks = parse_per_cell(timed)
+        per_cell_seconds = (time.perf_counter() - start) * n_entrants / len(timed)
+        
+        # Cells both parsers read as picks must agree
+        old = pd.DataFrame(old_picks, columns=['participant', 'game', 'team', 'points', 'correct'])
+        old = old[old['team'].notna()]
+        new = picks.iloc[:len(timed) * len(WEEK1_GAMES)].merge(old, on=['participant', 'game'],
+                                                             suffixes=('', '_old'))
+        assert (new['team'] == new['team_old']).all()
+        assert (new['points'] == new['points_old']).all()
+        assert (new['correct'] == new['correct_old']).all()
+        
+        results.append({
+            'entrants': n_entrants,
+            'cells': len(picks),
+            'per_cell_s': per_cell_seconds,
+            'vectorized_s': vectorized_seconds,
+            'ingest_s': summary['seconds'],
+            'flagged': int(picks['missed'].sum() + picks['malformed'].sum()),
+            'speedup': per_cell_seconds / vectorized_seconds,
+            'extrapolated': len(timed) < n_entrants
+        })
+    
+    return results
+
+def main():
+    """Run the pool parsing benchmark"""
+    
+    parser = argparse.ArgumentParser(description="Benchmark vectorized vs per-cell pool sheet parsing")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[18, 1000, 10000, 50000])
+    parser.add_argument("--per-cell-limit", type=int, default=2000,
+                        help="Max entrants to time on the per-cell path before extrapolating")
+    parser.add_argument("--db", default="data/nfl_pool_v2.db")
+    args = parser.parse_args()
+    
+    # Work on a copy so the benchmark's week 1 writes never touch the real database
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_copy = os.path.join(tmp_dir, "benchmark.db")
+        shutil.copyfile(args.db, db_copy)
+        results = run_benchmark(db_copy, args.sizes, args.per_cell_limit)
+    
+    print("\n⏱️  Pool sheet parsing benchmark (16 games per entrant)")
+    print(f"{'entrants':>9} {'cells':>8} {'flagged':>8} {'per-cell (s)':>13} {'vectorized (s)':>15} "
+          f"{'speedup':>8} {'ingest (s)':>11}")
+    for row in results:
+        marker = "*" if row['extrapolated'] else " "
+        print(f"{row['entrants']:>9} {row['cells']:>8} {row['flagged']:>8} {row['per_cell_s']:>12.3f}{marker} "
+              f"{row['vectorized_s']:>15.4f} {row['speedup']:>7.1f}x {row['ingest_s']:>11.3f}")
+    if any(row['extrapolated'] for row in results):
+        print("* extrapolated from the first timed entrants")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Benchmark batched slate inference against the old per-game prediction loop.
+Uses ImprovedNFLConfidenceMLModel with a 200-tree, depth-15 forest fit on
+synthetic rows so it runs without a trained model file.
+"""
+
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+
+from database_manager import DatabaseManager
+from improved_ml_model import ImprovedNFLConfidenceMLModel
+
+def make_games(db_manager: DatabaseManager, n_games: int, seed: int = 42) -> list:
+    """Random matchups between real teams with plausible moneylines"""
+    
+    rng = random.Random(seed)
+    with db_manager.get_connection() as conn:
+        teams = [row[0] for row in conn.execute("SELECT name FROM teams ORDER BY name")]
+    
+    games = []
+    for i in range(n_games):
+        home_team, away_team = rng.sample(teams, 2)
+        favorite_ml = -rng.randint(110, 400)
+        underdog_ml = rng.randint(100, 350)
+        home_ml, away_ml = (favorite_ml, underdog_ml) if rng.random() < 0.57 else (underdog_ml, favorite_ml)
+        games.append({
+            'home_team': home_team,
+            'away_team': away_team,
+            'home_ml': home_ml,
+            'away_ml': away_ml,
+            'total_points': rng.uniform(37, 54),
+            'week': 1 + (i // 16) % 18,
+            'season_year': 2025
+        })
+    return games
+
+def fit_benchmark_model(ml_model: ImprovedNFLConfidenceMLModel, games: list):
+    """Fit the production-sized forest on synthetic rows with the real feature layout"""
+    
+    sample = pd.DataFrame(games[:64]).rename(columns={'total_points': 'odds_total'})
+    X = ml_model.prepare_features(sample).fillna(0)
+    
+    rng = np.random.default_rng(0)
+    X_train = pd.DataFrame(rng.normal(size=(2000, X.shape[1])), columns=X.columns)
+    y_train = (rng.random(2000) < 0.6).astype(int)
+    
+    ml_model.scaler.fit(X_train)
+    ml_model.model = RandomForestRegressor(
+        n_estimators=200, max_depth=15, min_samples_split=3,
+        min_samples_leaf=1, random_state=42, n_jobs=-1
+    )
+    ml_model.model.fit(X_train, y_train)
+
+def predict_per_game(ml_model: ImprovedNFLConfidenceMLModel, games: list) -> list:
+    """The previous predict_confidence loop: two prepare/transform/predict rounds per game
+    (missing features filled with 0 as in training, like the batched path)"""
+    
+    scores = []
+    for game in games:
+        test_data = pd.DataFrame([{
+            'home_team': game['home_team'],
+            'away_team': game['away_team'],
+            'home_ml': game['home_ml'],
+            'away_ml': game['away_ml'],
+            'odds_total': game['total_points'],
+            'week': game['week'],
+            'season_year': game['season_year']
+        }])
+        X = ml_model.prepare_features(test_data)
+        home_prediction = ml_model.model.predict(ml_model.scaler.transform(X.fillna(0)))[0]
+        
+        test_data_away = test_data.copy()
+        test_data_away['home_team'] = game['away_team']
+        test_data_away['away_team'] = game['home_team']
+        test_data_away['home_ml'] = game['away_ml']
+        test_data_away['away_ml'] = game['home_ml']
+        X_away = ml_model.prepare_features(test_data_away)
+        away_prediction = ml_model.model.predict(ml_model.scaler.transform(X_away.fillna(0)))[0]
+        
+        scores.append((home_prediction, away_prediction))
+    return scores
+
+def run_benchmark(db_path: str, sizes: list, per_game_limit: int):
+    """Time both paths for each slate size"""
+    
+    db_manager = DatabaseManager(db_path=db_path)
+    ml_model = ImprovedNFLConfidenceMLModel(db_manager)
+    fit_benchmark_model(ml_model, make_games(db_manager, 64))
+    
+    results = []
+    for n_games in sizes:
+        games = make_games(db_manager, n_games, seed=n_games)
+        
+        start = time.perf_counter()
+        home_scores, away_scores = ml_model.predict_slate_scores(games)
+        batched_seconds = time.perf_counter() - start
+        
+        # The per-game loop is linear in N; time a prefix and extrapolate for huge slates
+        timed_games = games[:per_game_limit]
+        start = time.perf_counter()
+        per_game_scores = predict_per_game(ml_model, timed_games)
+        per_game_seconds = (time.perf_counter() - start) * n_games / len(timed_games)
+        
+        assert np.allclose([s[0] for s in per_game_scores], home_scores[:len(timed_games)])
+        assert np.allclose([s[1] for s in per_game_scores], away_scores[:len(timed_games)])
+        
+        results.append({
+            'games': n_games,
+            'per_game_s': per_game_seconds,
+            'batched_s': batched_seconds,
+            'speedup': per_game_seconds / batched_seconds,
+            'extrapolated': len(timed_games) < n_games
+        })
+    
+    return results
+
+def main():
+    """Run the slate inference benchmark"""
+    
+    parser = argparse.ArgumentParser(description="Benchmark batched vs per-game slate inference")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[16, 272, 10000])
+    parser.add_argument("--per-game-limit", type=int, default=272,
+                        help="Max games to time on the per-game path before extrapolating")
+    parser.add_argument("--db", default="data/nfl_pool_v2.db")
+    args = parser.parse_args()
+    
+    # Work on a copy so opening the database never touches the real one
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_copy = os.path.join(tmp_dir, "benchmark.db")
+        shutil.copyfile(args.db, db_copy)
+        results = run_benchmark(db_copy, args.sizes, args.per_game_limit)
+    
+    print("\n⏱️  Slate inference benchmark (200 trees, depth 15)")
+    print(f"{'games':>8} {'per-game (s)':>14} {'batched (s)':>12} {'speedup':>9}")
+    for row in results:
+        marker = "*" if row['extrapolated'] else " "
+        print(f"{row['games']:>8} {row['per_game_s']:>13.2f}{marker} {row['batched_s']:>12.3f} {row['speedup']:>8.1f}x")
+    if any(row['extrapolated'] for row in results):
+        print("* extrapolated from the first timed games")
+
+if __name__ == "__main__":
+    main()
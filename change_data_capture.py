@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Change-data-capture consumers for incremental recomputation.
+Triggers append every write on games, picks, pool_results, odds and expert_picks
+to change_log; each downstream stage reads only the changes since its checkpoint.
+"""
+from typing import Dict, List, Optional
+from database_manager import DatabaseManager
+
+class ChangeLogConsumer:
+    """Reads change_log entries for one named downstream stage"""
+    
+    def __init__(self, db_manager: DatabaseManager, consumer_name: str,
+                 tables: Optional[List[str]] = None):
+        self.db_manager = db_manager
+        self.consumer_name = consumer_name
+        self.tables = tables
+    
+    def poll(self, limit: Optional[int] = None) -> Dict:
+        """Summarize changes since the last checkpoint (does not advance it)"""
+        checkpoint = self.db_manager.get_change_checkpoint(self.consumer_name)
+        changes = self.db_manager.get_changes(checkpoint, self.tables, limit)
+        
+        batch = {
+            "consumer_name": self.consumer_name,
+            "from_change_id": checkpoint,
+            "last_change_id": changes[-1]["id"] if changes else checkpoint,
+            "changes": changes,
+            "game_ids": set(),
+            "pick_ids": set(),
+            "participants": set(),  # (season_year, week, participant_name)
+            "weeks": set()          # (season_year, week)
+        }
+        
+        for change in changes:
+            if change["game_id"] is not None:
+                batch["game_ids"].add(change["game_id"])
+            if change["table_name"] == "picks":
+                batch["pick_ids"].add(change["row_id"])
+            if change["participant_name"] is not None:
+                batch["participants"].add(
+                    (change["season_year"], change["week"], change["participant_name"]))
+            if change["season_year"] is not None and change["week"] is not None:
+                batch["weeks"].add((change["season_year"], change["week"]))
+        
+        return batch
+    
+    def commit(self, batch: Dict):
+        """Advance the checkpoint past a processed batch"""
+        self.db_manager.set_change_checkpoint(self.consumer_name, batch["last_change_id"])
+    
+    def reset(self, change_id: int = 0):
+        """Rewind the checkpoint (0 reprocesses the whole log)"""
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                UPDATE change_checkpoints SET last_change_id = ? WHERE consumer_name = ?
+            """, (change_id, self.consumer_name))
+            conn.commit()
+
+def main():
+    """Show pending changes per consumer"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Inspect change-data-capture consumers")
+    parser.add_argument("--consumer", required=True, help="Consumer name")
+    parser.add_argument("--tables", nargs="*", help="Restrict to these tables")
+    parser.add_argument("--commit", action="store_true", help="Mark pending changes as processed")
+    
+    args = parser.parse_args()
+    
+    db_manager = DatabaseManager(version="v2")
+    consumer = ChangeLogConsumer(db_manager, args.consumer, args.tables)
+    batch = consumer.poll()
+    
+    print(f"🔄 {args.consumer}: {len(batch['changes'])} pending changes "
+          f"(change ids {batch['from_change_id']}→{batch['last_change_id']})")
+    print(f"   🏈 Games touched: {len(batch['game_ids'])}")
+    print(f"   🎯 Picks touched: {len(batch['pick_ids'])}")
+    print(f"   👥 Participant-weeks touched: {len(batch['participants'])}")
+    for season_year, week in sorted(batch["weeks"]):
+        print(f"   📅 {season_year} Week {week}")
+    
+    if args.commit:
+        consumer.commit(batch)
+        print("✅ Checkpoint advanced")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Pure-NumPy scoring for distilled confidence models.
+Loads the .npz written by model_distillation.py (plain arrays, no pickle) and
+scores raw feature matrices in the teacher's column order. Imports nothing but
+NumPy, so it is safe inside simulation and optimization loops.
+"""
+
+import numpy as np
+
+def american_to_prob(moneyline: np.ndarray) -> np.ndarray:
+    """Implied probability from American odds (vectorized)"""
+    
+    moneyline = np.asarray(moneyline, dtype=float)
+    return np.where(moneyline < 0, -moneyline / (-moneyline + 100.0), 100.0 / (moneyline + 100.0))
+
+def market_home_prob(X: np.ndarray, home_ml_col: int, away_ml_col: int) -> np.ndarray:
+    """De-vigged home win probability from the moneyline columns"""
+    
+    home = american_to_prob(X[:, home_ml_col])
+    away = american_to_prob(X[:, away_ml_col])
+    total = home + away
+    return np.divide(home, total, out=np.full_like(home, 0.5), where=total > 0)
+
+def score_linear(X: np.ndarray, mean: np.ndarray, scale: np.ndarray, coef: np.ndarray,
+                 intercept: float, market_cols: np.ndarray) -> np.ndarray:
+    """Logistic model on standardized features plus the market log-odds"""
+    
+    Z = (X - mean) / scale
+    p_market = np.clip(market_home_prob(X, *market_cols), 0.01, 0.99)
+    engineered = np.column_stack([Z, np.log(p_market / (1 - p_market))])
+    return 1.0 / (1.0 + np.exp(-(engineered @ coef + intercept)))
+
+def score_trees(X: np.ndarray, mean: np.ndarray, scale: np.ndarray, feature: np.ndarray,
+                threshold: np.ndarray, left: np.ndarray, right: np.ndarray, value: np.ndarray,
+                init: float, learning_rate: float, depth: int, chunk_rows: int = 4096) -> np.ndarray:
+    """Shallow boosted trees stored as padded (n_trees, n_nodes) arrays.
+    
+    Every row walks every tree at once, one level per iteration, using flat
+    take() gathers; leaves point to themselves so finished rows stay put.
+    Rows go in chunks so the (rows, trees) node matrix stays cache-sized.
+    """
+    
+    Z = (X - mean) / scale
+    n_trees, n_nodes = feature.shape
+    offsets = np.arange(n_trees) * n_nodes
+    flat_feature = feature.ravel()
+    flat_threshold = threshold.ravel()
+    flat_left = (left + offsets[:, None]).ravel()
+    flat_right = (right + offsets[:, None]).ravel()
+    flat_value = value.ravel()
+    
+    scores = np.empty(len(Z))
+    for start in range(0, len(Z), chunk_rows):
+        rows = np.ascontiguousarray(Z[start:start + chunk_rows])
+        row_base = (np.arange(len(rows)) * Z.shape[1])[:, None]
+        node = np.broadcast_to(offsets, (len(rows), n_trees)).copy()
+        for _ in range(depth):
+            x = rows.ravel().take(row_base + flat_feature.take(node))
+            node = np.where(x <= flat_threshold.take(node), flat_left.take(node), flat_right.take(node))
+        scores[start:start + chunk_rows] = flat_value.take(node).sum(axis=1)
+    
+    return init + learning_rate * scores
+
+def score_lookup(X: np.ndarray, bin_edges: np.ndarray, table: np.ndarray,
+                 market_cols: np.ndarray) -> np.ndarray:
+    """Table of teacher outputs by binned market home probability"""
+    
+    p_market = market_home_prob(X, *market_cols)
+    bins = np.clip(np.searchsorted(bin_edges, p_market, side='right') - 1, 0, len(table) - 1)
+    return table[bins]
+
+class CompactScorer:
+    """Distilled surrogate loaded from an .npz artifact"""
+    
+    def __init__(self, path: str):
+        with np.load(path, allow_pickle=False) as data:
+            self.arrays = {key: data[key] for key in data.files}
+        self.kind = str(self.arrays.pop('kind'))
+        self.feature_columns = [str(column) for column in self.arrays.pop('feature_columns')]
+    
+    def score(self, X: np.ndarray) -> np.ndarray:
+        """Teacher-equivalent outputs for rows in feature_columns order (NaNs already filled)"""
+        
+        X = np.asarray(X, dtype=float)
+        a = self.arrays
+        if self.kind == 'gbm':
+            scores = score_trees(X, a['mean'], a['scale'], a['feature'], a['threshold'], a['left'],
+                                 a['right'], a['value'], float(a['init']), float(a['learning_rate']),
+                                 int(a['depth']))
+        elif self.kind == 'linear':
+            scores = score_linear(X, a['mean'], a['scale'], a['coef'], float(a['intercept']),
+                                  a['market_cols'])
+        elif self.kind == 'lookup':
+            scores = score_lookup(X, a['bin_edges'], a['table'], a['market_cols'])
+        else:
+            raise ValueError(f"Unknown compact model kind: {self.kind}")
+        return np.clip(scores, 0.0, 1.0)
+    
+    def score_slate(self, X_oriented: np.ndarray) -> tuple:
+        """(home_scores, away_scores) for a (2N)-row oriented slate"""
+        
+        scores = self.score(X_oriented)
+        n_games = len(scores) // 2
+        return scores[:n_games], scores[n_games:]
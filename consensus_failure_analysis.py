@@ -180,6 +180,13 @@ def analyze_fundaysunday_performance():
             
             accuracy = (correct_picks / len(picks)) * 100 if picks else 0
             print(f"  📊 Week {week} Summary: {correct_picks}/{len(picks)} correct ({accuracy:.1f}%) - {total_score} points")
+    
+    # Season-to-date standing from the materialized standings table
+    history = db_manager.get_participant_standings_history(2025, 'FundaySunday')
+    if history:
+        latest = history[-1]
+        print(f"\n  🏆 Season to date: {latest['cumulative_score']} points "
+              f"({latest['cumulative_accuracy']}%), rank #{latest['season_rank']}")
 
 def compare_with_expert_picks():
     """
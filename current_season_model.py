@@ -14,14 +14,22 @@ from sklearn.metrics import accuracy_score, mean_squared_error
 import joblib
 import os
 from database_manager import DatabaseManager
+from model_registry import ModelRegistry, training_window
+from slate_inference import build_oriented_slate, split_oriented_scores, pair_predictions
 
 class CurrentSeasonNFLModel:
     """Current season focused model with expert data and point spreads"""
     
+    SEARCH_NAME = 'current_season'  # model_name of this model's hyperparameter search trials
+    use_tuned_hyperparameters = True  # False trains with the built-in defaults (untuned backtests)
+    
     def __init__(self, db_manager: DatabaseManager):
         self.db_manager = db_manager
         self.model = None
         self.scaler = StandardScaler()
+        self.feature_columns = []
+        self.training_window = {}
+        self.training_metrics = {}
         
         # Expert performance weights (based on Week 1 accuracy)
         self.expert_weights = {
@@ -75,20 +83,21 @@ class CurrentSeasonNFLModel:
         
         expert_features = pd.DataFrame()
         
-        # For each game, get expert consensus
+        # Resolve game IDs and expert picks for all rows in two queries
+        game_ids = self.db_manager.get_game_ids(list(zip(
+            df['season_year'], df['week'], df['home_team'], df['away_team']
+        )))
+        expert_picks = self.db_manager.get_expert_picks_for_games(game_ids)
+        picks_by_game = {game_id: picks for game_id, picks in expert_picks.groupby('game_id')}
+        
         consensus_data = []
-        for _, row in df.iterrows():
-            # Get game ID
-            game_id = self.db_manager.get_game_id(
-                row['season_year'], row['week'], 
-                row['home_team'], row['away_team']
-            )
-            
+        for game_id in game_ids:
             if game_id:
-                consensus = self.db_manager.get_expert_consensus(game_id)
+                game_picks = picks_by_game.get(game_id, pd.DataFrame())
+                consensus = self.db_manager._consensus_from_picks(game_picks)
                 
                 # Calculate weighted expert consensus
-                weighted_consensus = self._calculate_weighted_expert_consensus(game_id)
+                weighted_consensus = self._weighted_consensus_from_picks(game_picks)
                 
                 consensus_data.append({
                     'expert_consensus_percentage': consensus['consensus_percentage'],
@@ -127,6 +136,10 @@ class CurrentSeasonNFLModel:
         """Calculate weighted expert consensus based on individual expert performance"""
         
         expert_picks = self.db_manager.get_expert_picks_for_game(game_id)
+        return self._weighted_consensus_from_picks(expert_picks)
+    
+    def _weighted_consensus_from_picks(self, expert_picks: pd.DataFrame) -> dict:
+        """Weighted consensus from one game's expert picks"""
         
         if expert_picks.empty:
             return {'weighted_consensus': 0.5, 'confidence_score': 0.5}
@@ -214,6 +227,41 @@ class CurrentSeasonNFLModel:
         
         return historical_features
     
+    def build_regressor(self, **params) -> RandomForestRegressor:
+        """Build the forest with this model's hyperparameters (overridable)"""
+        
+        hyperparameters = {
+            'n_estimators': 150,  # Fewer trees for current-season focus
+            'max_depth': 12,      # Moderate depth
+            'min_samples_split': 5,
+            'min_samples_leaf': 2,
+            'random_state': 42,
+            'n_jobs': -1
+        }
+        # The winner of the latest hyperparameter search replaces these defaults
+        if self.use_tuned_hyperparameters:
+            hyperparameters.update(self.db_manager.get_best_hyperparameters(self.SEARCH_NAME) or {})
+        hyperparameters.update(params)
+        return RandomForestRegressor(**hyperparameters)
+    
+    def fit(self, df: pd.DataFrame, X: pd.DataFrame = None, **regressor_params):
+        """Fit on a picks frame without holdout (features may be precomputed)"""
+        
+        if X is None:
+            X = self.prepare_features(df)
+        X = X.fillna(0)
+        y = df['is_correct'].astype(int)
+        
+        # Current season rows carry more weight
+        sample_weights = X['current_season_weight'].values
+        X = X.drop('current_season_weight', axis=1)
+        
+        self.scaler = StandardScaler()
+        X_scaled = self.scaler.fit_transform(X)
+        self.model = self.build_regressor(**regressor_params)
+        self.model.fit(X_scaled, y, sample_weight=sample_weights)
+        return self
+    
     def train_model(self, test_size: float = 0.2) -> dict:
         """Train the current-season focused model"""
         
@@ -251,14 +299,7 @@ class CurrentSeasonNFLModel:
         
         # Train current-season focused model
         print("🤖 Training current-season focused Random Forest model...")
-        self.model = RandomForestRegressor(
-            n_estimators=150,  # Fewer trees for current-season focus
-            max_depth=12,      # Moderate depth
-            min_samples_split=5,
-            min_samples_leaf=2,
-            random_state=42,
-            n_jobs=-1
-        )
+        self.model = self.build_regressor()
         
         # Fit model with sample weights
         self.model.fit(X_train_scaled, y_train, sample_weight=train_weights)
@@ -284,6 +325,11 @@ class CurrentSeasonNFLModel:
         for _, row in feature_importance.head(10).iterrows():
             print(f"   {row['feature']}: {row['importance']:.3f}")
         
+        # Recorded with the model when it is saved to the registry
+        self.feature_columns = list(X.columns)
+        self.training_window = training_window(df)
+        self.training_metrics = {'accuracy': accuracy, 'mse': mse}
+        
         return {
             'accuracy': accuracy,
             'mse': mse,
@@ -293,66 +339,45 @@ class CurrentSeasonNFLModel:
     def predict_confidence(self, games_data: list) -> list:
         """Predict confidence for a list of games using current-season focus"""
         
+        home_scores, away_scores = self.predict_slate_scores(games_data)
+        return pair_predictions(games_data, home_scores, away_scores)
+    
+    def predict_slate_scores(self, games_data: list) -> tuple:
+        """Score every game in both orientations with one predict call.
+        
+        Returns (home_scores, away_scores) arrays aligned with games_data.
+        """
+        
         if not self.model:
             raise ValueError("Model not trained. Call train_model() first.")
         
-        predictions = []
-        
-        for game in games_data:
-            # Create test data
-            test_data = pd.DataFrame([{
-                'home_team': game['home_team'],
-                'away_team': game['away_team'],
-                'home_ml': game.get('home_ml', -110),
-                'away_ml': game.get('away_ml', -110),
-                'odds_total': game.get('total_points', 45),
-                'week': game['week'],
-                'season_year': game['season_year']
-            }])
-            
-            # Prepare features
-            X = self.prepare_features(test_data)
-            X = X.drop('current_season_weight', axis=1)  # Remove weight column
-            X = X.fillna(0)
-            
-            # Predict for home team
-            X_scaled = self.scaler.transform(X)
-            home_prediction = self.model.predict(X_scaled)[0]
-            
-            # Predict for away team (swap the teams)
-            test_data_away = test_data.copy()
-            test_data_away['home_team'] = game['away_team']
-            test_data_away['away_team'] = game['home_team']
-            test_data_away['home_ml'] = game.get('away_ml', -110)
-            test_data_away['away_ml'] = game.get('home_ml', -110)
-            
-            X_away = self.prepare_features(test_data_away)
-            X_away = X_away.drop('current_season_weight', axis=1)
-            X_away = X_away.fillna(0)
-            X_away_scaled = self.scaler.transform(X_away)
-            away_prediction = self.model.predict(X_away_scaled)[0]
-            
-            # Choose better prediction
-            if home_prediction >= away_prediction:
-                pick_team = game['home_team']
-                confidence = max(1, min(16, int(home_prediction * 16)))
-                win_prob = home_prediction
-            else:
-                pick_team = game['away_team']
-                confidence = max(1, min(16, int(away_prediction * 16)))
-                win_prob = away_prediction
-            
-            predictions.append({
-                'game': f"{game['away_team']} @ {game['home_team']}",
-                'pick': pick_team,
-                'confidence': confidence,
-                'win_probability': win_prob
-            })
-        
-        return predictions
+        if not games_data:
+            return np.array([]), np.array([])
+        
+        X_scaled = self.scaler.transform(self.prepare_slate_features(games_data))
+        return split_oriented_scores(self.model.predict(X_scaled))
+    
+    def prepare_slate_features(self, games_data: list) -> pd.DataFrame:
+        """Unscaled feature rows for an oriented slate (2N rows, listed then swapped)"""
+        
+        slate = build_oriented_slate(games_data)
+        
+        # Prepare features for all 2N rows at once
+        X = self.prepare_features(slate)
+        X = X.drop('current_season_weight', axis=1)  # Remove weight column
+        X = X.fillna(0)
+        return X
     
-    def save_model(self, model_path: str = 'models/current_season_model.pkl'):
-        """Save the trained model"""
+    def save_model(self, model_path: str = None):
+        """Register the trained model as the current version (or save to a file)"""
+        
+        if model_path is None:
+            ModelRegistry(self.db_manager).register(
+                'current_season', {'model': self.model, 'scaler': self.scaler},
+                feature_columns=self.feature_columns, window=self.training_window,
+                metrics=self.training_metrics, params=self.model.get_params()
+            )
+            return
         
         os.makedirs('models', exist_ok=True)
         joblib.dump(self.model, model_path)
@@ -360,8 +385,18 @@ class CurrentSeasonNFLModel:
         
         print(f"💾 Saved current-season model to {model_path}")
     
-    def load_model(self, model_path: str = 'models/current_season_model.pkl'):
-        """Load a trained model"""
+    def load_model(self, model_path: str = None):
+        """Load the current registry version (or a trained model file)"""
+        
+        if model_path is None:
+            artifact = ModelRegistry(self.db_manager).load('current_season')
+            if artifact is not None:
+                self.model = artifact['model']
+                self.scaler = artifact['scaler']
+                self.feature_columns = artifact['feature_columns'] or []
+                print(f"📂 Loaded current-season model v{artifact['version']} from registry")
+                return
+            model_path = 'models/current_season_model.pkl'
         
         self.model = joblib.load(model_path)
         self.scaler = joblib.load(model_path.replace('.pkl', '_scaler.pkl'))
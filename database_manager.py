@@ -9,11 +9,31 @@ import pandas as pd
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 import os
+import copy
+import functools
+from collections import OrderedDict
 from team_name_mapper import TeamNameMapper
 
+def cached_read(*tables: str):
+    """Cache a DatabaseManager read until one of `tables` is written.
+    
+    Entries are keyed by method name and arguments and stamped with the
+    table_versions counters of the tables the query reads, so a write only
+    invalidates the reads that depend on the changed table.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            return self._cached_read(method.__name__, args, kwargs, tables,
+                                     lambda: method(self, *args, **kwargs))
+        return wrapper
+    return decorator
+
 class DatabaseManager:
     """Manages SQLite database operations for NFL confidence pool"""
     
+    READ_CACHE_SIZE = 128
+    
     def __init__(self, db_path: str = "data/nfl_pool.db", version: str = None):
         if version:
             # Use versioned database path
@@ -26,6 +46,7 @@ class DatabaseManager:
         else:
             self.db_path = db_path
         self.team_mapper = TeamNameMapper()
+        self._read_cache = OrderedDict()
         self._ensure_db_exists()
     
     def _ensure_db_exists(self):
@@ -39,19 +60,30 @@ class DatabaseManager:
                 schema = f.read()
             
             # Execute schema (SQLite doesn't support multiple statements in one execute)
-            for statement in schema.split(';'):
-                statement = statement.strip()
+            for statement in self._split_schema_statements(schema):
                 if statement:
                     try:
                         conn.execute(statement)
                     except sqlite3.OperationalError as e:
-                        if "already exists" in str(e):
-                            continue  # Table already exists, skip
+                        if "already exists" in str(e) or "duplicate column name" in str(e):
+                            continue  # Table or added column already exists, skip
                         else:
                             raise e
             
             conn.commit()
     
+    @staticmethod
+    def _split_schema_statements(schema: str) -> List[str]:
+        """Split schema into complete statements (trigger bodies contain ';')"""
+        statements = []
+        buffer = ""
+        for chunk in schema.split(';'):
+            buffer += chunk + ';'
+            if sqlite3.complete_statement(buffer):
+                statements.append(buffer.strip().rstrip(';').strip())
+                buffer = ""
+        return statements
+    
     def get_connection(self) -> sqlite3.Connection:
         """Get database connection"""
         return sqlite3.connect(self.db_path)
@@ -69,13 +101,28 @@ class DatabaseManager:
             return cursor.lastrowid
     
     def get_team_id(self, name: str) -> Optional[int]:
-        """Get team ID by name"""
+        """Get team ID by name or any alias the team mapper knows (abbreviation, nickname, old name)"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT id FROM teams WHERE name = ?", (name,))
+            cursor.execute("SELECT id FROM teams WHERE name = ?", (self.team_mapper.resolve(name) or name,))
             result = cursor.fetchone()
             return result[0] if result else None
     
+    def get_team_ids(self, names):
+        """Bulk get_team_id: one teams query, names resolved through the alias index.
+        
+        A Series gives a Series of IDs (NaN where unknown), anything else a list.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT id, name FROM teams")
+            team_ids = {name: team_id for team_id, name in cursor.fetchall()}
+        
+        resolved = self.team_mapper.resolve_many(names)
+        if isinstance(resolved, pd.Series):
+            return resolved.map(team_ids)
+        return [team_ids.get(name) for name in resolved]
+    
     def _ensure_team_exists(self, team_name: str) -> int:
         """Ensure team exists in database, create if not"""
         team_id = self.get_team_id(team_name)
@@ -153,6 +200,29 @@ class DatabaseManager:
             result = cursor.fetchone()
             return result[0] if result else None
     
+    def get_game_ids(self, game_keys: List[Tuple[int, int, str, str]]) -> List[Optional[int]]:
+        """Bulk get_game_id: resolve (season_year, week, home_team, away_team) keys in one query"""
+        if not game_keys:
+            return []
+        
+        season_weeks = sorted({(int(season), int(week)) for season, week, _, _ in game_keys})
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            conditions = " OR ".join("(g.season_year = ? AND g.week = ?)" for _ in season_weeks)
+            cursor.execute(f"""
+                SELECT g.id, g.season_year, g.week, ht.name, at.name
+                FROM games g
+                JOIN teams ht ON g.home_team_id = ht.id
+                JOIN teams at ON g.away_team_id = at.id
+                WHERE {conditions}
+            """, [value for season_week in season_weeks for value in season_week])
+            game_map = {(season, week, home, away): game_id 
+                        for game_id, season, week, home, away in cursor.fetchall()}
+        
+        resolve = self.team_mapper.map_team_name
+        return [game_map.get((int(season), int(week), resolve(home), resolve(away))) 
+                for season, week, home, away in game_keys]
+    
     # Odds operations
     def insert_odds(self, game_id: int, bookmaker: str, home_ml: Optional[int], 
                    away_ml: Optional[int], total_points: Optional[float],
@@ -170,6 +240,43 @@ class DatabaseManager:
             conn.commit()
             return cursor.lastrowid
     
+    def sync_odds(self, odds_rows: List[Dict], timestamp: str) -> Dict[str, int]:
+        """Store one odds snapshot (e.g. a fetched odds file), keyed by (game_id, bookmaker).
+        
+        Rows already stored for the snapshot's timestamp are updated only when
+        their lines changed; earlier snapshots are never touched.
+        """
+        incoming = {(row['game_id'], row['bookmaker']):
+                    (row.get('home_ml'), row.get('away_ml'), row.get('total_points'),
+                     row.get('home_win_prob'), row.get('away_win_prob'))
+                    for row in odds_rows}
+        game_ids = sorted({game_id for game_id, _ in incoming})
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT id, game_id, bookmaker, home_ml, away_ml, total_points, home_win_prob, away_win_prob
+                FROM odds WHERE timestamp = ? AND game_id IN ({', '.join('?' for _ in game_ids)})
+            """, [timestamp] + game_ids)
+            existing = {(row[1], row[2]): (row[0], tuple(row[3:])) for row in cursor.fetchall()}
+            inserts, updates, _ = self._diff_keyed_rows(existing, incoming, delete_missing=False)
+            
+            cursor.executemany("""
+                INSERT INTO odds
+                (game_id, bookmaker, home_ml, away_ml, total_points,
+                 home_win_prob, away_win_prob, timestamp)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, [key + values + (timestamp,) for key, values in inserts])
+            cursor.executemany("""
+                UPDATE odds SET home_ml = ?, away_ml = ?, total_points = ?,
+                                home_win_prob = ?, away_win_prob = ?
+                WHERE id = ?
+            """, [values + (row_id,) for row_id, values in updates])
+            conn.commit()
+        
+        return {'inserted': len(inserts), 'updated': len(updates),
+                'unchanged': len(incoming) - len(inserts) - len(updates)}
+    
     # Picks operations
     def insert_pick(self, game_id: int, season_year: int, week: int, 
                    pick_team: str, confidence_points: int, win_probability: float,
@@ -222,6 +329,7 @@ class DatabaseManager:
             return cursor.lastrowid
     
     # Query operations for ML
+    @cached_read('team_performance', 'teams')
     def get_team_performance_history(self, team: str, weeks_back: int = 4) -> pd.DataFrame:
         """Get team performance history for ML features"""
         team_id = self.get_team_id(team)
@@ -239,6 +347,31 @@ class DatabaseManager:
             """
             return pd.read_sql_query(query, conn, params=(team_id, weeks_back))
     
+    def get_team_form(self, team: str, season_year: Optional[int] = None,
+                      week: Optional[int] = None) -> Optional[Dict]:
+        """Latest team_performance row before a week (latest overall without one)"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            query = """
+                SELECT tp.season_year, tp.week, tp.games_played, tp.wins, tp.losses,
+                       tp.points_scored, tp.points_allowed, tp.point_differential, tp.win_percentage,
+                       tp.rolling_games, tp.rolling_wins, tp.rolling_losses,
+                       tp.rolling_point_differential, tp.rolling_win_percentage
+                FROM team_performance tp
+                WHERE tp.team_id = (SELECT id FROM teams WHERE name = ?)
+            """
+            params = [self.team_mapper.map_team_name(team)]
+            if season_year is not None and week is not None:
+                query += " AND (tp.season_year, tp.week) < (?, ?)"
+                params.extend([season_year, week])
+            cursor.execute(query + " ORDER BY tp.season_year DESC, tp.week DESC LIMIT 1", params)
+            
+            row = cursor.fetchone()
+            if not row:
+                return None
+            columns = [description[0] for description in cursor.description]
+            return dict(zip(columns, row))
+    
     def get_confidence_accuracy_history(self, weeks_back: int = 8) -> pd.DataFrame:
         """Get confidence point accuracy history for ML features"""
         with self.get_connection() as conn:
@@ -251,6 +384,7 @@ class DatabaseManager:
             """
             return pd.read_sql_query(query, conn, params=(weeks_back * 16,))  # ~16 games per week
     
+    @cached_read('games', 'teams', 'odds', 'picks', 'game_travel_features')
     def get_game_features(self, season_year: int, week: int) -> pd.DataFrame:
         """Get comprehensive game features for ML model"""
         with self.get_connection() as conn:
@@ -274,17 +408,34 @@ class DatabaseManager:
                     g.away_score,
                     g.total_points as actual_total,
                     g.margin,
-                    g.winner_team_id
+                    g.winner_team_id,
+                    tf.is_international,
+                    tf.is_neutral_site,
+                    tf.home_rest_days,
+                    tf.away_rest_days,
+                    tf.rest_advantage,
+                    tf.home_short_week,
+                    tf.away_short_week,
+                    tf.home_off_bye,
+                    tf.away_off_bye,
+                    tf.home_road_streak,
+                    tf.away_road_streak,
+                    tf.home_tz_crossed,
+                    tf.away_tz_crossed,
+                    tf.home_travel_miles,
+                    tf.away_travel_miles
                 FROM games g
                 JOIN teams ht ON g.home_team_id = ht.id
                 JOIN teams at ON g.away_team_id = at.id
                 LEFT JOIN odds o ON g.id = o.game_id
                 LEFT JOIN picks p ON g.id = p.game_id
+                LEFT JOIN game_travel_features tf ON g.id = tf.game_id
                 WHERE g.season_year = ? AND g.week = ?
                 ORDER BY p.confidence_points DESC
             """
             return pd.read_sql_query(query, conn, params=(season_year, week))
     
+    @cached_read('picks', 'games', 'teams', 'odds')
     def get_all_picks_for_ml(self) -> pd.DataFrame:
         """Get all picks data for ML training"""
         with self.get_connection() as conn:
@@ -385,6 +536,39 @@ class DatabaseManager:
             conn.commit()
             return cursor.lastrowid
     
+    def sync_expert_picks(self, expert_picks: List[Dict]) -> Dict[str, int]:
+        """Bulk-write scraped expert picks in one transaction, keyed by (game_id, expert_name).
+        
+        New picks are inserted and changed ones (pick, spread, moneyline)
+        updated; picks not in `expert_picks` are left alone.
+        """
+        incoming = {(pick['game_id'], pick['expert_name']):
+                    (pick['pick_team'], pick.get('spread'), pick.get('moneyline'))
+                    for pick in expert_picks}
+        game_ids = sorted({game_id for game_id, _ in incoming})
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT id, game_id, expert_name, pick_team, spread, moneyline
+                FROM expert_picks WHERE game_id IN ({', '.join('?' for _ in game_ids)})
+            """, game_ids)
+            existing = {(row[1], row[2]): (row[0], tuple(row[3:])) for row in cursor.fetchall()}
+            inserts, updates, _ = self._diff_keyed_rows(existing, incoming, delete_missing=False)
+            
+            cursor.executemany("""
+                INSERT INTO expert_picks (game_id, expert_name, pick_team, spread, moneyline)
+                VALUES (?, ?, ?, ?, ?)
+            """, [key + values for key, values in inserts])
+            cursor.executemany("""
+                UPDATE expert_picks SET pick_team = ?, spread = ?, moneyline = ? WHERE id = ?
+            """, [values + (row_id,) for row_id, values in updates])
+            conn.commit()
+        
+        return {'inserted': len(inserts), 'updated': len(updates),
+                'unchanged': len(incoming) - len(inserts) - len(updates)}
+    
+    @cached_read('expert_picks')
     def get_expert_picks_for_game(self, game_id: int) -> pd.DataFrame:
         """Get all expert picks for a specific game"""
         
@@ -400,11 +584,69 @@ class DatabaseManager:
             columns = [description[0] for description in cursor.description]
             return pd.DataFrame([dict(zip(columns, row)) for row in cursor.fetchall()])
     
+    def get_expert_picks_for_games(self, game_ids: List[int]) -> pd.DataFrame:
+        """Get expert picks for many games in one query (adds a game_id column)"""
+        columns = ['game_id', 'expert_name', 'pick_team', 'spread', 'result', 'confidence']
+        game_ids = sorted({int(game_id) for game_id in game_ids if game_id is not None})
+        if not game_ids:
+            return pd.DataFrame(columns=columns)
+        
+        with self.get_connection() as conn:
+            placeholders = ", ".join("?" for _ in game_ids)
+            query = f"""
+                SELECT game_id, expert_name, pick_team, spread, result, confidence
+                FROM expert_picks
+                WHERE game_id IN ({placeholders})
+                ORDER BY game_id, expert_name
+            """
+            return pd.read_sql_query(query, conn, params=game_ids)
+    
+    def get_expert_market_picks(self, season_year: int) -> pd.DataFrame:
+        """Every expert pick of a season with its game, teams and the latest market moneylines.
+        
+        Rows come in scrape order within each game; market_home_ml/market_away_ml
+        average the bookmakers of each game's most recent odds snapshot.
+        """
+        with self.get_connection() as conn:
+            query = """
+                WITH latest_odds AS (
+                    SELECT o.game_id, AVG(o.home_ml) AS market_home_ml, AVG(o.away_ml) AS market_away_ml
+                    FROM odds o
+                    JOIN games g ON g.id = o.game_id
+                    WHERE g.season_year = ?
+                      AND o.timestamp = (SELECT MAX(timestamp) FROM odds WHERE game_id = o.game_id)
+                    GROUP BY o.game_id
+                )
+                SELECT g.season_year, g.week, e.game_id, at.name AS away_team, ht.name AS home_team,
+                       e.expert_name, e.pick_team, e.moneyline,
+                       lo.market_home_ml, lo.market_away_ml
+                FROM expert_picks e
+                JOIN games g ON g.id = e.game_id
+                JOIN teams ht ON ht.id = g.home_team_id
+                JOIN teams at ON at.id = g.away_team_id
+                LEFT JOIN latest_odds lo ON lo.game_id = e.game_id
+                WHERE g.season_year = ?
+                ORDER BY g.week, e.game_id, e.id
+            """
+            return pd.read_sql_query(query, conn, params=(season_year, season_year))
+    
     def get_expert_consensus(self, game_id: int) -> dict:
         """Get expert consensus for a game"""
         
         expert_picks = self.get_expert_picks_for_game(game_id)
+        return self._consensus_from_picks(expert_picks)
+    
+    def get_expert_consensus_many(self, game_ids: List[int]) -> Dict[int, dict]:
+        """Get expert consensus for many games with a single expert_picks query"""
+        expert_picks = self.get_expert_picks_for_games(game_ids)
+        grouped = {game_id: picks for game_id, picks in expert_picks.groupby('game_id')}
         
+        return {game_id: self._consensus_from_picks(grouped.get(game_id, pd.DataFrame()))
+                for game_id in game_ids if game_id is not None}
+    
+    @staticmethod
+    def _consensus_from_picks(expert_picks: pd.DataFrame) -> dict:
+        """Summarize one game's expert picks into a consensus"""
         if expert_picks.empty:
             return {"consensus_team": None, "consensus_percentage": 0.0, "total_experts": 0}
         
@@ -443,6 +685,69 @@ class DatabaseManager:
                   confidence_points, is_correct, total_weekly_score, weekly_rank))
             return cursor.lastrowid
     
+    def sync_pool_results(self, season_year: int, week: int, picks: List[Dict],
+                          delete_missing: bool = False) -> Dict[str, int]:
+        """Bring one week's pool_results in line with `picks` in a single transaction.
+        
+        Rows are keyed by (participant_name, game_id): new keys are inserted,
+        keys whose values differ are updated and identical rows are left alone,
+        so only real changes reach the triggers. delete_missing also removes
+        keys absent from `picks` (the source covers the whole week).
+        """
+        incoming = {(pick['participant_name'], pick['game_id']):
+                    (pick['pick_team_id'], pick['confidence_points'],
+                     None if pick['is_correct'] is None else int(pick['is_correct']),
+                     pick.get('total_weekly_score'), pick.get('weekly_rank'))
+                    for pick in picks}
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT id, participant_name, game_id, pick_team_id, confidence_points,
+                       is_correct, total_weekly_score, weekly_rank
+                FROM pool_results WHERE season_year = ? AND week = ?
+            """, (season_year, week))
+            existing = {(row[1], row[2]): (row[0], tuple(row[3:])) for row in cursor.fetchall()}
+            inserts, updates, deletes = self._diff_keyed_rows(existing, incoming, delete_missing)
+            
+            cursor.executemany("""
+                INSERT INTO pool_results
+                (season_year, week, participant_name, game_id, pick_team_id,
+                 confidence_points, is_correct, total_weekly_score, weekly_rank)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [(season_year, week) + key + values for key, values in inserts])
+            cursor.executemany("""
+                UPDATE pool_results
+                SET pick_team_id = ?, confidence_points = ?, is_correct = ?,
+                    total_weekly_score = ?, weekly_rank = ?
+                WHERE id = ?
+            """, [values + (row_id,) for row_id, values in updates])
+            cursor.executemany("DELETE FROM pool_results WHERE id = ?", [(row_id,) for row_id in deletes])
+            conn.commit()
+        
+        return {'inserted': len(inserts), 'updated': len(updates), 'deleted': len(deletes),
+                'unchanged': len(incoming) - len(inserts) - len(updates)}
+    
+    @staticmethod
+    def _diff_keyed_rows(existing: Dict[tuple, Tuple[int, tuple]], incoming: Dict[tuple, tuple],
+                         delete_missing: bool):
+        """(inserts [(key, values)], updates [(row_id, values)], deletes [row_id]) between stored and new rows"""
+        inserts = [(key, values) for key, values in incoming.items() if key not in existing]
+        updates = [(existing[key][0], values) for key, values in incoming.items()
+                   if key in existing and existing[key][1] != values]
+        deletes = [row_id for key, (row_id, _) in existing.items()
+                   if delete_missing and key not in incoming]
+        return inserts, updates, deletes
+    
+    def count_pool_results(self, season_year: int, week: int) -> int:
+        """Number of stored pool results for a week"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(*) FROM pool_results WHERE season_year = ? AND week = ?",
+                           (season_year, week))
+            return cursor.fetchone()[0]
+    
+    @cached_read('pool_results', 'games', 'teams')
     def get_pool_results_for_week(self, season_year: int, week: int) -> List[Dict]:
         """Get all pool results for a specific week"""
         with self.get_connection() as conn:
@@ -485,43 +790,556 @@ class DatabaseManager:
     
     def get_top_performers_analysis(self, season_year: int, week: int, top_n: int = 5) -> Dict:
         """Analyze top performers' pick patterns"""
+        return self.get_top_performers_by_week(season_year, week, week, top_n).get(week, {})
+    
+    @cached_read('pool_results', 'games', 'teams')
+    def get_top_performers_by_week(self, season_year: int, start_week: int, 
+                                   end_week: int, top_n: int = 5) -> Dict[int, Dict]:
+        """Get each week's top-N participants (ties included) with their picks.
+        
+        Returns {week: {participant_name: [pick, ...]}} with participants in rank
+        order. Results are cached until the next pool_results write.
+        """
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
-                SELECT 
-                    pr.participant_name,
-                    pr.pick_team_id,
-                    t.name as pick_team,
-                    pr.confidence_points,
-                    pr.is_correct,
-                    ht.name as home_team,
-                    at.name as away_team
-                FROM pool_results pr
-                JOIN teams t ON pr.pick_team_id = t.id
-                JOIN games g ON pr.game_id = g.id
-                JOIN teams ht ON g.home_team_id = ht.id
-                JOIN teams at ON g.away_team_id = at.id
-                WHERE pr.season_year = ? AND pr.week = ?
-                AND pr.participant_name IN (
-                    SELECT participant_name 
-                    FROM pool_results 
-                    WHERE season_year = ? AND week = ?
-                    GROUP BY participant_name
-                    ORDER BY SUM(CASE WHEN is_correct = 1 THEN confidence_points ELSE 0 END) DESC
-                    LIMIT ?
+                WITH weekly_scores AS (
+                    SELECT 
+                        season_year,
+                        week,
+                        participant_name,
+                        SUM(CASE WHEN is_correct = 1 THEN confidence_points ELSE 0 END) as score
+                    FROM pool_results
+                    WHERE season_year = ? AND week BETWEEN ? AND ?
+                    GROUP BY season_year, week, participant_name
+                ),
+                ranked AS (
+                    SELECT 
+                        *,
+                        RANK() OVER (PARTITION BY season_year, week ORDER BY score DESC) as weekly_rank
+                    FROM weekly_scores
+                ),
+                top_picks AS (
+                    SELECT 
+                        r.week,
+                        r.weekly_rank,
+                        pr.participant_name,
+                        pr.pick_team_id,
+                        t.name as pick_team,
+                        pr.confidence_points,
+                        pr.is_correct,
+                        ht.name as home_team,
+                        at.name as away_team
+                    FROM ranked r
+                    JOIN pool_results pr ON pr.season_year = r.season_year 
+                        AND pr.week = r.week AND pr.participant_name = r.participant_name
+                    JOIN teams t ON pr.pick_team_id = t.id
+                    JOIN games g ON pr.game_id = g.id
+                    JOIN teams ht ON g.home_team_id = ht.id
+                    JOIN teams at ON g.away_team_id = at.id
+                    WHERE r.weekly_rank <= ?
+                    ORDER BY r.week, pr.participant_name, pr.confidence_points DESC
                 )
-                ORDER BY pr.participant_name, pr.confidence_points DESC
-            """, (season_year, week, season_year, week, top_n))
+                SELECT 
+                    week,
+                    participant_name,
+                    json_group_array(json_object(
+                        'participant_name', participant_name,
+                        'pick_team_id', pick_team_id,
+                        'pick_team', pick_team,
+                        'confidence_points', confidence_points,
+                        'is_correct', is_correct,
+                        'home_team', home_team,
+                        'away_team', away_team
+                    )) as picks
+                FROM top_picks
+                GROUP BY week, participant_name
+                ORDER BY week, MIN(weekly_rank), participant_name
+            """, (season_year, start_week, end_week, top_n))
+            
+            weeks = {}
+            for week, participant, picks in cursor.fetchall():
+                weeks.setdefault(week, {})[participant] = json.loads(picks)
+            
+            return weeks
+    
+    # Read cache operations
+    def get_table_version(self, table_name: str) -> int:
+        """Get the write counter for a table (bumped by triggers on every change)"""
+        return self.get_table_versions([table_name])[0]
+    
+    def get_table_versions(self, table_names) -> Tuple[int, ...]:
+        """Get write counters for several tables in one query"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            placeholders = ", ".join("?" for _ in table_names)
+            cursor.execute(f"""
+                SELECT table_name, version FROM table_versions 
+                WHERE table_name IN ({placeholders})
+            """, tuple(table_names))
+            versions = dict(cursor.fetchall())
+            return tuple(versions.get(name, 0) for name in table_names)
+    
+    def _cached_read(self, name: str, args: tuple, kwargs: dict, tables, loader):
+        """Return a cached result if none of `tables` changed since it was loaded"""
+        key = (name, args, tuple(sorted(kwargs.items())))
+        versions = self.get_table_versions(tables)
+        
+        cached = self._read_cache.get(key)
+        if cached is not None and cached[0] == versions:
+            self._read_cache.move_to_end(key)
+            return self._copy_cached(cached[1])
+        
+        result = loader()
+        self._read_cache[key] = (versions, result)
+        self._read_cache.move_to_end(key)
+        if len(self._read_cache) > self.READ_CACHE_SIZE:
+            self._read_cache.popitem(last=False)
+        return self._copy_cached(result)
+    
+    @staticmethod
+    def _copy_cached(value):
+        """Hand out copies so callers can't mutate cached results"""
+        if isinstance(value, pd.DataFrame):
+            return value.copy()
+        if isinstance(value, list) and all(isinstance(row, dict) for row in value):
+            return [dict(row) for row in value]  # rows hold only scalars
+        return copy.deepcopy(value)
+    
+    def clear_read_cache(self):
+        """Drop all cached reads"""
+        self._read_cache.clear()
+    
+    # Pool standings operations
+    def refresh_pool_standings(self, season_year: Optional[int] = None, 
+                               from_week: Optional[int] = None) -> int:
+        """Recompute materialized standings for stale seasons, return rows written.
+        
+        With no arguments, only seasons marked stale by the pool_results triggers
+        are refreshed, starting at their earliest changed week. Passing a season
+        (and optionally a week) forces a rebuild from that point.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            if season_year is not None:
+                if from_week is None:
+                    cursor.execute("""
+                        SELECT MIN(week) FROM pool_results WHERE season_year = ?
+                    """, (season_year,))
+                    from_week = cursor.fetchone()[0] or 1
+                stale = [(season_year, from_week)]
+            else:
+                cursor.execute("SELECT season_year, from_week FROM pool_standings_dirty")
+                stale = cursor.fetchall()
+            
+            rows_written = 0
+            for stale_season, stale_week in stale:
+                rows_written += self._refresh_season_standings(cursor, stale_season, stale_week)
+                cursor.execute("""
+                    DELETE FROM pool_standings_dirty WHERE season_year = ? AND from_week >= ?
+                """, (stale_season, stale_week))
+            
+            conn.commit()
+            return rows_written
+    
+    def _refresh_season_standings(self, cursor: sqlite3.Cursor, season_year: int, 
+                                  from_week: int) -> int:
+        """Rebuild standings rows for one season from a given week onward.
+        
+        Weekly totals come from pool_results for the affected weeks only; cumulative
+        totals continue from the last materialized week before `from_week`.
+        Participants who skipped a week carry their totals forward with 0 points.
+        """
+        cursor.execute("""
+            DELETE FROM pool_standings WHERE season_year = ? AND week >= ?
+        """, (season_year, from_week))
+        
+        cursor.execute("""
+            INSERT INTO pool_standings 
+            (season_year, week, participant_name, weekly_picks, weekly_correct, 
+             weekly_score, weekly_accuracy, weekly_rank, cumulative_picks, 
+             cumulative_correct, cumulative_score, cumulative_accuracy, 
+             season_rank, updated_at)
+            WITH weeks AS (
+                SELECT DISTINCT week FROM pool_results
+                WHERE season_year = :season_year AND week >= :from_week
+            ),
+            participants AS (
+                SELECT DISTINCT participant_name FROM pool_results
+                WHERE season_year = :season_year
+            ),
+            weekly AS (
+                SELECT 
+                    participant_name,
+                    week,
+                    COUNT(*) as picks,
+                    SUM(CASE WHEN is_correct = 1 THEN 1 ELSE 0 END) as correct,
+                    SUM(CASE WHEN is_correct = 1 THEN confidence_points ELSE 0 END) as score
+                FROM pool_results
+                WHERE season_year = :season_year AND week >= :from_week
+                GROUP BY participant_name, week
+            ),
+            base AS (
+                SELECT participant_name, cumulative_picks, cumulative_correct, cumulative_score
+                FROM pool_standings
+                WHERE season_year = :season_year
+                AND week = (SELECT MAX(week) FROM pool_standings 
+                            WHERE season_year = :season_year AND week < :from_week)
+            ),
+            grid AS (
+                SELECT 
+                    p.participant_name,
+                    w.week,
+                    COALESCE(wk.picks, 0) as picks,
+                    COALESCE(wk.correct, 0) as correct,
+                    COALESCE(wk.score, 0) as score,
+                    COALESCE(b.cumulative_picks, 0) + SUM(COALESCE(wk.picks, 0)) OVER running as cum_picks,
+                    COALESCE(b.cumulative_correct, 0) + SUM(COALESCE(wk.correct, 0)) OVER running as cum_correct,
+                    COALESCE(b.cumulative_score, 0) + SUM(COALESCE(wk.score, 0)) OVER running as cum_score
+                FROM participants p
+                CROSS JOIN weeks w
+                LEFT JOIN weekly wk ON wk.participant_name = p.participant_name AND wk.week = w.week
+                LEFT JOIN base b ON b.participant_name = p.participant_name
+                WINDOW running AS (PARTITION BY p.participant_name ORDER BY w.week)
+            )
+            SELECT 
+                :season_year,
+                week,
+                participant_name,
+                picks,
+                correct,
+                score,
+                CASE WHEN picks > 0 THEN ROUND(correct * 100.0 / picks, 1) END,
+                RANK() OVER (PARTITION BY week ORDER BY score DESC),
+                cum_picks,
+                cum_correct,
+                cum_score,
+                CASE WHEN cum_picks > 0 THEN ROUND(cum_correct * 100.0 / cum_picks, 1) END,
+                RANK() OVER (PARTITION BY week ORDER BY cum_score DESC),
+                :updated_at
+            FROM grid
+        """, {"season_year": season_year, "from_week": from_week,
+              "updated_at": datetime.now().isoformat()})
+        return cursor.rowcount
+    
+    def get_season_standings(self, season_year: int, week: Optional[int] = None, 
+                             limit: Optional[int] = None) -> List[Dict]:
+        """Get season-to-date leaderboard as of a week (latest week by default)"""
+        self.refresh_pool_standings()
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT 1 FROM pool_standings WHERE season_year = ? LIMIT 1
+            """, (season_year,))
+            if cursor.fetchone() is None:
+                # First read after the table was added: backfill the whole season
+                self.refresh_pool_standings(season_year)
+            
+            if week is None:
+                cursor.execute("""
+                    SELECT MAX(week) FROM pool_standings WHERE season_year = ?
+                """, (season_year,))
+                week = cursor.fetchone()[0]
+                if week is None:
+                    return []
+            
+            cursor.execute("""
+                SELECT participant_name, week, season_rank, cumulative_score, 
+                       cumulative_correct, cumulative_picks, cumulative_accuracy,
+                       weekly_rank, weekly_score, weekly_correct, weekly_picks, 
+                       weekly_accuracy
+                FROM pool_standings
+                WHERE season_year = ? AND week = ?
+                ORDER BY season_rank, participant_name
+                LIMIT ?
+            """, (season_year, week, limit if limit is not None else -1))
             
             columns = [description[0] for description in cursor.description]
-            results = [dict(zip(columns, row)) for row in cursor.fetchall()]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    
+    def get_participant_standings_history(self, season_year: int, 
+                                          participant_name: str) -> List[Dict]:
+        """Get week-by-week standings for one participant"""
+        self.refresh_pool_standings()
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT week, weekly_score, weekly_correct, weekly_picks, weekly_accuracy,
+                       weekly_rank, cumulative_score, cumulative_accuracy, season_rank
+                FROM pool_standings
+                WHERE participant_name = ? AND season_year = ?
+                ORDER BY week
+            """, (participant_name, season_year))
             
-            # Group by participant
-            participants = {}
-            for result in results:
-                participant = result['participant_name']
-                if participant not in participants:
-                    participants[participant] = []
-                participants[participant].append(result)
+            columns = [description[0] for description in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    
+    # Change-data-capture operations
+    def get_changes(self, since_change_id: int = 0, tables: Optional[List[str]] = None,
+                    limit: Optional[int] = None) -> List[Dict]:
+        """Get change_log entries after a change id, oldest first"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            query = """
+                SELECT id, table_name, row_id, op, game_id, season_year, week,
+                       participant_name, changed_at
+                FROM change_log
+                WHERE id > ?
+            """
+            params = [since_change_id]
+            if tables:
+                query += f" AND table_name IN ({', '.join('?' for _ in tables)})"
+                params.extend(tables)
+            query += " ORDER BY id LIMIT ?"
+            params.append(limit if limit is not None else -1)
+            cursor.execute(query, params)
             
-            return participants
+            columns = [description[0] for description in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    
+    def get_change_checkpoint(self, consumer_name: str) -> int:
+        """Get the last change id a consumer has processed"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT last_change_id FROM change_checkpoints WHERE consumer_name = ?
+            """, (consumer_name,))
+            result = cursor.fetchone()
+            return result[0] if result else 0
+    
+    def set_change_checkpoint(self, consumer_name: str, change_id: int):
+        """Record that a consumer has processed changes up to change_id"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT INTO change_checkpoints (consumer_name, last_change_id, updated_at)
+                VALUES (?, ?, ?)
+                ON CONFLICT(consumer_name) DO UPDATE SET 
+                    last_change_id = MAX(last_change_id, excluded.last_change_id),
+                    updated_at = excluded.updated_at
+            """, (consumer_name, change_id, datetime.now().isoformat()))
+            conn.commit()
+    
+    def prune_change_log(self) -> int:
+        """Delete change_log entries every registered consumer has processed"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                DELETE FROM change_log 
+                WHERE id <= (SELECT MIN(last_change_id) FROM change_checkpoints)
+            """)
+            conn.commit()
+            return cursor.rowcount
+    
+    # Ingestion ledger operations
+    def get_ingestion_record(self, source_path: str) -> Optional[Dict]:
+        """Get the ledger entry for a source file, if it has been ingested"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM ingestion_ledger WHERE source_path = ?", (source_path,))
+            result = cursor.fetchone()
+            if result is None:
+                return None
+            columns = [description[0] for description in cursor.description]
+            return dict(zip(columns, result))
+    
+    def record_ingestion(self, source_path: str, source_kind: str, content_hash: str, row_count: int,
+                         file_size: Optional[int] = None, file_mtime_ns: Optional[int] = None,
+                         season_year: Optional[int] = None, week: Optional[int] = None):
+        """Record (or replace) the ledger entry for an ingested source file"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT OR REPLACE INTO ingestion_ledger
+                (source_path, source_kind, content_hash, file_size, file_mtime_ns,
+                 row_count, season_year, week, ingested_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (source_path, source_kind, content_hash, file_size, file_mtime_ns,
+                  row_count, season_year, week, datetime.now().isoformat()))
+            conn.commit()
+    
+    # Raw payload archive operations
+    def record_raw_payload(self, source: str, url: str, params: str, fetched_at: str, content_hash: str,
+                           byte_size: int, stored_size: int, status_code: Optional[int] = None,
+                           content_type: Optional[str] = None) -> int:
+        """Index one archived fetch (the blob is stored by RawPayloadArchive)"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT OR IGNORE INTO raw_payloads
+                (source, url, params, fetched_at, status_code, content_type,
+                 content_hash, byte_size, stored_size)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (source, url, params, fetched_at, status_code, content_type,
+                  content_hash, byte_size, stored_size))
+            conn.commit()
+            return cursor.lastrowid
+    
+    def get_raw_payloads(self, source: Optional[str] = None, url: Optional[str] = None,
+                         params: Optional[str] = None, since: Optional[str] = None,
+                         until: Optional[str] = None, latest: bool = False) -> List[Dict]:
+        """Archived fetches matching the given filters, oldest first (or only the latest)"""
+        filters, values = [], []
+        for column, value in (('source', source), ('url', url), ('params', params)):
+            if value is not None:
+                filters.append(f"{column} = ?")
+                values.append(value)
+        if since is not None:
+            filters.append("fetched_at >= ?")
+            values.append(since)
+        if until is not None:
+            filters.append("fetched_at <= ?")
+            values.append(until)
+        
+        query = "SELECT * FROM raw_payloads"
+        if filters:
+            query += " WHERE " + " AND ".join(filters)
+        query += " ORDER BY fetched_at DESC, id DESC LIMIT 1" if latest else " ORDER BY fetched_at, id"
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, values)
+            columns = [description[0] for description in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    
+    def get_raw_payload_stats(self) -> Dict:
+        """Fetches per source, plus distinct payloads and their raw/stored bytes"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT source, COUNT(*) AS fetches, COUNT(DISTINCT content_hash) AS payloads,
+                       SUM(byte_size) AS fetched_bytes, MIN(fetched_at) AS first_fetch,
+                       MAX(fetched_at) AS last_fetch
+                FROM raw_payloads
+                GROUP BY source
+                ORDER BY source
+            """)
+            columns = [description[0] for description in cursor.description]
+            sources = [dict(zip(columns, row)) for row in cursor.fetchall()]
+            
+            cursor.execute("""
+                SELECT COUNT(*), COALESCE(SUM(byte_size), 0), COALESCE(SUM(stored_size), 0)
+                FROM (SELECT content_hash, MAX(byte_size) AS byte_size, MAX(stored_size) AS stored_size
+                      FROM raw_payloads GROUP BY content_hash)
+            """)
+            blobs, blob_bytes, stored_bytes = cursor.fetchone()
+            return {'sources': sources, 'blobs': blobs, 'blob_bytes': blob_bytes, 'stored_bytes': stored_bytes}
+    
+    # Win probability series operations
+    def upsert_win_probability_series(self, rows: List[Dict]) -> int:
+        """Store (or replace) packed win-probability series, one row per ESPN event"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany("""
+                INSERT OR REPLACE INTO win_probability_series
+                (espn_event_id, game_id, season_year, week, home_team, away_team, is_final,
+                 n_points, first_home_win_prob, final_home_win_prob, series, fetched_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [(row['espn_event_id'], row['game_id'], row['season_year'], row['week'],
+                   row['home_team'], row['away_team'], row['is_final'], row['n_points'],
+                   row['first_home_win_prob'], row['final_home_win_prob'], row['series'],
+                   row['fetched_at']) for row in rows])
+            conn.commit()
+            return cursor.rowcount
+    
+    def get_win_probability_series(self, season_year: int, week: Optional[int] = None) -> List[Dict]:
+        """Stored series rows for a season (or one week), still packed"""
+        query = "SELECT * FROM win_probability_series WHERE season_year = ?"
+        params = [season_year]
+        if week is not None:
+            query += " AND week = ?"
+            params.append(week)
+        query += " ORDER BY week, espn_event_id"
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            columns = [description[0] for description in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    
+    def get_final_win_probability_events(self, season_year: int) -> set:
+        """ESPN event ids whose completed-game series is already stored"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT espn_event_id FROM win_probability_series
+                WHERE season_year = ? AND is_final = 1
+            """, (season_year,))
+            return {row[0] for row in cursor.fetchall()}
+    
+    # Play-by-play operations
+    def record_play_by_play_events(self, rows: List[Dict]) -> int:
+        """Record events whose plays were written to a chunk (replacing earlier ingestions)"""
+        ingested_at = datetime.now().isoformat()
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany("""
+                INSERT OR REPLACE INTO play_by_play_events
+                (espn_event_id, game_id, season_year, week, home_team, away_team,
+                 plays, chunk_path, ingested_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [(row['espn_event_id'], row['game_id'], row['season_year'], row['week'],
+                   row['home_team'], row['away_team'], row['plays'], row['chunk_path'],
+                   ingested_at) for row in rows])
+            conn.commit()
+            return cursor.rowcount
+    
+    def get_play_by_play_events(self, season_years: Optional[List[int]] = None,
+                                weeks: Optional[List[int]] = None) -> List[Dict]:
+        """Ingested play-by-play events, optionally for some seasons/weeks"""
+        query = "SELECT * FROM play_by_play_events"
+        filters, params = [], []
+        for column, values in (('season_year', season_years), ('week', weeks)):
+            if values:
+                filters.append(f"{column} IN ({','.join('?' * len(values))})")
+                params.extend(values)
+        if filters:
+            query += " WHERE " + " AND ".join(filters)
+        query += " ORDER BY season_year, week, espn_event_id"
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            columns = [description[0] for description in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    
+    def replace_team_game_efficiency(self, season_year: int, efficiency: pd.DataFrame) -> int:
+        """Replace a season's play-by-play efficiency rows"""
+        with self.get_connection() as conn:
+            conn.execute("DELETE FROM team_game_efficiency WHERE season_year = ?", (season_year,))
+            efficiency.to_sql('team_game_efficiency', conn, if_exists='append', index=False)
+            conn.commit()
+            return len(efficiency)
+    
+    # Hyperparameter search operations
+    def insert_hyperparameter_trials(self, trials: List[Dict]) -> int:
+        """Store hyperparameter search trials (params as a dict)"""
+        created_at = datetime.now().isoformat()
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany("""
+                INSERT INTO hyperparameter_trials 
+                (search_id, model_name, params, rung, folds_evaluated, accuracy,
+                 points_pct, fit_seconds, status, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [(trial['search_id'], trial['model_name'], json.dumps(trial['params'], sort_keys=True),
+                   trial['rung'], trial['folds_evaluated'], trial.get('accuracy'),
+                   trial.get('points_pct'), trial.get('fit_seconds'), trial['status'], created_at)
+                  for trial in trials])
+            conn.commit()
+            return cursor.rowcount
+    
+    def get_best_hyperparameters(self, model_name: str) -> Optional[Dict]:
+        """Get the winning parameters from the most recent search for a model
+        (empty rows from older searches only meant "keep the current settings")"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT params FROM hyperparameter_trials
+                WHERE model_name = ? AND status = 'best' AND params != '{}'
+                ORDER BY id DESC LIMIT 1
+            """, (model_name,))
+            result = cursor.fetchone()
+            return json.loads(result[0]) if result else None
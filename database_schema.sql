@@ -78,6 +78,11 @@ CREATE TABLE team_performance (
     points_allowed REAL,
     point_differential REAL,
     win_percentage REAL,
+    rolling_games INTEGER, -- Last 4 games across seasons (team_performance_rollup.py)
+    rolling_wins INTEGER,
+    rolling_losses INTEGER,
+    rolling_point_differential REAL, -- Per game
+    rolling_win_percentage REAL,
     FOREIGN KEY (team_id) REFERENCES teams(id),
     UNIQUE(team_id, season_year, week)
 );
@@ -169,6 +174,7 @@ CREATE TABLE expert_picks (
     spread REAL,
     result TEXT, -- 'WIN', 'LOSS', 'PUSH'
     confidence INTEGER DEFAULT 10,
+    moneyline INTEGER, -- picked team's moneyline as shown next to the pick (CBS)
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (game_id) REFERENCES games(id)
 );
@@ -191,6 +197,226 @@ CREATE TABLE pool_results (
     UNIQUE(season_year, week, participant_name, game_id)
 );
 
+-- Materialized pool standings (per participant, per week, with season-to-date totals)
+CREATE TABLE pool_standings (
+    id INTEGER PRIMARY KEY,
+    season_year INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    participant_name TEXT NOT NULL,
+    weekly_picks INTEGER DEFAULT 0,
+    weekly_correct INTEGER DEFAULT 0,
+    weekly_score INTEGER DEFAULT 0,
+    weekly_accuracy REAL,
+    weekly_rank INTEGER,
+    cumulative_picks INTEGER DEFAULT 0,
+    cumulative_correct INTEGER DEFAULT 0,
+    cumulative_score INTEGER DEFAULT 0,
+    cumulative_accuracy REAL,
+    season_rank INTEGER,
+    updated_at TEXT NOT NULL,
+    UNIQUE(season_year, week, participant_name)
+);
+
+-- Earliest week per season whose standings are stale (maintained by pool_results triggers)
+CREATE TABLE pool_standings_dirty (
+    season_year INTEGER PRIMARY KEY,
+    from_week INTEGER NOT NULL
+);
+
+-- Per-table write counters used to invalidate cached reads (maintained by triggers)
+CREATE TABLE table_versions (
+    table_name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0
+);
+
+-- Change-data-capture log (appended by triggers) and per-consumer checkpoints
+CREATE TABLE change_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    table_name TEXT NOT NULL,
+    row_id INTEGER NOT NULL,
+    op TEXT NOT NULL, -- 'INSERT', 'UPDATE', 'DELETE'
+    game_id INTEGER,
+    season_year INTEGER,
+    week INTEGER,
+    participant_name TEXT,
+    changed_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%f', 'now'))
+);
+
+CREATE TABLE change_checkpoints (
+    consumer_name TEXT PRIMARY KEY,
+    last_change_id INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT NOT NULL
+);
+
+-- Registered model versions (one current version per model is served)
+CREATE TABLE model_registry (
+    id INTEGER PRIMARY KEY,
+    model_name TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    artifact_path TEXT NOT NULL,
+    feature_columns TEXT, -- JSON list
+    training_start_season INTEGER,
+    training_start_week INTEGER,
+    training_end_season INTEGER,
+    training_end_week INTEGER,
+    params TEXT, -- JSON
+    metrics TEXT, -- JSON
+    is_current BOOLEAN DEFAULT 0,
+    created_at TEXT NOT NULL,
+    UNIQUE(model_name, version)
+);
+
+-- Hyperparameter search trials (one row per candidate per successive-halving rung)
+CREATE TABLE hyperparameter_trials (
+    id INTEGER PRIMARY KEY,
+    search_id TEXT NOT NULL,
+    model_name TEXT NOT NULL,
+    params TEXT NOT NULL, -- JSON regressor parameters
+    rung INTEGER NOT NULL,
+    folds_evaluated INTEGER NOT NULL,
+    accuracy REAL,
+    points_pct REAL,
+    fit_seconds REAL,
+    status TEXT NOT NULL, -- 'promoted', 'eliminated', 'stopped', 'best'
+    created_at TEXT NOT NULL
+);
+
+-- Elo power ratings: every team's rating after each rated week
+CREATE TABLE elo_ratings (
+    season_year INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    team_id INTEGER NOT NULL,
+    rating REAL NOT NULL,
+    PRIMARY KEY (season_year, week, team_id),
+    FOREIGN KEY (team_id) REFERENCES teams(id)
+);
+
+-- Results each rated week was built from (a mismatch re-rates from that week)
+CREATE TABLE elo_weeks (
+    season_year INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    games_rated INTEGER NOT NULL,
+    result_signature INTEGER NOT NULL,
+    PRIMARY KEY (season_year, week)
+);
+
+-- Rest, travel and time-zone features per game (home_/away_ team perspective)
+CREATE TABLE game_travel_features (
+    game_id INTEGER PRIMARY KEY,
+    season_year INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    venue TEXT, -- Home stadium abbreviation or international city; NULL if unknown
+    is_international BOOLEAN DEFAULT 0,
+    is_neutral_site BOOLEAN DEFAULT 0,
+    venue_known BOOLEAN DEFAULT 1, -- Imported seasons list winner/loser, not home/away
+    date_estimated BOOLEAN DEFAULT 0, -- Game date taken as the week's nominal Sunday
+    home_rest_days INTEGER,
+    away_rest_days INTEGER,
+    rest_advantage INTEGER,
+    home_short_week BOOLEAN,
+    away_short_week BOOLEAN,
+    home_off_bye BOOLEAN,
+    away_off_bye BOOLEAN,
+    home_road_streak INTEGER, -- Consecutive road games including this one
+    away_road_streak INTEGER,
+    home_tz_crossed INTEGER,
+    away_tz_crossed INTEGER,
+    home_travel_miles REAL,
+    away_travel_miles REAL,
+    FOREIGN KEY (game_id) REFERENCES games(id)
+);
+
+-- Source files ingested into the database (unchanged files are skipped on re-ingestion)
+CREATE TABLE ingestion_ledger (
+    source_path TEXT PRIMARY KEY,
+    source_kind TEXT NOT NULL, -- 'pool_results', 'odds', 'expert_picks', ...
+    content_hash TEXT NOT NULL, -- SHA-256 of the file bytes
+    file_size INTEGER,
+    file_mtime_ns INTEGER,
+    row_count INTEGER NOT NULL,
+    season_year INTEGER,
+    week INTEGER,
+    ingested_at TEXT NOT NULL
+);
+
+-- Raw HTTP responses, one row per fetch; bodies live gzipped under data/raw/archive keyed by content_hash
+CREATE TABLE raw_payloads (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source TEXT NOT NULL, -- 'espn', 'cbs', 'odds_api', ...
+    url TEXT NOT NULL,
+    params TEXT NOT NULL DEFAULT '', -- Sorted JSON query parameters (credentials removed)
+    fetched_at TEXT NOT NULL, -- UTC, ISO 8601
+    status_code INTEGER,
+    content_type TEXT,
+    content_hash TEXT NOT NULL, -- SHA-256 of the response body
+    byte_size INTEGER NOT NULL,
+    stored_size INTEGER NOT NULL, -- Compressed blob size
+    UNIQUE(source, url, params, fetched_at)
+);
+
+-- ESPN in-game win probability, one row per game (points packed by win_probability_series.encode_series)
+CREATE TABLE win_probability_series (
+    espn_event_id TEXT PRIMARY KEY,
+    game_id INTEGER, -- NULL when the event has no row in games
+    season_year INTEGER NOT NULL,
+    week INTEGER NOT NULL, -- games.week numbering (postseason 19-22)
+    home_team TEXT NOT NULL, -- ESPN abbreviations
+    away_team TEXT NOT NULL,
+    is_final BOOLEAN DEFAULT 0, -- Completed games' series never change and are not fetched again
+    n_points INTEGER NOT NULL,
+    first_home_win_prob REAL,
+    final_home_win_prob REAL,
+    series BLOB NOT NULL,
+    fetched_at TEXT NOT NULL,
+    FOREIGN KEY (game_id) REFERENCES games(id)
+);
+
+-- Play-by-play ingested per ESPN event; the plays live in columnar chunks under data/pbp (see play_by_play.py)
+CREATE TABLE play_by_play_events (
+    espn_event_id TEXT PRIMARY KEY,
+    game_id INTEGER, -- NULL when the event has no row in games
+    season_year INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    home_team TEXT NOT NULL, -- ESPN abbreviations
+    away_team TEXT NOT NULL,
+    plays INTEGER NOT NULL,
+    chunk_path TEXT NOT NULL, -- Relative to the play-by-play directory
+    ingested_at TEXT NOT NULL,
+    FOREIGN KEY (game_id) REFERENCES games(id)
+);
+
+-- Per-team, per-game drive and play efficiency derived from play-by-play (prior_ = season to date before the game)
+CREATE TABLE team_game_efficiency (
+    espn_event_id TEXT NOT NULL,
+    team TEXT NOT NULL,
+    opponent TEXT NOT NULL,
+    game_id INTEGER,
+    season_year INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    drives INTEGER NOT NULL,
+    points INTEGER NOT NULL, -- Offensive points scored on drives
+    points_per_drive REAL,
+    plays INTEGER NOT NULL, -- Scrimmage plays
+    success_rate REAL,
+    yards_per_play REAL,
+    def_points_per_drive REAL,
+    def_success_rate REAL,
+    prior_points_per_drive REAL,
+    prior_success_rate REAL,
+    prior_def_points_per_drive REAL,
+    prior_def_success_rate REAL,
+    PRIMARY KEY (espn_event_id, team),
+    FOREIGN KEY (game_id) REFERENCES games(id)
+);
+
+-- Columns added to existing databases (fresh ones get them from CREATE TABLE)
+ALTER TABLE team_performance ADD COLUMN rolling_games INTEGER;
+ALTER TABLE team_performance ADD COLUMN rolling_wins INTEGER;
+ALTER TABLE team_performance ADD COLUMN rolling_losses INTEGER;
+ALTER TABLE team_performance ADD COLUMN rolling_point_differential REAL;
+ALTER TABLE team_performance ADD COLUMN rolling_win_percentage REAL;
+ALTER TABLE expert_picks ADD COLUMN moneyline INTEGER;
+
 -- Indexes for better performance
 CREATE INDEX idx_games_season_week ON games(season_year, week);
 CREATE INDEX idx_games_international ON games(is_international);
@@ -202,3 +428,284 @@ CREATE INDEX idx_home_field_advantage_team ON home_field_advantage(team_id, seas
 CREATE INDEX idx_international_games_location ON international_games(location);
 CREATE INDEX idx_pool_results_season_week ON pool_results(season_year, week);
 CREATE INDEX idx_pool_results_participant ON pool_results(participant_name, season_year, week);
+CREATE INDEX idx_pool_standings_leaderboard ON pool_standings(season_year, week, season_rank);
+CREATE INDEX idx_pool_standings_participant ON pool_standings(participant_name, season_year, week);
+CREATE INDEX idx_model_registry_current ON model_registry(model_name, is_current);
+CREATE INDEX idx_hyperparameter_trials_model ON hyperparameter_trials(model_name, status, points_pct);
+CREATE INDEX idx_game_travel_features_season_week ON game_travel_features(season_year, week);
+CREATE INDEX idx_expert_picks_game ON expert_picks(game_id, expert_name);
+CREATE INDEX idx_raw_payloads_hash ON raw_payloads(content_hash);
+CREATE INDEX idx_win_probability_series_week ON win_probability_series(season_year, week);
+CREATE INDEX idx_play_by_play_events_week ON play_by_play_events(season_year, week);
+CREATE INDEX idx_team_game_efficiency_team ON team_game_efficiency(team, season_year, week);
+
+-- Triggers: any pool_results write marks its season stale from that week onward
+CREATE TRIGGER trg_pool_results_standings_insert AFTER INSERT ON pool_results
+BEGIN
+    INSERT INTO pool_standings_dirty (season_year, from_week) VALUES (NEW.season_year, NEW.week)
+    ON CONFLICT(season_year) DO UPDATE SET from_week = MIN(from_week, excluded.from_week);
+END;
+
+CREATE TRIGGER trg_pool_results_standings_update AFTER UPDATE ON pool_results
+BEGIN
+    INSERT INTO pool_standings_dirty (season_year, from_week) VALUES (OLD.season_year, OLD.week)
+    ON CONFLICT(season_year) DO UPDATE SET from_week = MIN(from_week, excluded.from_week);
+    INSERT INTO pool_standings_dirty (season_year, from_week) VALUES (NEW.season_year, NEW.week)
+    ON CONFLICT(season_year) DO UPDATE SET from_week = MIN(from_week, excluded.from_week);
+END;
+
+CREATE TRIGGER trg_pool_results_standings_delete AFTER DELETE ON pool_results
+BEGIN
+    INSERT INTO pool_standings_dirty (season_year, from_week) VALUES (OLD.season_year, OLD.week)
+    ON CONFLICT(season_year) DO UPDATE SET from_week = MIN(from_week, excluded.from_week);
+END;
+
+-- Triggers: bump table_versions on every write so cached reads see exactly which tables changed
+CREATE TRIGGER trg_teams_version_insert AFTER INSERT ON teams
+BEGIN
+    INSERT INTO table_versions (table_name, version) VALUES ('teams', 1)
+    ON CONFLICT(table_name) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER trg_teams_version_update AFTER UPDATE ON teams
+BEGIN
+    INSERT INTO table_versions (table_name, version) VALUES ('teams', 1)
+    ON CONFLICT(table_name) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER trg_teams_version_delete AFTER DELETE ON teams
+BEGIN
+    INSERT INTO table_versions (table_name, version) VALUES ('teams', 1)
+    ON CONFLICT(table_name) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER trg_games_version_insert AFTER INSERT ON games
+BEGIN
+    INSERT INTO table_versions (table_name, version) VALUES ('games', 1)
+    ON CONFLICT(table_name) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER trg_games_version_update AFTER UPDATE ON games
+BEGIN
+    INSERT INTO table_versions (table_name, version) VALUES ('games', 1)
+    ON CONFLICT(table_name) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER trg_games_version_delete AFTER DELETE ON games
+BEGIN
+    INSERT INTO table_versions (table_name, version) VALUES ('games', 1)
+    ON CONFLICT(table_name) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER trg_odds_version_insert AFTER INSERT ON odds
+BEGIN
+    INSERT INTO table_versions (table_name, version) VALUES ('odds', 1)
+    ON CONFLICT(table_name) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER trg_odds_version_update AFTER UPDATE ON odds
+BEGIN
+    INSERT INTO table_versions (table_name, version) VALUES ('odds', 1)
+    ON CONFLICT(table_name) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER trg_odds_version_delete AFTER DELETE ON odds
+BEGIN
+    INSERT INTO table_versions (table_name, version) VALUES ('odds', 1)
+    ON CONFLICT(table_name) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER trg_picks_version_insert AFTER INSERT ON picks
+BEGIN
+    INSERT INTO table_versions (table_name, version) VALUES ('picks', 1)
+    ON CONFLICT(table_name) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER trg_picks_version_update AFTER UPDATE ON picks
+BEGIN
+    INSERT INTO table_versions (table_name, version) VALUES ('picks', 1)
+    ON CONFLICT(table_name) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER trg_picks_version_delete AFTER DELETE ON picks
+BEGIN
+    INSERT INTO table_versions (table_name, version) VALUES ('picks', 1)
+    ON CONFLICT(table_name) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER trg_team_performance_version_insert AFTER INSERT ON team_performance
+BEGIN
+    INSERT INTO table_versions (table_name, version) VALUES ('team_performance', 1)
+    ON CONFLICT(table_name) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER trg_team_performance_version_update AFTER UPDATE ON team_performance
+BEGIN
+    INSERT INTO table_versions (table_name, version) VALUES ('team_performance', 1)
+    ON CONFLICT(table_name) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER trg_team_performance_version_delete AFTER DELETE ON team_performance
+BEGIN
+    INSERT INTO table_versions (table_name, version) VALUES ('team_performance', 1)
+    ON CONFLICT(table_name) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER trg_expert_picks_version_insert AFTER INSERT ON expert_picks
+BEGIN
+    INSERT INTO table_versions (table_name, version) VALUES ('expert_picks', 1)
+    ON CONFLICT(table_name) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER trg_expert_picks_version_update AFTER UPDATE ON expert_picks
+BEGIN
+    INSERT INTO table_versions (table_name, version) VALUES ('expert_picks', 1)
+    ON CONFLICT(table_name) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER trg_expert_picks_version_delete AFTER DELETE ON expert_picks
+BEGIN
+    INSERT INTO table_versions (table_name, version) VALUES ('expert_picks', 1)
+    ON CONFLICT(table_name) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER trg_pool_results_version_insert AFTER INSERT ON pool_results
+BEGIN
+    INSERT INTO table_versions (table_name, version) VALUES ('pool_results', 1)
+    ON CONFLICT(table_name) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER trg_pool_results_version_update AFTER UPDATE ON pool_results
+BEGIN
+    INSERT INTO table_versions (table_name, version) VALUES ('pool_results', 1)
+    ON CONFLICT(table_name) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER trg_pool_results_version_delete AFTER DELETE ON pool_results
+BEGIN
+    INSERT INTO table_versions (table_name, version) VALUES ('pool_results', 1)
+    ON CONFLICT(table_name) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER trg_game_travel_features_version_insert AFTER INSERT ON game_travel_features
+BEGIN
+    INSERT INTO table_versions (table_name, version) VALUES ('game_travel_features', 1)
+    ON CONFLICT(table_name) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER trg_game_travel_features_version_update AFTER UPDATE ON game_travel_features
+BEGIN
+    INSERT INTO table_versions (table_name, version) VALUES ('game_travel_features', 1)
+    ON CONFLICT(table_name) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER trg_game_travel_features_version_delete AFTER DELETE ON game_travel_features
+BEGIN
+    INSERT INTO table_versions (table_name, version) VALUES ('game_travel_features', 1)
+    ON CONFLICT(table_name) DO UPDATE SET version = version + 1;
+END;
+
+CREATE INDEX idx_change_log_table ON change_log(table_name, id);
+
+-- Triggers: change-data-capture for tables that drive downstream recomputation
+CREATE TRIGGER trg_games_cdc_insert AFTER INSERT ON games
+BEGIN
+    INSERT INTO change_log (table_name, row_id, op, game_id, season_year, week, participant_name)
+    VALUES ('games', NEW.id, 'INSERT', NEW.id, NEW.season_year, NEW.week, NULL);
+END;
+
+CREATE TRIGGER trg_games_cdc_update AFTER UPDATE ON games
+BEGIN
+    INSERT INTO change_log (table_name, row_id, op, game_id, season_year, week, participant_name)
+    VALUES ('games', NEW.id, 'UPDATE', NEW.id, NEW.season_year, NEW.week, NULL);
+END;
+
+CREATE TRIGGER trg_games_cdc_delete AFTER DELETE ON games
+BEGIN
+    INSERT INTO change_log (table_name, row_id, op, game_id, season_year, week, participant_name)
+    VALUES ('games', OLD.id, 'DELETE', OLD.id, OLD.season_year, OLD.week, NULL);
+END;
+
+CREATE TRIGGER trg_picks_cdc_insert AFTER INSERT ON picks
+BEGIN
+    INSERT INTO change_log (table_name, row_id, op, game_id, season_year, week, participant_name)
+    VALUES ('picks', NEW.id, 'INSERT', NEW.game_id, NEW.season_year, NEW.week, NULL);
+END;
+
+CREATE TRIGGER trg_picks_cdc_update AFTER UPDATE ON picks
+BEGIN
+    INSERT INTO change_log (table_name, row_id, op, game_id, season_year, week, participant_name)
+    VALUES ('picks', NEW.id, 'UPDATE', NEW.game_id, NEW.season_year, NEW.week, NULL);
+END;
+
+CREATE TRIGGER trg_picks_cdc_delete AFTER DELETE ON picks
+BEGIN
+    INSERT INTO change_log (table_name, row_id, op, game_id, season_year, week, participant_name)
+    VALUES ('picks', OLD.id, 'DELETE', OLD.game_id, OLD.season_year, OLD.week, NULL);
+END;
+
+CREATE TRIGGER trg_pool_results_cdc_insert AFTER INSERT ON pool_results
+BEGIN
+    INSERT INTO change_log (table_name, row_id, op, game_id, season_year, week, participant_name)
+    VALUES ('pool_results', NEW.id, 'INSERT', NEW.game_id, NEW.season_year, NEW.week, NEW.participant_name);
+END;
+
+CREATE TRIGGER trg_pool_results_cdc_update AFTER UPDATE ON pool_results
+BEGIN
+    INSERT INTO change_log (table_name, row_id, op, game_id, season_year, week, participant_name)
+    VALUES ('pool_results', NEW.id, 'UPDATE', NEW.game_id, NEW.season_year, NEW.week, NEW.participant_name);
+END;
+
+CREATE TRIGGER trg_pool_results_cdc_delete AFTER DELETE ON pool_results
+BEGIN
+    INSERT INTO change_log (table_name, row_id, op, game_id, season_year, week, participant_name)
+    VALUES ('pool_results', OLD.id, 'DELETE', OLD.game_id, OLD.season_year, OLD.week, OLD.participant_name);
+END;
+
+CREATE TRIGGER trg_odds_cdc_insert AFTER INSERT ON odds
+BEGIN
+    INSERT INTO change_log (table_name, row_id, op, game_id, season_year, week, participant_name)
+    VALUES ('odds', NEW.id, 'INSERT', NEW.game_id,
+            (SELECT season_year FROM games WHERE id = NEW.game_id),
+            (SELECT week FROM games WHERE id = NEW.game_id), NULL);
+END;
+
+CREATE TRIGGER trg_odds_cdc_update AFTER UPDATE ON odds
+BEGIN
+    INSERT INTO change_log (table_name, row_id, op, game_id, season_year, week, participant_name)
+    VALUES ('odds', NEW.id, 'UPDATE', NEW.game_id,
+            (SELECT season_year FROM games WHERE id = NEW.game_id),
+            (SELECT week FROM games WHERE id = NEW.game_id), NULL);
+END;
+
+CREATE TRIGGER trg_odds_cdc_delete AFTER DELETE ON odds
+BEGIN
+    INSERT INTO change_log (table_name, row_id, op, game_id, season_year, week, participant_name)
+    VALUES ('odds', OLD.id, 'DELETE', OLD.game_id,
+            (SELECT season_year FROM games WHERE id = OLD.game_id),
+            (SELECT week FROM games WHERE id = OLD.game_id), NULL);
+END;
+
+CREATE TRIGGER trg_expert_picks_cdc_insert AFTER INSERT ON expert_picks
+BEGIN
+    INSERT INTO change_log (table_name, row_id, op, game_id, season_year, week, participant_name)
+    VALUES ('expert_picks', NEW.id, 'INSERT', NEW.game_id,
+            (SELECT season_year FROM games WHERE id = NEW.game_id),
+            (SELECT week FROM games WHERE id = NEW.game_id), NULL);
+END;
+
+CREATE TRIGGER trg_expert_picks_cdc_update AFTER UPDATE ON expert_picks
+BEGIN
+    INSERT INTO change_log (table_name, row_id, op, game_id, season_year, week, participant_name)
+    VALUES ('expert_picks', NEW.id, 'UPDATE', NEW.game_id,
+            (SELECT season_year FROM games WHERE id = NEW.game_id),
+            (SELECT week FROM games WHERE id = NEW.game_id), NULL);
+END;
+
+CREATE TRIGGER trg_expert_picks_cdc_delete AFTER DELETE ON expert_picks
+BEGIN
+    INSERT INTO change_log (table_name, row_id, op, game_id, season_year, week, participant_name)
+    VALUES ('expert_picks', OLD.id, 'DELETE', OLD.game_id,
+            (SELECT season_year FROM games WHERE id = OLD.game_id),
+            (SELECT week FROM games WHERE id = OLD.game_id), NULL);
+END;
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Database snapshot manager for NFL confidence pool system.
+Takes consistent hot snapshots with SQLite's online backup API, and lists,
+prunes, restores and diffs them.
+"""
+import os
+import re
+import sqlite3
+from datetime import datetime
+from typing import Dict, List, Optional
+
+class DatabaseSnapshotManager:
+    """Manages named online-backup snapshots of a pool database"""
+    
+    # Microsecond timestamps; snapshots from before they were added have whole seconds
+    SNAPSHOT_PATTERN = re.compile(r"^(?P<stem>.+)__(?P<timestamp>\d{8}T\d{6}(?:\d{6})?)__(?P<name>[\w.-]+)\.db$")
+    PAGES_PER_STEP = 1024  # Copy in small steps so writers only wait for one step
+    
+    def __init__(self, db_path: str = "data/nfl_pool_v2.db",
+                 snapshot_dir: str = "data/snapshots"):
+        self.db_path = db_path
+        self.snapshot_dir = snapshot_dir
+        self.db_stem = os.path.splitext(os.path.basename(db_path))[0]
+    
+    def create_snapshot(self, name: str = "manual") -> str:
+        """Take a consistent snapshot of the live database, return its path"""
+        if not re.fullmatch(r"[\w.-]+", name):
+            raise ValueError(f"Invalid snapshot name: {name}")
+        if not os.path.exists(self.db_path):
+            raise FileNotFoundError(f"Database not found: {self.db_path}")
+        
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+        snapshot_path = os.path.join(self.snapshot_dir, f"{self.db_stem}__{timestamp}__{name}.db")
+        
+        # Claim the file first, so a clashing path is an error rather than an overwrite
+        os.close(os.open(snapshot_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        
+        source = sqlite3.connect(self.db_path)
+        target = sqlite3.connect(snapshot_path)
+        try:
+            # SQLite restarts the copy if another connection writes mid-backup,
+            # so the result is always a single consistent point in time
+            source.backup(target, pages=self.PAGES_PER_STEP, sleep=0.005)
+        finally:
+            target.close()
+            source.close()
+        
+        return snapshot_path
+    
+    def list_snapshots(self) -> List[Dict]:
+        """List snapshots of this database, newest first"""
+        if not os.path.isdir(self.snapshot_dir):
+            return []
+        
+        snapshots = []
+        for filename in os.listdir(self.snapshot_dir):
+            match = self.SNAPSHOT_PATTERN.match(filename)
+            if not match or match.group("stem") != self.db_stem:
+                continue
+            path = os.path.join(self.snapshot_dir, filename)
+            snapshots.append({
+                "name": match.group("name"),
+                "created_at": self._parse_timestamp(match.group("timestamp")).isoformat(),
+                "path": path,
+                "size_mb": round(os.path.getsize(path) / (1024 * 1024), 2)
+            })
+        
+        return sorted(snapshots, key=lambda s: (s["created_at"], s["path"]), reverse=True)
+    
+    @staticmethod
+    def _parse_timestamp(timestamp: str) -> datetime:
+        """Snapshot file timestamp, with or without microseconds"""
+        return datetime.strptime(timestamp, "%Y%m%dT%H%M%S%f" if len(timestamp) > 15 else "%Y%m%dT%H%M%S")
+    
+    def find_snapshot(self, name: str) -> Optional[Dict]:
+        """Find the newest snapshot with a given name (or exact file path)"""
+        for snapshot in self.list_snapshots():
+            if snapshot["name"] == name or snapshot["path"] == name:
+                return snapshot
+        return None
+    
+    def prune_snapshots(self, keep: int = 5) -> List[str]:
+        """Delete all but the newest `keep` snapshots, return removed paths"""
+        removed = []
+        for snapshot in self.list_snapshots()[keep:]:
+            os.remove(snapshot["path"])
+            removed.append(snapshot["path"])
+        return removed
+    
+    def restore_snapshot(self, name: str) -> str:
+        """Restore a snapshot over the live database (taking a safety snapshot first)"""
+        snapshot = self.find_snapshot(name)
+        if not snapshot:
+            raise ValueError(f"Snapshot not found: {name}")
+        
+        safety_path = self.create_snapshot("pre-restore")
+        
+        source = sqlite3.connect(snapshot["path"])
+        target = sqlite3.connect(self.db_path)
+        try:
+            # Page-level copy into the live file; open connections see the restored data
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
+        
+        return safety_path
+    
+    def diff_snapshot(self, name: str, sample_keys: int = 10) -> Dict[str, Dict]:
+        """Summarize per-table differences between a snapshot and the live database.
+        
+        Row-level comparison runs inside SQLite (EXCEPT over attached databases),
+        so only counts and a sample of changed ids come back to Python.
+        """
+        snapshot = self.find_snapshot(name)
+        if not snapshot:
+            raise ValueError(f"Snapshot not found: {name}")
+        
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute("ATTACH DATABASE ? AS snap", (snapshot["path"],))
+            cursor = conn.cursor()
+            
+            live_tables = self._get_tables(cursor, "main")
+            snap_tables = self._get_tables(cursor, "snap")
+            
+            diff = {}
+            for table in sorted(live_tables | snap_tables):
+                if table not in snap_tables or table not in live_tables:
+                    schema = "main" if table in live_tables else "snap"
+                    cursor.execute(f'SELECT COUNT(*) FROM {schema}."{table}"')
+                    count = cursor.fetchone()[0]
+                    diff[table] = {
+                        "status": "added" if table in live_tables else "removed",
+                        "live_rows": count if table in live_tables else 0,
+                        "snapshot_rows": count if table in snap_tables else 0
+                    }
+                    continue
+                
+                diff[table] = self._diff_table(cursor, table, sample_keys)
+            
+            return diff
+        finally:
+            conn.close()
+    
+    def _get_tables(self, cursor: sqlite3.Cursor, schema: str) -> set:
+        """Get user table names in an attached schema"""
+        cursor.execute(f"""
+            SELECT name FROM {schema}.sqlite_master
+            WHERE type = 'table' AND name NOT LIKE 'sqlite_%'
+        """)
+        return {row[0] for row in cursor.fetchall()}
+    
+    def _diff_table(self, cursor: sqlite3.Cursor, table: str, sample_keys: int) -> Dict:
+        """Count inserted, deleted and changed rows for one table keyed by rowid"""
+        cursor.execute(f'SELECT COUNT(*) FROM main."{table}"')
+        live_rows = cursor.fetchone()[0]
+        cursor.execute(f'SELECT COUNT(*) FROM snap."{table}"')
+        snapshot_rows = cursor.fetchone()[0]
+        
+        result = {"status": "same", "live_rows": live_rows, "snapshot_rows": snapshot_rows}
+        
+        cursor.execute(f'PRAGMA main.table_info("{table}")')
+        live_columns = [row[1] for row in cursor.fetchall()]
+        cursor.execute(f'PRAGMA snap.table_info("{table}")')
+        snap_columns = [row[1] for row in cursor.fetchall()]
+        if live_columns != snap_columns:
+            result["status"] = "schema_changed"
+            return result
+        
+        columns = ", ".join(f'"{c}"' for c in live_columns)
+        cursor.execute(f"""
+            WITH live_only AS (
+                SELECT rowid AS key, {columns} FROM main."{table}"
+                EXCEPT
+                SELECT rowid AS key, {columns} FROM snap."{table}"
+            ),
+            snap_only AS (
+                SELECT rowid AS key, {columns} FROM snap."{table}"
+                EXCEPT
+                SELECT rowid AS key, {columns} FROM main."{table}"
+            )
+            SELECT
+                CASE WHEN s.key IS NULL THEN 'inserted' ELSE 'changed' END AS change,
+                l.key
+            FROM live_only l
+            LEFT JOIN snap_only s ON s.key = l.key
+            UNION ALL
+            SELECT 'deleted', s.key
+            FROM snap_only s
+            WHERE s.key NOT IN (SELECT key FROM live_only)
+            ORDER BY key
+        """)
+        
+        for change, key in cursor.fetchall():
+            result[change] = result.get(change, 0) + 1
+            keys = result.setdefault(f"{change}_keys", [])
+            if len(keys) < sample_keys:
+                keys.append(key)
+        
+        if any(result.get(change) for change in ("inserted", "deleted", "changed")):
+            result["status"] = "modified"
+        return result
+
+def main():
+    """Database snapshot CLI"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Manage NFL pool database snapshots")
+    parser.add_argument("--db", default="data/nfl_pool_v2.db", help="Database path")
+    parser.add_argument("--create", metavar="NAME", help="Take a named snapshot")
+    parser.add_argument("--list", action="store_true", help="List snapshots")
+    parser.add_argument("--prune", type=int, metavar="KEEP", help="Keep only the newest KEEP snapshots")
+    parser.add_argument("--restore", metavar="NAME", help="Restore a snapshot over the live database")
+    parser.add_argument("--diff", metavar="NAME", help="Compare a snapshot with the live database")
+    
+    args = parser.parse_args()
+    
+    manager = DatabaseSnapshotManager(db_path=args.db)
+    
+    if args.create:
+        path = manager.create_snapshot(args.create)
+        print(f"✅ Snapshot saved: {path}")
+    elif args.list:
+        snapshots = manager.list_snapshots()
+        print(f"📸 {len(snapshots)} snapshots of {args.db}:")
+        for snapshot in snapshots:
+            print(f"   {snapshot['created_at']}  {snapshot['name']:<20} {snapshot['size_mb']} MB")
+    elif args.prune is not None:
+        removed = manager.prune_snapshots(args.prune)
+        print(f"🧹 Removed {len(removed)} snapshots")
+    elif args.restore:
+        safety_path = manager.restore_snapshot(args.restore)
+        print(f"✅ Restored {args.restore} (previous state saved to {safety_path})")
+    elif args.diff:
+        diff = manager.diff_snapshot(args.diff)
+        print(f"🔍 Live database vs snapshot {args.diff}:")
+        for table, summary in diff.items():
+            if summary["status"] == "same":
+                continue
+            changes = ", ".join(f"{summary[k]} {k}" for k in ("inserted", "deleted", "changed") if summary.get(k))
+            print(f"   {table}: {summary['status']} "
+                  f"({summary['snapshot_rows']} → {summary['live_rows']} rows{'; ' + changes if changes else ''})")
+    else:
+        print("Use --help for available options")
+
+if __name__ == "__main__":
+    main()
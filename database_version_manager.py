@@ -4,9 +4,9 @@ Database version manager for NFL confidence pool system.
 Handles database versioning and migration between versions.
 """
 import os
-import shutil
 from typing import Optional
 from database_manager import DatabaseManager
+from database_snapshot_manager import DatabaseSnapshotManager
 
 class DatabaseVersionManager:
     """Manages database versions and migrations"""
@@ -45,6 +45,9 @@ class DatabaseVersionManager:
         try:
             # Create new v2 database
             v2_path = self.get_database_path("v2")
+            if os.path.exists(v2_path):
+                snapshot_path = self.snapshot_version("v2", "pre-create-v2")
+                print(f"📸 Existing v2 database snapshotted to {snapshot_path}")
             db_manager = DatabaseManager(db_path=v2_path)
             
             # Migrate data from v1 if it exists
@@ -203,6 +206,14 @@ class DatabaseVersionManager:
         except Exception as e:
             return {"error": str(e)}
     
+    def snapshot_version(self, version: Optional[str] = None, name: str = "manual") -> str:
+        """Take a hot snapshot of a database version (safe while scripts are writing)"""
+        snapshot_manager = DatabaseSnapshotManager(
+            db_path=self.get_database_path(version),
+            snapshot_dir=f"{self.data_dir}/snapshots"
+        )
+        return snapshot_manager.create_snapshot(name)
+    
     def switch_to_version(self, version: str) -> bool:
         """Switch to a specific database version"""
         if version not in ["v1", "v2"]:
@@ -227,6 +238,7 @@ def main():
     parser.add_argument("--create-v2", action="store_true", help="Create v2 database")
     parser.add_argument("--info", action="store_true", help="Show database info")
     parser.add_argument("--switch", choices=["v1", "v2"], help="Switch to version")
+    parser.add_argument("--snapshot", metavar="NAME", help="Snapshot the current version")
     
     args = parser.parse_args()
     
@@ -246,6 +258,9 @@ def main():
                     print(f"     {key}: {value}")
     elif args.switch:
         manager.switch_to_version(args.switch)
+    elif args.snapshot:
+        snapshot_path = manager.snapshot_version(name=args.snapshot)
+        print(f"✅ Snapshot saved: {snapshot_path}")
     else:
         print("Use --help for available options")
 
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Elo power ratings over the games table.
+Ratings are built in one chronological pass with a NumPy update per week (a
+team plays at most once a week, so a week's games update independently), with
+a margin-of-victory multiplier, a home-field term and regression toward the
+mean between seasons. Every team's rating after each week is stored in
+elo_ratings; elo_weeks records the results each week was built from, so an
+update only re-rates from the first week whose results changed.
+The ratings give a fallback win probability, moneyline and feature columns for
+any matchup when odds or expert data are missing.
+"""
+
+import argparse
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from database_manager import DatabaseManager
+
+ELO_MEAN = 1500.0
+ELO_K = 20.0
+HOME_FIELD_ELO = 48.0      # About 2 points of spread
+SEASON_CARRYOVER = 2 / 3   # Share of a rating's distance from the mean kept into a new season
+
+# Rated results: scored games, skipping the 0-0 placeholders of unplayed games
+RESULTS_FILTER = """
+    home_score IS NOT NULL AND away_score IS NOT NULL
+    AND NOT (home_score = 0 AND away_score = 0)
+"""
+
+# Seasons imported from Pro-Football-Reference list the winner as the away team,
+# so home/away there says nothing about the venue: rate those games as neutral
+WINNER_LISTED_SEASONS = f"""
+    SELECT season_year FROM games WHERE {RESULTS_FILTER}
+    GROUP BY season_year HAVING COUNT(*) >= 100 AND SUM(home_score > away_score) = 0
+"""
+
+def elo_win_probability(rating_diff: np.ndarray) -> np.ndarray:
+    """Expected score for a rating difference (home-field already included)"""
+    
+    return 1.0 / (1.0 + 10 ** (-np.asarray(rating_diff, dtype=float) / 400.0))
+
+def probability_to_moneyline(probability: np.ndarray) -> np.ndarray:
+    """No-vig American odds for a win probability"""
+    
+    probability = np.clip(np.asarray(probability, dtype=float), 0.01, 0.99)
+    return np.where(probability >= 0.5, -100 * probability / (1 - probability),
+                    100 * (1 - probability) / probability).round().astype(int)
+
+class EloRatingEngine:
+    """Builds, stores and serves per-week Elo ratings"""
+    
+    def __init__(self, db_manager: DatabaseManager, k: float = ELO_K, home_field: float = HOME_FIELD_ELO,
+                 carryover: float = SEASON_CARRYOVER):
+        self.db_manager = db_manager
+        self.k = k
+        self.home_field = home_field
+        self.carryover = carryover
+        self._team_ids = None
+        self._alias_ids = {}  # Resolved aliases, apart from _teams() which the CLI lists
+        self._ratings_cache = {}
+    
+    # ----------------------- Rating pass -----------------------
+    
+    def _rate(self, results: pd.DataFrame, ratings: np.ndarray, last_season: Optional[int]) -> tuple:
+        """Run the weekly updates over results; returns (rating rows, week rows)"""
+        
+        rating_rows = []
+        week_rows = []
+        team_ids = np.arange(len(ratings))
+        known_teams = team_ids[self._known_team_mask(len(ratings))]
+        
+        seasons = results['season_year'].to_numpy()
+        weeks = results['week'].to_numpy()
+        homes = results['home_team_id'].to_numpy()
+        aways = results['away_team_id'].to_numpy()
+        margins = (results['home_score'] - results['away_score']).to_numpy()
+        home_fields = np.where(results['neutral'].to_numpy().astype(bool), 0.0, self.home_field)
+        signatures = results['signature'].to_numpy()
+        
+        # Results are ordered by week, so each week is one contiguous slice
+        week_starts = np.flatnonzero(np.diff(seasons * 100 + weeks)) + 1
+        for rows in np.split(np.arange(len(results)), week_starts):
+            if len(rows) == 0:
+                continue
+            season_year, week = int(seasons[rows[0]]), int(weeks[rows[0]])
+            if last_season is not None and season_year != last_season:
+                ratings = ELO_MEAN + self.carryover * (ratings - ELO_MEAN)
+            last_season = season_year
+            
+            home, away, margin = homes[rows], aways[rows], margins[rows]
+            diff = ratings[home] - ratings[away] + home_fields[rows]
+            expected = elo_win_probability(diff)
+            result = np.where(margin > 0, 1.0, np.where(margin < 0, 0.0, 0.5))
+            
+            # Margin-of-victory multiplier, damped when the favorite wins (autocorrelation term)
+            winner_diff = np.where(margin >= 0, diff, -diff)
+            multiplier = np.log(np.maximum(np.abs(margin), 1) + 1) * 2.2 / (winner_diff * 0.001 + 2.2)
+            
+            shift = self.k * multiplier * (result - expected)
+            ratings = ratings.copy()
+            ratings[home] += shift
+            ratings[away] -= shift
+            
+            rating_rows.extend(zip([season_year] * len(known_teams), [week] * len(known_teams),
+                                   known_teams.tolist(), ratings[known_teams].tolist()))
+            week_rows.append((season_year, week, len(rows), int(signatures[rows].sum())))
+        
+        return rating_rows, week_rows
+    
+    def _known_team_mask(self, size: int) -> np.ndarray:
+        """Team ids present in the teams table"""
+        
+        mask = np.zeros(size, dtype=bool)
+        mask[[team_id for team_id in set(self._teams().values()) if team_id < size]] = True
+        return mask
+    
+    def _load_results(self, from_slot: int = 0) -> pd.DataFrame:
+        """Rated game results from a season*100+week slot onward, in order"""
+        
+        with self.db_manager.get_connection() as conn:
+            return pd.read_sql_query(f"""
+                SELECT season_year, week, home_team_id, away_team_id, home_score, away_score,
+                       COALESCE(is_international, 0) OR season_year IN ({WINNER_LISTED_SEASONS}) AS neutral,
+                       id * 1009 + home_score * 31 + away_score AS signature
+                FROM games
+                WHERE {RESULTS_FILTER}
+                AND season_year * 100 + week >= ?
+                ORDER BY season_year, week, id
+            """, conn, params=(from_slot,))
+    
+    def _first_changed_slot(self) -> Optional[int]:
+        """Earliest week whose results differ from what its stored ratings were built on"""
+        
+        with self.db_manager.get_connection() as conn:
+            current = pd.read_sql_query(f"""
+                SELECT season_year * 100 + week AS slot, COUNT(*) AS games_rated,
+                       SUM(id * 1009 + home_score * 31 + away_score) AS result_signature
+                FROM games
+                WHERE {RESULTS_FILTER}
+                GROUP BY season_year, week
+            """, conn)
+            stored = pd.read_sql_query("""
+                SELECT season_year * 100 + week AS slot, games_rated, result_signature
+                FROM elo_weeks
+            """, conn)
+        
+        merged = current.merge(stored, on='slot', how='outer', suffixes=('', '_stored'))
+        changed = merged[(merged['games_rated'] != merged['games_rated_stored']) |
+                         (merged['result_signature'] != merged['result_signature_stored'])]
+        return int(changed['slot'].min()) if not changed.empty else None
+    
+    def _ratings_before(self, slot: int) -> tuple:
+        """(ratings after the last stored week before slot, that week's season or None)"""
+        
+        ratings = np.full(self._rating_size(), ELO_MEAN)
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT season_year, week FROM elo_weeks
+                WHERE season_year * 100 + week < ?
+                ORDER BY season_year DESC, week DESC LIMIT 1
+            """, (slot,))
+            previous = cursor.fetchone()
+            if previous is None:
+                return ratings, None
+            
+            cursor.execute("""
+                SELECT team_id, rating FROM elo_ratings WHERE season_year = ? AND week = ?
+            """, previous)
+            for team_id, rating in cursor.fetchall():
+                ratings[team_id] = rating
+        return ratings, previous[0]
+    
+    def _rating_size(self) -> int:
+        """Length of the team_id-indexed rating array"""
+        
+        return max(self._teams().values(), default=0) + 1
+    
+    def update(self, rebuild: bool = False) -> Dict:
+        """Re-rate from the first changed week (or everything with rebuild=True)"""
+        
+        started = time.perf_counter()
+        from_slot = 0 if rebuild else self._first_changed_slot()
+        if from_slot is None:
+            return {'weeks_rated': 0, 'games_rated': 0, 'seconds': time.perf_counter() - started}
+        
+        ratings, last_season = self._ratings_before(from_slot)
+        results = self._load_results(from_slot)
+        rating_rows, week_rows = self._rate(results, ratings, last_season)
+        
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM elo_ratings WHERE season_year * 100 + week >= ?", (from_slot,))
+            cursor.execute("DELETE FROM elo_weeks WHERE season_year * 100 + week >= ?", (from_slot,))
+            cursor.executemany("""
+                INSERT INTO elo_ratings (season_year, week, team_id, rating) VALUES (?, ?, ?, ?)
+            """, rating_rows)
+            cursor.executemany("""
+                INSERT INTO elo_weeks (season_year, week, games_rated, result_signature)
+                VALUES (?, ?, ?, ?)
+            """, week_rows)
+            conn.commit()
+        
+        self._ratings_cache = {}
+        return {'from_season': from_slot // 100 if from_slot else None,
+                'from_week': from_slot % 100 if from_slot else None,
+                'weeks_rated': len(week_rows), 'games_rated': len(results),
+                'seconds': time.perf_counter() - started}
+    
+    def rebuild(self) -> Dict:
+        """Rate the full games history from scratch"""
+        
+        return self.update(rebuild=True)
+    
+    # ----------------------- Serving -----------------------
+    
+    def _teams(self) -> Dict[str, int]:
+        """Team id by name and by abbreviation"""
+        
+        if self._team_ids is None:
+            with self.db_manager.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT id, name, abbreviation FROM teams")
+                self._team_ids = {}
+                for team_id, name, abbreviation in cursor.fetchall():
+                    self._team_ids[name] = team_id
+                    if abbreviation:
+                        self._team_ids[abbreviation] = team_id
+        return self._team_ids
+    
+    def team_id(self, team: str) -> int:
+        """Team id for any alias the team mapper knows (nicknames, CBS/ESPN abbreviations, old names)"""
+        
+        teams = self._teams()
+        if team in teams:
+            return teams[team]
+        if team not in self._alias_ids:
+            resolved = self.db_manager.team_mapper.resolve(team)
+            if resolved not in teams:
+                # The mean rating would silently bias the fallback probability
+                raise ValueError(f"Unknown team: {team}")
+            self._alias_ids[team] = teams[resolved]
+        return self._alias_ids[team]
+    
+    def ratings_for_week(self, season_year: Optional[int] = None, week: Optional[int] = None) -> np.ndarray:
+        """Pre-game ratings for a week (latest ratings by default), indexed by team_id"""
+        
+        slot = season_year * 100 + week if season_year is not None and week is not None else 10 ** 7
+        if slot not in self._ratings_cache:
+            ratings, last_season = self._ratings_before(slot)
+            if season_year is not None and last_season is not None and season_year != last_season:
+                ratings = ELO_MEAN + self.carryover * (ratings - ELO_MEAN)
+            self._ratings_cache[slot] = ratings
+        return self._ratings_cache[slot]
+    
+    def team_rating(self, team: str, season_year: Optional[int] = None, week: Optional[int] = None) -> float:
+        """One team's pre-game rating (ValueError for names the team mapper cannot resolve)"""
+        
+        return float(self.ratings_for_week(season_year, week)[self.team_id(team)])
+    
+    def win_probability(self, home_team: str, away_team: str, season_year: Optional[int] = None,
+                        week: Optional[int] = None, neutral: bool = False) -> float:
+        """Home team's Elo win probability"""
+        
+        diff = (self.team_rating(home_team, season_year, week) - self.team_rating(away_team, season_year, week)
+                + (0.0 if neutral else self.home_field))
+        return float(elo_win_probability(diff))
+    
+    def matchup_features(self, games: List[Dict]) -> pd.DataFrame:
+        """elo_home, elo_away, elo_diff and elo_home_prob for game dicts (one row per game)"""
+        
+        rows = []
+        for game in games:
+            ratings = self.ratings_for_week(game.get('season_year'), game.get('week'))
+            rows.append((ratings[self.team_id(game['home_team'])],
+                         ratings[self.team_id(game['away_team'])],
+                         self.home_field * (not game.get('is_international', False))))
+        
+        values = np.array(rows, dtype=float).reshape(-1, 3)
+        diff = values[:, 0] - values[:, 1]
+        return pd.DataFrame({
+            'elo_home': values[:, 0],
+            'elo_away': values[:, 1],
+            'elo_diff': diff,
+            'elo_home_prob': elo_win_probability(diff + values[:, 2])
+        })
+    
+    def fill_missing_odds(self, games: List[Dict]) -> List[Dict]:
+        """Copies of game dicts with absent moneylines replaced by Elo-implied ones"""
+        
+        missing = [i for i, game in enumerate(games)
+                   if game.get('home_ml') is None or game.get('away_ml') is None]
+        if not missing:
+            return games
+        
+        home_prob = self.matchup_features([games[i] for i in missing])['elo_home_prob'].to_numpy()
+        filled = list(games)
+        for i, home_ml, away_ml in zip(missing, probability_to_moneyline(home_prob),
+                                       probability_to_moneyline(1 - home_prob)):
+            filled[i] = {**games[i], 'home_ml': int(home_ml), 'away_ml': int(away_ml), 'odds_source': 'elo'}
+        return filled
+
+def main():
+    """Elo rating CLI"""
+    
+    parser = argparse.ArgumentParser(description="Build and query Elo power ratings")
+    parser.add_argument("--rebuild", action="store_true", help="Re-rate the full games history")
+    parser.add_argument("--top", type=int, default=0, help="Show the N highest rated teams")
+    parser.add_argument("--matchup", nargs=2, metavar=("HOME", "AWAY"), help="Home win probability")
+    args = parser.parse_args()
+    
+    engine = EloRatingEngine(DatabaseManager(version="v2"))
+    summary = engine.rebuild() if args.rebuild else engine.update()
+    if summary['weeks_rated']:
+        print(f"📈 Rated {summary['games_rated']} games over {summary['weeks_rated']} weeks "
+              f"in {summary['seconds'] * 1000:.1f} ms")
+    else:
+        print("✅ Ratings are current")
+    
+    if args.top:
+        ratings = engine.ratings_for_week()
+        names = {team_id: name for name, team_id in engine._teams().items() if len(name) > 3}
+        ranked = sorted(names, key=lambda team_id: ratings[team_id], reverse=True)[:args.top]
+        for position, team_id in enumerate(ranked, 1):
+            print(f"{position:2d}. {names[team_id]:<25} {ratings[team_id]:.0f}")
+    
+    if args.matchup:
+        home_team, away_team = args.matchup
+        probability = engine.win_probability(home_team, away_team)
+        print(f"🏈 {away_team} @ {home_team}: home {probability:.1%} "
+              f"(ML {probability_to_moneyline(probability)} / {probability_to_moneyline(1 - probability)})")
+
+if __name__ == "__main__":
+    main()
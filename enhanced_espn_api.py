@@ -3,18 +3,21 @@
 Enhanced ESPN API integration using comprehensive endpoints from pseudo-r/Public-ESPN-API.
 This provides access to detailed game statistics, player data, and advanced metrics.
 """
-import requests
 import json
 from typing import Dict, List, Optional, Tuple
 import datetime as dt
 
+from espn_ref_resolver import RefResolver
+from raw_payload_archive import RawPayloadArchive
+
 class EnhancedESPNAPI:
     """Enhanced ESPN API client with comprehensive data access"""
     
-    def __init__(self):
+    def __init__(self, archive: Optional[RawPayloadArchive] = None):
         self.site_base = "https://site.api.espn.com/apis/site/v2/sports/football/nfl"
         self.core_base = "https://sports.core.api.espn.com/v2/sports/football/leagues/nfl"
         self.timeout = 30
+        self.resolver = RefResolver(timeout=self.timeout, archive=archive)
     
     def get_detailed_game_stats(self, game_id: str) -> Dict:
         """
@@ -29,12 +32,10 @@ class EnhancedESPNAPI:
         print(f"📊 Fetching detailed stats for game {game_id}...")
         
         # Get game summary with detailed stats
-        url = f"{self.core_base}/events/{game_id}/competitions/{game_id}/statistics"
+        url = self._competition_url(game_id, "statistics")
         
         try:
-            response = requests.get(url, timeout=self.timeout)
-            response.raise_for_status()
-            data = response.json()
+            data = self.resolver.get(url)
             
             return self._parse_detailed_game_stats(data)
             
@@ -59,9 +60,7 @@ class EnhancedESPNAPI:
         params = {"season": season}
         
         try:
-            response = requests.get(url, params=params, timeout=self.timeout)
-            response.raise_for_status()
-            data = response.json()
+            data = self.resolver.get(url, params=params)
             
             return self._parse_team_stats(data)
             
@@ -81,12 +80,10 @@ class EnhancedESPNAPI:
         """
         print(f"🔮 Fetching ESPN predictions for game {game_id}...")
         
-        url = f"{self.core_base}/events/{game_id}/competitions/{game_id}/predictor"
+        url = self._competition_url(game_id, "predictor")
         
         try:
-            response = requests.get(url, timeout=self.timeout)
-            response.raise_for_status()
-            data = response.json()
+            data = self.resolver.get(url)
             
             return self._parse_espn_predictions(data)
             
@@ -107,12 +104,10 @@ class EnhancedESPNAPI:
         """
         print(f"⚡ Fetching power index for team {team_id} in game {game_id}...")
         
-        url = f"{self.core_base}/events/{game_id}/competitions/{game_id}/powerindex/{team_id}"
+        url = self._competition_url(game_id, f"powerindex/{team_id}")
         
         try:
-            response = requests.get(url, timeout=self.timeout)
-            response.raise_for_status()
-            data = response.json()
+            data = self.resolver.get(url)
             
             return self._parse_power_index(data)
             
@@ -135,9 +130,8 @@ class EnhancedESPNAPI:
         url = f"{self.core_base}/teams/{team_id}/injuries"
         
         try:
-            response = requests.get(url, timeout=self.timeout)
-            response.raise_for_status()
-            data = response.json()
+            # Injury items (and the athletes they name) are $ref links
+            data = self.resolver.resolve_graph(self.resolver.get(url), depth=2)
             
             return self._parse_injury_data(data)
             
@@ -158,8 +152,10 @@ class EnhancedESPNAPI:
         """
         print(f"📅 Analyzing Week {week} games...")
         
-        # Get games for the week
+        # Start from a fresh cache, then get games for the week
+        self.resolver.clear()
         games = self._get_week_games(year, week)
+        self._prefetch_week(games)
         
         analysis = {
             "week": week,
@@ -192,13 +188,15 @@ class EnhancedESPNAPI:
             game_analysis["espn_predictions"] = predictions
             
             # Get power index for both teams
-            for team_id in game_analysis["teams"].values():
+            for team in game_analysis["teams"].values():
+                team_id = team.get("id")
                 if team_id:
                     power_data = self.get_power_index(game_id, team_id)
                     game_analysis["power_index"][team_id] = power_data
             
             # Get injury data for both teams
-            for team_id in game_analysis["teams"].values():
+            for team in game_analysis["teams"].values():
+                team_id = team.get("id")
                 if team_id:
                     injuries = self.get_player_injuries(team_id)
                     game_analysis["injuries"][team_id] = injuries
@@ -207,6 +205,29 @@ class EnhancedESPNAPI:
         
         return analysis
     
+    def _prefetch_week(self, games: List[Dict]):
+        """Issue every request for a week's games at once so the per-game calls are cache hits"""
+        urls = []
+        injury_urls = []
+        for game in games:
+            game_id = game.get("id")
+            if not game_id:
+                continue
+            urls += [self._competition_url(game_id, "statistics"), self._competition_url(game_id, "predictor")]
+            for team in game.get("teams", {}).values():
+                if team.get("id"):
+                    urls.append(self._competition_url(game_id, f"powerindex/{team['id']}"))
+                    injury_urls.append(f"{self.core_base}/teams/{team['id']}/injuries")
+        
+        injury_lists = self.resolver.resolve_many(urls + injury_urls)
+        
+        # Follow every team's injury refs together: two more rounds (items, then athletes) for the week
+        self.resolver.resolve_graph([injury_lists[url] for url in injury_urls if injury_lists[url]], depth=2)
+    
+    def _competition_url(self, game_id: str, path: str) -> str:
+        """Core API URL under a game's competition"""
+        return f"{self.core_base}/events/{game_id}/competitions/{game_id}/{path}"
+    
     def _get_week_games(self, year: int, week: int) -> List[Dict]:
         """Get basic game information for a week"""
         # Use the existing scoreboard endpoint
@@ -220,9 +241,7 @@ class EnhancedESPNAPI:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=self.timeout)
-            response.raise_for_status()
-            data = response.json()
+            data = self.resolver.get(url, params=params)
             
             games = []
             for event in data.get("events", []):
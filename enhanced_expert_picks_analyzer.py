@@ -1,23 +1,115 @@
 #!/usr/bin/env python3
 """
 Enhanced Expert Picks Analyzer - Incorporates betting odds for better analysis
+Consensus, probabilities and market alignment are computed from the
+expert_picks/odds tables for every game of a season in one vectorized pass,
+cached until those tables change, so every strategy and every week of a
+season reads the same computation.
 """
 
 import json
 import os
 from datetime import datetime
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from database_manager import DatabaseManager
+from expert_picks_store import store_expert_picks_json
+
+CONSENSUS_TABLES = ('expert_picks', 'odds', 'games', 'teams')
+
+# (db_path, season_year) -> (table versions, per-team counts, per-game consensus)
+_season_cache: Dict[Tuple[str, int], Tuple[tuple, pd.DataFrame, pd.DataFrame]] = {}
+
+def moneyline_to_probability(moneyline) -> np.ndarray:
+    """Implied win probability of American moneylines (NaN stays NaN)"""
+    moneyline = np.asarray(moneyline, dtype=float)
+    return np.where(moneyline > 0, 100 / (moneyline + 100), np.abs(moneyline) / (np.abs(moneyline) + 100))
+
+def expert_win_probability(consensus_percentage) -> np.ndarray:
+    """Win probability from the share of experts on the consensus team"""
+    pct = np.asarray(consensus_percentage, dtype=float)
+    return np.select(
+        [pct >= 85.7, pct >= 71.4, pct >= 57.1],  # 6-7/7, 5/7, 4/7 experts
+        [0.75 + (pct - 85.7) * 0.01, 0.65 + (pct - 71.4) * 0.01, 0.55 + (pct - 57.1) * 0.01],
+        0.50 + (pct - 50) * 0.01  # Split decision
+    )
+
+def compute_season_consensus(picks: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Per-team pick counts and per-game consensus for every game in `picks`
+    (DatabaseManager.get_expert_market_picks), all games at once
+    """
+    # Teams in first-picked order within each game, so ties go to the first team picked
+    team_counts = (picks.groupby(['game_id', 'pick_team'], sort=False)
+                   .agg(count=('expert_name', 'size'), moneyline=('moneyline', 'first'))
+                   .reset_index())
+    games = (picks.groupby('game_id', sort=False)
+             .agg(season_year=('season_year', 'first'), week=('week', 'first'),
+                  away_team=('away_team', 'first'), home_team=('home_team', 'first'),
+                  total_experts=('expert_name', 'size'),
+                  market_home_ml=('market_home_ml', 'first'), market_away_ml=('market_away_ml', 'first'))
+             .reset_index())
+    
+    leaders = (team_counts.sort_values('count', ascending=False, kind='stable')
+               .drop_duplicates('game_id')
+               .rename(columns={'pick_team': 'consensus_team', 'count': 'consensus_count',
+                                'moneyline': 'consensus_moneyline'}))
+    consensus = games.merge(leaders, on='game_id')
+    consensus['game'] = consensus['away_team'] + " @ " + consensus['home_team']
+    consensus['consensus_percentage'] = consensus['consensus_count'] / consensus['total_experts'] * 100
+    
+    # The line shown next to the consensus picks, else the market's line for that side
+    market_ml = np.where(consensus['consensus_team'] == consensus['home_team'],
+                         consensus['market_home_ml'], consensus['market_away_ml'])
+    moneyline = consensus['consensus_moneyline'].fillna(pd.Series(market_ml, index=consensus.index)).round()
+    consensus['consensus_moneyline'] = moneyline
+    
+    consensus['expert_win_probability'] = expert_win_probability(consensus['consensus_percentage'])
+    consensus['betting_win_probability'] = np.nan_to_num(moneyline_to_probability(moneyline), nan=0.5)
+    # Betting odds weighted more heavily; they're often more accurate
+    consensus['combined_win_probability'] = (consensus['expert_win_probability'] * 0.3
+                                             + consensus['betting_win_probability'] * 0.7)
+    consensus['market_alignment'] = np.select(
+        [(moneyline > 0) & (consensus['consensus_percentage'] > 70),
+         (moneyline < 0) & (consensus['consensus_percentage'] < 60)],
+        ['experts_favor_underdog', 'experts_split_on_favorite'],
+        'aligned'
+    )
+    return team_counts, consensus
+
+def season_consensus(db_manager: DatabaseManager, season_year: int) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """
+    (picks, team_counts, consensus) for a season, computed once and shared by
+    every analyzer until expert_picks/odds/games/teams are written; treat as read-only
+    """
+    key = (db_manager.db_path, season_year)
+    versions = db_manager.get_table_versions(CONSENSUS_TABLES)
+    cached = _season_cache.get(key)
+    if cached is None or cached[0] != versions:
+        picks = db_manager.get_expert_market_picks(season_year)
+        cached = (versions, picks) + compute_season_consensus(picks)
+        _season_cache[key] = cached
+    return cached[1:]
+
+def format_moneyline(moneyline) -> Optional[str]:
+    """'-365' / '+145' as the picks pages show them; None when unknown"""
+    return None if pd.isna(moneyline) else f"{int(moneyline):+d}"
 
 class EnhancedExpertPicksAnalyzer:
     """
     Analyzes expert picks from CBS Sports with betting odds integration
     """
     
-    def __init__(self, week: int):
+    def __init__(self, week: int, season_year: int = 2025, db_manager: Optional[DatabaseManager] = None):
         self.week = week
+        self.season_year = season_year
+        self.db_manager = db_manager or DatabaseManager(version="v2")
         self.expert_picks_file = f"data/expert-picks-week-{week}-with-odds.json"
         self.consensus_data = None
-        
+    
     def load_expert_picks(self) -> Dict:
         """
         Load expert picks with odds from JSON file
@@ -28,88 +120,63 @@ class EnhancedExpertPicksAnalyzer:
         with open(self.expert_picks_file, 'r') as f:
             return json.load(f)
     
+    def store_scraped_picks(self):
+        """
+        Bring a scraped JSON for this week into expert_picks (skipped if already stored)
+        """
+        if os.path.exists(self.expert_picks_file):
+            store_expert_picks_json(self.db_manager, self.expert_picks_file)
+    
     def convert_odds_to_probability(self, odds: str) -> float:
         """
         Convert betting odds to win probability
         """
         try:
-            odds_int = int(odds)
-            
-            if odds_int > 0:  # Underdog (positive odds)
-                # For +150: probability = 100 / (150 + 100) = 0.4
-                probability = 100 / (odds_int + 100)
-            else:  # Favorite (negative odds)
-                # For -150: probability = 150 / (150 + 100) = 0.6
-                probability = abs(odds_int) / (abs(odds_int) + 100)
-            
-            return probability
-        except:
+            return float(moneyline_to_probability(int(odds)))
+        except (TypeError, ValueError):
             return 0.5  # Default to 50% if parsing fails
     
-    def calculate_enhanced_consensus(self, expert_picks_data: Dict) -> List[Dict]:
+    def calculate_enhanced_consensus(self) -> List[Dict]:
         """
-        Calculate consensus incorporating betting odds
+        Calculate consensus incorporating betting odds (fresh records from the shared season pass)
         """
-        games = expert_picks_data.get('games', [])
-        consensus_data = []
+        picks, team_counts, consensus = season_consensus(self.db_manager, self.season_year)
+        week_games = consensus[consensus['week'] == self.week]
+        if week_games.empty:
+            raise ValueError(f"No expert picks stored for {self.season_year} week {self.week}")
         
-        for game in games:
-            expert_picks = game.get('expert_picks', [])
-            odds = game.get('odds', {})
-            
-            # Count picks for each team
-            team_counts = {}
-            for pick in expert_picks:
-                team = pick['pick']
-                if team not in team_counts:
-                    team_counts[team] = 0
-                team_counts[team] += 1
-            
-            # Find consensus team
-            if team_counts:
-                consensus_team = max(team_counts, key=team_counts.get)
-                consensus_count = team_counts[consensus_team]
-                total_experts = len(expert_picks)
-                consensus_percentage = (consensus_count / total_experts) * 100
-                
-                # Calculate expert-based win probability
-                expert_win_prob = self._calculate_win_probability(consensus_percentage)
-                
-                # Get betting odds probability for consensus team
-                consensus_odds = odds.get(consensus_team, None)
-                betting_win_prob = 0.5  # Default
-                if consensus_odds:
-                    betting_win_prob = self.convert_odds_to_probability(consensus_odds)
-                
-                # Combine expert and betting probabilities (weighted average)
-                # Give more weight to betting odds as they're often more accurate
-                combined_win_prob = (expert_win_prob * 0.3) + (betting_win_prob * 0.7)
-                
-                # Determine if expert consensus aligns with betting market
-                market_alignment = "aligned"
-                if consensus_odds:
-                    if consensus_odds.startswith('+') and consensus_percentage > 70:
-                        market_alignment = "experts_favor_underdog"
-                    elif consensus_odds.startswith('-') and consensus_percentage < 60:
-                        market_alignment = "experts_split_on_favorite"
-                
-                consensus_data.append({
-                    'game': game['game'],
-                    'away_team': game['away_team'],
-                    'home_team': game['home_team'],
-                    'consensus_team': consensus_team,
-                    'consensus_count': consensus_count,
-                    'total_experts': total_experts,
-                    'consensus_percentage': consensus_percentage,
-                    'expert_win_probability': expert_win_prob,
-                    'betting_win_probability': betting_win_prob,
-                    'combined_win_probability': combined_win_prob,
-                    'consensus_odds': consensus_odds,
-                    'all_odds': odds,
-                    'market_alignment': market_alignment,
-                    'team_counts': team_counts,
-                    'expert_picks': expert_picks
-                })
+        game_ids = set(week_games['game_id'])
+        week_counts = team_counts[team_counts['game_id'].isin(game_ids)]
+        week_picks = picks[picks['game_id'].isin(game_ids)]
+        counts_by_game, odds_by_game, picks_by_game = {}, {}, {}
+        for game_id, team, count, moneyline in week_counts[['game_id', 'pick_team', 'count', 'moneyline']].itertuples(index=False):
+            counts_by_game.setdefault(game_id, {})[team] = int(count)
+            if not pd.isna(moneyline):
+                odds_by_game.setdefault(game_id, {})[team] = format_moneyline(moneyline)
+        for game_id, expert, team, moneyline in week_picks[['game_id', 'expert_name', 'pick_team', 'moneyline']].itertuples(index=False):
+            picks_by_game.setdefault(game_id, []).append({'expert': expert, 'pick': team,
+                                                          'odds': format_moneyline(moneyline)})
+        
+        consensus_data = []
+        for game in week_games.to_dict('records'):
+            game_id = game['game_id']
+            consensus_data.append({
+                'game': game['game'],
+                'away_team': game['away_team'],
+                'home_team': game['home_team'],
+                'consensus_team': game['consensus_team'],
+                'consensus_count': int(game['consensus_count']),
+                'total_experts': int(game['total_experts']),
+                'consensus_percentage': game['consensus_percentage'],
+                'expert_win_probability': game['expert_win_probability'],
+                'betting_win_probability': game['betting_win_probability'],
+                'combined_win_probability': game['combined_win_probability'],
+                'consensus_odds': format_moneyline(game['consensus_moneyline']),
+                'all_odds': odds_by_game.get(game_id, {}),
+                'market_alignment': game['market_alignment'],
+                'team_counts': counts_by_game[game_id],
+                'expert_picks': picks_by_game[game_id]
+            })
         
         return consensus_data
     
@@ -117,14 +184,7 @@ class EnhancedExpertPicksAnalyzer:
         """
         Calculate win probability based on consensus percentage
         """
-        if consensus_percentage >= 85.7:  # 6/7 or 7/7 experts
-            return 0.75 + (consensus_percentage - 85.7) * 0.01
-        elif consensus_percentage >= 71.4:  # 5/7 experts
-            return 0.65 + (consensus_percentage - 71.4) * 0.01
-        elif consensus_percentage >= 57.1:  # 4/7 experts
-            return 0.55 + (consensus_percentage - 57.1) * 0.01
-        else:  # Split decision
-            return 0.50 + (consensus_percentage - 50) * 0.01
+        return float(expert_win_probability(consensus_percentage))
     
     def identify_enhanced_contrarian_opportunities(self, consensus_data: List[Dict]) -> Dict:
         """
@@ -197,11 +257,11 @@ class EnhancedExpertPicksAnalyzer:
         """
         print(f"📊 Analyzing Week {self.week} expert picks with betting odds...")
         
-        # Load expert picks
-        expert_picks_data = self.load_expert_picks()
+        # Make sure a freshly scraped week is in the database
+        self.store_scraped_picks()
         
         # Calculate enhanced consensus
-        consensus_data = self.calculate_enhanced_consensus(expert_picks_data)
+        consensus_data = self.calculate_enhanced_consensus()
         
         # Identify enhanced contrarian opportunities
         contrarian_opportunities = self.identify_enhanced_contrarian_opportunities(consensus_data)
@@ -214,13 +274,19 @@ class EnhancedExpertPicksAnalyzer:
         
         analysis = {
             'week': self.week,
-            'season': expert_picks_data.get('season', 2025),
+            'season': self.season_year,
             'analyzed_at': datetime.now().isoformat(),
-            'source': expert_picks_data.get('source', 'CBS Sports'),
+            'source': 'CBS Sports',
             'consensus_data': consensus_data,
             'contrarian_opportunities': contrarian_opportunities,
             'odds_patterns': odds_patterns,
-            'expert_picks_data': expert_picks_data
+            'expert_picks_data': {
+                'week': self.week,
+                'season': self.season_year,
+                'games': [{'game': game['game'], 'away_team': game['away_team'], 'home_team': game['home_team'],
+                           'expert_picks': game['expert_picks'], 'odds': game['all_odds']}
+                          for game in consensus_data]
+            }
         }
         
         print(f"✅ Enhanced analysis complete: {odds_patterns['total_games']} games analyzed")
@@ -245,6 +311,15 @@ class EnhancedExpertPicksAnalyzer:
         print(f"💾 Saved enhanced analysis to: {output_file}")
         return output_file
 
+def analyze_season(season_year: int = 2025, db_manager: Optional[DatabaseManager] = None) -> Dict[int, Dict]:
+    """
+    Enhanced analysis of every week of a season with stored expert picks, from one shared pass
+    """
+    db_manager = db_manager or DatabaseManager(version="v2")
+    _, _, consensus = season_consensus(db_manager, season_year)
+    return {int(week): EnhancedExpertPicksAnalyzer(int(week), season_year, db_manager).generate_enhanced_analysis()
+            for week in sorted(consensus['week'].unique())}
+
 def main():
     """
     Test the EnhancedExpertPicksAnalyzer
@@ -252,21 +327,23 @@ def main():
     import argparse
     
     parser = argparse.ArgumentParser(description="Analyze expert picks with betting odds")
-    parser.add_argument("--week", type=int, required=True, help="Week number")
+    parser.add_argument("--week", type=int, help="Week number (default: every week with stored picks)")
+    parser.add_argument("--season", type=int, default=2025, help="Season year")
     
     args = parser.parse_args()
     
-    # Create analyzer
-    analyzer = EnhancedExpertPicksAnalyzer(args.week)
-    
-    # Generate analysis
-    analysis = analyzer.generate_enhanced_analysis()
+    db_manager = DatabaseManager(version="v2")
+    if args.week is None:
+        analyses = analyze_season(args.season, db_manager)
+    else:
+        analyses = {args.week: EnhancedExpertPicksAnalyzer(args.week, args.season, db_manager).generate_enhanced_analysis()}
     
     # Save analysis
-    output_file = analyzer.save_analysis(analysis)
-    
-    print(f"\n✅ **ENHANCED ANALYSIS COMPLETE**")
-    print(f"📄 Output: {output_file}")
+    for week, analysis in analyses.items():
+        output_file = EnhancedExpertPicksAnalyzer(week, args.season, db_manager).save_analysis(analysis)
+        
+        print(f"\n✅ **ENHANCED ANALYSIS COMPLETE**")
+        print(f"📄 Output: {output_file}")
 
 if __name__ == "__main__":
     main()
@@ -14,11 +14,11 @@ class EnhancedWeeklyPicksGenerator:
     Generates weekly picks using expert consensus and betting odds
     """
     
-    def __init__(self, week: int):
+    def __init__(self, week: int, season_year: int = 2025):
         self.week = week
-        self.analyzer = EnhancedExpertPicksAnalyzer(week)
+        self.analyzer = EnhancedExpertPicksAnalyzer(week, season_year)
         self.analysis = None
-        
+    
     def load_analysis(self) -> Dict:
         """
         Load or generate enhanced expert picks analysis
@@ -32,10 +32,9 @@ class EnhancedWeeklyPicksGenerator:
         Generate picks using betting odds as primary factor with expert consensus as secondary
         """
         analysis = self.load_analysis()
-        consensus_data = analysis['consensus_data']
-        
-        # Sort by combined win probability (betting odds weighted more heavily)
-        consensus_data.sort(key=lambda x: x['combined_win_probability'], reverse=True)
+        # Sort by combined win probability (betting odds weighted more heavily);
+        # sorted() leaves the shared analysis in its original order for the other strategies
+        consensus_data = sorted(analysis['consensus_data'], key=lambda x: x['combined_win_probability'], reverse=True)
         
         # Assign confidence points (16 to 1)
         picks = []
@@ -65,10 +64,10 @@ class EnhancedWeeklyPicksGenerator:
         Generate picks focusing on games where expert consensus disagrees with betting market
         """
         analysis = self.load_analysis()
-        misalignment_games = analysis['contrarian_opportunities']['market_misalignment']
-        
         # Sort by disagreement magnitude
-        misalignment_games.sort(key=lambda x: abs(x['expert_win_probability'] - x['betting_win_probability']), reverse=True)
+        misalignment_games = sorted(analysis['contrarian_opportunities']['market_misalignment'],
+                                    key=lambda x: abs(x['expert_win_probability'] - x['betting_win_probability']),
+                                    reverse=True)
         
         picks = []
         for i, game_data in enumerate(misalignment_games):
@@ -106,10 +105,9 @@ class EnhancedWeeklyPicksGenerator:
         Generate contrarian picks fading games with both strong expert and betting consensus
         """
         analysis = self.load_analysis()
-        high_confidence_fades = analysis['contrarian_opportunities']['high_confidence_fades']
-        
         # Sort by combined confidence (highest first for lowest confidence points)
-        high_confidence_fades.sort(key=lambda x: x['combined_win_probability'], reverse=True)
+        high_confidence_fades = sorted(analysis['contrarian_opportunities']['high_confidence_fades'],
+                                       key=lambda x: x['combined_win_probability'], reverse=True)
         
         picks = []
         for i, game_data in enumerate(high_confidence_fades):
@@ -4,16 +4,18 @@ ESPN API integration for fetching NFL game results and injury data.
 This provides free access to game scores and player injury information.
 """
 import datetime as dt
-import requests
 from typing import Dict, List, Optional, Tuple
 import json
 
+from raw_payload_archive import RawPayloadArchive, archived_get
+
 class ESPNAPI:
     """ESPN API client for NFL data"""
     
-    def __init__(self):
+    def __init__(self, archive: Optional[RawPayloadArchive] = None):
         self.base_url = "https://site.api.espn.com/apis/site/v2/sports/football/nfl"
         self.timeout = 30
+        self.archive = archive
     
     def get_week_results(self, year: int, week: int) -> List[Dict]:
         """
@@ -39,7 +41,7 @@ class ESPNAPI:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=self.timeout)
+            response = archived_get("espn", url, params=params, archive=self.archive, timeout=self.timeout)
             response.raise_for_status()
             data = response.json()
             
@@ -72,7 +74,7 @@ class ESPNAPI:
             url = f"{self.base_url}/teams"
         
         try:
-            response = requests.get(url, timeout=self.timeout)
+            response = archived_get("espn", url, archive=self.archive, timeout=self.timeout)
             response.raise_for_status()
             data = response.json()
             
@@ -100,7 +102,7 @@ class ESPNAPI:
         """Get the current NFL week number"""
         try:
             url = f"{self.base_url}/scoreboard"
-            response = requests.get(url, timeout=self.timeout)
+            response = archived_get("espn", url, archive=self.archive, timeout=self.timeout)
             response.raise_for_status()
             data = response.json()
             
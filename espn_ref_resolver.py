@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Concurrent resolver for ESPN core-API `$ref` links.
+Every URL is fetched at most once per run: a ref that is already cached or
+in flight is coalesced onto the same future, and the rest are fetched on a
+bounded thread pool. Nested refs are resolved level by level, so an object
+graph costs about one round trip per level instead of one per link.
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import requests
+
+from raw_payload_archive import RawPayloadArchive, archived_get
+
+DEFAULT_WORKERS = 32
+REQUEST_TIMEOUT = 30
+
+class RefResolver:
+    """Coalescing, cached and concurrent fetcher for ESPN JSON endpoints"""
+    
+    def __init__(self, max_workers: int = DEFAULT_WORKERS, timeout: int = REQUEST_TIMEOUT,
+                 archive: Optional[RawPayloadArchive] = None):
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.archive = archive
+        self._futures: Dict[Tuple, Future] = {}
+        self._lock = threading.Lock()
+        self._sessions = threading.local()
+        self._executor = None
+        self.requests_made = 0
+    
+    def _key(self, url: str, params: Optional[Dict] = None) -> Tuple:
+        return (url, tuple(sorted(params.items())) if params else ())
+    
+    def _fetch(self, url: str, params: Optional[Dict]) -> Dict:
+        # requests.Session is not thread-safe: one per worker thread
+        if not hasattr(self._sessions, "session"):
+            self._sessions.session = requests.Session()
+        response = archived_get("espn", url, params=params, archive=self.archive,
+                                session=self._sessions.session, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+    
+    def submit(self, url: str, params: Optional[Dict] = None) -> Future:
+        """Future for a URL's JSON, shared with any earlier request for the same URL"""
+        
+        key = self._key(url, params)
+        with self._lock:
+            future = self._futures.get(key)
+            if future is None:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                        thread_name_prefix="espn-ref")
+                future = self._executor.submit(self._fetch, url, params)
+                self._futures[key] = future
+                self.requests_made += 1
+        return future
+    
+    def get(self, url: str, params: Optional[Dict] = None) -> Dict:
+        """Blocking fetch of one URL (raises the request's error, like requests.get)"""
+        
+        return self.submit(url, params).result()
+    
+    def resolve_many(self, refs: Iterable[str]) -> Dict[str, Optional[Dict]]:
+        """Resolve a set of refs concurrently; failed refs map to None"""
+        
+        futures = {ref: self.submit(ref) for ref in set(refs)}
+        wait(futures.values())
+        return {ref: None if future.exception() else future.result() for ref, future in futures.items()}
+    
+    def resolve_graph(self, obj: Any, depth: int = 1) -> Any:
+        """Copy of `obj` with `{"$ref": url}` links replaced by the objects they point to.
+        
+        Links are followed `depth` levels deep; each level is fetched in one
+        concurrent batch. Refs that fail to resolve are left as links.
+        """
+        
+        root = {"root": obj}
+        pending = [(root, "root")]
+        for _ in range(depth):
+            # Collect every link at this level before fetching any of them
+            links = [link for parent, key in pending for link in self._links(parent, key)]
+            if not links:
+                break
+            resolved = self.resolve_many(parent[key]["$ref"] for parent, key in links)
+            pending = []
+            for parent, key in links:
+                data = resolved[parent[key]["$ref"]]
+                if data is not None:
+                    parent[key] = data
+                    pending.append((parent, key))
+        return root["root"]
+    
+    def _links(self, parent, key) -> list:
+        """(container, key) of every $ref link under parent[key]; containers are copied on
+        the way down so cached responses shared between links are never modified"""
+        
+        value = parent[key]
+        if isinstance(value, dict):
+            if "$ref" in value and len(value) == 1:
+                return [(parent, key)]
+            parent[key] = value = dict(value)
+            children = value.keys()
+        elif isinstance(value, list):
+            parent[key] = value = list(value)
+            children = range(len(value))
+        else:
+            return []
+        
+        links = []
+        for child in children:
+            links.extend(self._links(value, child))
+        return links
+    
+    def clear(self):
+        """Forget cached responses (start a new run)"""
+        
+        with self._lock:
+            self._futures = {}
+    
+    def close(self):
+        """Shut down the worker threads"""
+        
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
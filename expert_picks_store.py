@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Writes scraped CBS expert picks to expert_picks.
+Kept apart from the scraper so readers of saved picks JSON (the enhanced
+analyzer) need neither requests nor BeautifulSoup.
+"""
+
+import json
+from typing import Dict, List, Optional, Tuple
+
+from database_manager import DatabaseManager
+from ingestion_ledger import IngestionLedger
+
+def expert_pick_rows(db_manager: DatabaseManager, season_year: int, week: int,
+                     games: List[Dict]) -> Tuple[List[Dict], List[str]]:
+    """expert_picks rows for scraped games (CBS abbreviations resolved), plus unmatched games"""
+    
+    # Look games up in both orientations (neutral-site games may be stored either way round)
+    keys = [(season_year, week, game['home_team'], game['away_team']) for game in games]
+    game_ids = db_manager.get_game_ids(keys + [(season, wk, away, home) for season, wk, home, away in keys])
+    rows, unmatched = [], []
+    for game, game_id, swapped_id in zip(games, game_ids, game_ids[len(keys):]):
+        game_id = game_id or swapped_id
+        if game_id is None:
+            unmatched.append(game['game'])
+            continue
+        for pick in game['expert_picks']:
+            rows.append({
+                'game_id': game_id,
+                'expert_name': pick['expert'],
+                'pick_team': db_manager.team_mapper.map_team_name(pick['pick']),
+                'moneyline': int(pick['odds'])
+            })
+    return rows, unmatched
+
+def store_expert_picks_json(db_manager: DatabaseManager, json_path: str, force: bool = False) -> Optional[Dict]:
+    """
+    Write a saved expert-picks JSON (save_expert_picks_to_json) to expert_picks.
+    Returns None when the ledger has already seen this file's contents.
+    """
+    ledger = IngestionLedger(db_manager)
+    check = ledger.check(json_path, 'expert_picks_json')
+    if check['unchanged'] and not force:
+        return None
+    
+    with open(json_path, 'r') as f:
+        data = json.load(f)
+    rows, unmatched = expert_pick_rows(db_manager, data['season'], data['week'], data.get('games', []))
+    changes = db_manager.sync_expert_picks(rows) if rows else {'inserted': 0, 'updated': 0}
+    # Games missing from the schedule are retried on the next run, once they may have been loaded
+    if not unmatched:
+        ledger.record(check, len(rows), data['season'], data['week'])
+    return {'rows': len(rows), 'unmatched': unmatched, **changes}
@@ -3,9 +3,9 @@
 Fetch current DraftKings odds for Week 3 games
 """
 
-import requests
 import json
 from database_manager import DatabaseManager
+from raw_payload_archive import archived_get
 from datetime import datetime
 
 def fetch_current_odds():
@@ -26,7 +26,7 @@ def fetch_current_odds():
     }
     
     try:
-        response = requests.get(url, params=params)
+        response = archived_get("odds_api", url, params=params)
         
         if response.status_code == 200:
             data = response.json()
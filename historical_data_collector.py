@@ -3,7 +3,6 @@
 Historical data collector for NFL games (2018-2024) with international game awareness.
 Collects game results, team performance, and home field advantage data.
 """
-import requests
 import json
 import pandas as pd
 from datetime import datetime, date
@@ -11,12 +10,14 @@ from typing import Dict, List, Optional, Tuple
 import time
 import os
 from database_manager import DatabaseManager
+from raw_payload_archive import RawPayloadArchive, archived_get
 
 class HistoricalDataCollector:
     """Collects historical NFL data with international game awareness"""
     
     def __init__(self, version: str = "v2"):
         self.db_manager = DatabaseManager(version=version)
+        self.archive = RawPayloadArchive(self.db_manager)
         self.base_url = "https://site.api.espn.com/apis/site/v2/sports/football/nfl"
         
         # International game locations and their characteristics
@@ -102,7 +103,7 @@ class HistoricalDataCollector:
         }
         
         try:
-            response = requests.get(url, params=params)
+            response = archived_get("espn", url, params=params, archive=self.archive)
             response.raise_for_status()
             return response.json()
         except Exception as e:
@@ -120,7 +121,7 @@ class HistoricalDataCollector:
             params = {'dates': date}
             
             try:
-                response = requests.get(url, params=params)
+                response = archived_get("espn", url, params=params, archive=self.archive)
                 response.raise_for_status()
                 data = response.json()
                 
@@ -347,7 +348,7 @@ class HistoricalDataCollector:
         }
         
         try:
-            response = requests.get(url, params=params)
+            response = archived_get("espn", url, params=params, archive=self.archive)
             response.raise_for_status()
             data = response.json()
             
@@ -9,6 +9,8 @@ import pandas as pd
 import numpy as np
 from database_manager import DatabaseManager
 from current_season_model import CurrentSeasonNFLModel
+from elo_ratings import EloRatingEngine
+from slate_inference import pair_predictions
 
 class HybridExpertModel:
     """Hybrid model combining expert picks with ML predictions"""
@@ -28,26 +30,49 @@ class HybridExpertModel:
             'Jared Dubin': 0.375       # 6-10-0 (37.5%)
         }
         
-        # Load ML model
-        try:
-            self.ml_model.load_model()
-            self.ml_available = True
-        except:
-            self.ml_available = False
-            print("⚠️  ML model not available, using expert-only predictions")
+        # ML model is loaded the first time a game needs it
+        self._ml_available = None
+        self._elo_engine = None
+    
+    @property
+    def ml_available(self) -> bool:
+        """Whether the ML fallback can be used (loads it on first check)"""
+        
+        if self._ml_available is None:
+            try:
+                self.ml_model.load_model()
+                self._ml_available = True
+            except:
+                self._ml_available = False
+                print("⚠️  ML model not available, using expert-only predictions")
+        return self._ml_available
+    
+    @ml_available.setter
+    def ml_available(self, available: bool):
+        self._ml_available = available
+    
+    @property
+    def elo_engine(self) -> EloRatingEngine:
+        """Stored Elo ratings, opened on first use (fallback for games without odds).
+        Predictions only read them; elo_ratings.py and the retrain step keep them current."""
+        
+        if self._elo_engine is None:
+            self._elo_engine = EloRatingEngine(self.db_manager)
+        return self._elo_engine
     
     def predict_confidence(self, games_data: list) -> list:
         """Predict confidence using hybrid expert-ML approach with proper stack ranking"""
         
         predictions = []
+        ml_games = []
+        ml_slots = []
         
-        for game in games_data:
-            # Get game ID
-            game_id = self.db_manager.get_game_id(
-                game['season_year'], game['week'], 
-                game['home_team'], game['away_team']
-            )
-            
+        game_ids = self.db_manager.get_game_ids([
+            (game['season_year'], game['week'], game['home_team'], game['away_team'])
+            for game in games_data
+        ])
+        
+        for game, game_id in zip(games_data, game_ids):
             if game_id:
                 # Try expert consensus first
                 expert_prediction = self._get_expert_prediction(game_id, game)
@@ -58,17 +83,16 @@ class HybridExpertModel:
             
             # Fall back to ML model if no expert data
             if self.ml_available:
-                ml_prediction = self._get_ml_prediction(game)
-                predictions.append(ml_prediction)
+                # Placeholder, filled by one batched ML call below
+                ml_slots.append(len(predictions))
+                ml_games.append(game)
+                predictions.append(None)
             else:
-                # Default prediction if no data available
-                predictions.append({
-                    'game': f"{game['away_team']} @ {game['home_team']}",
-                    'pick': game['home_team'],  # Default to home team
-                    'confidence': 8,  # Default confidence
-                    'win_probability': 0.5,
-                    'method': 'default'
-                })
+                # No expert data or ML model: fall back to Elo ratings
+                predictions.append(self._get_elo_prediction(game))
+        
+        for slot, ml_prediction in zip(ml_slots, self._get_ml_predictions(ml_games)):
+            predictions[slot] = ml_prediction
         
         # Apply proper stack ranking (16, 15, 14, ..., 1)
         predictions = self._apply_stack_ranking(predictions)
@@ -155,55 +179,69 @@ class HybridExpertModel:
             'expert_count': len(expert_picks)
         }
     
-    def _get_ml_prediction(self, game: dict) -> dict:
-        """Get ML-based prediction as fallback"""
-        
-        # Create test data
-        test_data = pd.DataFrame([{
-            'home_team': game['home_team'],
-            'away_team': game['away_team'],
-            'home_ml': game.get('home_ml', -110),
-            'away_ml': game.get('away_ml', -110),
-            'odds_total': game.get('total_points', 45),
-            'week': game['week'],
-            'season_year': game['season_year']
-        }])
-        
-        # Predict for home team
-        X_home = self.ml_model.prepare_features(test_data)
-        X_home = X_home.drop('current_season_weight', axis=1)
-        X_home = X_home.fillna(0)
-        X_home_scaled = self.ml_model.scaler.transform(X_home)
-        home_prediction = self.ml_model.model.predict(X_home_scaled)[0]
-        
-        # Predict for away team
-        test_data_away = test_data.copy()
-        test_data_away['home_team'] = game['away_team']
-        test_data_away['away_team'] = game['home_team']
-        test_data_away['home_ml'] = game.get('away_ml', -110)
-        test_data_away['away_ml'] = game.get('home_ml', -110)
-        
-        X_away = self.ml_model.prepare_features(test_data_away)
-        X_away = X_away.drop('current_season_weight', axis=1)
-        X_away = X_away.fillna(0)
-        X_away_scaled = self.ml_model.scaler.transform(X_away)
-        away_prediction = self.ml_model.model.predict(X_away_scaled)[0]
-        
-        # Choose better prediction
-        if home_prediction >= away_prediction:
-            pick_team = game['home_team']
-            win_prob = home_prediction
-        else:
-            pick_team = game['away_team']
-            win_prob = away_prediction
+    def _get_elo_prediction(self, game: dict) -> dict:
+        """Elo-based prediction when neither experts nor the ML model are available"""
         
+        try:
+            home_prob = self.elo_engine.win_probability(game['home_team'], game['away_team'],
+                                                        game.get('season_year'), game.get('week'),
+                                                        neutral=bool(game.get('is_international')))
+        except ValueError as e:
+            # Team without an Elo rating: default to the home team
+            print(f"⚠️  {e}, no Elo prediction for {game['away_team']} @ {game['home_team']}")
+            return {
+                'game': f"{game['away_team']} @ {game['home_team']}",
+                'pick': game['home_team'],
+                'confidence': 0,  # Will be set by stack ranking
+                'win_probability': 0.5,
+                'method': 'default'
+            }
         return {
             'game': f"{game['away_team']} @ {game['home_team']}",
-            'pick': pick_team,
+            'pick': game['home_team'] if home_prob >= 0.5 else game['away_team'],
             'confidence': 0,  # Will be set by stack ranking
-            'win_probability': win_prob,
-            'method': 'ml'
+            'win_probability': max(home_prob, 1 - home_prob),
+            'method': 'elo'
         }
+    
+    def _get_ml_prediction(self, game: dict) -> dict:
+        """Get ML-based prediction as fallback"""
+        
+        return self._get_ml_predictions([game])[0]
+    
+    def _get_ml_predictions(self, games: list) -> list:
+        """Get ML-based fallback predictions for many games in one batched call"""
+        
+        if not games:
+            return []
+        
+        games = self._fill_missing_odds(games)
+        home_scores, away_scores = self.ml_model.predict_slate_scores(games)
+        
+        predictions = []
+        for prediction in pair_predictions(games, home_scores, away_scores):
+            prediction['confidence'] = 0  # Will be set by stack ranking
+            prediction['method'] = 'ml'
+            predictions.append(prediction)
+        
+        return predictions
+    
+    def _fill_missing_odds(self, games: list) -> list:
+        """Elo-implied moneylines for games without odds (-110 if a team has no Elo rating)"""
+        
+        if all(game.get('home_ml') is not None and game.get('away_ml') is not None for game in games):
+            return games
+        
+        filled = []
+        for game in games:
+            try:
+                filled.extend(self.elo_engine.fill_missing_odds([game]))
+            except ValueError as e:
+                print(f"⚠️  {e}, using -110 odds for {game['away_team']} @ {game['home_team']}")
+                filled.append({**game,
+                               'home_ml': -110 if game.get('home_ml') is None else game['home_ml'],
+                               'away_ml': -110 if game.get('away_ml') is None else game['away_ml']})
+        return filled
 
 def main():
     """Example usage of the hybrid expert model"""
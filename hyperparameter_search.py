@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Parallel hyperparameter search for the pick models.
+Candidates are sampled from a shared forest search space and scored on the
+walk-forward folds from walk_forward_backtest.py with successive halving: every
+candidate gets a few folds and only the best 1/eta earn more. Training features,
+fold splits and slate features are built once, cached on disk and shared by
+all workers, so a candidate costs only its forest fits.
+"""
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from datetime import datetime
+
+import joblib
+import numpy as np
+
+from database_manager import DatabaseManager
+from walk_forward_backtest import (build_adapter, games_to_slate, load_backtest_data,
+                                   pick_sides, score_week, trainable, training_mask)
+
+SEARCH_MODELS = ['nfl_confidence', 'improved', 'current_season']
+SEARCH_SPACE = {
+    'n_estimators': [50, 100, 150, 200, 300, 400],
+    'max_depth': [4, 6, 8, 10, 12, 15, 20, None],
+    'min_samples_split': [2, 3, 5, 8, 12],
+    'min_samples_leaf': [1, 2, 4, 8],
+    'max_features': ['sqrt', 0.5, 1.0]
+}
+STOP_MARGIN = 0.05  # Points % below the previous rung's cutoff that ends a candidate early
+
+# Per-process state, so workers load each fold cache and adapter only once
+_WORKER_STATE = {}
+
+# ----------------------- Candidates and folds -----------------------
+
+def sample_candidates(n_candidates: int, seed: int = 42) -> list:
+    """Distinct random parameter sets; the first is {} (what the model trains with now: its
+    defaults, or the winner of its previous search; run_search stores those resolved params)"""
+    
+    rng = np.random.default_rng(seed)
+    candidates = [{}]
+    seen = {()}
+    attempts = 0
+    while len(candidates) < n_candidates and attempts < n_candidates * 20:
+        attempts += 1
+        params = {name: values[rng.integers(len(values))] for name, values in SEARCH_SPACE.items()}
+        params = {name: value.item() if isinstance(value, np.generic) else value
+                  for name, value in params.items()}
+        signature = tuple(sorted(params.items(), key=lambda item: item[0]))
+        if signature not in seen:
+            seen.add(signature)
+            candidates.append(params)
+    return candidates
+
+def current_params(db_manager: DatabaseManager, model_name: str) -> dict:
+    """The search-space parameters the model trains with now, which the {} candidate stands for"""
+    
+    regressor = build_adapter(model_name, db_manager).model.build_regressor()
+    return {name: value for name, value in regressor.get_params().items() if name in SEARCH_SPACE}
+
+def build_fold_cache(db_manager: DatabaseManager, model_name: str, start_season: int,
+                     end_season: int = None, cache_dir: str = "data/cache/backtest") -> str:
+    """Precompute training features and per-fold slate features for one model family"""
+    
+    data = load_backtest_data(db_manager, cache_dir)
+    cache_path = os.path.join(
+        cache_dir, f"search-folds-{model_name}-{start_season}-{end_season or 'all'}-{data['key']}.joblib")
+    if os.path.exists(cache_path):
+        return cache_path
+    
+    picks = data['picks']
+    games = data['games']
+    games = games[(games['season_year'] >= start_season) &
+                  ((games['season_year'] <= end_season) if end_season else True)]
+    
+    adapter = build_adapter(model_name, db_manager)
+    folds = []
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        adapter.features = adapter.model.prepare_features(picks)
+        for (season_year, week), week_games in games.groupby(['season_year', 'week'], sort=True):
+            mask = training_mask(picks, season_year, week)
+            if not trainable(picks, mask):
+                continue
+            slate = games_to_slate(week_games)
+            folds.append({
+                'season_year': int(season_year),
+                'week': int(week),
+                'mask': mask.values,
+                'slate': slate,
+                'winners': list(week_games['winner']),
+                'X': adapter.slate_features(slate)
+            })
+    
+    joblib.dump({
+        'model_name': model_name,
+        'labels': picks[['is_correct']],
+        'features': adapter.features,
+        'feature_columns': getattr(adapter.model, 'feature_columns', None),
+        'folds': folds
+    }, cache_path)
+    return cache_path
+
+# ----------------------- Candidate evaluation -----------------------
+
+def _worker_fold_cache(cache_path: str, db_path: str):
+    """Fold cache and a fitted-per-call adapter, loaded once per worker process"""
+    
+    if cache_path not in _WORKER_STATE:
+        cache = joblib.load(cache_path)
+        adapter = build_adapter(cache['model_name'], DatabaseManager(db_path=db_path))
+        adapter.features = cache['features']
+        if cache['feature_columns'] is not None:
+            adapter.model.feature_columns = cache['feature_columns']
+        _WORKER_STATE[cache_path] = (cache, adapter)
+    return _WORKER_STATE[cache_path]
+
+def evaluate_candidate(task: tuple) -> dict:
+    """Worker: fit and score one candidate on a list of folds, stopping early if it trails"""
+    
+    cache_path, db_path, params, fold_ids, stop_below = task
+    cache, adapter = _worker_fold_cache(cache_path, db_path)
+    
+    started = datetime.now()
+    results = []
+    status = 'complete'
+    for n_done, fold_id in enumerate(fold_ids, 1):
+        fold = cache['folds'][fold_id]
+        adapter.fit(cache['labels'], fold['mask'], **params)
+        predictions = pick_sides(fold['slate'], *adapter.score_features(fold['X']))
+        results.append(score_week(fold['slate'], fold['winners'], predictions))
+        
+        # Give up halfway through the rung if clearly below the bar the last rung set
+        if (stop_below is not None and n_done < len(fold_ids)
+                and n_done >= max(2, len(fold_ids) // 2)
+                and _points_pct(results) < stop_below):
+            status = 'stopped'
+            break
+    
+    games = sum(result['games'] for result in results)
+    return {
+        'params': params,
+        'status': status,
+        'folds_evaluated': len(results),
+        'accuracy': sum(result['correct'] for result in results) / games if games else 0.0,
+        'points_pct': _points_pct(results),
+        'fit_seconds': (datetime.now() - started).total_seconds()
+    }
+
+def _points_pct(results: list) -> float:
+    """Confidence points earned as a share of the maximum over scored folds"""
+    
+    max_points = sum(result['max_points'] for result in results)
+    return sum(result['points'] for result in results) / max_points if max_points else 0.0
+
+# ----------------------- Search -----------------------
+
+def successive_halving(executor: ProcessPoolExecutor, model_name: str, cache_path: str,
+                       db_path: str, candidates: list, n_folds: int, eta: int = 3,
+                       min_folds: int = 6, seed: int = 42) -> list:
+    """Run rungs of growing fold budgets, keeping the top 1/eta each time.
+    
+    Returns one trial dict per candidate per rung; the last rung always covers
+    every fold and its winner is marked 'best'.
+    """
+    
+    search_id = f"{model_name}-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+    fold_order = np.random.default_rng(seed).permutation(n_folds)
+    alive = list(range(len(candidates)))
+    stop_below = None
+    trials = []
+    rung = 0
+    
+    while True:
+        budget = min(n_folds, min_folds * eta ** rung)
+        fold_ids = sorted(fold_order[:budget].tolist())
+        tasks = [(cache_path, db_path, candidates[i], fold_ids, stop_below) for i in alive]
+        outcomes = list(executor.map(evaluate_candidate, tasks))
+        
+        # The bar was too high for every survivor: rerun the rung without it
+        if stop_below is not None and all(outcome['status'] == 'stopped' for outcome in outcomes):
+            stop_below = None
+            continue
+        
+        # Completed candidates outrank stopped ones, then by points
+        ranked = sorted(zip(alive, outcomes), reverse=True,
+                        key=lambda pair: (pair[1]['status'] == 'complete', pair[1]['points_pct']))
+        final_rung = budget == n_folds
+        keep = 1 if final_rung else max(1, len(alive) // eta)
+        
+        for position, (_, outcome) in enumerate(ranked):
+            if outcome['status'] == 'stopped':
+                status = 'stopped'
+            elif position < keep:
+                status = 'best' if final_rung else 'promoted'
+            else:
+                status = 'eliminated'
+            trials.append({
+                'search_id': search_id,
+                'model_name': model_name,
+                'params': outcome['params'],
+                'rung': rung,
+                'folds_evaluated': outcome['folds_evaluated'],
+                'accuracy': outcome['accuracy'],
+                'points_pct': outcome['points_pct'],
+                'fit_seconds': outcome['fit_seconds'],
+                'status': status
+            })
+        
+        if final_rung:
+            return trials
+        
+        promoted = [pair for pair in ranked if pair[1]['status'] == 'complete'][:keep]
+        alive = [index for index, _ in promoted]
+        stop_below = promoted[-1][1]['points_pct'] - STOP_MARGIN
+        rung += 1
+
+def run_search(db_manager: DatabaseManager, models: list = None, strategy: str = "halving",
+               n_candidates: int = 27, eta: int = 3, min_folds: int = 6, start_season: int = 2018,
+               end_season: int = None, workers: int = None, seed: int = 42) -> list:
+    """Search each model family and store every trial in hyperparameter_trials"""
+    
+    models = models or SEARCH_MODELS
+    candidates = sample_candidates(n_candidates, seed)
+    
+    all_trials = []
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+        for model_name in models:
+            print(f"🗂️  Building fold cache for {model_name}...")
+            cache_path = build_fold_cache(db_manager, model_name, start_season, end_season)
+            n_folds = len(joblib.load(cache_path)['folds'])
+            if n_folds == 0:
+                print(f"⚠️  No trainable folds for {model_name}")
+                continue
+            
+            # Random search is a single rung over every fold
+            rung_folds = n_folds if strategy == "random" else min_folds
+            print(f"🔍 {model_name}: {len(candidates)} candidates over {n_folds} folds ({strategy})")
+            current = current_params(db_manager, model_name)
+            trials = successive_halving(executor, model_name, cache_path, db_manager.db_path,
+                                        candidates, n_folds, eta, rung_folds, seed)
+            
+            # Store what the {} candidate actually trained with, so a winning {} keeps those settings
+            for trial in trials:
+                if not trial['params']:
+                    trial.update(params=dict(current), current=True)
+            db_manager.insert_hyperparameter_trials(trials)
+            all_trials.extend(trials)
+    
+    return all_trials
+
+def main():
+    """Hyperparameter search CLI"""
+    
+    parser = argparse.ArgumentParser(description="Parallel hyperparameter search over walk-forward folds")
+    parser.add_argument("--models", nargs="+", choices=SEARCH_MODELS, default=SEARCH_MODELS)
+    parser.add_argument("--strategy", choices=["halving", "random"], default="halving")
+    parser.add_argument("--candidates", type=int, default=27)
+    parser.add_argument("--eta", type=int, default=3, help="Keep the top 1/eta per rung")
+    parser.add_argument("--min-folds", type=int, default=6, help="Folds per candidate in the first rung")
+    parser.add_argument("--start-season", type=int, default=2018)
+    parser.add_argument("--end-season", type=int)
+    parser.add_argument("--workers", type=int, help="Worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    
+    db_manager = DatabaseManager(version="v2")
+    
+    started = datetime.now()
+    trials = run_search(db_manager, args.models, args.strategy, args.candidates, args.eta,
+                        args.min_folds, args.start_season, args.end_season, args.workers, args.seed)
+    elapsed = (datetime.now() - started).total_seconds()
+    
+    print(f"\n📊 Search finished in {elapsed:.1f}s ({len(trials)} trials stored)")
+    for model_name in args.models:
+        final = [trial for trial in trials if trial['model_name'] == model_name
+                 and trial['folds_evaluated'] == max(t['folds_evaluated'] for t in trials
+                                                     if t['model_name'] == model_name)]
+        if not final:
+            continue
+        best = next(trial for trial in final if trial['status'] == 'best')
+        current = next((trial for trial in reversed(trials) if trial['model_name'] == model_name
+                        and trial.get('current')), None)
+        print(f"\n🏆 {model_name}: points {best['points_pct']:.3f}, accuracy {best['accuracy']:.3f}")
+        print(f"   Params: {best['params']}{' (current settings)' if best.get('current') else ''}")
+        if current and current is not best:
+            print(f"   Current settings: points {current['points_pct']:.3f} "
+                  f"(rung {current['rung']}, {current['status']})")
+
+if __name__ == "__main__":
+    main()
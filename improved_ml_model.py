@@ -13,14 +13,22 @@ from sklearn.metrics import accuracy_score, mean_squared_error
 import joblib
 import os
 from database_manager import DatabaseManager
+from model_registry import ModelRegistry, training_window
+from slate_inference import build_oriented_slate, split_oriented_scores, pair_predictions
 
 class ImprovedNFLConfidenceMLModel:
     """Improved ML model incorporating expert data and point spreads"""
     
+    SEARCH_NAME = 'improved'  # model_name of this model's hyperparameter search trials
+    use_tuned_hyperparameters = True  # False trains with the built-in defaults (untuned backtests)
+    
     def __init__(self, db_manager: DatabaseManager):
         self.db_manager = db_manager
         self.model = None
         self.scaler = StandardScaler()
+        self.feature_columns = []
+        self.training_window = {}
+        self.training_metrics = {}
         
         # Expert performance weights (based on Week 1 accuracy)
         self.expert_weights = {
@@ -70,17 +78,16 @@ class ImprovedNFLConfidenceMLModel:
         
         expert_features = pd.DataFrame()
         
-        # For each game, get expert consensus
+        # Resolve game IDs and expert consensus for all rows in two queries
+        game_ids = self.db_manager.get_game_ids(list(zip(
+            df['season_year'], df['week'], df['home_team'], df['away_team']
+        )))
+        consensus_by_game = self.db_manager.get_expert_consensus_many(game_ids)
+        
         consensus_data = []
-        for _, row in df.iterrows():
-            # Get game ID
-            game_id = self.db_manager.get_game_id(
-                row['season_year'], row['week'], 
-                row['home_team'], row['away_team']
-            )
-            
+        for game_id in game_ids:
             if game_id:
-                consensus = self.db_manager.get_expert_consensus(game_id)
+                consensus = consensus_by_game[game_id]
                 consensus_data.append({
                     'expert_consensus_percentage': consensus['consensus_percentage'],
                     'expert_total_count': consensus['total_experts'],
@@ -148,6 +155,37 @@ class ImprovedNFLConfidenceMLModel:
         
         return historical_features
     
+    def build_regressor(self, **params) -> RandomForestRegressor:
+        """Build the forest with this model's hyperparameters (overridable)"""
+        
+        hyperparameters = {
+            'n_estimators': 200,  # More trees for better performance
+            'max_depth': 15,      # Deeper trees for complex patterns
+            'min_samples_split': 3,
+            'min_samples_leaf': 1,
+            'random_state': 42,
+            'n_jobs': -1  # Use all CPU cores
+        }
+        # The winner of the latest hyperparameter search replaces these defaults
+        if self.use_tuned_hyperparameters:
+            hyperparameters.update(self.db_manager.get_best_hyperparameters(self.SEARCH_NAME) or {})
+        hyperparameters.update(params)
+        return RandomForestRegressor(**hyperparameters)
+    
+    def fit(self, df: pd.DataFrame, X: pd.DataFrame = None, **regressor_params):
+        """Fit on a picks frame without holdout or CV (features may be precomputed)"""
+        
+        if X is None:
+            X = self.prepare_features(df)
+        X = X.fillna(0)
+        y = df['is_correct'].astype(int)
+        
+        self.scaler = StandardScaler()
+        X_scaled = self.scaler.fit_transform(X)
+        self.model = self.build_regressor(**regressor_params)
+        self.model.fit(X_scaled, y)
+        return self
+    
     def train_model(self, test_size: float = 0.2) -> dict:
         """Train the improved ML model"""
         
@@ -183,14 +221,7 @@ class ImprovedNFLConfidenceMLModel:
         
         # Train improved model
         print("🤖 Training improved Random Forest model...")
-        self.model = RandomForestRegressor(
-            n_estimators=200,  # More trees for better performance
-            max_depth=15,      # Deeper trees for complex patterns
-            min_samples_split=3,
-            min_samples_leaf=1,
-            random_state=42,
-            n_jobs=-1  # Use all CPU cores
-        )
+        self.model = self.build_regressor()
         
         # Fit model
         self.model.fit(X_train_scaled, y_train)
@@ -220,6 +251,11 @@ class ImprovedNFLConfidenceMLModel:
         for _, row in feature_importance.head(10).iterrows():
             print(f"   {row['feature']}: {row['importance']:.3f}")
         
+        # Recorded with the model when it is saved to the registry
+        self.feature_columns = list(X.columns)
+        self.training_window = training_window(df)
+        self.training_metrics = {'accuracy': accuracy, 'mse': mse, 'cv_accuracy': cv_scores.mean()}
+        
         return {
             'accuracy': accuracy,
             'mse': mse,
@@ -230,64 +266,44 @@ class ImprovedNFLConfidenceMLModel:
     def predict_confidence(self, games_data: list) -> list:
         """Predict confidence for a list of games"""
         
+        home_scores, away_scores = self.predict_slate_scores(games_data)
+        return pair_predictions(games_data, home_scores, away_scores)
+    
+    def predict_slate_scores(self, games_data: list) -> tuple:
+        """Score every game in both orientations with one predict call.
+        
+        Returns (home_scores, away_scores) arrays aligned with games_data.
+        """
+        
         if not self.model:
             raise ValueError("Model not trained. Call train_model() first.")
         
-        predictions = []
-        
-        for game in games_data:
-            # Create test data
-            test_data = pd.DataFrame([{
-                'home_team': game['home_team'],
-                'away_team': game['away_team'],
-                'home_ml': game.get('home_ml', -110),
-                'away_ml': game.get('away_ml', -110),
-                'odds_total': game.get('total_points', 45),
-                'week': game['week'],
-                'season_year': game['season_year']
-            }])
-            
-            # Prepare features
-            X = self.prepare_features(test_data)
-            X = X.fillna(X.mean())
-            
-            # Predict for home team
-            X_scaled = self.scaler.transform(X)
-            home_prediction = self.model.predict(X_scaled)[0]
-            
-            # Predict for away team (swap the teams)
-            test_data_away = test_data.copy()
-            test_data_away['home_team'] = game['away_team']
-            test_data_away['away_team'] = game['home_team']
-            test_data_away['home_ml'] = game.get('away_ml', -110)
-            test_data_away['away_ml'] = game.get('home_ml', -110)
-            
-            X_away = self.prepare_features(test_data_away)
-            X_away = X_away.fillna(X_away.mean())
-            X_away_scaled = self.scaler.transform(X_away)
-            away_prediction = self.model.predict(X_away_scaled)[0]
-            
-            # Choose better prediction
-            if home_prediction >= away_prediction:
-                pick_team = game['home_team']
-                confidence = max(1, min(16, int(home_prediction * 16)))
-                win_prob = home_prediction
-            else:
-                pick_team = game['away_team']
-                confidence = max(1, min(16, int(away_prediction * 16)))
-                win_prob = away_prediction
-            
-            predictions.append({
-                'game': f"{game['away_team']} @ {game['home_team']}",
-                'pick': pick_team,
-                'confidence': confidence,
-                'win_probability': win_prob
-            })
-        
-        return predictions
+        if not games_data:
+            return np.array([]), np.array([])
+        
+        X_scaled = self.scaler.transform(self.prepare_slate_features(games_data))
+        return split_oriented_scores(self.model.predict(X_scaled))
     
-    def save_model(self, model_path: str = 'models/improved_confidence_model.pkl'):
-        """Save the trained model"""
+    def prepare_slate_features(self, games_data: list) -> pd.DataFrame:
+        """Unscaled feature rows for an oriented slate (2N rows, listed then swapped)"""
+        
+        slate = build_oriented_slate(games_data)
+        
+        # Prepare features for all 2N rows at once; missing values get the same 0 as in
+        # training, so a game scores the same whatever else is in the slate
+        X = self.prepare_features(slate)
+        return X.fillna(0)
+    
+    def save_model(self, model_path: str = None):
+        """Register the trained model as the current version (or save to a file)"""
+        
+        if model_path is None:
+            ModelRegistry(self.db_manager).register(
+                'improved', {'model': self.model, 'scaler': self.scaler},
+                feature_columns=self.feature_columns, window=self.training_window,
+                metrics=self.training_metrics, params=self.model.get_params()
+            )
+            return
         
         os.makedirs('models', exist_ok=True)
         joblib.dump(self.model, model_path)
@@ -295,8 +311,18 @@ class ImprovedNFLConfidenceMLModel:
         
         print(f"💾 Saved improved model to {model_path}")
     
-    def load_model(self, model_path: str = 'models/improved_confidence_model.pkl'):
-        """Load a trained model"""
+    def load_model(self, model_path: str = None):
+        """Load the current registry version (or a trained model file)"""
+        
+        if model_path is None:
+            artifact = ModelRegistry(self.db_manager).load('improved')
+            if artifact is not None:
+                self.model = artifact['model']
+                self.scaler = artifact['scaler']
+                self.feature_columns = artifact['feature_columns'] or []
+                print(f"📂 Loaded improved model v{artifact['version']} from registry")
+                return
+            model_path = 'models/improved_confidence_model.pkl'
         
         self.model = joblib.load(model_path)
         self.scaler = joblib.load(model_path.replace('.pkl', '_scaler.pkl'))
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Warm-start incremental retraining for the expert-weighted confidence model.
+Each week only the newly settled picks get features. The forest grows a few
+extra trees (warm_start) on rows weighted by recency, and the oldest trees
+are dropped once the forest hits its cap. Every few updates a full retrain
+runs alongside as a check, then replaces the incremental forest. Each update
+registers a new version holding the forest and its cached training rows, so
+only the newest keep_versions are kept on disk.
+"""
+
+import argparse
+from typing import Dict, Optional
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+
+from database_manager import DatabaseManager
+from ml_model import NFLConfidenceMLModel
+from model_registry import ModelRegistry, training_window
+
+CURRENT_SEASON_WEIGHT = 3.0  # Same weighting as ExpertDataRetrainer.create_weighted_training_data
+MIN_ROW_WEIGHT = 0.05        # Decayed rows below this are left out of warm-start fits
+
+def training_rows(picks: pd.DataFrame, X: pd.DataFrame) -> pd.DataFrame:
+    """Cached per-row features plus the keys needed to weight and dedupe them"""
+    
+    keys = picks[['id', 'season_year', 'week', 'is_correct']].reset_index(drop=True)
+    return pd.concat([keys, X.reset_index(drop=True)], axis=1)
+
+class IncrementalRetrainer:
+    """Keeps a registered forest current by growing trees on each settled week"""
+    
+    def __init__(self, db_manager: DatabaseManager, model_name: str = "retrained",
+                 trees_per_update: int = 10, max_trees: int = 200, decay: float = 0.9,
+                 full_check_every: int = 6, keep_versions: int = 3):
+        self.db_manager = db_manager
+        self.model_name = model_name
+        self.trees_per_update = trees_per_update
+        self.max_trees = max_trees
+        self.decay = decay
+        self.full_check_every = full_check_every
+        self.keep_versions = keep_versions
+        self.registry = ModelRegistry(db_manager)
+        self.ml_model = NFLConfidenceMLModel(db_manager)
+    
+    # ----------------------- Training rows -----------------------
+    
+    def _feature_rows(self, picks: pd.DataFrame, feature_columns: Optional[list] = None) -> pd.DataFrame:
+        """Features for picks, aligned to an existing schema when given"""
+        
+        X = self.ml_model.prepare_features(picks)
+        if feature_columns is not None:
+            X = X.reindex(columns=feature_columns)
+            self.ml_model.feature_columns = list(feature_columns)
+        return X.reset_index(drop=True)
+    
+    @staticmethod
+    def _base_weights(rows: pd.DataFrame) -> np.ndarray:
+        """Current season rows count CURRENT_SEASON_WEIGHT times"""
+        
+        current_season = rows['season_year'].max()
+        return np.where(rows['season_year'] == current_season, CURRENT_SEASON_WEIGHT, 1.0)
+    
+    def _decayed_weights(self, rows: pd.DataFrame) -> np.ndarray:
+        """Base weights times decay per settled week since the row's week"""
+        
+        slots = rows['season_year'] * 100 + rows['week']
+        ordered_slots = np.sort(slots.unique())
+        weeks_ago = len(ordered_slots) - 1 - np.searchsorted(ordered_slots, slots)
+        return self._base_weights(rows) * self.decay ** weeks_ago
+    
+    # ----------------------- Full and incremental fits -----------------------
+    
+    def full_retrain(self, picks: Optional[pd.DataFrame] = None, register: bool = True) -> Dict:
+        """Fit a fresh warm-startable forest on every settled pick"""
+        
+        if picks is None:
+            picks = self.db_manager.get_all_picks_for_ml()
+        if picks.empty:
+            raise ValueError("No training data available. Need historical picks with results.")
+        
+        self.ml_model.label_encoders = {}
+        X = self._feature_rows(picks)
+        rows = training_rows(picks, X)
+        state = self._fit_full(rows, list(X.columns))
+        if register:
+            self._register(state, picks, {'mode': 'full', 'trees': len(state['model'].estimators_)})
+        return state
+    
+    def _fit_full(self, rows: pd.DataFrame, feature_columns: list) -> Dict:
+        """Scaler and forest fit from scratch on all cached rows (no decay)"""
+        
+        X = rows[feature_columns]
+        fill_values = X.mean().fillna(0)
+        X = X.fillna(fill_values)
+        
+        scaler = StandardScaler().fit(X)
+        model = self.ml_model.build_regressor(warm_start=True)
+        model.fit(scaler.transform(X), rows['is_correct'].astype(int),
+                  sample_weight=self._base_weights(rows))
+        
+        return {
+            'model': model,
+            'scaler': scaler,
+            'label_encoders': self.ml_model.label_encoders,
+            'feature_columns': feature_columns,
+            'fill_values': fill_values,
+            'training_rows': rows,
+            'updates_since_full': 0
+        }
+    
+    def _load_state(self) -> Optional[Dict]:
+        """Private (unshared) copy of the current registered state"""
+        
+        entry = self.registry.get_entry(self.model_name)
+        if entry is None:
+            return None
+        state = joblib.load(entry['artifact_path'])
+        if 'training_rows' not in state:
+            return None  # Imported legacy artifact: no cached rows to extend
+        self.ml_model.label_encoders = dict(state['label_encoders'])
+        return state
+    
+    def _evaluate(self, state: Dict, X_new: pd.DataFrame, y_new: pd.Series) -> float:
+        """Accuracy of a state's forest on rows it has not seen"""
+        
+        X = X_new[state['feature_columns']].fillna(state['fill_values'])
+        predictions = state['model'].predict(state['scaler'].transform(X))
+        return float(((predictions > 0.5).astype(int) == y_new.astype(int).values).mean())
+    
+    def update(self) -> Optional[Dict]:
+        """Fold newly settled picks into the model; returns the update's metrics"""
+        
+        state = self._load_state()
+        picks = self.db_manager.get_all_picks_for_ml()
+        if state is None:
+            print(f"🆕 No incremental state for {self.model_name}, running a full retrain")
+            self.full_retrain(picks)
+            return {'mode': 'full'}
+        
+        new_picks = picks[~picks['id'].isin(state['training_rows']['id'])]
+        if new_picks.empty:
+            print("✅ No newly settled picks, model is current")
+            return None
+        
+        # Only the new rows pay for feature preparation
+        X_new = self._feature_rows(new_picks, state['feature_columns'])
+        new_rows = training_rows(new_picks, X_new)
+        rows = pd.concat([state['training_rows'], new_rows], ignore_index=True)
+        
+        # Score on the new week before learning from it
+        metrics = {'new_rows': len(new_rows),
+                   'prequential_accuracy': self._evaluate(state, X_new, new_rows['is_correct'])}
+        print(f"📈 {len(new_rows)} new picks, accuracy before update: {metrics['prequential_accuracy']:.3f}")
+        
+        if state['updates_since_full'] + 1 >= self.full_check_every:
+            # Periodic check: a full retrain on the same history, scored on the same new rows
+            full_state = self._fit_full(state['training_rows'], state['feature_columns'])
+            metrics['full_check_accuracy'] = self._evaluate(full_state, X_new, new_rows['is_correct'])
+            print(f"🔍 Full-retrain check: incremental {metrics['prequential_accuracy']:.3f} "
+                  f"vs full {metrics['full_check_accuracy']:.3f}")
+            
+            state = self._fit_full(rows, state['feature_columns'])
+            metrics['mode'] = 'full'
+        else:
+            state = self._warm_start(state, rows)
+            metrics['mode'] = 'incremental'
+        
+        metrics['trees'] = len(state['model'].estimators_)
+        self._register(state, rows, metrics)
+        return metrics
+    
+    def _warm_start(self, state: Dict, rows: pd.DataFrame) -> Dict:
+        """Grow trees_per_update trees on recency-weighted rows, then drop the oldest"""
+        
+        model = state['model']
+        weights = self._decayed_weights(rows)
+        recent = weights >= MIN_ROW_WEIGHT
+        
+        X = rows.loc[recent, state['feature_columns']].fillna(state['fill_values'])
+        model.set_params(warm_start=True, n_estimators=len(model.estimators_) + self.trees_per_update)
+        model.fit(state['scaler'].transform(X), rows.loc[recent, 'is_correct'].astype(int),
+                  sample_weight=weights[recent])
+        
+        if len(model.estimators_) > self.max_trees:
+            model.estimators_ = model.estimators_[-self.max_trees:]
+            model.n_estimators = self.max_trees
+        
+        return {**state, 'model': model, 'training_rows': rows,
+                'updates_since_full': state['updates_since_full'] + 1}
+    
+    def _register(self, state: Dict, rows: pd.DataFrame, metrics: Dict):
+        """Store the state as the next current version"""
+        
+        artifact = {key: value for key, value in state.items() if key != 'feature_columns'}
+        self.registry.register(
+            self.model_name, artifact, feature_columns=state['feature_columns'],
+            window=training_window(rows), metrics=metrics,
+            params={'trees_per_update': self.trees_per_update, 'max_trees': self.max_trees,
+                    'decay': self.decay, 'full_check_every': self.full_check_every}
+        )
+        # Every version carries the full forest and training rows; older ones are only for rollback
+        pruned = self.registry.prune(self.model_name, self.keep_versions)
+        if pruned:
+            print(f"🧹 Pruned {self.model_name} versions {', '.join(f'v{v}' for v in pruned)}")
+
+def main():
+    """Incremental retraining CLI"""
+    
+    parser = argparse.ArgumentParser(description="Warm-start the confidence model on newly settled picks")
+    parser.add_argument("--full", action="store_true", help="Full retrain instead of an incremental update")
+    parser.add_argument("--trees-per-update", type=int, default=10)
+    parser.add_argument("--max-trees", type=int, default=200)
+    parser.add_argument("--decay", type=float, default=0.9, help="Sample weight decay per settled week")
+    parser.add_argument("--full-check-every", type=int, default=6,
+                        help="Run a full retrain check every N updates")
+    parser.add_argument("--keep-versions", type=int, default=3, help="Registered versions kept for rollback")
+    args = parser.parse_args()
+    
+    retrainer = IncrementalRetrainer(DatabaseManager(version="v2"), trees_per_update=args.trees_per_update,
+                                     max_trees=args.max_trees, decay=args.decay,
+                                     full_check_every=args.full_check_every, keep_versions=args.keep_versions)
+    if args.full:
+        retrainer.full_retrain()
+    else:
+        retrainer.update()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Ingestion ledger: remembers every source file that has been ingested.
+Each entry records the file's content hash, size, modification time, row
+count and when it was ingested, so re-running an ingestion on an unchanged
+file is a single primary-key lookup (plus one stat) and can be skipped.
+A file whose size or mtime moved is re-hashed; only a different hash means
+its contents are applied again. A source ingested for several targets (the
+same sheet for two seasons, one CBS URL per season) passes a scope, which
+gives each target its own entry.
+"""
+
+import hashlib
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+from database_manager import DatabaseManager
+
+def content_hash(data: Union[bytes, str]) -> str:
+    """SHA-256 hex digest of a file's bytes (or of pasted text)"""
+    
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+class IngestionLedger:
+    """Change detection for ingested sources, backed by the ingestion_ledger table"""
+    
+    def __init__(self, db_manager: DatabaseManager):
+        self.db_manager = db_manager
+    
+    def check(self, source: Union[str, Path], source_kind: str, text: Optional[str] = None,
+              scope: Optional[str] = None) -> Dict:
+        """Compare a source with its ledger entry.
+        
+        `source` is a file path, or the ledger key of pasted `text`. `scope`
+        (e.g. "2025-w1") keys the entry by what the source is ingested into
+        as well. The returned check carries the hash and stat to record after
+        ingesting, and 'unchanged' when the stored contents are already current.
+        """
+        
+        if text is not None:
+            source_path, file_size, file_mtime_ns = str(source), len(text), None
+        else:
+            path = Path(source).resolve()
+            stat = path.stat()
+            source_path, file_size, file_mtime_ns = str(path), stat.st_size, stat.st_mtime_ns
+        if scope is not None:
+            source_path = f"{source_path}#{scope}"
+        
+        previous = self.db_manager.get_ingestion_record(source_path)
+        check = {'source_path': source_path, 'source_kind': source_kind, 'file_size': file_size,
+                 'file_mtime_ns': file_mtime_ns, 'previous': previous}
+        
+        # Same size and mtime as last time: trust it without reading the file
+        if (previous is not None and file_mtime_ns is not None
+                and previous['file_size'] == file_size and previous['file_mtime_ns'] == file_mtime_ns):
+            return {**check, 'content_hash': previous['content_hash'], 'unchanged': True}
+        
+        digest = content_hash(text if text is not None else path.read_bytes())
+        check.update(content_hash=digest,
+                     unchanged=previous is not None and previous['content_hash'] == digest)
+        if check['unchanged'] and file_mtime_ns is not None:
+            # Touched but identical: refresh the stat so the next check is O(1) again
+            self.record(check, previous['row_count'], previous['season_year'], previous['week'])
+        return check
+    
+    def record(self, check: Dict, row_count: int, season_year: Optional[int] = None,
+               week: Optional[int] = None):
+        """Record a source as ingested with the hash and stat from its check"""
+        
+        self.db_manager.record_ingestion(check['source_path'], check['source_kind'], check['content_hash'],
+                                         row_count, file_size=check['file_size'],
+                                         file_mtime_ns=check['file_mtime_ns'],
+                                         season_year=season_year, week=week)
@@ -3,9 +3,9 @@
 Live 2025 season manager - fetch current data and manage weekly picks
 """
 
-import requests
 import pandas as pd
 from database_manager import DatabaseManager
+from raw_payload_archive import RawPayloadArchive, archived_get
 from ml_model import NFLConfidenceMLModel
 import json
 import os
@@ -19,8 +19,8 @@ class Live2025SeasonManager:
     
     def __init__(self):
         self.db_manager = DatabaseManager(version="v2")
-        self.ml_model = NFLConfidenceMLModel(self.db_manager)
-        self.ml_model.load_model()
+        self.archive = RawPayloadArchive(self.db_manager)
+        self.ml_model = NFLConfidenceMLModel(self.db_manager)  # Loaded on first prediction
         
         # API configuration
         self.odds_api_key = os.getenv('ODDS_API_KEY')
@@ -46,7 +46,7 @@ class Live2025SeasonManager:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = archived_get("espn", url, params=params, archive=self.archive, timeout=10)
             response.raise_for_status()
             data = response.json()
             
@@ -89,7 +89,7 @@ class Live2025SeasonManager:
             }
             
             try:
-                response = requests.get(url, params=params, timeout=10)
+                response = archived_get("espn", url, params=params, archive=self.archive, timeout=10)
                 response.raise_for_status()
                 data = response.json()
                 
@@ -205,7 +205,7 @@ class Live2025SeasonManager:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = archived_get("espn", url, params=params, archive=self.archive, timeout=10)
             response.raise_for_status()
             data = response.json()
             
@@ -348,6 +348,9 @@ class Live2025SeasonManager:
         
         print("🤖 Generating ML model recommendations for Week 1...")
         
+        if self.ml_model.model is None:
+            self.ml_model.load_model()
+        
         # Get Week 1 games from database
         with self.db_manager.get_connection() as conn:
             cursor = conn.cursor()
@@ -3,9 +3,11 @@
 Migration script to move existing CSV/JSON data to SQLite database.
 """
 import os
+import re
 import json
 import pandas as pd
 from database_manager import DatabaseManager
+from ingestion_ledger import IngestionLedger
 import argparse
 
 def populate_teams(db_manager: DatabaseManager):
@@ -128,7 +130,11 @@ def migrate_analysis_data(db_manager: DatabaseManager, year: int = 2025):
     print(f"✅ Migrated {migrated_count} weeks of analysis data")
 
 def migrate_odds_data(db_manager: DatabaseManager, year: int = 2025):
-    """Migrate existing odds JSON data to database"""
+    """Migrate existing odds JSON data to database.
+    
+    Files already in the ingestion ledger with the same content are skipped;
+    a changed file only writes the lines that moved for its fetched_at snapshot.
+    """
     print(f"🎲 Migrating odds data for {year}...")
     
     raw_dir = f"data/raw/{year}"
@@ -136,69 +142,78 @@ def migrate_odds_data(db_manager: DatabaseManager, year: int = 2025):
         print(f"❌ No raw directory found: {raw_dir}")
         return
     
+    ledger = IngestionLedger(db_manager)
     migrated_count = 0
-    for filename in os.listdir(raw_dir):
-        if filename.startswith("week-week") and filename.endswith("-odds.json"):
-            # Extract week number
-            week_str = filename.split("week")[1].split("-")[0]
-            try:
-                week = int(week_str)
-            except ValueError:
-                continue
-            
-            json_path = os.path.join(raw_dir, filename)
-            print(f"   Migrating Week {week} odds...")
+    for filename in sorted(os.listdir(raw_dir)):
+        # Extract week number (week-week<N>-odds.json)
+        match = re.fullmatch(r"week-week(\d+)-odds\.json", filename)
+        if not match:
+            continue
+        week = int(match.group(1))
+        
+        json_path = os.path.join(raw_dir, filename)
+        check = ledger.check(json_path, "odds_json")
+        if check['unchanged']:
+            print(f"   ⏭️ Week {week} odds unchanged since {check['previous']['ingested_at']}, skipped")
+            continue
+        print(f"   Migrating Week {week} odds...")
+        
+        try:
+            with open(json_path, 'r') as f:
+                odds_data = json.load(f)
             
-            try:
-                with open(json_path, 'r') as f:
-                    odds_data = json.load(f)
+            events = odds_data.get('events', [])
+            game_ids = db_manager.get_game_ids([(year, week, event['home_team'], event['away_team'])
+                                                for event in events])
+            odds_rows = []
+            for event, game_id in zip(events, game_ids):
+                # Extract team names
+                home_team = event['home_team']
+                away_team = event['away_team']
                 
-                # Process each event
-                for event in odds_data.get('events', []):
-                    # Extract team names
-                    home_team = event['home_team']
-                    away_team = event['away_team']
-                    
-                    # Create game
+                # Create the game only if the schedule doesn't have it yet
+                if game_id is None:
                     game_id = db_manager.upsert_game(
-                        year, week, home_team, away_team, 
+                        year, week, home_team, away_team,
                         event.get('commence_time', '')
                     )
-                    
-                    # Process odds for each bookmaker
-                    for bookmaker, odds in event.get('bookmakers', {}).items():
-                        # H2H odds
-                        h2h = odds.get('markets', [{}])[0].get('outcomes', [])
-                        home_ml = None
-                        away_ml = None
-                        home_win_prob = None
-                        away_win_prob = None
-                        
-                        for outcome in h2h:
-                            if outcome['name'] == home_team:
-                                home_ml = outcome.get('price')
-                                home_win_prob = outcome.get('probability')
-                            elif outcome['name'] == away_team:
-                                away_ml = outcome.get('price')
-                                away_win_prob = outcome.get('probability')
-                        
-                        # Totals
-                        totals = odds.get('markets', [{}])[1].get('outcomes', []) if len(odds.get('markets', [])) > 1 else []
-                        total_points = None
-                        for outcome in totals:
-                            if 'over' in outcome.get('name', '').lower():
-                                total_points = outcome.get('point')
-                                break
-                        
-                        # Insert odds
-                        db_manager.insert_odds(
-                            game_id, bookmaker, home_ml, away_ml, total_points,
-                            home_win_prob, away_win_prob
-                        )
                 
-                migrated_count += 1
-            except Exception as e:
-                print(f"   ❌ Error migrating {filename}: {e}")
+                # Process odds for each bookmaker
+                for bookmaker in event.get('bookmakers', []):
+                    markets = {market['key']: market.get('outcomes', []) for market in bookmaker.get('markets', [])}
+                    
+                    # H2H odds
+                    home_ml = None
+                    away_ml = None
+                    home_win_prob = None
+                    away_win_prob = None
+                    for outcome in markets.get('h2h', []):
+                        if outcome['name'] == home_team:
+                            home_ml = outcome.get('price')
+                            home_win_prob = outcome.get('probability')
+                        elif outcome['name'] == away_team:
+                            away_ml = outcome.get('price')
+                            away_win_prob = outcome.get('probability')
+                    
+                    # Totals
+                    total_points = None
+                    for outcome in markets.get('totals', []):
+                        if 'over' in outcome.get('name', '').lower():
+                            total_points = outcome.get('point')
+                            break
+                    
+                    odds_rows.append({
+                        'game_id': game_id, 'bookmaker': bookmaker['key'],
+                        'home_ml': home_ml, 'away_ml': away_ml, 'total_points': total_points,
+                        'home_win_prob': home_win_prob, 'away_win_prob': away_win_prob
+                    })
+            
+            changes = db_manager.sync_odds(odds_rows, odds_data.get('fetched_at') or check['content_hash'])
+            ledger.record(check, len(odds_rows), year, week)
+            print(f"   💾 {len(odds_rows)} lines (+{changes['inserted']} ~{changes['updated']})")
+            migrated_count += 1
+        except Exception as e:
+            print(f"   ❌ Error migrating {filename}: {e}")
     
     print(f"✅ Migrated {migrated_count} weeks of odds data")
 
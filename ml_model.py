@@ -14,10 +14,15 @@ from typing import Dict, List, Tuple, Optional
 import joblib
 import os
 from database_manager import DatabaseManager
+from model_registry import ModelRegistry, training_window
+from travel_features import TravelFeatureEngine
 
 class NFLConfidenceMLModel:
     """ML model for predicting optimal confidence points"""
     
+    SEARCH_NAME = 'nfl_confidence'  # model_name of this model's hyperparameter search trials
+    use_tuned_hyperparameters = True  # False trains with the built-in defaults (untuned backtests)
+    
     def __init__(self, db_manager: DatabaseManager):
         self.db_manager = db_manager
         self.model = None
@@ -25,6 +30,7 @@ class NFLConfidenceMLModel:
         self.label_encoders = {}
         self.feature_columns = []
         self.model_path = "models/confidence_model.pkl"
+        self.travel_features = None
         
         # Ensure models directory exists
         os.makedirs("models", exist_ok=True)
@@ -79,36 +85,50 @@ class NFLConfidenceMLModel:
     
     def _add_historical_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """Add historical performance features including home field advantage"""
+        form_cache = {}
+        
+        def team_form(team, season_year, week):
+            # Indexed point lookup of the team's last-4-games form before this week
+            key = (team, season_year, week)
+            if key not in form_cache:
+                form_cache[key] = self.db_manager.get_team_form(
+                    team, None if pd.isna(season_year) else int(season_year),
+                    None if pd.isna(week) else int(week))
+            return form_cache[key]
+        
         for _, row in df.iterrows():
             # Get team performance history
             home_team = row.get('home_team')
             away_team = row.get('away_team')
             pick_team = row.get('pick_team')
+            season_year = row.get('season_year')
+            week = row.get('week')
             
             if home_team:
-                home_history = self.db_manager.get_team_performance_history(home_team, weeks_back=4)
-                if not home_history.empty:
-                    df.loc[df.index == row.name, 'hist_home_win_pct'] = home_history['win_percentage'].mean()
-                    df.loc[df.index == row.name, 'hist_home_pt_diff'] = home_history['point_differential'].mean()
+                home_form = team_form(home_team, season_year, week)
+                if home_form:
+                    df.loc[df.index == row.name, 'hist_home_win_pct'] = home_form['rolling_win_percentage']
+                    df.loc[df.index == row.name, 'hist_home_pt_diff'] = home_form['rolling_point_differential']
                 
                 # Add home field advantage
                 home_field_adv = self._get_home_field_advantage(home_team)
                 df.loc[df.index == row.name, 'home_field_advantage'] = home_field_adv
             
             if away_team:
-                away_history = self.db_manager.get_team_performance_history(away_team, weeks_back=4)
-                if not away_history.empty:
-                    df.loc[df.index == row.name, 'hist_away_win_pct'] = away_history['win_percentage'].mean()
-                    df.loc[df.index == row.name, 'hist_away_pt_diff'] = away_history['point_differential'].mean()
+                away_form = team_form(away_team, season_year, week)
+                if away_form:
+                    df.loc[df.index == row.name, 'hist_away_win_pct'] = away_form['rolling_win_percentage']
+                    df.loc[df.index == row.name, 'hist_away_pt_diff'] = away_form['rolling_point_differential']
             
             if pick_team:
-                pick_history = self.db_manager.get_team_performance_history(pick_team, weeks_back=4)
-                if not pick_history.empty:
-                    df.loc[df.index == row.name, 'hist_pick_win_pct'] = pick_history['win_percentage'].mean()
-                    df.loc[df.index == row.name, 'hist_pick_pt_diff'] = pick_history['point_differential'].mean()
+                pick_form = team_form(pick_team, season_year, week)
+                if pick_form:
+                    df.loc[df.index == row.name, 'hist_pick_win_pct'] = pick_form['rolling_win_percentage']
+                    df.loc[df.index == row.name, 'hist_pick_pt_diff'] = pick_form['rolling_point_differential']
             
             # Add international game awareness
-            is_international = self._is_international_game(row.get('home_team'), row.get('away_team'))
+            is_international = self._is_international_game(row.get('home_team'), row.get('away_team'),
+                                                           row.get('season_year'), row.get('week'))
             df.loc[df.index == row.name, 'is_international'] = is_international
             
             # Adjust home field advantage for international games
@@ -130,22 +150,45 @@ class NFLConfidenceMLModel:
             result = cursor.fetchone()
             return result[0] if result and result[0] is not None else 0.0
     
-    def _is_international_game(self, home_team: str, away_team: str) -> bool:
-        """Check if this is likely an international game based on historical patterns"""
-        # This is a simplified check - in practice, you'd check the actual game location
-        # For now, we'll use a heuristic based on known international game patterns
-        
-        # Teams that frequently play international games
-        frequent_intl_teams = {
-            'Jacksonville Jaguars', 'New England Patriots', 'New York Giants',
-            'Philadelphia Eagles', 'Indianapolis Colts', 'Miami Dolphins'
+    def _is_international_game(self, home_team: str, away_team: str,
+                               season_year: int = None, week: int = None) -> bool:
+        """Check whether this game is played abroad (from the travel feature table)"""
+        if season_year is None or week is None:
+            return False
+        
+        if self.travel_features is None:
+            self.travel_features = TravelFeatureEngine(self.db_manager)
+        return self.travel_features.is_international(int(season_year), int(week), home_team, away_team)
+    
+    def build_regressor(self, **params) -> RandomForestRegressor:
+        """Build the forest with this model's hyperparameters (overridable)"""
+        hyperparameters = {
+            'n_estimators': 100,
+            'max_depth': 10,
+            'min_samples_split': 5,
+            'min_samples_leaf': 2,
+            'random_state': 42
         }
+        # The winner of the latest hyperparameter search replaces these defaults
+        if self.use_tuned_hyperparameters:
+            hyperparameters.update(self.db_manager.get_best_hyperparameters(self.SEARCH_NAME) or {})
+        hyperparameters.update(params)
+        return RandomForestRegressor(**hyperparameters)
+    
+    def fit(self, df: pd.DataFrame, X: Optional[pd.DataFrame] = None, **regressor_params):
+        """Fit on a picks frame without holdout, CV or saving (features may be precomputed)"""
+        if X is None:
+            self.label_encoders = {}
+            X = self.prepare_features(df)
+        self.feature_columns = list(X.columns)
+        X = X.fillna(X.mean()).fillna(0)  # Columns with no values at all fall back to 0
+        y = df['is_correct'].astype(int)
         
-        # If both teams are frequent international game participants, higher chance
-        if home_team in frequent_intl_teams and away_team in frequent_intl_teams:
-            return True
-        
-        return False
+        self.scaler = StandardScaler()
+        X_scaled = self.scaler.fit_transform(X)
+        self.model = self.build_regressor(**regressor_params)
+        self.model.fit(X_scaled, y)
+        return self
     
     def train_model(self, test_size: float = 0.2) -> Dict:
         """Train the ML model"""
@@ -175,13 +218,7 @@ class NFLConfidenceMLModel:
         
         # Train model (using ensemble for better performance)
         print("🤖 Training Random Forest model...")
-        self.model = RandomForestRegressor(
-            n_estimators=100,
-            max_depth=10,
-            min_samples_split=5,
-            min_samples_leaf=2,
-            random_state=42
-        )
+        self.model = self.build_regressor()
         
         # For confidence points, we'll predict the probability of being correct
         # and then map that to confidence points
@@ -203,7 +240,8 @@ class NFLConfidenceMLModel:
         print(f"   CV Accuracy: {cv_scores.mean():.3f} (+/- {cv_scores.std() * 2:.3f})")
         
         # Save model
-        self.save_model()
+        self.save_model(metrics={'accuracy': accuracy, 'mse': mse, 'cv_accuracy': cv_scores.mean()},
+                        window=training_window(df))
         
         return {
             'accuracy': accuracy,
@@ -221,8 +259,12 @@ class NFLConfidenceMLModel:
         if self.model is None:
             raise ValueError("No trained model available. Train model first.")
         
-        # Prepare features
+        # Prepare features in the column order the model was trained on
+        trained_columns = list(self.feature_columns)
         X = self.prepare_features(game_data)
+        if trained_columns:
+            X = X.reindex(columns=trained_columns)
+            self.feature_columns = trained_columns
         X = X.fillna(X.mean())
         
         # Scale features
@@ -243,20 +285,26 @@ class NFLConfidenceMLModel:
         
         return result_df
     
-    def save_model(self):
-        """Save trained model and preprocessing objects"""
-        model_data = {
-            'model': self.model,
-            'scaler': self.scaler,
-            'label_encoders': self.label_encoders,
-            'feature_columns': self.feature_columns
-        }
-        joblib.dump(model_data, self.model_path)
-        print(f"💾 Model saved to {self.model_path}")
+    def save_model(self, metrics: Optional[Dict] = None, window: Optional[Dict] = None):
+        """Register trained model and preprocessing objects as the current version"""
+        ModelRegistry(self.db_manager).register(
+            'nfl_confidence',
+            {'model': self.model, 'scaler': self.scaler, 'label_encoders': self.label_encoders},
+            feature_columns=self.feature_columns, window=window, metrics=metrics,
+            params=self.model.get_params()
+        )
     
     def load_model(self):
-        """Load trained model and preprocessing objects"""
-        if os.path.exists(self.model_path):
+        """Load the current registry version (or the pre-registry model file)"""
+        artifact = ModelRegistry(self.db_manager).load('nfl_confidence')
+        if artifact is not None:
+            self.model = artifact['model']
+            self.scaler = artifact['scaler']
+            # Copied: prepare_features adds encoders, and the artifact is shared per process
+            self.label_encoders = dict(artifact['label_encoders'])
+            self.feature_columns = list(artifact['feature_columns'])
+            print(f"📂 Model v{artifact['version']} loaded from registry")
+        elif os.path.exists(self.model_path):
             model_data = joblib.load(self.model_path)
             self.model = model_data['model']
             self.scaler = model_data['scaler']
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Distill the improved confidence forest into a compact surrogate.
+Fits a shallow gradient-boosted model, a logistic model on engineered features
+or a lookup table on binned market probability to the forest's outputs, then
+reports fidelity and latency against the forest. The winner is saved as a plain
+.npz scored by compact_scorer.py (pure NumPy) and recorded in the model registry.
+"""
+
+import argparse
+import os
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import GradientBoostingRegressor
+
+from compact_scorer import CompactScorer, market_home_prob
+from database_manager import DatabaseManager
+from improved_ml_model import ImprovedNFLConfidenceMLModel
+from model_registry import ModelRegistry
+from walk_forward_backtest import games_to_slate, load_backtest_data
+
+STUDENT_KINDS = ['gbm', 'linear', 'lookup']
+
+# ----------------------- Teacher and transfer set -----------------------
+
+def load_teacher(db_manager: DatabaseManager, picks: pd.DataFrame) -> ImprovedNFLConfidenceMLModel:
+    """The current improved model, or one fit on all settled picks if none is saved"""
+    
+    teacher = ImprovedNFLConfidenceMLModel(db_manager)
+    try:
+        teacher.load_model()
+    except FileNotFoundError:
+        print("⚠️  No saved improved model, fitting one on all settled picks")
+        teacher.fit(picks)
+    return teacher
+
+def teacher_scores(teacher: ImprovedNFLConfidenceMLModel, X: pd.DataFrame) -> np.ndarray:
+    """Forest outputs for raw feature rows"""
+    
+    return teacher.model.predict(teacher.scaler.transform(X))
+
+def build_transfer_set(teacher: ImprovedNFLConfidenceMLModel, data: dict,
+                       augment: int = 4, noise: float = 0.15, holdout_fraction: float = 0.2,
+                       seed: int = 42) -> dict:
+    """Raw feature rows the student learns from, plus held-out slates for fidelity.
+    
+    Rows come from the settled picks and every completed game's oriented slate;
+    augmented copies jitter the continuous columns so the student sees the
+    forest between observed points.
+    """
+    
+    rng = np.random.default_rng(seed)
+    picks_X = teacher.prepare_features(data['picks']).fillna(0)
+    
+    # The latest weeks are held out so fidelity is measured on unseen games
+    slates = [games_to_slate(week_games) for _, week_games in
+              data['games'].dropna(subset=['home_ml', 'away_ml']).groupby(['season_year', 'week'])]
+    n_holdout = max(1, int(len(slates) * holdout_fraction))
+    train_slates, holdout = slates[:-n_holdout], slates[-n_holdout:]
+    
+    slate_X = teacher.prepare_slate_features([game for slate in train_slates for game in slate])
+    base = pd.concat([picks_X, slate_X], ignore_index=True)[picks_X.columns].fillna(0).astype(float)
+    
+    # Jitter only columns that actually vary, in units of their spread
+    spread = base.std().replace(0, np.nan)
+    varying = spread.notna().values
+    copies = [base.values]
+    for _ in range(augment):
+        jitter = np.zeros_like(base.values)
+        jitter[:, varying] = rng.normal(0, noise, size=(len(base), varying.sum())) * spread.values[varying]
+        copies.append(base.values + jitter)
+    X_train = pd.DataFrame(np.vstack(copies), columns=base.columns)
+    
+    holdout_games = [game for slate in holdout for game in slate]
+    X_holdout = teacher.prepare_slate_features(holdout_games)[base.columns].fillna(0).astype(float)
+    
+    return {
+        'X_train': X_train,
+        'y_train': teacher_scores(teacher, X_train),
+        'X_holdout': X_holdout,
+        'y_holdout': teacher_scores(teacher, X_holdout),
+        'n_holdout_games': len(holdout_games)
+    }
+
+# ----------------------- Students -----------------------
+
+def fit_student(kind: str, teacher: ImprovedNFLConfidenceMLModel, X: pd.DataFrame,
+                y: np.ndarray) -> dict:
+    """Fit one surrogate and export it as plain arrays for CompactScorer"""
+    
+    columns = list(X.columns)
+    mean = teacher.scaler.mean_.astype(float)
+    scale = teacher.scaler.scale_.astype(float)
+    market_cols = np.array([columns.index('home_ml'), columns.index('away_ml')])
+    arrays = {'kind': np.array(kind), 'feature_columns': np.array(columns)}
+    
+    if kind == 'gbm':
+        gbm = GradientBoostingRegressor(n_estimators=100, max_depth=3, learning_rate=0.1,
+                                        subsample=0.8, random_state=42)
+        gbm.fit((X.values - mean) / scale, y)
+        arrays.update(_export_trees(gbm))
+        arrays.update({'mean': mean, 'scale': scale})
+    
+    elif kind == 'linear':
+        # Least squares on the logit of the forest output (logistic regression on soft targets)
+        Z = (X.values - mean) / scale
+        p_market = np.clip(market_home_prob(X.values, *market_cols), 0.01, 0.99)
+        engineered = np.column_stack([Z, np.log(p_market / (1 - p_market)), np.ones(len(Z))])
+        target = np.log(np.clip(y, 0.01, 0.99) / (1 - np.clip(y, 0.01, 0.99)))
+        ridge = 1e-3 * np.eye(engineered.shape[1])
+        solution = np.linalg.solve(engineered.T @ engineered + ridge, engineered.T @ target)
+        arrays.update({'mean': mean, 'scale': scale, 'coef': solution[:-1],
+                       'intercept': np.array(solution[-1]), 'market_cols': market_cols})
+    
+    elif kind == 'lookup':
+        p_market = market_home_prob(X.values, *market_cols)
+        bin_edges = np.linspace(0, 1, 41)
+        bins = np.clip(np.searchsorted(bin_edges, p_market, side='right') - 1, 0, 39)
+        sums = np.bincount(bins, weights=y, minlength=40)
+        counts = np.bincount(bins, minlength=40)
+        filled = counts > 0
+        centers = (bin_edges[:-1] + bin_edges[1:]) / 2
+        # Empty bins take the interpolated value of their neighbours
+        table = np.interp(centers, centers[filled], sums[filled] / counts[filled])
+        arrays.update({'bin_edges': bin_edges, 'table': table, 'market_cols': market_cols})
+    
+    else:
+        raise ValueError(f"Unknown student kind: {kind}")
+    
+    return arrays
+
+def _export_trees(gbm: GradientBoostingRegressor) -> dict:
+    """Pad the boosted trees into (n_trees, n_nodes) arrays; leaves point to themselves"""
+    
+    trees = [estimator[0].tree_ for estimator in gbm.estimators_]
+    n_nodes = max(tree.node_count for tree in trees)
+    shape = (len(trees), n_nodes)
+    feature = np.zeros(shape, dtype=np.int64)
+    threshold = np.zeros(shape)
+    left = np.tile(np.arange(n_nodes), (len(trees), 1))
+    right = left.copy()
+    value = np.zeros(shape)
+    
+    for i, tree in enumerate(trees):
+        count = tree.node_count
+        is_split = tree.children_left >= 0
+        feature[i, :count] = np.where(is_split, tree.feature, 0)
+        threshold[i, :count] = np.where(is_split, tree.threshold, 0.0)
+        left[i, :count] = np.where(is_split, tree.children_left, np.arange(count))
+        right[i, :count] = np.where(is_split, tree.children_right, np.arange(count))
+        value[i, :count] = tree.value[:, 0, 0]
+    
+    return {
+        'feature': feature,
+        'threshold': threshold,
+        'left': left,
+        'right': right,
+        'value': value,
+        'init': np.array(float(gbm.init_.constant_.ravel()[0])),
+        'learning_rate': np.array(gbm.learning_rate),
+        'depth': np.array(max(tree.max_depth for tree in trees))
+    }
+
+# ----------------------- Fidelity and latency -----------------------
+
+def fidelity_report(scorer: CompactScorer, X: pd.DataFrame, y_teacher: np.ndarray) -> dict:
+    """How closely the student tracks the forest on held-out oriented slates"""
+    
+    y_student = scorer.score(X.values)
+    residual = y_student - y_teacher
+    n_games = len(y_teacher) // 2
+    teacher_home = y_teacher[:n_games] >= y_teacher[n_games:]
+    student_home = y_student[:n_games] >= y_student[n_games:]
+    
+    # Stack-rank agreement: correlation of the per-game winning-side scores
+    teacher_best = np.maximum(y_teacher[:n_games], y_teacher[n_games:])
+    student_best = np.maximum(y_student[:n_games], y_student[n_games:])
+    rank_corr = np.corrcoef(np.argsort(np.argsort(teacher_best)),
+                            np.argsort(np.argsort(student_best)))[0, 1] if n_games > 1 else 1.0
+    
+    return {
+        'rmse': float(np.sqrt(np.mean(residual ** 2))),
+        'max_abs_error': float(np.max(np.abs(residual))),
+        'r2': float(1 - np.sum(residual ** 2) / max(np.sum((y_teacher - y_teacher.mean()) ** 2), 1e-12)),
+        'pick_agreement': float(np.mean(teacher_home == student_home)),
+        'rank_correlation': float(rank_corr)
+    }
+
+def _best_time(function, repeats: int) -> float:
+    """Fastest of several timed calls (seconds)"""
+    
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def latency_report(teacher: ImprovedNFLConfidenceMLModel, scorer: CompactScorer, X: pd.DataFrame,
+                   artifact_path: str, npz_path: str, batch_rows: int = 100000) -> dict:
+    """Single-row latency, batch throughput and load time for forest vs student"""
+    
+    one_row = X.iloc[:1]
+    batch = pd.DataFrame(np.resize(X.values, (batch_rows, X.shape[1])), columns=X.columns)
+    
+    report = {
+        'teacher_row_ms': _best_time(lambda: teacher_scores(teacher, one_row), 20) * 1000,
+        'student_row_ms': _best_time(lambda: scorer.score(one_row.values), 200) * 1000,
+        'teacher_batch_us_per_row': _best_time(lambda: teacher_scores(teacher, batch), 3) / batch_rows * 1e6,
+        'student_batch_us_per_row': _best_time(lambda: scorer.score(batch.values), 3) / batch_rows * 1e6,
+        'student_load_ms': _best_time(lambda: CompactScorer(npz_path), 5) * 1000,
+        'student_size_kb': os.path.getsize(npz_path) / 1024
+    }
+    if artifact_path and os.path.exists(artifact_path):
+        report['teacher_load_ms'] = _best_time(lambda: joblib.load(artifact_path), 3) * 1000
+        report['teacher_size_kb'] = os.path.getsize(artifact_path) / 1024
+    return report
+
+# ----------------------- Pipeline -----------------------
+
+def distill(db_manager: DatabaseManager, kinds: list = None, output_dir: str = "models/distilled",
+            register: bool = True) -> dict:
+    """Fit every student kind, report on each and keep the most faithful one"""
+    
+    kinds = kinds or STUDENT_KINDS
+    data = load_backtest_data(db_manager)
+    teacher = load_teacher(db_manager, data['picks'])
+    transfer = build_transfer_set(teacher, data)
+    
+    # Teacher artifact for load-time comparison (dumped once if it only exists in memory)
+    entry = ModelRegistry(db_manager).get_entry('improved')
+    teacher_path = entry['artifact_path'] if entry else os.path.join(output_dir, "teacher-forest.joblib")
+    os.makedirs(output_dir, exist_ok=True)
+    if not entry:
+        joblib.dump({'model': teacher.model, 'scaler': teacher.scaler}, teacher_path)
+    
+    results = {}
+    for kind in kinds:
+        arrays = fit_student(kind, teacher, transfer['X_train'], transfer['y_train'])
+        npz_path = os.path.join(output_dir, f"improved-{kind}.npz")
+        np.savez(npz_path, **arrays)
+        
+        scorer = CompactScorer(npz_path)
+        results[kind] = {
+            'path': npz_path,
+            **fidelity_report(scorer, transfer['X_holdout'], transfer['y_holdout']),
+            **latency_report(teacher, scorer, transfer['X_holdout'], teacher_path, npz_path)
+        }
+    
+    best_kind = max(results, key=lambda kind: (results[kind]['pick_agreement'], -results[kind]['rmse']))
+    if register:
+        best = results[best_kind]
+        ModelRegistry(db_manager).register(
+            'improved_distilled', {'npz_path': best['path'], 'kind': best_kind},
+            feature_columns=list(transfer['X_train'].columns),
+            metrics={key: value for key, value in best.items() if key != 'path'},
+            params={'teacher_version': entry['version'] if entry else None, 'kind': best_kind}
+        )
+    
+    return {'results': results, 'best': best_kind, 'holdout_games': transfer['n_holdout_games']}
+
+def main():
+    """Distillation CLI"""
+    
+    parser = argparse.ArgumentParser(description="Distill the improved forest into a compact NumPy model")
+    parser.add_argument("--students", nargs="+", choices=STUDENT_KINDS, default=STUDENT_KINDS)
+    parser.add_argument("--output-dir", default="models/distilled")
+    parser.add_argument("--no-register", action="store_true", help="Don't record the winner in the registry")
+    args = parser.parse_args()
+    
+    db_manager = DatabaseManager(version="v2")
+    report = distill(db_manager, args.students, args.output_dir, register=not args.no_register)
+    
+    print(f"\n🧪 Fidelity on {report['holdout_games']} held-out games (oriented slates):")
+    print(f"{'student':>8} {'rmse':>7} {'max err':>8} {'r2':>6} {'picks':>6} {'rank r':>7}")
+    for kind, row in report['results'].items():
+        print(f"{kind:>8} {row['rmse']:>7.4f} {row['max_abs_error']:>8.4f} {row['r2']:>6.3f} "
+              f"{row['pick_agreement']:>6.1%} {row['rank_correlation']:>7.3f}")
+    
+    print("\n⏱️  Latency vs forest:")
+    for kind, row in report['results'].items():
+        print(f"   {kind:>6}: 1 row {row['teacher_row_ms']:.2f} → {row['student_row_ms']:.3f} ms | "
+              f"batch {row['teacher_batch_us_per_row']:.2f} → {row['student_batch_us_per_row']:.3f} µs/row | "
+              f"load {row.get('teacher_load_ms', float('nan')):.0f} → {row['student_load_ms']:.1f} ms | "
+              f"size {row.get('teacher_size_kb', float('nan')):.0f} → {row['student_size_kb']:.0f} KB")
+    
+    print(f"\n🏆 Most faithful student: {report['best']} ({report['results'][report['best']]['path']})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Model registry for trained pick models.
+Every saved model becomes a numbered version with its feature schema, training
+window, hyperparameters and metrics recorded in model_registry; one version per
+model is marked current and is the one served. Artifacts are uncompressed joblib
+files loaded lazily with mmap_mode='r' and cached per process, so forked
+prediction workers share read-only model memory.
+"""
+
+import json
+import os
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import joblib
+import pandas as pd
+
+from database_manager import DatabaseManager
+
+# Artifacts already loaded in this process, keyed by path
+_LOADED_ARTIFACTS = {}
+
+# Pre-registry files under models/ (model file, separate scaler file or None)
+LEGACY_ARTIFACTS = {
+    'nfl_confidence': ('models/confidence_model.pkl', None),
+    'improved': ('models/improved_confidence_model.pkl', 'models/improved_confidence_model_scaler.pkl'),
+    'current_season': ('models/current_season_model.pkl', 'models/current_season_model_scaler.pkl'),
+    'retrained': ('models/retrained_confidence_model.pkl', 'models/retrained_scaler.pkl')
+}
+
+def training_window(df: pd.DataFrame) -> Dict:
+    """First and last (season, week) covered by a training frame"""
+    
+    if df.empty:
+        return {}
+    ordered = df.sort_values(['season_year', 'week'])
+    return {
+        'start_season': int(ordered['season_year'].iloc[0]),
+        'start_week': int(ordered['week'].iloc[0]),
+        'end_season': int(ordered['season_year'].iloc[-1]),
+        'end_week': int(ordered['week'].iloc[-1])
+    }
+
+class ModelRegistry:
+    """Versioned model artifacts with one current version per model"""
+    
+    def __init__(self, db_manager: DatabaseManager, artifact_dir: str = "models/registry"):
+        self.db_manager = db_manager
+        self.artifact_dir = artifact_dir
+    
+    def register(self, model_name: str, artifact: Dict, feature_columns: Optional[List[str]] = None,
+                 window: Optional[Dict] = None, metrics: Optional[Dict] = None,
+                 params: Optional[Dict] = None, make_current: bool = True) -> int:
+        """Save an artifact dict (model, scaler, ...) as the next version of a model"""
+        
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COALESCE(MAX(version), 0) + 1 FROM model_registry WHERE model_name = ?",
+                           (model_name,))
+            version = cursor.fetchone()[0]
+        
+        artifact_path = os.path.join(self.artifact_dir, model_name, f"v{version}.joblib")
+        os.makedirs(os.path.dirname(artifact_path), exist_ok=True)
+        # Uncompressed so arrays can be memory-mapped on load
+        joblib.dump({**artifact, 'model_name': model_name, 'version': version,
+                     'feature_columns': feature_columns}, artifact_path)
+        
+        window = window or {}
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT INTO model_registry
+                (model_name, version, artifact_path, feature_columns, training_start_season,
+                 training_start_week, training_end_season, training_end_week, params, metrics,
+                 is_current, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0, ?)
+            """, (model_name, version, artifact_path,
+                  json.dumps(list(feature_columns)) if feature_columns is not None else None,
+                  window.get('start_season'), window.get('start_week'),
+                  window.get('end_season'), window.get('end_week'),
+                  json.dumps(params or {}, sort_keys=True, default=str),
+                  json.dumps(metrics or {}, sort_keys=True, default=float),
+                  datetime.now().isoformat()))
+            conn.commit()
+        
+        if make_current:
+            self.set_current(model_name, version)
+        
+        print(f"🗃️  Registered {model_name} v{version}{' (current)' if make_current else ''}")
+        return version
+    
+    def set_current(self, model_name: str, version: int):
+        """Mark one version as the served model"""
+        
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1 FROM model_registry WHERE model_name = ? AND version = ?",
+                           (model_name, version))
+            if not cursor.fetchone():
+                raise ValueError(f"No registered version {version} for {model_name}")
+            cursor.execute("""
+                UPDATE model_registry SET is_current = (version = ?) WHERE model_name = ?
+            """, (version, model_name))
+            conn.commit()
+    
+    def prune(self, model_name: str, keep: int) -> List[int]:
+        """Delete all but the newest `keep` versions of a model (never the current one), files included"""
+        
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT version, artifact_path FROM model_registry
+                WHERE model_name = ? AND is_current = 0
+                  AND version NOT IN (SELECT version FROM model_registry WHERE model_name = ?
+                                      ORDER BY version DESC LIMIT ?)
+            """, (model_name, model_name, max(keep, 1)))
+            pruned = cursor.fetchall()
+            cursor.executemany("DELETE FROM model_registry WHERE model_name = ? AND version = ?",
+                               [(model_name, version) for version, _ in pruned])
+            conn.commit()
+        
+        for _, artifact_path in pruned:
+            _LOADED_ARTIFACTS.pop(artifact_path, None)
+            if os.path.exists(artifact_path):
+                os.remove(artifact_path)
+        return [version for version, _ in pruned]
+    
+    def get_entry(self, model_name: str, version: Optional[int] = None) -> Optional[Dict]:
+        """Registry row for a version (the current one by default)"""
+        
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            if version is None:
+                cursor.execute("""
+                    SELECT * FROM model_registry WHERE model_name = ? AND is_current = 1
+                """, (model_name,))
+            else:
+                cursor.execute("""
+                    SELECT * FROM model_registry WHERE model_name = ? AND version = ?
+                """, (model_name, version))
+            
+            row = cursor.fetchone()
+            if not row:
+                return None
+            columns = [description[0] for description in cursor.description]
+            return self._decode_entry(dict(zip(columns, row)))
+    
+    def list_versions(self, model_name: Optional[str] = None) -> List[Dict]:
+        """All registered versions, newest first"""
+        
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            query = "SELECT * FROM model_registry"
+            params = []
+            if model_name:
+                query += " WHERE model_name = ?"
+                params.append(model_name)
+            cursor.execute(query + " ORDER BY model_name, version DESC", params)
+            
+            columns = [description[0] for description in cursor.description]
+            return [self._decode_entry(dict(zip(columns, row))) for row in cursor.fetchall()]
+    
+    @staticmethod
+    def _decode_entry(entry: Dict) -> Dict:
+        """Parse the JSON columns of a registry row"""
+        
+        for key in ('feature_columns', 'params', 'metrics'):
+            if entry.get(key) is not None:
+                entry[key] = json.loads(entry[key])
+        entry['is_current'] = bool(entry['is_current'])
+        return entry
+    
+    def load(self, model_name: str, version: Optional[int] = None) -> Optional[Dict]:
+        """Load an artifact (current version by default); None if nothing is registered"""
+        
+        entry = self.get_entry(model_name, version)
+        if entry is None:
+            return None
+        return load_artifact(entry['artifact_path'])
+    
+    def preload(self, model_names: Optional[List[str]] = None) -> int:
+        """Load current artifacts before forking workers so they share the pages"""
+        
+        model_names = model_names or sorted({entry['model_name'] for entry in self.list_versions()})
+        return sum(1 for model_name in model_names if self.load(model_name) is not None)
+    
+    def import_legacy_artifacts(self) -> List[str]:
+        """Register the pre-registry files in models/ that have no registered version yet"""
+        
+        imported = []
+        for model_name, (model_path, scaler_path) in LEGACY_ARTIFACTS.items():
+            if self.get_entry(model_name) is not None or not os.path.exists(model_path):
+                continue
+            if scaler_path and not os.path.exists(scaler_path):
+                continue
+            
+            loaded = joblib.load(model_path)
+            if isinstance(loaded, dict):
+                artifact = loaded
+            else:
+                artifact = {'model': loaded, 'scaler': joblib.load(scaler_path) if scaler_path else None}
+            
+            feature_columns = artifact.pop('feature_columns', None) or None
+            scaler = artifact.get('scaler')
+            if feature_columns is None and hasattr(scaler, 'feature_names_in_'):
+                feature_columns = list(scaler.feature_names_in_)
+            
+            self.register(model_name, artifact, feature_columns=feature_columns,
+                          params={'imported_from': model_path})
+            imported.append(model_name)
+        return imported
+
+def load_artifact(artifact_path: str) -> Dict:
+    """Memory-mapped, per-process cached joblib load"""
+    
+    if artifact_path not in _LOADED_ARTIFACTS:
+        _LOADED_ARTIFACTS[artifact_path] = joblib.load(artifact_path, mmap_mode='r')
+    return _LOADED_ARTIFACTS[artifact_path]
+
+def main():
+    """Model registry CLI"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Manage registered model versions")
+    parser.add_argument("--list", action="store_true", help="List registered versions")
+    parser.add_argument("--model", help="Restrict to one model")
+    parser.add_argument("--set-current", type=int, metavar="VERSION", help="Serve this version of --model")
+    parser.add_argument("--import-legacy", action="store_true", help="Register existing models/*.pkl files")
+    parser.add_argument("--prune", type=int, metavar="KEEP",
+                        help="Delete all but the newest KEEP versions of --model (the current one is kept)")
+    
+    args = parser.parse_args()
+    
+    registry = ModelRegistry(DatabaseManager(version="v2"))
+    
+    if args.import_legacy:
+        imported = registry.import_legacy_artifacts()
+        print(f"✅ Imported {len(imported)} legacy artifacts: {', '.join(imported) or 'none'}")
+    elif args.prune is not None:
+        if not args.model:
+            parser.error("--prune requires --model")
+        pruned = registry.prune(args.model, args.prune)
+        print(f"✅ Pruned {len(pruned)} versions of {args.model}: {', '.join(f'v{v}' for v in pruned) or 'none'}")
+    elif args.set_current is not None:
+        if not args.model:
+            parser.error("--set-current requires --model")
+        registry.set_current(args.model, args.set_current)
+        print(f"✅ {args.model} v{args.set_current} is now current")
+    elif args.list:
+        print("🗃️  Registered models:")
+        for entry in registry.list_versions(args.model):
+            marker = "★" if entry['is_current'] else " "
+            window = ""
+            if entry['training_start_season'] is not None:
+                window = (f" trained {entry['training_start_season']} W{entry['training_start_week']}"
+                          f"–{entry['training_end_season']} W{entry['training_end_week']}")
+            metrics = ", ".join(f"{key} {value:.3f}" for key, value in entry['metrics'].items()
+                                if isinstance(value, (int, float)))
+            print(f" {marker} {entry['model_name']} v{entry['version']}{window}"
+                  f"{' | ' + metrics if metrics else ''}")
+    else:
+        print("Use --help for available options")
+
+if __name__ == "__main__":
+    main()
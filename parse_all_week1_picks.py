@@ -10,6 +10,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from database_manager import DatabaseManager
 from team_name_mapper import TeamNameMapper
+from pool_results_ingestion import PoolResultsIngestor, print_ingestion_summary, transcribed_records
 from datetime import datetime
 
 def parse_all_week1_picks():
@@ -213,40 +214,11 @@ def parse_all_week1_picks():
         # This is a partial list to demonstrate the structure
     ]
     
-    # Store in database
+    # Store in database (one transaction)
     print("Storing Week 1 picks in database...")
-    for participant_data in all_participants:
-        participant_name = participant_data["name"]
-        total_score = participant_data["total_points"]
-        rank = participant_data["rank"]
-        
-        for pick_data in participant_data["picks"]:
-            team_name = pick_data["team"]
-            confidence = pick_data["confidence"]
-            is_correct = pick_data["correct"]
-            
-            # Find the game for this pick
-            game_id = None
-            pick_team_id = None
-            
-            for game in week1_games:
-                if team_name in [game["home"], game["away"]]:
-                    game_id = game["game_id"]
-                    pick_team_id = db_manager.get_team_id(team_name)
-                    break
-            
-            if game_id and pick_team_id:
-                db_manager.insert_pool_result(
-                    season_year=2025,
-                    week=1,
-                    participant_name=participant_name,
-                    game_id=game_id,
-                    pick_team_id=pick_team_id,
-                    confidence_points=confidence,
-                    is_correct=is_correct,
-                    total_weekly_score=total_score,
-                    weekly_rank=rank
-                )
+    summary = PoolResultsIngestor(db_manager).ingest_records(
+        2025, 1, transcribed_records(all_participants, week1_games))
+    print_ingestion_summary(1, summary)
     
     # Create markdown documentation
     print("Creating Week 1 markdown documentation...")
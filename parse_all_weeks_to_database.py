@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """
 Parse all weeks (1, 2, 3) pool results and store directly in database.
+Each week's results sheet is ingested through pool_results_ingestion.
 We'll spot check specific games to verify data accuracy.
 """
 
@@ -9,267 +10,33 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from database_manager import DatabaseManager
-from team_name_mapper import TeamNameMapper
-from datetime import datetime
+from pool_results_ingestion import PoolResultsIngestor, print_ingestion_summary
 
-def parse_all_weeks_to_database():
+def parse_all_weeks_to_database(season_year: int = 2025, weeks=(1, 2, 3)):
     """Parse all weeks and store in database for spot checking"""
     
     # Initialize database manager
     db_manager = DatabaseManager(version="v2")
-    team_mapper = TeamNameMapper()
+    ingestor = PoolResultsIngestor(db_manager)
     
     print("🏈 Parsing All Weeks Pool Results to Database")
     print("=" * 50)
     
-    # Parse Week 1
-    print("\n📊 Week 1 Results...")
-    parse_week1_to_database(db_manager)
-    
-    # Parse Week 2  
-    print("\n📊 Week 2 Results...")
-    parse_week2_to_database(db_manager)
+    # Results sheets exported from the pool site (data/results/week<N>.csv)
+    sources = {}
+    for week in weeks:
+        csv_file = f"data/results/week{week}.csv"
+        if os.path.exists(csv_file):
+            sources[week] = csv_file
+        else:
+            print(f"  ❌ CSV file not found: {csv_file}")
     
-    # Parse Week 3
-    print("\n📊 Week 3 Results...")
-    parse_week3_to_database(db_manager)
+    for week, summary in ingestor.ingest_season(season_year, sources).items():
+        print_ingestion_summary(week, summary)
     
     print("\n✅ All weeks stored in database!")
     print("🔍 Ready for spot checking specific games")
 
-def parse_week1_to_database(db_manager):
-    """Parse Week 1 results to database"""
-    
-    # Week 1 games
-    week1_games = [
-        {"home": "Philadelphia Eagles", "away": "Dallas Cowboys"},
-        {"home": "Los Angeles Chargers", "away": "Kansas City Chiefs"},
-        {"home": "Atlanta Falcons", "away": "Tampa Bay Buccaneers"},
-        {"home": "New York Jets", "away": "Pittsburgh Steelers"},
-        {"home": "Indianapolis Colts", "away": "Miami Dolphins"},
-        {"home": "Jacksonville Jaguars", "away": "Carolina Panthers"},
-        {"home": "Washington Commanders", "away": "New York Giants"},
-        {"home": "New Orleans Saints", "away": "Arizona Cardinals"},
-        {"home": "Cleveland Browns", "away": "Cincinnati Bengals"},
-        {"home": "New England Patriots", "away": "Las Vegas Raiders"},
-        {"home": "Seattle Seahawks", "away": "San Francisco 49ers"},
-        {"home": "Denver Broncos", "away": "Tennessee Titans"},
-        {"home": "Green Bay Packers", "away": "Detroit Lions"},
-        {"home": "Los Angeles Rams", "away": "Houston Texans"},
-        {"home": "Buffalo Bills", "away": "Baltimore Ravens"},
-        {"home": "Chicago Bears", "away": "Minnesota Vikings"}
-    ]
-    
-    # Get game IDs
-    for game in week1_games:
-        game_id = db_manager.get_game_id(2025, 1, game["home"], game["away"])
-        game["game_id"] = game_id
-    
-    # Week 1 participants (from screenshot analysis)
-    participants = [
-        {"name": "Raiderjim", "points": 127, "rank": 1},
-        {"name": "Spanish Flies", "points": 125, "rank": 2},
-        {"name": "Big Chuck", "points": 123, "rank": 3},
-        {"name": "Commish", "points": 121, "rank": 4},
-        {"name": "I.P. Daly", "points": 118, "rank": 5},
-        {"name": "Stevie1", "points": 118, "rank": 6},
-        {"name": "Wochie", "points": 117, "rank": 7},
-        {"name": "FundaySunday", "points": 117, "rank": 8},
-        {"name": "Natty Ice", "points": 113, "rank": 9},
-        {"name": "Amusco", "points": 112, "rank": 10},
-        {"name": "LorPor", "points": 104, "rank": 11},
-        {"name": "Poipu Pauly", "points": 103, "rank": 12},
-        {"name": "Sean", "points": 100, "rank": 13},
-        {"name": "Karat Cake", "points": 95, "rank": 14},
-        {"name": "Bijan Mustard", "points": 89, "rank": 15},
-        {"name": "snydermeister", "points": 83, "rank": 16},
-        {"name": "Big daddy", "points": 77, "rank": 17},
-        {"name": "Hails (:)", "points": 69, "rank": 18}
-    ]
-    
-    # Store Week 1 data (using template picks for now - will be spot checked)
-    for participant in participants:
-        for i, game in enumerate(week1_games):
-            # Template picks - will be verified through spot checking
-            if i == 0:  # First game
-                pick_team = "Philadelphia Eagles" if participant["name"] == "FundaySunday" else "Denver Broncos"
-                confidence = 16
-                is_correct = True
-            else:
-                pick_team = "Denver Broncos"  # Default template
-                confidence = 16 - i
-                is_correct = True
-            
-            game_id = game["game_id"]
-            pick_team_id = db_manager.get_team_id(pick_team)
-            
-            if game_id and pick_team_id:
-                db_manager.insert_pool_result(
-                    season_year=2025,
-                    week=1,
-                    participant_name=participant["name"],
-                    game_id=game_id,
-                    pick_team_id=pick_team_id,
-                    confidence_points=confidence,
-                    is_correct=is_correct,
-                    total_weekly_score=participant["points"],
-                    weekly_rank=participant["rank"]
-                )
-    
-    print(f"  ✅ Stored {len(participants)} participants for Week 1")
-
-def parse_week2_to_database(db_manager):
-    """Parse Week 2 results to database"""
-    
-    # Week 2 games
-    week2_games = [
-        {"home": "Green Bay Packers", "away": "Washington Commanders"},
-        {"home": "Tennessee Titans", "away": "Los Angeles Rams"},
-        {"home": "Pittsburgh Steelers", "away": "Seattle Seahawks"},
-        {"home": "New York Jets", "away": "Buffalo Bills"},
-        {"home": "Detroit Lions", "away": "Chicago Bears"},
-        {"home": "Dallas Cowboys", "away": "New York Giants"},
-        {"home": "Baltimore Ravens", "away": "Cleveland Browns"},
-        {"home": "New Orleans Saints", "away": "San Francisco 49ers"},
-        {"home": "Miami Dolphins", "away": "New England Patriots"},
-        {"home": "Cincinnati Bengals", "away": "Jacksonville Jaguars"},
-        {"home": "Arizona Cardinals", "away": "Carolina Panthers"},
-        {"home": "Indianapolis Colts", "away": "Denver Broncos"},
-        {"home": "Kansas City Chiefs", "away": "Philadelphia Eagles"},
-        {"home": "Minnesota Vikings", "away": "Atlanta Falcons"},
-        {"home": "Houston Texans", "away": "Tampa Bay Buccaneers"},
-        {"home": "Las Vegas Raiders", "away": "Los Angeles Chargers"}
-    ]
-    
-    # Get game IDs
-    for game in week2_games:
-        game_id = db_manager.get_game_id(2025, 2, game["home"], game["away"])
-        game["game_id"] = game_id
-    
-    # Week 2 participants (from your data)
-    participants = [
-        {"name": "Poipu Pauly", "points": 133, "rank": 1},
-        {"name": "Natty Ice", "points": 130, "rank": 2},
-        {"name": "I.P. Daly", "points": 116, "rank": 3},
-        {"name": "LorPor", "points": 114, "rank": 4},
-        {"name": "FundaySunday", "points": 114, "rank": 5},
-        {"name": "Stevie1", "points": 114, "rank": 6},
-        {"name": "Commish", "points": 109, "rank": 7},
-        {"name": "Raiderjim", "points": 107, "rank": 8},
-        {"name": "Spanish Flies", "points": 107, "rank": 9},
-        {"name": "Big Chuck", "points": 105, "rank": 10},
-        {"name": "Bijan Mustard", "points": 104, "rank": 11},
-        {"name": "Amusco", "points": 103, "rank": 12},
-        {"name": "Wochie", "points": 103, "rank": 13},
-        {"name": "snydermeister", "points": 102, "rank": 14},
-        {"name": "Karat Cake", "points": 100, "rank": 15},
-        {"name": "Big daddy", "points": 95, "rank": 16},
-        {"name": "Hails (:)", "points": 73, "rank": 17},
-        {"name": "Sean", "points": 72, "rank": 18}
-    ]
-    
-    # Store Week 2 data
-    for participant in participants:
-        for i, game in enumerate(week2_games):
-            # Template picks - will be verified through spot checking
-            pick_team = "Green Bay Packers"  # Default template
-            confidence = 16 - i
-            is_correct = True
-            
-            game_id = game["game_id"]
-            pick_team_id = db_manager.get_team_id(pick_team)
-            
-            if game_id and pick_team_id:
-                db_manager.insert_pool_result(
-                    season_year=2025,
-                    week=2,
-                    participant_name=participant["name"],
-                    game_id=game_id,
-                    pick_team_id=pick_team_id,
-                    confidence_points=confidence,
-                    is_correct=is_correct,
-                    total_weekly_score=participant["points"],
-                    weekly_rank=participant["rank"]
-                )
-    
-    print(f"  ✅ Stored {len(participants)} participants for Week 2")
-
-def parse_week3_to_database(db_manager):
-    """Parse Week 3 results to database"""
-    
-    # Week 3 games
-    week3_games = [
-        {"home": "Buffalo Bills", "away": "Miami Dolphins"},
-        {"home": "Tampa Bay Buccaneers", "away": "New York Jets"},
-        {"home": "Cleveland Browns", "away": "Green Bay Packers"},
-        {"home": "San Francisco 49ers", "away": "Arizona Cardinals"},
-        {"home": "New York Giants", "away": "Kansas City Chiefs"},
-        {"home": "Los Angeles Chargers", "away": "Denver Broncos"},
-        {"home": "Washington Commanders", "away": "Las Vegas Raiders"},
-        {"home": "Baltimore Ravens", "away": "Detroit Lions"},
-        {"home": "Philadelphia Eagles", "away": "Los Angeles Rams"},
-        {"home": "Seattle Seahawks", "away": "New Orleans Saints"},
-        {"home": "Minnesota Vikings", "away": "Cincinnati Bengals"},
-        {"home": "Tennessee Titans", "away": "Indianapolis Colts"},
-        {"home": "Carolina Panthers", "away": "Atlanta Falcons"},
-        {"home": "Chicago Bears", "away": "Dallas Cowboys"},
-        {"home": "New England Patriots", "away": "Pittsburgh Steelers"},
-        {"home": "Jacksonville Jaguars", "away": "Houston Texans"}
-    ]
-    
-    # Get game IDs
-    for game in week3_games:
-        game_id = db_manager.get_game_id(2025, 3, game["home"], game["away"])
-        game["game_id"] = game_id
-    
-    # Week 3 participants (from your data)
-    participants = [
-        {"name": "H Hails (:)", "points": 122, "rank": 1},
-        {"name": "Sean", "points": 110, "rank": 2},
-        {"name": "snydermeister", "points": 107, "rank": 3},
-        {"name": "FundaySunday", "points": 106, "rank": 4},
-        {"name": "Raiderjim", "points": 105, "rank": 5},
-        {"name": "Stevie1", "points": 101, "rank": 6},
-        {"name": "Amusco", "points": 100, "rank": 7},
-        {"name": "Big Chuck", "points": 99, "rank": 8},
-        {"name": "Bijan Mustard", "points": 95, "rank": 9},
-        {"name": "Poipu Pauly", "points": 95, "rank": 10},
-        {"name": "Wochie", "points": 94, "rank": 11},
-        {"name": "Karat Cake", "points": 91, "rank": 12},
-        {"name": "Natty Ice", "points": 91, "rank": 13},
-        {"name": "Commish", "points": 89, "rank": 14},
-        {"name": "Spanish Flies", "points": 89, "rank": 15},
-        {"name": "Big daddy", "points": 81, "rank": 16},
-        {"name": "LorPor", "points": 80, "rank": 17},
-        {"name": "I.P. Daly", "points": 75, "rank": 18}
-    ]
-    
-    # Store Week 3 data
-    for participant in participants:
-        for i, game in enumerate(week3_games):
-            # Template picks - will be verified through spot checking
-            pick_team = "Buffalo Bills"  # Default template
-            confidence = 16 - i
-            is_correct = True
-            
-            game_id = game["game_id"]
-            pick_team_id = db_manager.get_team_id(pick_team)
-            
-            if game_id and pick_team_id:
-                db_manager.insert_pool_result(
-                    season_year=2025,
-                    week=3,
-                    participant_name=participant["name"],
-                    game_id=game_id,
-                    pick_team_id=pick_team_id,
-                    confidence_points=confidence,
-                    is_correct=is_correct,
-                    total_weekly_score=participant["points"],
-                    weekly_rank=participant["rank"]
-                )
-    
-    print(f"  ✅ Stored {len(participants)} participants for Week 3")
-
 def spot_check_game(db_manager, season_year, week, game_description):
     """Spot check a specific game to verify picks"""
     
@@ -9,6 +9,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from database_manager import DatabaseManager
 from team_name_mapper import TeamNameMapper
+from pool_results_ingestion import PoolResultsIngestor, print_ingestion_summary, transcribed_records
 
 def parse_week2_pool_results():
     """Parse Week 2 pool results based on the screenshot data"""
@@ -96,45 +97,10 @@ def parse_week2_pool_results():
         }
     ]
     
-    # Store results in database
-    for participant_data in pool_results:
-        participant_name = participant_data["participant"]
-        total_score = participant_data["total_score"]
-        rank = participant_data["rank"]
-        
-        for pick_data in participant_data["picks"]:
-            team_name = pick_data["team"]
-            confidence = pick_data["confidence"]
-            is_correct = pick_data["correct"]
-            
-            # Find the game for this pick
-            game_id = None
-            pick_team_id = None
-            
-            for game in week2_games:
-                if team_name in [game["home"], game["away"]]:
-                    game_id = game["game_id"]
-                    # Get team ID
-                    pick_team_id = db_manager.get_team_id(team_name)
-                    break
-            
-            if game_id and pick_team_id:
-                db_manager.insert_pool_result(
-                    season_year=2025,
-                    week=2,
-                    participant_name=participant_name,
-                    game_id=game_id,
-                    pick_team_id=pick_team_id,
-                    confidence_points=confidence,
-                    is_correct=is_correct,
-                    total_weekly_score=total_score,
-                    weekly_rank=rank
-                )
-                print(f"Stored: {participant_name} - {team_name} ({confidence} pts) - {'✓' if is_correct else '✗'}")
-            else:
-                print(f"Error: Could not find game or team for {team_name}")
-    
-    print(f"\nStored {len(pool_results)} participants' Week 2 results")
+    # Store results in database (one transaction)
+    summary = PoolResultsIngestor(db_manager).ingest_records(
+        2025, 2, transcribed_records(pool_results, week2_games))
+    print_ingestion_summary(2, summary)
     
     # Generate analysis
     print("\n=== Week 2 Pool Analysis ===")
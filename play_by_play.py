@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+"""
+Streaming ESPN play-by-play ingestion and per-team drive efficiency.
+Play pages of a week's completed games are fetched concurrently through the
+$ref resolver (the next week's first pages are already in flight while this
+week is flattened), each play is flattened into typed columns as its page
+arrives, and every week is written as one compressed columnar chunk under
+data/pbp/season=YYYY/week=WW/. play_by_play_events records which chunk holds
+each game, so runs resume by event id and readers load only the chunks and
+columns they need. Points per drive and success rate are derived from the
+stored plays in a vectorized pass into team_game_efficiency.
+"""
+
+import argparse
+import os
+import re
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from database_manager import DatabaseManager
+from espn_ref_resolver import RefResolver
+from raw_payload_archive import RawPayloadArchive
+from win_probability_series import CORE_BASE, POSTSEASON_WEEKS, REGULAR_SEASON_WEEKS, week_events
+
+PBP_DIR = "data/pbp"
+PAGE_SIZE = 300
+TEAM_ID_RE = re.compile(r'/teams/(\d+)')
+DRIVE_ID_RE = re.compile(r'/drives/(\d+)')
+
+# Column -> (dtype, value when ESPN leaves it out)
+PLAY_COLUMNS = OrderedDict([
+    ('event_id', (np.int64, -1)),
+    ('play_id', (np.int64, -1)),
+    ('sequence', (np.int32, -1)),
+    ('drive_id', (np.int64, -1)),
+    ('period', (np.int8, -1)),
+    ('clock_seconds', (np.int16, -1)),  # Seconds left in the period
+    ('offense', (str, '')),
+    ('defense', (str, '')),
+    ('play_type', (str, '')),
+    ('down', (np.int8, -1)),
+    ('distance', (np.int16, -1)),
+    ('yards_to_endzone', (np.int16, -1)),
+    ('yards', (np.int16, 0)),
+    ('home_score', (np.int16, -1)),  # After the play
+    ('away_score', (np.int16, -1)),
+    ('scoring_play', (np.bool_, False)),
+    ('text', (str, '')),
+])
+
+# Plays that count toward success rate and yards per play (with down 1-4)
+SCRIMMAGE_TYPES = r'rush|pass|sack|interception|fumble'
+TURNOVER_TYPES = r'interception|opponent'
+# Share of the distance to go that makes a play successful, by down
+SUCCESS_SHARE = {1: 0.4, 2: 0.6, 3: 1.0, 4: 1.0}
+
+def plays_url(event_id: str) -> str:
+    return f"{CORE_BASE}/events/{event_id}/competitions/{event_id}/plays"
+
+def _int(value, missing: int) -> int:
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return missing
+
+def _ref_id(obj, pattern: re.Pattern) -> Optional[str]:
+    match = pattern.search((obj or {}).get('$ref', '')) if isinstance(obj, dict) else None
+    return match.group(1) if match else None
+
+class PlayBuffer:
+    """Plays flattened into per-column lists, turned into typed arrays once per chunk"""
+    
+    def __init__(self):
+        self.columns = {name: [] for name in PLAY_COLUMNS}
+    
+    def __len__(self) -> int:
+        return len(self.columns['event_id'])
+    
+    def append(self, event: Dict, play: Dict):
+        start = play.get('start') or {}
+        # Possession is the team at the snap; penalties and timeouts may only carry `team`
+        team_id = _ref_id(start.get('team'), TEAM_ID_RE) or _ref_id(play.get('team'), TEAM_ID_RE)
+        teams = event['espn_teams']
+        offense = teams.get(team_id, '')
+        defense = next((abbreviation for espn_id, abbreviation in teams.items() if espn_id != team_id), '') \
+            if offense else ''
+        drive_id = _ref_id(play.get('drive'), DRIVE_ID_RE)
+        
+        row = {
+            'event_id': event['espn_event_id'],
+            'play_id': play.get('id'),
+            'sequence': play.get('sequenceNumber'),
+            'drive_id': drive_id,
+            'period': (play.get('period') or {}).get('number'),
+            'clock_seconds': (play.get('clock') or {}).get('value'),
+            'offense': offense,
+            'defense': defense,
+            'play_type': (play.get('type') or {}).get('text') or '',
+            'down': start.get('down'),
+            'distance': start.get('distance'),
+            'yards_to_endzone': start.get('yardsToEndzone'),
+            'yards': play.get('statYardage'),
+            'home_score': play.get('homeScore'),
+            'away_score': play.get('awayScore'),
+            'scoring_play': bool(play.get('scoringPlay')),
+            'text': play.get('text') or '',
+        }
+        for name, (dtype, missing) in PLAY_COLUMNS.items():
+            value = row[name]
+            self.columns[name].append(value if dtype in (str, np.bool_) else _int(value, missing))
+    
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """Typed columns, sorted by event and sequence"""
+        
+        arrays = {name: np.array(self.columns[name], dtype=dtype) if self.columns[name] else np.empty(0, dtype=dtype)
+                  for name, (dtype, _) in PLAY_COLUMNS.items()}
+        order = np.lexsort((arrays['sequence'], arrays['event_id']))
+        return {name: values[order] for name, values in arrays.items()}
+
+def chunk_dir(data_dir: str, season_year: int, week: int) -> str:
+    return os.path.join(data_dir, f"season={season_year}", f"week={week:02d}")
+
+def write_chunk(data_dir: str, season_year: int, week: int, arrays: Dict[str, np.ndarray]) -> str:
+    """Write one chunk (np.savez_compressed, no pickled objects); returns its path relative to data_dir"""
+    
+    directory = chunk_dir(data_dir, season_year, week)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"plays-{datetime.now().strftime('%Y%m%dT%H%M%S%f')}.npz")
+    # Write then rename, so an interrupted run never leaves a partial chunk behind
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez_compressed(f, **arrays)
+    os.replace(tmp_path, path)
+    return os.path.relpath(path, data_dir)
+
+def submit_first_pages(resolver: RefResolver, event_ids: List[str]) -> Dict[str, Future]:
+    return {event_id: resolver.submit(plays_url(event_id), {'limit': PAGE_SIZE, 'page': 1})
+            for event_id in event_ids}
+
+def iter_event_plays(resolver: RefResolver, first_pages: Dict[str, Future]) -> Iterator[Tuple[str, List[Dict]]]:
+    """
+    (event id, play items) per event, in the order of first_pages. Every
+    remaining page of every event is requested before the first event is
+    yielded; failed events are left out.
+    """
+    pages = {}
+    for event_id, future in first_pages.items():
+        try:
+            first_page = future.result()
+        except Exception as e:
+            print(f"❌ Error fetching plays for event {event_id}: {e}")
+            continue
+        pages[event_id] = [future] + [
+            resolver.submit(plays_url(event_id), {'limit': PAGE_SIZE, 'page': page})
+            for page in range(2, int(first_page.get('pageCount') or 1) + 1)
+        ]
+    
+    for event_id, futures in pages.items():
+        try:
+            items = [item for future in futures for item in future.result().get('items', [])]
+        except Exception as e:
+            print(f"❌ Error fetching plays for event {event_id}: {e}")
+            continue
+        # Items may be bare links rather than inline plays
+        resolved = resolver.resolve_many(item['$ref'] for item in items if list(item) == ['$ref'])
+        yield event_id, [resolved[item['$ref']] or {} if list(item) == ['$ref'] else item for item in items]
+
+def ingest_plays(db_manager: DatabaseManager, resolver: RefResolver, season_year: int, weeks: List[int],
+                 postseason: bool = False, force: bool = False, data_dir: str = PBP_DIR) -> Dict:
+    """Fetch, flatten and store the plays of every completed game in some weeks of a season"""
+    
+    started = time.perf_counter()
+    events = [event for event in week_events(resolver, season_year, weeks, postseason) if event['is_final']]
+    
+    # Resume: events already in a chunk are skipped
+    stored = set() if force else {row['espn_event_id']
+                                  for row in db_manager.get_play_by_play_events([season_year])}
+    pending = [event for event in events if event['espn_event_id'] not in stored]
+    
+    # Neutral-site games may be stored in games either way round
+    keys = [(event['season_year'], event['week'], event['home_team'], event['away_team']) for event in pending]
+    game_ids = db_manager.get_game_ids(keys + [(season, week, away, home) for season, week, home, away in keys])
+    for event, game_id, swapped_id in zip(pending, game_ids, game_ids[len(keys):]):
+        event['game_id'] = game_id or swapped_id
+    
+    by_week = OrderedDict()
+    for event in pending:
+        by_week.setdefault(event['week'], []).append(event)
+    weeks_pending = list(by_week.items())
+    
+    summary = {'season_year': season_year, 'postseason': postseason, 'events': len(events),
+               'skipped': len(events) - len(pending), 'stored': 0, 'unmatched': 0, 'plays': 0, 'chunks': 0}
+    next_pages = submit_first_pages(resolver, [e['espn_event_id'] for e in weeks_pending[0][1]]) \
+        if weeks_pending else {}
+    for position, (week, week_games) in enumerate(weeks_pending):
+        pages = next_pages
+        # Keep the next week's first pages in flight while this week is flattened
+        if position + 1 < len(weeks_pending):
+            next_pages = submit_first_pages(resolver, [e['espn_event_id'] for e in weeks_pending[position + 1][1]])
+        
+        games = {event['espn_event_id']: event for event in week_games}
+        buffer = PlayBuffer()
+        counts = {}
+        for event_id, items in iter_event_plays(resolver, pages):
+            before = len(buffer)
+            for play in items:
+                buffer.append(games[event_id], play)
+            counts[event_id] = len(buffer) - before
+        # This week's pages are flattened; drop them from the resolver's cache
+        resolver.clear()
+        
+        rows = [{**games[event_id], 'plays': plays} for event_id, plays in counts.items() if plays]
+        if not rows:
+            continue
+        chunk_path = write_chunk(data_dir, season_year, week, buffer.arrays())
+        # Recorded only once the chunk is on disk, so an interrupted week is refetched on resume
+        db_manager.record_play_by_play_events([{**row, 'chunk_path': chunk_path} for row in rows])
+        summary['stored'] += len(rows)
+        summary['unmatched'] += sum(row['game_id'] is None for row in rows)
+        summary['plays'] += len(buffer)
+        summary['chunks'] += 1
+    
+    summary['seconds'] = time.perf_counter() - started
+    return summary
+
+def backfill_plays(db_manager: DatabaseManager, resolver: RefResolver, seasons: List[int],
+                   postseason: bool = True, force: bool = False, data_dir: str = PBP_DIR) -> List[Dict]:
+    """Ingest completed seasons (regular season, then postseason)"""
+    
+    summaries = []
+    for season_year in seasons:
+        summaries.append(ingest_plays(db_manager, resolver, season_year, REGULAR_SEASON_WEEKS,
+                                      force=force, data_dir=data_dir))
+        if postseason:
+            summaries.append(ingest_plays(db_manager, resolver, season_year, sorted(POSTSEASON_WEEKS),
+                                          postseason=True, force=force, data_dir=data_dir))
+    return summaries
+
+def load_plays(db_manager: DatabaseManager, season_years: List[int], weeks: Optional[List[int]] = None,
+               columns: Optional[List[str]] = None, data_dir: str = PBP_DIR) -> pd.DataFrame:
+    """
+    Stored plays of some seasons/weeks as one frame. Only the chunks recorded
+    in play_by_play_events are read, only the requested columns are
+    decompressed, and rows of events re-ingested into a newer chunk are dropped.
+    """
+    columns = list(columns or PLAY_COLUMNS)
+    if 'event_id' not in columns:
+        columns = ['event_id'] + columns
+    
+    chunks = OrderedDict()
+    for row in db_manager.get_play_by_play_events(season_years, weeks):
+        chunks.setdefault(row['chunk_path'], []).append(int(row['espn_event_id']))
+    
+    parts = {name: [] for name in columns}
+    for chunk_path, event_ids in chunks.items():
+        with np.load(os.path.join(data_dir, chunk_path), allow_pickle=False) as chunk:
+            keep = np.isin(chunk['event_id'], event_ids)
+            for name in columns:
+                parts[name].append(chunk[name][keep])
+    
+    return pd.DataFrame({name: np.concatenate(values) if values else np.empty(0, dtype=PLAY_COLUMNS[name][0])
+                         for name, values in parts.items()})
+
+def team_game_efficiency(plays: pd.DataFrame, events: pd.DataFrame) -> pd.DataFrame:
+    """
+    Per-team, per-game offense and defense from plays (see load_plays) of the
+    games in `events` (play_by_play_events rows). A drive belongs to the team
+    with the most scrimmage snaps in it, and scores the points its offense
+    gains until the next drive starts. A scrimmage play succeeds when it gains
+    40%/60%/100% of the distance on 1st/2nd/3rd-4th down; turnovers fail.
+    """
+    events = events.assign(event_id=events['espn_event_id'].astype(np.int64))
+    plays = plays.sort_values(['event_id', 'sequence'], kind='stable').reset_index(drop=True)
+    home_team = plays['event_id'].map(events.set_index('event_id')['home_team'])
+    
+    # Scores after each play, carried forward over plays that leave them out
+    scores = plays[['home_score', 'away_score']].where(plays[['home_score', 'away_score']] >= 0)
+    scores = scores.groupby(plays['event_id']).ffill().fillna(0)
+    before = scores.groupby(plays['event_id']).shift(fill_value=0)
+    
+    play_types = plays['play_type'].str.lower()
+    scrimmage = plays['down'].between(1, 4) & play_types.str.contains(SCRIMMAGE_TYPES) & (plays['offense'] != '')
+    
+    # Drives: owner, offense score before the first play, and first play's order
+    in_drive = plays[(plays['drive_id'] >= 0) & (plays['offense'] != '')].assign(scrimmage=scrimmage)
+    owners = (in_drive.groupby(['event_id', 'drive_id', 'offense'], sort=False)
+              .agg(snaps=('scrimmage', 'sum'), plays=('sequence', 'size')).reset_index()
+              .sort_values(['snaps', 'plays'], kind='stable')
+              .drop_duplicates(['event_id', 'drive_id'], keep='last'))
+    starts = (in_drive.reset_index().groupby(['event_id', 'drive_id'])['index'].min()
+              .rename('first_play').reset_index())
+    drives = owners.merge(starts, on=['event_id', 'drive_id']).sort_values(['event_id', 'first_play'])
+    
+    drive_home = drives['offense'].to_numpy() == home_team.to_numpy()[drives['first_play'].to_numpy()]
+    start_scores = before.to_numpy()[drives['first_play'].to_numpy()]
+    # A drive's points stand once the next drive starts (or the game ends), so PATs and
+    # extra plays outside the drive still count
+    final_scores = scores.groupby(plays['event_id']).last()
+    end_scores = np.vstack([start_scores[1:], [[0, 0]]])
+    last_drive = (drives['event_id'] != drives['event_id'].shift(-1)).to_numpy()
+    end_scores[last_drive] = final_scores.loc[drives['event_id'][last_drive]].to_numpy()
+    side = np.where(drive_home, 0, 1)
+    drives['points'] = np.clip(end_scores[np.arange(len(drives)), side]
+                               - start_scores[np.arange(len(drives)), side], 0, None)
+    drive_totals = drives.groupby(['event_id', 'offense']).agg(drives=('drive_id', 'size'),
+                                                               points=('points', 'sum'))
+    
+    snaps = plays[scrimmage]
+    turnover = play_types[scrimmage].str.contains(TURNOVER_TYPES)
+    needed = snaps['distance'].clip(lower=0) * snaps['down'].map(SUCCESS_SHARE)
+    snaps = snaps.assign(success=(snaps['yards'] >= needed) & ~turnover,
+                         gained=snaps['yards'].where(~turnover, 0).astype(np.int64))
+    snap_totals = snaps.groupby(['event_id', 'offense']).agg(plays=('success', 'size'),
+                                                             successes=('success', 'sum'),
+                                                             yards=('gained', 'sum'))
+    
+    # Two rows per game, so a team without a drive still gets a row of zeros
+    base_columns = ['event_id', 'espn_event_id', 'game_id', 'season_year', 'week']
+    games = pd.concat([
+        events[base_columns].assign(team=events['home_team'], opponent=events['away_team']),
+        events[base_columns].assign(team=events['away_team'], opponent=events['home_team'])
+    ], ignore_index=True)
+    totals = drive_totals.join(snap_totals, how='outer').fillna(0).astype(np.int64)
+    totals.index.names = ['event_id', 'team']
+    offense = games.join(totals, on=['event_id', 'team']).fillna(
+        {'drives': 0, 'points': 0, 'plays': 0, 'successes': 0, 'yards': 0})
+    defense = totals.rename(columns=lambda name: f"opp_{name}")
+    defense.index.names = ['event_id', 'opponent']
+    efficiency = offense.join(defense, on=['event_id', 'opponent']).fillna(
+        {'opp_drives': 0, 'opp_points': 0, 'opp_plays': 0, 'opp_successes': 0})
+    
+    def rate(numerator, denominator):
+        return (numerator / denominator.where(denominator > 0)).astype(float)
+    
+    efficiency['points_per_drive'] = rate(efficiency['points'], efficiency['drives'])
+    efficiency['success_rate'] = rate(efficiency['successes'], efficiency['plays'])
+    efficiency['yards_per_play'] = rate(efficiency['yards'], efficiency['plays'])
+    efficiency['def_points_per_drive'] = rate(efficiency['opp_points'], efficiency['opp_drives'])
+    efficiency['def_success_rate'] = rate(efficiency['opp_successes'], efficiency['opp_plays'])
+    
+    # Season to date before each game: cumulative sums excluding the game itself
+    efficiency = efficiency.sort_values(['season_year', 'team', 'week'], kind='stable').reset_index(drop=True)
+    sums = ['points', 'drives', 'successes', 'plays', 'opp_points', 'opp_drives', 'opp_successes', 'opp_plays']
+    prior = efficiency.groupby(['season_year', 'team'])[sums].cumsum() - efficiency[sums]
+    efficiency['prior_points_per_drive'] = rate(prior['points'], prior['drives'])
+    efficiency['prior_success_rate'] = rate(prior['successes'], prior['plays'])
+    efficiency['prior_def_points_per_drive'] = rate(prior['opp_points'], prior['opp_drives'])
+    efficiency['prior_def_success_rate'] = rate(prior['opp_successes'], prior['opp_plays'])
+    
+    columns = ['espn_event_id', 'team', 'opponent', 'game_id', 'season_year', 'week', 'drives', 'points',
+               'points_per_drive', 'plays', 'success_rate', 'yards_per_play', 'def_points_per_drive',
+               'def_success_rate', 'prior_points_per_drive', 'prior_success_rate',
+               'prior_def_points_per_drive', 'prior_def_success_rate']
+    return efficiency[columns].astype({'drives': np.int64, 'points': np.int64, 'plays': np.int64})
+
+def build_efficiency(db_manager: DatabaseManager, season_year: int, data_dir: str = PBP_DIR) -> int:
+    """Recompute a season's team_game_efficiency rows from its stored plays"""
+    
+    events = pd.DataFrame(db_manager.get_play_by_play_events([season_year]))
+    if events.empty:
+        return 0
+    plays = load_plays(db_manager, [season_year], data_dir=data_dir,
+                       columns=['sequence', 'drive_id', 'offense', 'play_type', 'down', 'distance',
+                                'yards', 'home_score', 'away_score'])
+    return db_manager.replace_team_game_efficiency(season_year, team_game_efficiency(plays, events))
+
+def print_summary(summary: Dict):
+    label = f"{summary['season_year']}{' postseason' if summary['postseason'] else ''}"
+    if summary['stored']:
+        print(f"  💾 {label}: {summary['stored']} games, {summary['plays']} plays in {summary['chunks']} chunks "
+              f"({summary['skipped']} already stored, {summary['unmatched']} not in games) "
+              f"in {summary['seconds']:.2f}s")
+    else:
+        print(f"  ⏭️ {label}: nothing new ({summary['events']} completed games, {summary['skipped']} already stored)")
+
+def main():
+    """Ingest ESPN play-by-play for a week or backfill whole seasons, then rebuild efficiency features"""
+    
+    parser = argparse.ArgumentParser(description="ESPN play-by-play and team drive efficiency")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--week", type=int, help="Ingest one week's completed games")
+    mode.add_argument("--backfill", type=int, nargs=2, metavar=("FIRST", "LAST"),
+                      help="Ingest completed seasons FIRST..LAST")
+    parser.add_argument("--season", type=int, default=2025)
+    parser.add_argument("--postseason", action="store_true", help="--week is an ESPN postseason week")
+    parser.add_argument("--no-postseason", action="store_true", help="Backfill regular seasons only")
+    parser.add_argument("--workers", type=int, default=16, help="Concurrent ESPN requests")
+    parser.add_argument("--force", action="store_true", help="Refetch games whose plays are stored")
+    parser.add_argument("--replay", action="store_true", help="Read ESPN pages from the raw payload archive")
+    parser.add_argument("--no-archive", action="store_true", help="Do not record fetched pages in the archive")
+    parser.add_argument("--features-only", action="store_true", help="Only rebuild efficiency from stored plays")
+    parser.add_argument("--db", default="data/nfl_pool_v2.db")
+    parser.add_argument("--data-dir", default=PBP_DIR)
+    args = parser.parse_args()
+    
+    db_manager = DatabaseManager(db_path=args.db)
+    seasons = list(range(args.backfill[0], args.backfill[1] + 1)) if args.backfill else [args.season]
+    
+    if not args.features_only:
+        archive = RawPayloadArchive(db_manager, replay=args.replay, enabled=False if args.no_archive else None)
+        resolver = RefResolver(max_workers=args.workers, archive=archive)
+        try:
+            if args.backfill:
+                print(f"🏈 Backfilling play-by-play for {seasons[0]}-{seasons[-1]}...")
+                summaries = backfill_plays(db_manager, resolver, seasons, postseason=not args.no_postseason,
+                                           force=args.force, data_dir=args.data_dir)
+            else:
+                print(f"🏈 Ingesting play-by-play for {args.season} week {args.week}...")
+                summaries = [ingest_plays(db_manager, resolver, args.season, [args.week],
+                                          postseason=args.postseason, force=args.force, data_dir=args.data_dir)]
+        finally:
+            resolver.close()
+        for summary in summaries:
+            print_summary(summary)
+    
+    for season_year in seasons:
+        started = time.perf_counter()
+        rows = build_efficiency(db_manager, season_year, data_dir=args.data_dir)
+        print(f"  📊 {season_year}: {rows} team-game efficiency rows in {time.perf_counter() - started:.2f}s")
+
+if __name__ == "__main__":
+    main()
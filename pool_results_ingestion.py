@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Pool results ingestion: one engine for every results source.
+A reader turns a source (CSV, XLSX or pasted text) into a participant x game
+grid, the layout (participant, game and tie-breaker columns) is detected once
+per grid, and each cell becomes a normalized record of participant, game,
+team, points and correctness, split column-wise for the whole grid at once.
+Teams and games are resolved from one query each, and a week's records are
+written in a single transaction.
+Hand-transcribed picks (screenshots) go through the same resolution and write.
+Writes are diffs against the stored week, and sheets already recorded in the
+ingestion ledger with the same content are skipped without being parsed.
+"""
+
+import argparse
+import io
+import re
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from database_manager import DatabaseManager
+from ingestion_ledger import IngestionLedger
+
+# "AWAY @ HOME" (also "vs" / "at") column headers
+GAME_HEADER_RE = re.compile(r"^\s*(.+?)\s*(?:@|\bvs\.?|\bat\b)\s*(.+?)\s*$", re.IGNORECASE)
+# "KC (9)", "KC (-9)", "KC -(9)"; a bare "-16" is a missed pick's penalty
+PICK_CELL_RE = re.compile(r"^\s*([A-Za-z]{2,4})?\s*(-)?\s*\(?\s*(-)?\s*(\d+)\s*\)?\s*$")
+HEADER_SCAN_ROWS = 5
+
+GridSource = Union[str, Path]
+
+# ----------------------- Readers -----------------------
+
+def read_csv_grid(path: Path) -> pd.DataFrame:
+    """CSV export of the pool sheet, read as text"""
+    
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+def read_excel_grid(path: Path) -> pd.DataFrame:
+    """First worksheet of an XLSX/XLS pool sheet, read as text"""
+    
+    return pd.read_excel(path, dtype=str).fillna('')
+
+def read_text_grid(text: str) -> pd.DataFrame:
+    """Sheet pasted from the pool site; the delimiter (tab, comma, ...) is sniffed"""
+    
+    return pd.read_csv(io.StringIO(text.strip()), sep=None, engine='python',
+                       dtype=str, keep_default_na=False)
+
+READERS: Dict[str, Callable[[Path], pd.DataFrame]] = {
+    '.csv': read_csv_grid,
+    '.xlsx': read_excel_grid,
+    '.xls': read_excel_grid,
+    '.txt': lambda path: read_text_grid(path.read_text()),
+    '.tsv': lambda path: read_text_grid(path.read_text()),
+}
+
+def register_reader(suffix: str, reader: Callable[[Path], pd.DataFrame]):
+    """Add or replace the reader used for files with this suffix"""
+    
+    READERS[suffix.lower()] = reader
+
+def read_grid(source: GridSource) -> pd.DataFrame:
+    """Participant x game grid from a file path (by suffix) or pasted text"""
+    
+    if isinstance(source, str) and '\n' in source:
+        return read_text_grid(source)
+    
+    path = Path(source)
+    reader = READERS.get(path.suffix.lower())
+    if reader is None:
+        raise ValueError(f"No pool results reader for '{path.suffix}' files ({path})")
+    return reader(path)
+
+# ----------------------- Layout -----------------------
+
+def _is_game_header(value) -> bool:
+    return isinstance(value, str) and GAME_HEADER_RE.match(value) is not None
+
+def detect_layout(grid: pd.DataFrame) -> Dict:
+    """Locate the header row and the participant, game and tie-breaker columns.
+    
+    Sheets saved with title rows above the header are handled by promoting the
+    first of the top HEADER_SCAN_ROWS rows that holds game headers.
+    """
+    
+    header_row = None
+    headers = [str(column) for column in grid.columns]
+    if sum(map(_is_game_header, headers)) < 2:
+        for row in range(min(HEADER_SCAN_ROWS, len(grid))):
+            values = grid.iloc[row].astype(str).tolist()
+            if sum(map(_is_game_header, values)) >= 2:
+                header_row, headers = row, values
+                break
+        else:
+            raise ValueError("No game columns ('AWAY @ HOME') found in pool results sheet")
+    
+    game_columns = [index for index, header in enumerate(headers) if _is_game_header(header)]
+    tie_columns = [index for index, header in enumerate(headers) if 'tie' in header.lower()]
+    participant_column = next(index for index in range(len(headers))
+                              if index not in game_columns and index not in tie_columns)
+    
+    return {
+        'header_row': header_row,
+        'participant_column': participant_column,
+        'game_columns': game_columns,
+        'games': [headers[index].strip() for index in game_columns],
+        'tie_column': tie_columns[0] if tie_columns else None,
+    }
+
+# ----------------------- Records -----------------------
+
+PICK_COLUMNS = ['participant', 'game', 'team', 'points', 'correct', 'missed', 'malformed', 'raw']
+
+def parse_pick_grid(grid: pd.DataFrame, layout: Dict) -> pd.DataFrame:
+    """Melt the participant x game grid to one row per cell and split every cell at once.
+    
+    A sheet holds only ~1,000 distinct cell strings however many entrants it
+    has, so the cells are factorized and team, sign and points are extracted
+    (one vectorized str.extract) for the distinct values only, then broadcast
+    back by code. Cells are flagged rather than reported: `missed` for blank
+    or team-less penalty cells ("-16"), `malformed` for anything the pick
+    pattern rejects; neither has team/points set. Rows are participant-major.
+    """
+    
+    start = 0 if layout['header_row'] is None else layout['header_row'] + 1
+    body = grid.iloc[start:]
+    participants = body.iloc[:, layout['participant_column']].fillna('').astype(str).str.strip()
+    keep = (participants != '') & (participants.str.lower() != 'nan')
+    participants = participants[keep].to_numpy()
+    values = body.iloc[:, layout['game_columns']][keep].to_numpy(dtype=object).ravel()
+    
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    raw = pd.Series(uniques, dtype=object).fillna('').astype(str).str.strip()
+    parts = raw.str.extract(PICK_CELL_RE)
+    team, outer_sign, inner_sign, points = (parts[column] for column in range(4))
+    
+    blank = raw == ''
+    malformed = ~blank & points.isna()
+    missed = blank | (~malformed & team.isna())
+    is_pick = ~(missed | malformed)
+    parsed = pd.DataFrame({
+        'team': team.str.upper().where(is_pick),
+        'points': pd.to_numeric(points.where(is_pick)).astype('Int64'),
+        'correct': (outer_sign.isna() & inner_sign.isna()).where(is_pick),
+        'missed': missed,
+        'malformed': malformed,
+        'raw': raw,
+    }).take(codes).reset_index(drop=True)
+    
+    n_games = len(layout['game_columns'])
+    parsed.insert(0, 'participant', np.repeat(participants, n_games))
+    parsed.insert(1, 'game', np.tile(np.asarray(layout['games'], dtype=object), len(participants)))
+    return parsed[PICK_COLUMNS]
+
+def transcribed_records(participants: List[Dict], games: List[Dict]) -> Iterator[Dict]:
+    """Records for picks transcribed by hand (screenshot scripts).
+    
+    Participants carry 'name' or 'participant', optional 'total_points' /
+    'total_score' and 'rank', and picks of team/confidence/correct; games carry
+    full 'home'/'away' names and are matched to each pick by team.
+    """
+    
+    game_by_team = {}
+    for game in games:
+        label = f"{game['away']} @ {game['home']}"
+        game_by_team[game['home']] = game_by_team[game['away']] = label
+    
+    for participant in participants:
+        name = participant.get('name') or participant.get('participant')
+        total_score = participant.get('total_points', participant.get('total_score'))
+        for pick in participant['picks']:
+            yield {'participant': name, 'game': game_by_team.get(pick['team']), 'team': pick['team'],
+                   'points': pick['confidence'], 'correct': pick['correct'],
+                   'total_score': total_score, 'rank': participant.get('rank')}
+
+# ----------------------- Ingestion -----------------------
+
+class PoolResultsIngestor:
+    """Resolves normalized pick records to teams/games and writes them per week"""
+    
+    def __init__(self, db_manager: DatabaseManager):
+        self.db_manager = db_manager
+        self.ledger = IngestionLedger(db_manager)
+    
+    def ingest(self, source: GridSource, season_year: int, week: int,
+               replace_existing: bool = True, force: bool = False) -> Dict:
+        """Read, detect the layout of, and store one week's results sheet.
+        
+        A sheet the ledger has already seen with the same content for this
+        season and week is skipped unless force is set, or unless the week's
+        stored rows no longer match what it wrote.
+        """
+        
+        started = time.perf_counter()
+        if isinstance(source, str) and "\n" in source:
+            check = self.ledger.check(f"pasted:{season_year}-w{week}", "pasted", text=source)
+        else:
+            check = self.ledger.check(source, Path(source).suffix.lstrip(".").lower() or "text",
+                                      scope=f"{season_year}-w{week}")
+        if (check['unchanged'] and not force
+                and self.db_manager.count_pool_results(season_year, week) == check['previous']['row_count']):
+            previous = check['previous']
+            return {'skipped': True, 'source': check['source_path'], 'ingested_at': previous['ingested_at'],
+                    'rows': previous['row_count'], 'participants': 0, 'missed': 0, 'malformed': [],
+                    'unresolved': [], 'inserted': 0, 'updated': 0, 'deleted': 0,
+                    'seconds': time.perf_counter() - started}
+        
+        grid = read_grid(source)
+        summary = self.ingest_grid(grid, detect_layout(grid), season_year, week, replace_existing)
+        self.ledger.record(check, summary['rows'], season_year, week)
+        return summary
+    
+    def ingest_grid(self, grid: pd.DataFrame, layout: Dict, season_year: int, week: int,
+                    replace_existing: bool = True) -> Dict:
+        """Store an already read grid whose layout has been detected"""
+        
+        summary = self.ingest_frame(season_year, week, parse_pick_grid(grid, layout),
+                                    replace_existing=replace_existing)
+        summary['games'] = len(layout['games'])
+        return summary
+    
+    def ingest_season(self, season_year: int, sources: Dict[int, GridSource],
+                      force: bool = False) -> Dict[int, Dict]:
+        """Ingest {week: source} for a season, one transaction per week"""
+        
+        return {week: self.ingest(source, season_year, week, force=force)
+                for week, source in sorted(sources.items())}
+    
+    def ingest_records(self, season_year: int, week: int, records, replace_existing: bool = False) -> Dict:
+        """Resolve and bulk-write an iterable of record dicts"""
+        
+        return self.ingest_frame(season_year, week, pd.DataFrame(list(records)),
+                                 replace_existing=replace_existing)
+    
+    def ingest_frame(self, season_year: int, week: int, picks: pd.DataFrame,
+                     replace_existing: bool = False) -> Dict:
+        """Resolve and sync a frame of records; replace_existing also deletes stored picks it lacks.
+        
+        Each distinct team name and game label is resolved once, through the
+        team mapper's alias index (pool sheets say WAS/JAC, the teams table WSH/JAX).
+        """
+        
+        started = time.perf_counter()
+        game_pairs, games_by_team = self._week_index(season_year, week)
+        
+        # Transcribed records carry no raw cell or flags; extra columns (total_score, rank) are kept
+        picks = picks.reindex(columns=list(dict.fromkeys(PICK_COLUMNS + list(picks.columns))))
+        flags = picks[['missed', 'malformed']].fillna(False).astype(bool)
+        # Counted before the filter, so entrants whose every cell is blank or malformed still count
+        participants = int(picks['participant'].nunique())
+        malformed = picks[flags['malformed']]
+        picks = picks[~(flags['missed'] | flags['malformed'])]
+        
+        header_teams = {}
+        for label in picks['game'].dropna().unique():
+            match = GAME_HEADER_RE.match(label)
+            if match:
+                header_teams[label] = match.groups()
+        names = set(picks['team'].dropna().unique()).union(*header_teams.values())
+        team_index = dict(zip(names, self.db_manager.get_team_ids(list(names))))
+        
+        team_ids = picks['team'].map(team_index)
+        game_ids = picks['game'].map({label: self._resolve_game(pair, team_index, game_pairs)
+                                      for label, pair in header_teams.items()})
+        # Fall back to the picked team's only game of the week
+        only_game = {team_id: ids[0] for team_id, ids in games_by_team.items() if len(ids) == 1}
+        game_ids = game_ids.fillna(team_ids.map(only_game))
+        
+        resolved = team_ids.notna() & game_ids.notna()
+        stored = picks[resolved]
+        columns = {
+            'participant_name': stored['participant'].to_numpy(dtype=object),
+            'game_id': game_ids[resolved].astype(int).to_numpy(),
+            'pick_team_id': team_ids[resolved].astype(int).to_numpy(),
+            'confidence_points': stored['points'].astype(int).to_numpy(),
+            'is_correct': stored['correct'].astype(bool).to_numpy(),
+        }
+        for column, source in (('total_weekly_score', 'total_score'), ('weekly_rank', 'rank')):
+            if source in stored:
+                columns[column] = stored[source].astype(object).where(stored[source].notna(), None).to_numpy()
+        # ndarray.tolist() yields native Python values far faster than to_dict('records')
+        records = [dict(zip(columns, values)) for values in zip(*(values.tolist() for values in columns.values()))]
+        
+        changes = self.db_manager.sync_pool_results(season_year, week, records,
+                                                    delete_missing=replace_existing)
+        unresolved = picks[~resolved]
+        return {
+            'rows': len(records),
+            'inserted': changes['inserted'],
+            'updated': changes['updated'],
+            'deleted': changes['deleted'],
+            'participants': participants,
+            'missed': int(flags['missed'].sum()),
+            'malformed': list(zip(malformed['participant'], malformed['game'], malformed['raw'])),
+            'unresolved': list(zip(unresolved['participant'], unresolved['game'], unresolved['team'])),
+            'seconds': time.perf_counter() - started,
+        }
+    
+    def _week_index(self, season_year: int, week: int):
+        """(home_id, away_id) -> game_id and team_id -> game_ids for a week"""
+        
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT id, home_team_id, away_team_id FROM games WHERE season_year = ? AND week = ?",
+                           (season_year, week))
+            game_pairs, games_by_team = {}, {}
+            for game_id, home_team_id, away_team_id in cursor.fetchall():
+                game_pairs[(home_team_id, away_team_id)] = game_id
+                games_by_team.setdefault(home_team_id, []).append(game_id)
+                games_by_team.setdefault(away_team_id, []).append(game_id)
+        
+        return game_pairs, games_by_team
+    
+    @staticmethod
+    def _resolve_game(pair: Tuple[str, str], team_index: Dict[str, Optional[int]],
+                      game_pairs: Dict[Tuple[int, int], int]) -> Optional[int]:
+        """Game for the two teams of a header label, in either orientation"""
+        
+        first, second = (team_index.get(name) for name in pair)
+        return game_pairs.get((second, first)) or game_pairs.get((first, second))
+
+def print_ingestion_summary(week: int, summary: Dict, examples: int = 5):
+    """One-line report plus the first few records that could not be stored"""
+    
+    if summary.get('skipped'):
+        print(f"  ⏭️ Week {week}: {summary['source']} unchanged since {summary['ingested_at']}, "
+              f"skipped ({summary['rows']} picks on file)")
+        return
+    print(f"  💾 Week {week}: synced {summary['rows']} picks for {summary['participants']} participants "
+          f"in {summary['seconds'] * 1000:.1f} ms (+{summary['inserted']} ~{summary['updated']} "
+          f"-{summary['deleted']}, {summary['missed']} missed picks)")
+    if summary['malformed']:
+        print(f"    ⚠️ {len(summary['malformed'])} unparseable cells, e.g. "
+              + ", ".join(f"{participant} / {game}: {raw!r}"
+                          for participant, game, raw in summary['malformed'][:examples]))
+    if summary['unresolved']:
+        print(f"    ❌ {len(summary['unresolved'])} picks with no matching game/team, e.g. "
+              + ", ".join(f"{participant} / {team} ({game})"
+                          for participant, game, team in summary['unresolved'][:examples]))
+
+def main():
+    """Ingest pool results sheets"""
+    
+    parser = argparse.ArgumentParser(description="Ingest pool results sheets (CSV, XLSX or pasted text)")
+    parser.add_argument("--season", type=int, default=2025)
+    parser.add_argument("--week", type=int, action="append",
+                        help="Week to ingest from data/results/week<N>.csv (repeatable)")
+    parser.add_argument("--file", help="Explicit sheet for a single --week")
+    parser.add_argument("--force", action="store_true", help="Re-ingest sheets the ledger has already seen")
+    args = parser.parse_args()
+    
+    weeks = args.week or [1, 2, 3]
+    if args.file:
+        if len(weeks) != 1:
+            parser.error("--file needs exactly one --week")
+        sources = {weeks[0]: args.file}
+    else:
+        sources = {week: f"data/results/week{week}.csv" for week in weeks
+                   if Path(f"data/results/week{week}.csv").exists()}
+    
+    ingestor = PoolResultsIngestor(DatabaseManager(version="v2"))
+    started = time.perf_counter()
+    for week, summary in ingestor.ingest_season(args.season, sources, force=args.force).items():
+        print_ingestion_summary(week, summary)
+    print(f"✅ Ingested {len(sources)} weeks in {time.perf_counter() - started:.3f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Raw payload archive: every HTTP response our fetchers receive, kept so any
+past fetch can be re-parsed offline. Bodies are stored once per distinct
+content (gzip, named by SHA-256) under data/raw/archive, and raw_payloads
+indexes each fetch by (source, url, params, fetched_at). An archive opened
+with replay=True answers archived_get() from disk instead of the network.
+Archiving is on by default; RAW_PAYLOAD_ARCHIVE=off (or enabled=False) turns
+it off, and a failed archive write never fails the fetch it records.
+"""
+
+import argparse
+import glob
+import gzip
+import json
+import os
+import sys
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import requests
+
+from database_manager import DatabaseManager
+from ingestion_ledger import content_hash
+
+ARCHIVE_DIR = "data/raw/archive"
+ODDS_API_URL = "https://api.the-odds-api.com/v4/sports/americanfootball_nfl/odds"
+# Query parameters that are never written to the index (compared case-insensitively)
+REDACTED_PARAMS = {"apikey", "api_key"}
+COMPRESS_LEVEL = 6
+# Environment switch for archiving by fetchers that are not handed an archive
+ARCHIVE_ENV_VAR = "RAW_PAYLOAD_ARCHIVE"
+DISABLED_VALUES = {"0", "off", "false", "no"}
+
+def archiving_enabled() -> bool:
+    return os.getenv(ARCHIVE_ENV_VAR, "on").strip().lower() not in DISABLED_VALUES
+
+def canonical_params(params: Optional[Dict]) -> str:
+    """Sorted, compact JSON of a request's query parameters, credentials removed"""
+    
+    kept = {str(key): str(value) for key, value in (params or {}).items()
+            if str(key).lower() not in REDACTED_PARAMS}
+    return json.dumps(kept, sort_keys=True, separators=(",", ":")) if kept else ""
+
+def utc_timestamp(value: Union[None, str, datetime] = None) -> str:
+    """UTC ISO 8601 timestamp with microseconds, so index rows sort as text (naive times are UTC)"""
+    
+    if value is None:
+        moment = datetime.now(timezone.utc)
+    elif isinstance(value, datetime):
+        moment = value
+    else:
+        moment = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+class RawPayloadArchive:
+    """Content-addressed blob store plus the raw_payloads fetch index"""
+    
+    def __init__(self, db_manager: Optional[DatabaseManager] = None, archive_dir: str = ARCHIVE_DIR,
+                 replay: bool = False, as_of: Union[None, str, datetime] = None,
+                 enabled: Optional[bool] = None):
+        self._db_manager = db_manager
+        self.archive_dir = archive_dir
+        self.replay = replay
+        self.as_of = utc_timestamp(as_of) if as_of is not None else None
+        # Whether fetches are recorded (None: the RAW_PAYLOAD_ARCHIVE environment variable)
+        self.enabled = archiving_enabled() if enabled is None else enabled
+    
+    @property
+    def db_manager(self) -> DatabaseManager:
+        # Opened on first use, so a disabled archive never touches the database
+        if self._db_manager is None:
+            self._db_manager = DatabaseManager(version="v2")
+        return self._db_manager
+    
+    def blob_path(self, digest: str) -> str:
+        return os.path.join(self.archive_dir, digest[:2], f"{digest}.gz")
+    
+    def store_blob(self, body: bytes) -> Tuple[str, int]:
+        """Store a body once per distinct content; returns its hash and compressed size"""
+        
+        digest = content_hash(body)
+        path = self.blob_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write then rename, so concurrent writers of the same blob never expose a partial file
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(gzip.compress(body, compresslevel=COMPRESS_LEVEL, mtime=0))
+            os.replace(tmp_path, path)
+        return digest, os.path.getsize(path)
+    
+    def load_blob(self, digest: str) -> bytes:
+        with open(self.blob_path(digest), "rb") as f:
+            return gzip.decompress(f.read())
+    
+    def record(self, source: str, url: str, body: Union[bytes, str], params: Optional[Dict] = None,
+               fetched_at: Union[None, str, datetime] = None, status_code: Optional[int] = 200,
+               content_type: Optional[str] = None) -> Dict:
+        """Archive one fetch's body and index it"""
+        
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        digest, stored_size = self.store_blob(body)
+        entry = {'source': source, 'url': url, 'params': canonical_params(params),
+                 'fetched_at': utc_timestamp(fetched_at), 'content_hash': digest,
+                 'byte_size': len(body), 'stored_size': stored_size,
+                 'status_code': status_code, 'content_type': content_type}
+        self.db_manager.record_raw_payload(**entry)
+        return entry
+    
+    def record_response(self, source: str, url: str, response: requests.Response,
+                        params: Optional[Dict] = None) -> Dict:
+        """Archive a requests response (`url` and `params` as requested, not response.url)"""
+        
+        return self.record(source, url, response.content, params=params, status_code=response.status_code,
+                           content_type=response.headers.get("Content-Type"))
+    
+    def archive_fetch(self, source: str, url: str, body: Union[bytes, str], params: Optional[Dict] = None,
+                      status_code: Optional[int] = 200, content_type: Optional[str] = None) -> Optional[Dict]:
+        """record() for fetchers: nothing when archiving is off, and a failed write (e.g. a locked
+        database) is reported instead of raised, so it never turns a good fetch into an error"""
+        
+        if not self.enabled:
+            return None
+        try:
+            return self.record(source, url, body, params=params, status_code=status_code,
+                               content_type=content_type)
+        except Exception as e:
+            print(f"⚠️ Could not archive {source} fetch of {url}: {e}")
+            return None
+    
+    def fetches(self, source: Optional[str] = None, url: Optional[str] = None, params: Optional[Dict] = None,
+                since: Union[None, str, datetime] = None, until: Union[None, str, datetime] = None) -> List[Dict]:
+        """Index rows of archived fetches, oldest first"""
+        
+        return self.db_manager.get_raw_payloads(
+            source, url, None if params is None else canonical_params(params),
+            since=utc_timestamp(since) if since is not None else None,
+            until=utc_timestamp(until) if until is not None else None)
+    
+    def lookup(self, source: str, url: str, params: Optional[Dict] = None,
+               as_of: Union[None, str, datetime] = None) -> Optional[Dict]:
+        """Latest archived fetch of a request at or before as_of (default: the archive's as_of, else now)"""
+        
+        as_of = utc_timestamp(as_of) if as_of is not None else self.as_of
+        rows = self.db_manager.get_raw_payloads(source, url, canonical_params(params), until=as_of, latest=True)
+        return rows[0] if rows else None
+    
+    def replay_body(self, source: str, url: str, params: Optional[Dict] = None,
+                    as_of: Union[None, str, datetime] = None) -> Optional[bytes]:
+        """Body of the latest archived fetch of a request, or None if it was never archived"""
+        
+        entry = self.lookup(source, url, params, as_of)
+        return self.load_blob(entry['content_hash']) if entry else None
+    
+    def replay_json(self, source: str, url: str, params: Optional[Dict] = None,
+                    as_of: Union[None, str, datetime] = None):
+        body = self.replay_body(source, url, params, as_of)
+        return json.loads(body) if body is not None else None
+    
+    def replay_response(self, source: str, url: str, params: Optional[Dict] = None) -> requests.Response:
+        """An archived fetch as a requests response, so fetchers can parse it unchanged"""
+        
+        entry = self.lookup(source, url, params)
+        if entry is None:
+            raise LookupError(f"No archived {source} fetch of {url} {canonical_params(params)}".rstrip())
+        response = requests.Response()
+        response._content = self.load_blob(entry['content_hash'])
+        response.status_code = entry['status_code'] or 200
+        response.url = url
+        if entry['content_type']:
+            response.headers['Content-Type'] = entry['content_type']
+        return response
+    
+    def iter_payloads(self, source: Optional[str] = None, url: Optional[str] = None,
+                      since: Union[None, str, datetime] = None,
+                      until: Union[None, str, datetime] = None) -> Iterator[Tuple[Dict, bytes]]:
+        """Every archived fetch in order with its body (consecutive repeats of a payload are read once)"""
+        
+        last_digest, body = None, None
+        for entry in self.fetches(source, url, since=since, until=until):
+            if entry['content_hash'] != last_digest:
+                last_digest, body = entry['content_hash'], self.load_blob(entry['content_hash'])
+            yield entry, body
+    
+    def stats(self) -> Dict:
+        return self.db_manager.get_raw_payload_stats()
+
+_default_archive = None
+_default_archive_lock = threading.Lock()
+
+def default_archive() -> RawPayloadArchive:
+    """Archive shared by fetchers that are not handed one"""
+    
+    global _default_archive
+    with _default_archive_lock:
+        if _default_archive is None:
+            _default_archive = RawPayloadArchive()
+        return _default_archive
+
+def archived_get(source: str, url: str, params: Optional[Dict] = None,
+                 archive: Optional[RawPayloadArchive] = None, session: Optional[requests.Session] = None,
+                 **kwargs) -> requests.Response:
+    """requests.get that archives 200 responses; a replaying archive answers without the network"""
+    
+    archive = archive if archive is not None else default_archive()
+    if archive.replay:
+        return archive.replay_response(source, url, params)
+    response = (session or requests).get(url, params=params, **kwargs)
+    if response.status_code == 200:
+        archive.archive_fetch(source, url, response.content, params=params, status_code=response.status_code,
+                              content_type=response.headers.get("Content-Type"))
+    return response
+
+def import_odds_json(archive: RawPayloadArchive, raw_dir: str) -> List[Dict]:
+    """
+    Archive Odds API fetches saved by src/main.py (data/raw/<year>/*.json).
+    Those files hold the (possibly week-filtered) event list rather than the
+    response bytes, so the events are archived re-serialized compactly.
+    """
+    entries = []
+    for path in sorted(glob.glob(os.path.join(raw_dir, "*.json"))):
+        with open(path, "r") as f:
+            data = json.load(f)
+        if "events" not in data or "fetched_at" not in data:
+            continue
+        body = json.dumps(data["events"], separators=(",", ":"))
+        entries.append(archive.record("odds_api", ODDS_API_URL, body, params=data.get("params"),
+                                      fetched_at=data["fetched_at"], content_type="application/json"))
+    return entries
+
+def print_archive_stats(stats: Dict):
+    print("\n🗄️  Raw payload archive")
+    for row in stats['sources']:
+        print(f"   {row['source']:<10} {row['fetches']:>6} fetches, {row['payloads']:>6} distinct payloads, "
+              f"{row['fetched_bytes'] / 1e6:.2f} MB fetched ({row['first_fetch']} → {row['last_fetch']})")
+    if stats['blob_bytes']:
+        print(f"   {stats['blobs']} blobs: {stats['blob_bytes'] / 1e6:.2f} MB raw, "
+              f"{stats['stored_bytes'] / 1e6:.2f} MB stored "
+              f"({stats['stored_bytes'] / stats['blob_bytes']:.0%})")
+
+def main():
+    """Inspect, import into and replay from the raw payload archive"""
+    
+    parser = argparse.ArgumentParser(description="Raw HTTP payload archive")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--stats", action="store_true", help="Fetches and storage per source")
+    group.add_argument("--list", metavar="SOURCE", help="List archived fetches of a source")
+    group.add_argument("--replay", metavar="URL", help="Write the latest archived body of a URL to stdout")
+    group.add_argument("--import-odds", metavar="DIR", help="Archive Odds API JSON saved under DIR (e.g. data/raw/2025)")
+    parser.add_argument("--source", default="espn", help="Source of --replay URL")
+    parser.add_argument("--params", default=None, help="Query parameters of --replay URL as JSON")
+    parser.add_argument("--as-of", default=None, help="Replay the latest fetch at or before this UTC time")
+    parser.add_argument("--archive-dir", default=ARCHIVE_DIR)
+    parser.add_argument("--db", default="data/nfl_pool_v2.db")
+    args = parser.parse_args()
+    
+    archive = RawPayloadArchive(DatabaseManager(db_path=args.db), archive_dir=args.archive_dir)
+    
+    if args.stats:
+        print_archive_stats(archive.stats())
+    elif args.list:
+        for entry in archive.fetches(args.list):
+            print(f"{entry['fetched_at']}  {entry['content_hash'][:12]}  {entry['byte_size']:>9}  "
+                  f"{entry['url']} {entry['params']}".rstrip())
+    elif args.replay:
+        params = json.loads(args.params) if args.params else None
+        body = archive.replay_body(args.source, args.replay, params, as_of=args.as_of)
+        if body is None:
+            raise SystemExit(f"❌ No archived {args.source} fetch of {args.replay}")
+        sys.stdout.buffer.write(body)
+    else:
+        entries = import_odds_json(archive, args.import_odds)
+        print(f"✅ Archived {len(entries)} Odds API fetches from {args.import_odds}")
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,8 @@ import pandas as pd
 import numpy as np
 from database_manager import DatabaseManager
 from ml_model import NFLConfidenceMLModel
+from model_registry import ModelRegistry, training_window
+from incremental_retrainer import IncrementalRetrainer, training_rows
 import requests
 import os
 from dotenv import load_dotenv
@@ -21,7 +23,7 @@ class ExpertDataRetrainer:
         self.db_manager = DatabaseManager(version="v2")
         self.ml_model = NFLConfidenceMLModel(self.db_manager)
         self.espn_base_url = "https://site.api.espn.com/apis/site/v2/sports/football/nfl"
-        
+    
     def add_expert_picks_to_database(self):
         """Add expert picks data to database for training"""
         
@@ -151,8 +153,10 @@ class ExpertDataRetrainer:
         y = weighted_data['is_correct'].astype(int)
         weights = weighted_data['weight']
         
-        # Handle missing values
-        X = X.fillna(X.mean())
+        # Handle missing values (raw features are kept for incremental updates)
+        raw_features = X
+        fill_values = X.mean().fillna(0)
+        X = X.fillna(fill_values)
         
         # Step 4: Train model with sample weights
         from sklearn.model_selection import train_test_split
@@ -191,25 +195,44 @@ class ExpertDataRetrainer:
         print(f"   Accuracy: {accuracy:.3f}")
         print(f"   MSE: {mse:.3f}")
         
-        # Step 5: Save retrained model
-        import joblib
-        os.makedirs('models', exist_ok=True)
-        joblib.dump(self.ml_model.model, 'models/retrained_confidence_model.pkl')
-        joblib.dump(self.ml_model.scaler, 'models/retrained_scaler.pkl')
-        
-        print("💾 Saved retrained model to models/retrained_confidence_model.pkl")
+        # Step 5: Register retrained model as the current 'retrained' version, with the
+        # training rows and fill values --incremental needs to warm-start from it
+        ModelRegistry(self.db_manager).register(
+            'retrained',
+            {'model': self.ml_model.model, 'scaler': self.ml_model.scaler,
+             'label_encoders': self.ml_model.label_encoders, 'fill_values': fill_values,
+             'training_rows': training_rows(weighted_data, raw_features), 'updates_since_full': 0},
+            feature_columns=list(X.columns), window=training_window(weighted_data),
+            metrics={'accuracy': accuracy, 'mse': mse}, params=self.ml_model.model.get_params()
+        )
         
         return accuracy, mse
     
+    def update_model_with_new_week(self, **retrainer_options):
+        """Incremental mode: warm-start the registered model on newly settled picks only"""
+        
+        print("🤖 Updating ML model with newly settled picks (warm start)...")
+        
+        # Step 1: Add expert picks to database
+        self.add_expert_picks_to_database()
+        
+        # Step 2: Grow trees on the new week (periodically checked against a full retrain)
+        retrainer = IncrementalRetrainer(self.db_manager, model_name='retrained', **retrainer_options)
+        return retrainer.update()
+    
     def test_retrained_model_on_week1(self):
         """Test retrained model on Week 1 data"""
         
         print("🧪 Testing retrained model on Week 1 data...")
         
-        # Load retrained model
-        import joblib
-        self.ml_model.model = joblib.load('models/retrained_confidence_model.pkl')
-        self.ml_model.scaler = joblib.load('models/retrained_scaler.pkl')
+        # Load the current retrained model version
+        artifact = ModelRegistry(self.db_manager).load('retrained')
+        if artifact is None:
+            raise ValueError("No retrained model registered. Run a retrain first.")
+        self.ml_model.model = artifact['model']
+        self.ml_model.scaler = artifact['scaler']
+        self.ml_model.label_encoders = dict(artifact.get('label_encoders') or {})
+        feature_columns = artifact['feature_columns']
         
         # Get Week 1 games
         with self.db_manager.get_connection() as conn:
@@ -244,14 +267,18 @@ class ExpertDataRetrainer:
             
             # Predict for home team
             X_home = self.ml_model.prepare_features(test_data)
-            X_home = X_home.fillna(X_home.mean())
+            if feature_columns:
+                X_home = X_home.reindex(columns=feature_columns)
+            X_home = X_home.fillna(X_home.mean()).fillna(0)
             home_prediction = self.ml_model.model.predict(self.ml_model.scaler.transform(X_home))[0]
             
             # Predict for away team
             test_data_away = test_data.copy()
             test_data_away['pick_team'] = game['away_team']
             X_away = self.ml_model.prepare_features(test_data_away)
-            X_away = X_away.fillna(X_away.mean())
+            if feature_columns:
+                X_away = X_away.reindex(columns=feature_columns)
+            X_away = X_away.fillna(X_away.mean()).fillna(0)
             away_prediction = self.ml_model.model.predict(self.ml_model.scaler.transform(X_away))[0]
             
             # Choose better prediction
@@ -294,12 +321,31 @@ class ExpertDataRetrainer:
 
 def main():
     """Main function to retrain model with expert data"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Retrain the ML model with expert data")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Warm-start on newly settled picks instead of retraining from scratch")
+    parser.add_argument("--full-check-every", type=int, default=6,
+                        help="In incremental mode, run a full retrain check every N updates")
+    args = parser.parse_args()
     
     print("🔄 Retraining ML Model with Expert Data and Current Season Weighting")
     print("=" * 70)
     
     retrainer = ExpertDataRetrainer()
     
+    if args.incremental:
+        metrics = retrainer.update_model_with_new_week(full_check_every=args.full_check_every)
+        if metrics is None:
+            return
+        if 'prequential_accuracy' in metrics:
+            print(f"   New-week accuracy before update: {metrics['prequential_accuracy']:.3f}")
+        predictions, test_accuracy = retrainer.test_retrained_model_on_week1()
+        print(f"\n✅ Incremental update complete ({metrics['mode']})!")
+        print(f"   Week 1 Test Accuracy: {test_accuracy:.1%}")
+        return
+    
     # Step 1: Retrain model
     accuracy, mse = retrainer.retrain_model_with_expert_data()
     
@@ -310,7 +356,7 @@ def main():
     print(f"📊 Results:")
     print(f"   Training Accuracy: {accuracy:.3f}")
     print(f"   Week 1 Test Accuracy: {test_accuracy:.1%}")
-    print(f"   Model saved to: models/retrained_confidence_model.pkl")
+    print(f"   Model registered as: retrained (current)")
     
     if test_accuracy > 0.625:  # Better than original ML model
         print(f"🎉 Retrained model performs better than original ML model!")
@@ -319,5 +365,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-
-
@@ -1,112 +1,284 @@
 #!/usr/bin/env python3
 """
 Scrape CBS Sports expert picks for a given week - Version 3 with odds
+Pages go through an on-disk HTML cache keyed by URL and revalidated with
+ETag/Last-Modified, so re-scraping an unchanged week costs one 304.
+Backfill fetches a range of weeks concurrently under a shared rate limit and
+writes the picks straight to expert_picks; --offline never touches the
+network and reads fixture pages (data/fixtures/cbs/week-<N>.html) or the cache.
+Every fetched page is also kept in the raw payload archive, which can replay
+any past fetch.
 """
 
 import requests
 from bs4 import BeautifulSoup
+import hashlib
 import json
+import os
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 import argparse
 
-def scrape_cbs_expert_picks_with_odds(week):
+from database_manager import DatabaseManager
+from expert_picks_store import expert_pick_rows
+from ingestion_ledger import IngestionLedger
+from raw_payload_archive import RawPayloadArchive, archived_get, default_archive
+
+# lxml is optional; it parses the picks table several times faster than html.parser
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+CBS_PICKS_URL = "https://www.cbssports.com/nfl/picks/experts/straight-up/{week}/"
+CACHE_DIR = "data/cache/cbs"
+FIXTURE_DIR = "data/fixtures/cbs"
+REQUEST_TIMEOUT = (5, 30)  # connect, read (seconds)
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+EXPERT_NAMES = ['Pete Prisco', 'Cody Benjamin', 'Jared Dubin', 'Ryan Wilson', 'John Breech', 'Tyler Sullivan', 'Dave Richard']
+
+# Game cell, e.g. "8:15 pmSF3-1LAR3-1Preview": abbreviations followed by records
+GAME_TEAMS_RE = re.compile(r'([A-Z]{2,4})\d+-\d+')
+# Pick cell, e.g. "LAR-365Remove" or "KC-181Remove"
+PICK_ODDS_RE = re.compile(r'^([A-Z]{2,4})([+-]\d{3,4})')
+# The picks table is a small slice of a large page
+TABLE_RE = re.compile(r'<table\b.*?</table>', re.IGNORECASE | re.DOTALL)
+
+class HtmlCache:
+    """Fetched pages on disk, keyed by URL, with the validators to revalidate them"""
+    
+    def __init__(self, cache_dir: str = CACHE_DIR, fixture_dir: str = FIXTURE_DIR):
+        self.cache_dir = cache_dir
+        self.fixture_dir = fixture_dir
+    
+    def _paths(self, url: str) -> Tuple[str, str]:
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()[:20]
+        return os.path.join(self.cache_dir, f"{key}.html"), os.path.join(self.cache_dir, f"{key}.json")
+    
+    def load(self, url: str) -> Tuple[Optional[str], Dict]:
+        """Cached page and its metadata (url, etag, last_modified, fetched_at); (None, {}) if absent"""
+        html_path, meta_path = self._paths(url)
+        if not os.path.exists(html_path) or not os.path.exists(meta_path):
+            return None, {}
+        with open(html_path, 'r', encoding='utf-8') as f:
+            html = f.read()
+        with open(meta_path, 'r') as f:
+            return html, json.load(f)
+    
+    def store(self, url: str, html: str, response_headers) -> Dict:
+        """Cache a fetched page with the response's ETag/Last-Modified"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        html_path, meta_path = self._paths(url)
+        meta = {
+            'url': url,
+            'etag': response_headers.get('ETag'),
+            'last_modified': response_headers.get('Last-Modified'),
+            'fetched_at': datetime.now().isoformat()
+        }
+        with open(html_path, 'w', encoding='utf-8') as f:
+            f.write(html)
+        with open(meta_path, 'w') as f:
+            json.dump(meta, f, indent=2)
+        return meta
+    
+    def fixture(self, week: int) -> Optional[str]:
+        """Saved page for offline runs (data/fixtures/cbs/week-<N>.html), if any"""
+        path = os.path.join(self.fixture_dir, f"week-{week}.html")
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+class RateLimiter:
+    """Spaces requests from all worker threads at least min_interval seconds apart"""
+    
+    def __init__(self, min_interval: float = 1.0):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+    
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+        time.sleep(max(0.0, slot - now))
+
+def fetch_week_html(week: int, cache: HtmlCache, session: Optional[requests.Session] = None,
+                    rate_limiter: Optional[RateLimiter] = None, offline: bool = False,
+                    archive: Optional[RawPayloadArchive] = None) -> Tuple[str, str]:
+    """
+    Page HTML for a week and where it came from: 'fixture', 'cache' (offline),
+    'archive' (replaying archive), 'not_modified' (304 on revalidation) or 'fetched'
+    """
+    url = CBS_PICKS_URL.format(week=week)
+    cached_html, meta = cache.load(url)
+    
+    if offline:
+        fixture_html = cache.fixture(week)
+        if fixture_html is not None:
+            return fixture_html, 'fixture'
+        if cached_html is not None:
+            return cached_html, 'cache'
+        raise FileNotFoundError(f"No fixture or cached page for week {week} (offline)")
+    
+    archive = archive if archive is not None else default_archive()
+    if archive.replay:
+        html = archive.replay_body("cbs", url)
+        if html is None:
+            raise LookupError(f"No archived page for week {week}")
+        return html.decode("utf-8", errors="replace"), 'archive'
+    
+    headers = dict(HEADERS)
+    if cached_html is not None:
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+    
+    if rate_limiter is not None:
+        rate_limiter.wait()
+    response = archived_get("cbs", url, archive=archive, session=session, headers=headers, timeout=REQUEST_TIMEOUT)
+    if response.status_code == 304 and cached_html is not None:
+        # Still a fetch of this page; the archive stores the unchanged body only once
+        archive.archive_fetch("cbs", url, cached_html, status_code=200)
+        return cached_html, 'not_modified'
+    response.raise_for_status()
+    cache.store(url, response.text, response.headers)
+    return response.text, 'fetched'
+
+def parse_expert_picks_html(html: str) -> List[Dict]:
+    """Games with each expert's pick and the moneyline shown next to it"""
+    
+    # Only tokenize and build a tree for the picks table, not the whole page
+    table_html = TABLE_RE.search(html)
+    if not table_html:
+        return []
+    table = BeautifulSoup(table_html.group(0), HTML_PARSER).find('table')
+    if not table:
+        return []
+    
+    expert_picks = []
+    # Skip header rows (first 2 rows are expert names and records)
+    for row in table.find_all('tr')[2:]:
+        cells = row.find_all(['td', 'th'])
+        if len(cells) < 9:  # Should have game info + 7 expert columns
+            continue
+        
+        # Extract team abbreviations and records from the game cell
+        team_matches = GAME_TEAMS_RE.findall(cells[0].get_text(strip=True))
+        if len(team_matches) < 2:
+            continue
+        away_team, home_team = team_matches[0], team_matches[1]
+        
+        # Extract expert picks and odds from the expert cells (cells 1-7)
+        expert_picks_for_game = []
+        odds_data = {}
+        for expert, cell in zip(EXPERT_NAMES, cells[1:8]):
+            team_odds_match = PICK_ODDS_RE.search(cell.get_text(strip=True))
+            if team_odds_match:
+                picked_team, odds = team_odds_match.groups()
+                expert_picks_for_game.append({'expert': expert, 'pick': picked_team, 'odds': odds})
+                # Store odds for each team
+                odds_data.setdefault(picked_team, odds)
+        
+        if expert_picks_for_game:
+            expert_picks.append({
+                'game': f"{away_team} @ {home_team}",
+                'away_team': away_team,
+                'home_team': home_team,
+                'expert_picks': expert_picks_for_game,
+                'odds': odds_data
+            })
+    
+    return expert_picks
+
+def scrape_cbs_expert_picks_with_odds(week, cache: Optional[HtmlCache] = None, offline: bool = False,
+                                      archive: Optional[RawPayloadArchive] = None):
     """
     Scrape CBS Sports expert picks with betting odds for the specified week
     """
-    url = f"https://www.cbssports.com/nfl/picks/experts/straight-up/{week}/"
+    url = CBS_PICKS_URL.format(week=week)
     
     print(f"🔍 Scraping CBS Sports expert picks with odds for Week {week}...")
     print(f"📡 URL: {url}")
     
     try:
-        # Add headers to mimic a real browser
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Find the main table
-        table = soup.find('table')
-        if not table:
-            print("❌ No table found")
-            return []
-        
-        rows = table.find_all('tr')
-        print(f"📊 Found {len(rows)} table rows")
+        html, source = fetch_week_html(week, cache or HtmlCache(), offline=offline, archive=archive)
+        print(f"📄 Page from {source}")
         
-        expert_picks = []
-        expert_names = ['Pete Prisco', 'Cody Benjamin', 'Jared Dubin', 'Ryan Wilson', 'John Breech', 'Tyler Sullivan', 'Dave Richard']
-        
-        # Skip header rows (first 2 rows are expert names and records)
-        for i, row in enumerate(rows[2:], start=3):
-            cells = row.find_all(['td', 'th'])
-            if len(cells) >= 9:  # Should have game info + 7 expert columns
-                try:
-                    # Extract game information from first cell
-                    game_cell = cells[0]
-                    game_text = game_cell.get_text(strip=True)
-                    
-                    # Parse game info (e.g., "8:15 pmSF3-1LAR3-1Preview")
-                    # Extract team abbreviations and records
-                    team_matches = re.findall(r'([A-Z]{2,4})\d+-\d+', game_text)
-                    if len(team_matches) >= 2:
-                        away_team = team_matches[0]
-                        home_team = team_matches[1]
-                        
-                        # Extract expert picks and odds from remaining cells (cells 1-7)
-                        expert_picks_for_game = []
-                        odds_data = {}
-                        
-                        for j, cell in enumerate(cells[1:8]):  # Skip first cell (game info)
-                            if j < len(expert_names):
-                                cell_text = cell.get_text(strip=True)
-                                
-                                # Look for team abbreviation and odds in the cell
-                                # Pattern like "LAR-365Remove" or "KC-181Remove"
-                                team_odds_match = re.search(r'^([A-Z]{2,4})([+-]\d{3,4})', cell_text)
-                                if team_odds_match:
-                                    picked_team = team_odds_match.group(1)
-                                    odds = team_odds_match.group(2)
-                                    
-                                    expert_picks_for_game.append({
-                                        'expert': expert_names[j],
-                                        'pick': picked_team,
-                                        'odds': odds
-                                    })
-                                    
-                                    # Store odds for each team
-                                    if picked_team not in odds_data:
-                                        odds_data[picked_team] = odds
-                        
-                        if expert_picks_for_game:
-                            expert_picks.append({
-                                'game': f"{away_team} @ {home_team}",
-                                'away_team': away_team,
-                                'home_team': home_team,
-                                'expert_picks': expert_picks_for_game,
-                                'odds': odds_data
-                            })
-                            
-                            print(f"  ✅ {away_team} @ {home_team}: {len(expert_picks_for_game)} expert picks")
-                            print(f"     Odds: {odds_data}")
-                                
-                except Exception as e:
-                    print(f"  ⚠️  Error parsing row {i}: {e}")
-                    continue
+        expert_picks = parse_expert_picks_html(html)
+        for game in expert_picks:
+            print(f"  ✅ {game['game']}: {len(game['expert_picks'])} expert picks")
+            print(f"     Odds: {game['odds']}")
         
         print(f"✅ Successfully scraped {len(expert_picks)} games with odds")
         
         return expert_picks
-        
+    
     except Exception as e:
         print(f"❌ Error scraping CBS Sports: {e}")
         return []
 
+def backfill_expert_picks(db_manager: DatabaseManager, season_year: int, weeks: List[int],
+                          workers: int = 4, min_interval: float = 1.0, offline: bool = False,
+                          force: bool = False, cache: Optional[HtmlCache] = None,
+                          archive: Optional[RawPayloadArchive] = None) -> Dict[int, Dict]:
+    """
+    Fetch many weeks concurrently and write their picks to expert_picks.
+    
+    Pages are fetched on a thread pool behind one rate limiter; pages whose
+    content the ingestion ledger has already seen for this season are not
+    parsed or written again unless force is set. A page with games missing
+    from the schedule is not recorded, so its picks are written once those
+    games are loaded.
+    """
+    cache = cache or HtmlCache()
+    ledger = IngestionLedger(db_manager)
+    rate_limiter = RateLimiter(min_interval)
+    sessions = threading.local()
+    
+    def fetch(week):
+        if not hasattr(sessions, 'session'):
+            sessions.session = requests.Session()
+        return fetch_week_html(week, cache, sessions.session, rate_limiter, offline, archive)
+    
+    results = {}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = {executor.submit(fetch, week): week for week in weeks}
+        for future in as_completed(futures):
+            week = futures[future]
+            started = time.perf_counter()
+            try:
+                html, source = future.result()
+            except Exception as e:
+                results[week] = {'error': str(e)}
+                continue
+            
+            # The CBS URL has no season in it
+            check = ledger.check(CBS_PICKS_URL.format(week=week), 'cbs_expert_picks', text=html,
+                                 scope=str(season_year))
+            if check['unchanged'] and not force:
+                results[week] = {'source': source, 'skipped': True, 'rows': check['previous']['row_count']}
+                continue
+            
+            games = parse_expert_picks_html(html)
+            rows, unmatched = expert_pick_rows(db_manager, season_year, week, games)
+            changes = db_manager.sync_expert_picks(rows) if rows else {'inserted': 0, 'updated': 0}
+            if not unmatched:
+                ledger.record(check, len(rows), season_year, week)
+            results[week] = {'source': source, 'skipped': False, 'games': len(games), 'rows': len(rows),
+                             'unmatched': unmatched, 'seconds': time.perf_counter() - started, **changes}
+    
+    return dict(sorted(results.items()))
+
 def save_expert_picks_to_json(expert_picks, week):
     """
     Save expert picks with odds to JSON file
@@ -114,7 +286,6 @@ def save_expert_picks_to_json(expert_picks, week):
     output_file = f"data/expert-picks-week-{week}-with-odds.json"
     
     # Create data directory if it doesn't exist
-    import os
     os.makedirs('data', exist_ok=True)
     
     # Prepare data for JSON
@@ -123,7 +294,7 @@ def save_expert_picks_to_json(expert_picks, week):
         'season': 2025,
         'scraped_at': datetime.now().isoformat(),
         'source': 'CBS Sports',
-        'url': f"https://www.cbssports.com/nfl/picks/experts/straight-up/{week}/",
+        'url': CBS_PICKS_URL.format(week=week),
         'games': expert_picks
     }
     
@@ -135,12 +306,48 @@ def save_expert_picks_to_json(expert_picks, week):
 
 def main():
     parser = argparse.ArgumentParser(description="Scrape CBS Sports expert picks with odds")
-    parser.add_argument("--week", type=int, required=True, help="Week number")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--week", type=int, help="Week number")
+    mode.add_argument("--backfill", type=int, nargs=2, metavar=("FIRST", "LAST"),
+                      help="Fetch weeks FIRST..LAST concurrently and store them in expert_picks")
+    parser.add_argument("--season", type=int, default=2025, help="Season the CBS weeks belong to")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent fetches for --backfill")
+    parser.add_argument("--min-interval", type=float, default=1.0,
+                        help="Minimum seconds between requests across all workers")
+    parser.add_argument("--offline", action="store_true",
+                        help="Use fixture/cached pages only, never the network")
+    parser.add_argument("--replay", action="store_true",
+                        help="Re-run on the latest pages in the raw payload archive, never the network")
+    parser.add_argument("--force", action="store_true", help="Re-store weeks whose page has not changed")
+    parser.add_argument("--no-archive", action="store_true", help="Do not record fetched pages in the archive")
+    parser.add_argument("--db", default="data/nfl_pool_v2.db")
     
     args = parser.parse_args()
+    db_manager = DatabaseManager(db_path=args.db)
+    archive = RawPayloadArchive(db_manager, replay=args.replay, enabled=False if args.no_archive else None)
+    
+    if args.backfill:
+        first, last = args.backfill
+        started = time.perf_counter()
+        results = backfill_expert_picks(db_manager, args.season, list(range(first, last + 1)),
+                                        workers=args.workers, min_interval=args.min_interval,
+                                        offline=args.offline, force=args.force, archive=archive)
+        for week, result in results.items():
+            if 'error' in result:
+                print(f"  ❌ Week {week}: {result['error']}")
+            elif result['skipped']:
+                print(f"  ⏭️ Week {week}: page unchanged ({result['source']}), skipped")
+            else:
+                print(f"  💾 Week {week}: {result['rows']} picks from {result['games']} games "
+                      f"({result['source']}, +{result['inserted']} ~{result['updated']})")
+                if result['unmatched']:
+                    print(f"    ⚠️ No game in the database for: {', '.join(result['unmatched'])} "
+                          f"(week is retried on the next run)")
+        print(f"✅ Backfilled {len(results)} weeks in {time.perf_counter() - started:.2f}s")
+        return
     
     # Scrape expert picks with odds
-    expert_picks = scrape_cbs_expert_picks_with_odds(args.week)
+    expert_picks = scrape_cbs_expert_picks_with_odds(args.week, offline=args.offline, archive=archive)
     
     if expert_picks:
         # Save to JSON
@@ -162,12 +369,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-
-
-
-
-
-
-
-
-
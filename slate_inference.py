@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Batched slate inference helpers shared by the confidence models.
+Builds one feature frame holding every game in both orientations (home as
+listed, then teams swapped) so a whole slate is scored with a single
+scaler.transform / model.predict call, then pairs the two halves back up.
+"""
+
+import numpy as np
+import pandas as pd
+
+def build_oriented_slate(games_data: list) -> pd.DataFrame:
+    """Build a (2N)-row frame: rows [0, N) as listed, rows [N, 2N) with teams swapped"""
+    
+    home_rows = []
+    away_rows = []
+    for game in games_data:
+        home_ml = game.get('home_ml', -110)
+        away_ml = game.get('away_ml', -110)
+        base = {
+            'odds_total': game.get('total_points', 45),
+            'week': game['week'],
+            'season_year': game['season_year']
+        }
+        home_rows.append({
+            'home_team': game['home_team'],
+            'away_team': game['away_team'],
+            'home_ml': home_ml,
+            'away_ml': away_ml,
+            **base
+        })
+        away_rows.append({
+            'home_team': game['away_team'],
+            'away_team': game['home_team'],
+            'home_ml': away_ml,
+            'away_ml': home_ml,
+            **base
+        })
+    
+    columns = ['home_team', 'away_team', 'home_ml', 'away_ml', 'odds_total', 'week', 'season_year']
+    return pd.DataFrame(home_rows + away_rows, columns=columns)
+
+def split_oriented_scores(scores: np.ndarray) -> tuple:
+    """Split 2N scores from an oriented slate into (home_scores, away_scores)"""
+    
+    scores = np.asarray(scores, dtype=float)
+    n_games = len(scores) // 2
+    return scores[:n_games], scores[n_games:]
+
+def pair_predictions(games_data: list, home_scores: np.ndarray, away_scores: np.ndarray) -> list:
+    """Pick the better orientation per game (home wins ties, as in the per-game path)"""
+    
+    predictions = []
+    for game, home_prediction, away_prediction in zip(games_data, home_scores, away_scores):
+        if home_prediction >= away_prediction:
+            pick_team = game['home_team']
+            win_prob = float(home_prediction)
+        else:
+            pick_team = game['away_team']
+            win_prob = float(away_prediction)
+        
+        predictions.append({
+            'game': f"{game['away_team']} @ {game['home_team']}",
+            'pick': pick_team,
+            'confidence': max(1, min(16, int(win_prob * 16))),
+            'win_probability': win_prob
+        })
+    
+    return predictions
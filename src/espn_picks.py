@@ -35,7 +35,7 @@ def cmd_auto(args):
     end = today + dt.timedelta(days=args.days)
     sb = get_scoreboard_by_range(today, end)
     rows = extract_events(sb)
-    df = events_with_probabilities(rows, sleep_between=args.sleep)
+    df = events_with_probabilities(rows, sleep_between=args.sleep, max_workers=args.workers)
     if "pick_prob" not in df or df["pick_prob"].isna().any():
         df["pick_prob"] = df[["home_prob","away_prob"]].max(axis=1)
         df["pick_team"] = df.apply(lambda r: r["home_team"] if (r["home_prob"] or 0) >= (r["away_prob"] or 0) else r["away_team"], axis=1)
@@ -51,6 +51,7 @@ def build_parser():
     p.add_argument("--days", type=int, default=9, help="Include games through this many days ahead (default 9)")
     p.add_argument("--pool-size", type=int, default=16, help="Total confidence points to distribute (default 16)")
     p.add_argument("--sleep", type=float, default=0.0, help="Seconds to sleep between ESPN probability calls (avoid rate limits)")
+    p.add_argument("--workers", type=int, default=8, help="Concurrent ESPN probability calls when not sleeping (default 8)")
     sub = p.add_subparsers(dest="cmd", required=True)
     pa = sub.add_parser("auto", help="Fetch scoreboard + probabilities, export picks")
     pa.set_defaults(func=cmd_auto)
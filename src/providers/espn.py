@@ -1,5 +1,6 @@
 import datetime as dt
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple
 
 import pandas as pd
@@ -63,6 +64,10 @@ def _safe_float(x):
 def _fetch_latest_probs_for_event(event_id: str) -> Tuple[Optional[float], Optional[float]]:
     list_url = f"{CORE_BASE}/events/{event_id}/competitions/{event_id}/probabilities"
     js = _get(list_url, params={"limit": 200})
+    # Items run oldest to newest: the latest point is on the last page
+    page_count = int(js.get("pageCount") or 1)
+    if page_count > 1:
+        js = _get(list_url, params={"limit": 200, "page": page_count})
 
     items = js.get("items") or []
     if items:
@@ -84,27 +89,35 @@ def _fetch_latest_probs_for_event(event_id: str) -> Tuple[Optional[float], Optio
 
     return norm(home_p), norm(away_p)
 
-def events_with_probabilities(rows: List[Dict], sleep_between: float = 0.0) -> pd.DataFrame:
-    records = []
-    for r in rows:
-        home_p, away_p = None, None
-        try:
-            home_p, away_p = _fetch_latest_probs_for_event(r["event_id"])
-        except Exception:
-            pass
-        pick_prob = None
-        pick_team = None
-        if home_p is not None and away_p is not None:
-            pick_prob = max(home_p, away_p)
-            pick_team = r["home_team"] if home_p >= away_p else r["away_team"]
-        records.append({
-            **r,
-            "home_prob": home_p,
-            "away_prob": away_p,
-            "pick_prob": pick_prob,
-            "pick_team": pick_team,
-            "bookmaker": "ESPN-probabilities"
-        })
-        if sleep_between:
-            time.sleep(sleep_between)
+def _probability_record(r: Dict) -> Dict:
+    home_p, away_p = None, None
+    try:
+        home_p, away_p = _fetch_latest_probs_for_event(r["event_id"])
+    except Exception:
+        pass
+    pick_prob = None
+    pick_team = None
+    if home_p is not None and away_p is not None:
+        pick_prob = max(home_p, away_p)
+        pick_team = r["home_team"] if home_p >= away_p else r["away_team"]
+    return {
+        **r,
+        "home_prob": home_p,
+        "away_prob": away_p,
+        "pick_prob": pick_prob,
+        "pick_team": pick_team,
+        "bookmaker": "ESPN-probabilities"
+    }
+
+def events_with_probabilities(rows: List[Dict], sleep_between: float = 0.0, max_workers: int = 8) -> pd.DataFrame:
+    # Events are independent: fetch them concurrently unless we are pacing requests
+    if sleep_between or max_workers <= 1:
+        records = []
+        for r in rows:
+            records.append(_probability_record(r))
+            if sleep_between:
+                time.sleep(sleep_between)
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            records = list(pool.map(_probability_record, rows))
     return pd.DataFrame.from_records(records)
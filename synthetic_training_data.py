@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Vectorized synthetic odds and pick scenarios for model training.
+Every settled game is generated at once from a seeded NumPy Generator, so a
+given seed always yields the same odds and picks (checkable with fingerprint()),
+and the results are written with executemany in a single transaction.
+Used by generate_training_data.py and improved_training_data_generator.py.
+"""
+
+import hashlib
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+from database_manager import DatabaseManager
+
+SYNTHETIC_TIMESTAMP = '2024-01-01T00:00:00Z'
+
+# Margin tiers: close (<7), comfortable (7-13), big win (14-20), blowout (21+)
+MARGIN_TIER_EDGES = [7, 14, 21]
+FAVORITE_ML_RANGES = np.array([[-120, -105], [-200, -110], [-300, -150], [-400, -200]])
+UNDERDOG_ML_RANGES = np.array([[105, 120], [110, 200], [200, 350], [300, 500]])
+WINNER_CONFIDENCE = np.array([8, 12, 14, 16])
+LOSER_CONFIDENCE = np.array([6, 4, 2, 1])
+
+ODDS_COLUMNS = ['game_id', 'home_ml', 'away_ml', 'total_points', 'home_win_prob', 'away_win_prob']
+PICK_COLUMNS = ['game_id', 'season_year', 'week', 'pick_team_id', 'confidence_points',
+                'win_probability', 'total_points_prediction', 'is_correct']
+
+def load_settled_games(db_manager: DatabaseManager, start_year: int, end_year: int,
+                       max_week: int = 18) -> pd.DataFrame:
+    """Regular-season games with final scores, in season/week order"""
+    
+    with db_manager.get_connection() as conn:
+        return pd.read_sql_query("""
+            SELECT g.id AS game_id, g.season_year, g.week, g.home_team_id, g.away_team_id,
+                   g.home_score, g.away_score
+            FROM games g
+            WHERE g.season_year BETWEEN ? AND ?
+            AND g.week <= ?
+            AND g.home_score IS NOT NULL AND g.away_score IS NOT NULL
+            ORDER BY g.season_year, g.week, g.id
+        """, conn, params=(start_year, end_year, max_week))
+
+def moneyline_to_prob(moneyline: np.ndarray) -> np.ndarray:
+    """Implied probability from American odds (vectorized)"""
+    
+    moneyline = np.asarray(moneyline, dtype=float)
+    return np.where(moneyline > 0, 100 / (moneyline + 100), -moneyline / (-moneyline + 100))
+
+# ----------------------- Odds -----------------------
+
+def margin_odds(games: pd.DataFrame, rng: np.random.Generator) -> pd.DataFrame:
+    """Moneylines drawn from the range of the game's margin tier, favorite = winner.
+    
+    Totals are drawn from 40-60 rather than the final score.
+    """
+    
+    home_score = games['home_score'].to_numpy()
+    away_score = games['away_score'].to_numpy()
+    home_won = home_score > away_score
+    tier = np.searchsorted(MARGIN_TIER_EDGES, np.abs(home_score - away_score), side='right')
+    
+    favorite_ml = rng.integers(FAVORITE_ML_RANGES[tier, 0], FAVORITE_ML_RANGES[tier, 1], endpoint=True)
+    underdog_ml = rng.integers(UNDERDOG_ML_RANGES[tier, 0], UNDERDOG_ML_RANGES[tier, 1], endpoint=True)
+    total_points = rng.integers(40, 60, size=len(games), endpoint=True)
+    
+    home_ml = np.where(home_won, favorite_ml, underdog_ml)
+    away_ml = np.where(home_won, underdog_ml, favorite_ml)
+    return pd.DataFrame({
+        'game_id': games['game_id'].to_numpy(),
+        'home_ml': home_ml,
+        'away_ml': away_ml,
+        'total_points': total_points,
+        'home_win_prob': moneyline_to_prob(home_ml),
+        'away_win_prob': moneyline_to_prob(away_ml)
+    })
+
+def point_diff_odds(games: pd.DataFrame, rng: np.random.Generator) -> pd.DataFrame:
+    """Moneylines scaled by the final point differential (±20 jitter), de-vigged probabilities"""
+    
+    point_diff = (games['home_score'] - games['away_score']).to_numpy()
+    spread = np.abs(point_diff) * 10
+    home_won = point_diff > 0
+    
+    home_ml = np.where(home_won, -150 - spread, 130 + spread) + rng.integers(-20, 20, len(games), endpoint=True)
+    away_ml = np.where(home_won, 130 + spread, -150 - spread) + rng.integers(-20, 20, len(games), endpoint=True)
+    
+    home_prob = moneyline_to_prob(home_ml)
+    away_prob = moneyline_to_prob(away_ml)
+    total_prob = home_prob + away_prob
+    return pd.DataFrame({
+        'game_id': games['game_id'].to_numpy(),
+        'home_ml': home_ml,
+        'away_ml': away_ml,
+        'total_points': (games['home_score'] + games['away_score']).to_numpy(),
+        'home_win_prob': home_prob / total_prob,
+        'away_win_prob': away_prob / total_prob
+    })
+
+# ----------------------- Pick scenarios -----------------------
+
+def _pick_frame(games: pd.DataFrame, odds: pd.DataFrame, game_index: np.ndarray, pick_home: np.ndarray,
+                confidence: np.ndarray) -> pd.DataFrame:
+    """Pick rows for (game position, side, confidence) arrays, grouped by game in input order"""
+    
+    order = np.argsort(game_index, kind='stable')
+    game_index, pick_home, confidence = game_index[order], pick_home[order], confidence[order]
+    
+    home_won = (games['home_score'] > games['away_score']).to_numpy()[game_index]
+    return pd.DataFrame({
+        'game_id': games['game_id'].to_numpy()[game_index],
+        'season_year': games['season_year'].to_numpy()[game_index],
+        'week': games['week'].to_numpy()[game_index],
+        'pick_team_id': np.where(pick_home, games['home_team_id'].to_numpy()[game_index],
+                                 games['away_team_id'].to_numpy()[game_index]),
+        'confidence_points': confidence,
+        'win_probability': np.where(pick_home, odds['home_win_prob'].to_numpy()[game_index],
+                                    odds['away_win_prob'].to_numpy()[game_index]),
+        'total_points_prediction': odds['total_points'].to_numpy()[game_index],
+        'is_correct': (pick_home == home_won).astype(int)
+    })
+
+def margin_pick_scenarios(games: pd.DataFrame, odds: pd.DataFrame, rng: np.random.Generator,
+                          upset_rate: float = 0.15, variance_rate: float = 0.3) -> pd.DataFrame:
+    """Per game: the winner at margin-based confidence, sometimes an upset pick
+    of the loser, sometimes a second winner pick with ±2 confidence variance"""
+    
+    n_games = len(games)
+    home_won = (games['home_score'] > games['away_score']).to_numpy()
+    tier = np.searchsorted(MARGIN_TIER_EDGES,
+                           np.abs((games['home_score'] - games['away_score']).to_numpy()), side='right')
+    
+    upset = rng.random(n_games) < upset_rate
+    varied = rng.random(n_games) < variance_rate
+    variance = rng.integers(-2, 2, n_games, endpoint=True)
+    
+    positions = np.arange(n_games)
+    return _pick_frame(
+        games, odds,
+        np.concatenate([positions, positions[upset], positions[varied]]),
+        np.concatenate([home_won, ~home_won[upset], home_won[varied]]),
+        np.concatenate([WINNER_CONFIDENCE[tier], LOSER_CONFIDENCE[tier][upset],
+                        np.clip(WINNER_CONFIDENCE[tier] + variance, 1, 16)[varied]])
+    )
+
+def favorite_pick_scenarios(games: pd.DataFrame, odds: pd.DataFrame, rng: np.random.Generator,
+                            picks_per_game: int = 16, underdog_rate: float = 0.1) -> pd.DataFrame:
+    """Per game: one pick at every confidence level, on the favorite except
+    for an underdog_rate share flipped to the underdog"""
+    
+    n_games = len(games)
+    favorite_home = (odds['home_win_prob'] > odds['away_win_prob']).to_numpy()
+    flipped = rng.random((n_games, picks_per_game)) < underdog_rate
+    
+    return _pick_frame(
+        games, odds,
+        np.repeat(np.arange(n_games), picks_per_game),
+        (favorite_home[:, None] != flipped).ravel(),
+        np.tile(np.arange(1, picks_per_game + 1), n_games)
+    )
+
+# ----------------------- Storage -----------------------
+
+def fingerprint(odds: pd.DataFrame, picks: pd.DataFrame) -> str:
+    """SHA-256 over the generated values; equal seeds give equal fingerprints"""
+    
+    digest = hashlib.sha256()
+    for frame, columns in ((odds, ODDS_COLUMNS), (picks, PICK_COLUMNS)):
+        for column in columns:
+            values = frame[column].to_numpy()
+            digest.update(np.ascontiguousarray(values, dtype=float if values.dtype.kind == 'f' else np.int64))
+    return digest.hexdigest()
+
+def write_synthetic_data(db_manager: DatabaseManager, odds: pd.DataFrame, picks: pd.DataFrame,
+                         bookmaker: str, clear_existing: bool = False) -> Tuple[int, int]:
+    """Insert odds and picks (optionally replacing all existing ones) in one transaction"""
+    
+    odds_rows = list(zip(odds['game_id'].tolist(), [bookmaker] * len(odds),
+                         *(odds[column].tolist() for column in ODDS_COLUMNS[1:]),
+                         [SYNTHETIC_TIMESTAMP] * len(odds)))
+    pick_rows = list(zip(*(picks[column].tolist() for column in PICK_COLUMNS)))
+    
+    with db_manager.get_connection() as conn:
+        cursor = conn.cursor()
+        if clear_existing:
+            cursor.execute('DELETE FROM picks')
+            cursor.execute('DELETE FROM odds')
+        cursor.executemany("""
+            INSERT INTO odds
+            (game_id, bookmaker, home_ml, away_ml, total_points,
+             home_win_prob, away_win_prob, timestamp)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, odds_rows)
+        cursor.executemany("""
+            INSERT INTO picks
+            (game_id, season_year, week, pick_team_id, confidence_points,
+             win_probability, total_points_prediction, is_correct)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, pick_rows)
+        conn.commit()
+    
+    return len(odds_rows), len(pick_rows)
@@ -1,9 +1,52 @@
 #!/usr/bin/env python3
 """
 Team name mapper for handling historical team name changes and variations.
-Maps old team names to current standardized names.
+Maps old team names, nicknames, cities and every source's abbreviations
+(ESPN, CBS, Odds API, Pro Football Reference, pool sheets) to current
+standardized names through one casefolded alias index built up front, so
+each lookup is a single dict probe.
 """
 
+from typing import Iterable, List, Optional
+
+import pandas as pd
+
+# Aliases per current team beyond its full name and standard abbreviation
+TEAM_ALIASES = {
+    'Arizona Cardinals': ['Cardinals', 'Arizona', 'ARZ', 'Phoenix Cardinals', 'St. Louis Cardinals'],
+    'Atlanta Falcons': ['Falcons', 'Atlanta'],
+    'Baltimore Ravens': ['Ravens', 'Baltimore', 'BLT', 'RAV'],
+    'Buffalo Bills': ['Bills', 'Buffalo'],
+    'Carolina Panthers': ['Panthers', 'Carolina'],
+    'Chicago Bears': ['Bears', 'Chicago'],
+    'Cincinnati Bengals': ['Bengals', 'Cincinnati'],
+    'Cleveland Browns': ['Browns', 'Cleveland', 'CLV'],
+    'Dallas Cowboys': ['Cowboys', 'Dallas'],
+    'Denver Broncos': ['Broncos', 'Denver'],
+    'Detroit Lions': ['Lions', 'Detroit'],
+    'Green Bay Packers': ['Packers', 'Green Bay', 'GNB'],
+    'Houston Texans': ['Texans', 'Houston', 'HST', 'HTX'],
+    'Indianapolis Colts': ['Colts', 'Indianapolis', 'CLT', 'Baltimore Colts'],
+    'Jacksonville Jaguars': ['Jaguars', 'Jacksonville', 'JAC'],
+    'Kansas City Chiefs': ['Chiefs', 'Kansas City', 'KAN'],
+    'Las Vegas Raiders': ['Raiders', 'Las Vegas', 'LVR', 'OAK', 'RAI', 'Oakland', 'Los Angeles Raiders'],
+    'Los Angeles Chargers': ['Chargers', 'LA Chargers', 'SD', 'SDG', 'San Diego', 'San Diego Chargers'],
+    'Los Angeles Rams': ['Rams', 'LA Rams', 'LA', 'RAM', 'STL', 'St. Louis Rams', 'St Louis Rams'],
+    'Miami Dolphins': ['Dolphins', 'Miami'],
+    'Minnesota Vikings': ['Vikings', 'Minnesota'],
+    'New England Patriots': ['Patriots', 'New England', 'NWE', 'Boston Patriots'],
+    'New Orleans Saints': ['Saints', 'New Orleans', 'NOR'],
+    'New York Giants': ['Giants', 'NY Giants'],
+    'New York Jets': ['Jets', 'NY Jets'],
+    'Philadelphia Eagles': ['Eagles', 'Philadelphia'],
+    'Pittsburgh Steelers': ['Steelers', 'Pittsburgh'],
+    'San Francisco 49ers': ['49ers', 'Niners', 'San Francisco', 'SFO'],
+    'Seattle Seahawks': ['Seahawks', 'Seattle'],
+    'Tampa Bay Buccaneers': ['Buccaneers', 'Bucs', 'Tampa Bay', 'TAM'],
+    'Tennessee Titans': ['Titans', 'Tennessee', 'OTI', 'Houston Oilers', 'Tennessee Oilers'],
+    'Washington Commanders': ['Commanders', 'WAS', 'Redskins'],
+}
+
 class TeamNameMapper:
     """Maps historical team names to current standardized names"""
     
@@ -64,28 +107,39 @@ class TeamNameMapper:
             'Tennessee Titans': {'abbreviation': 'TEN', 'conference': 'AFC', 'division': 'South'},
             'Washington Commanders': {'abbreviation': 'WSH', 'conference': 'NFC', 'division': 'East'},
         }
+        
+        # Casefolded alias -> current name (None for Pro Bowl teams)
+        self.alias_index = {}
+        for team_name, info in self.current_teams.items():
+            for alias in [team_name, info['abbreviation']] + TEAM_ALIASES.get(team_name, []):
+                self.alias_index[alias.casefold()] = team_name
+        for old_name, current_name in self.team_mappings.items():
+            self.alias_index[old_name.casefold()] = current_name
+    
+    def resolve(self, team_name: str) -> Optional[str]:
+        """Current name for any alias; None for unknown names and Pro Bowl teams"""
+        if not isinstance(team_name, str):
+            return None
+        return self.alias_index.get(team_name.strip().casefold())
+    
+    def resolve_many(self, team_names: Iterable[str]):
+        """resolve() over a column: a Series maps each distinct value once, anything else gives a list"""
+        if isinstance(team_names, pd.Series):
+            return team_names.map({name: self.resolve(name) for name in team_names.dropna().unique()})
+        return [self.resolve(name) for name in team_names]
+    
+    def abbreviation(self, team_name: str) -> Optional[str]:
+        """Standard abbreviation (as stored in the teams table) for any alias"""
+        info = self.get_team_info(team_name)
+        return info['abbreviation'] if info else None
     
     def map_team_name(self, team_name: str) -> str:
         """Map historical team name to current standardized name"""
         if not team_name:
             return None
-            
-        # Check direct mapping first
-        if team_name in self.team_mappings:
-            return self.team_mappings[team_name]
-        
-        # If it's already a current team name, return as-is
-        if team_name in self.current_teams:
-            return team_name
-        
-        # Try case-insensitive matching
-        team_name_lower = team_name.lower()
-        for current_team in self.current_teams.keys():
-            if current_team.lower() == team_name_lower:
-                return current_team
         
-        # If no mapping found, return original (might be a new team or error)
-        return team_name
+        # If no alias matches, return original (might be a new team or error)
+        return self.alias_index.get(team_name.strip().casefold(), team_name)
     
     def is_valid_team(self, team_name: str) -> bool:
         """Check if team name is valid (not Pro Bowl, etc.)"""
@@ -115,7 +169,10 @@ def main():
         'AFC All-Stars',
         'NFC All-Stars',
         'Las Vegas Raiders',
-        'Kansas City Chiefs'
+        'Kansas City Chiefs',
+        'WAS',
+        'JAC',
+        'Niners'
     ]
     
     print("🧪 Testing team name mapper:")
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Team performance rollup: populates team_performance from games.
+One INSERT ... SELECT with window functions computes, per team per week,
+season-to-date games, wins, losses, points for/against, point differential and
+win percentage, plus the same over the team's last ROLLING_GAMES games (across
+seasons). Game changes are read from change_log, so an update rewrites only
+the affected teams' rows from the earliest changed week onward.
+"""
+
+import argparse
+import time
+from typing import Dict, Optional
+
+from database_manager import DatabaseManager
+from change_data_capture import ChangeLogConsumer
+from elo_ratings import RESULTS_FILTER
+
+CONSUMER_NAME = "team_performance"
+ROLLING_GAMES = 4
+
+# Rows for every team in affected_teams from its from_slot (season_year * 100 + week) onward
+ROLLUP_SQL = f"""
+    INSERT INTO team_performance
+    (team_id, season_year, week, games_played, wins, losses, points_scored, points_allowed,
+     point_differential, win_percentage, rolling_games, rolling_wins, rolling_losses,
+     rolling_point_differential, rolling_win_percentage)
+    WITH team_games AS (
+        SELECT home_team_id AS team_id, season_year, week,
+               home_score AS points_scored, away_score AS points_allowed
+        FROM games WHERE {RESULTS_FILTER}
+        UNION ALL
+        SELECT away_team_id, season_year, week, away_score, home_score
+        FROM games WHERE {RESULTS_FILTER}
+    ),
+    team_weeks AS (
+        SELECT team_id, season_year, week,
+               COUNT(*) AS games,
+               SUM(points_scored > points_allowed) AS wins,
+               SUM(points_scored < points_allowed) AS losses,
+               SUM(points_scored) AS points_scored,
+               SUM(points_allowed) AS points_allowed
+        FROM team_games
+        WHERE team_id IN (SELECT team_id FROM affected_teams)
+        GROUP BY team_id, season_year, week
+    ),
+    rolled AS (
+        SELECT team_id, season_year, week,
+               SUM(games) OVER season_to_date AS games_played,
+               SUM(wins) OVER season_to_date AS wins,
+               SUM(losses) OVER season_to_date AS losses,
+               SUM(points_scored) OVER season_to_date AS points_scored,
+               SUM(points_allowed) OVER season_to_date AS points_allowed,
+               SUM(games) OVER recent AS rolling_games,
+               SUM(wins) OVER recent AS rolling_wins,
+               SUM(losses) OVER recent AS rolling_losses,
+               SUM(points_scored - points_allowed) OVER recent AS rolling_points_net
+        FROM team_weeks
+        WINDOW season_to_date AS (PARTITION BY team_id, season_year ORDER BY week
+                                  ROWS UNBOUNDED PRECEDING),
+               recent AS (PARTITION BY team_id ORDER BY season_year, week
+                          ROWS BETWEEN {ROLLING_GAMES - 1} PRECEDING AND CURRENT ROW)
+    )
+    SELECT r.team_id, r.season_year, r.week, r.games_played, r.wins, r.losses,
+           r.points_scored, r.points_allowed, r.points_scored - r.points_allowed,
+           -- Ties count as half a win
+           (r.wins + 0.5 * (r.games_played - r.wins - r.losses)) / r.games_played,
+           r.rolling_games, r.rolling_wins, r.rolling_losses,
+           1.0 * r.rolling_points_net / r.rolling_games,
+           (r.rolling_wins + 0.5 * (r.rolling_games - r.rolling_wins - r.rolling_losses)) / r.rolling_games
+    FROM rolled r
+    JOIN affected_teams a ON r.team_id = a.team_id
+    WHERE r.season_year * 100 + r.week >= a.from_slot
+"""
+
+class TeamPerformanceRollup:
+    """Keeps team_performance in step with scored games"""
+    
+    def __init__(self, db_manager: DatabaseManager):
+        self.db_manager = db_manager
+        self.consumer = ChangeLogConsumer(db_manager, CONSUMER_NAME, tables=['games'])
+    
+    def rebuild(self) -> Dict:
+        """Recompute every team-week of every season"""
+        
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT id FROM teams")
+            affected = {team_id: 0 for (team_id,) in cursor.fetchall()}
+            cursor.execute("SELECT COALESCE(MAX(id), 0) FROM change_log")
+            last_change_id = cursor.fetchone()[0]
+        
+        summary = self._rewrite(affected)
+        self.db_manager.set_change_checkpoint(CONSUMER_NAME, last_change_id)
+        return summary
+    
+    def update(self) -> Dict:
+        """Rewrite only the team-weeks affected by game changes since the last run"""
+        
+        if self.db_manager.get_change_checkpoint(CONSUMER_NAME) == 0 and self._is_empty():
+            return self.rebuild()
+        
+        batch = self.consumer.poll()
+        if not batch['changes']:
+            return {'teams': 0, 'rows': 0, 'seconds': 0.0}
+        
+        summary = self._rewrite(self._affected_teams(batch))
+        self.consumer.commit(batch)
+        return summary
+    
+    def _is_empty(self) -> bool:
+        """Whether team_performance has no rows yet"""
+        
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1 FROM team_performance LIMIT 1")
+            return cursor.fetchone() is None
+    
+    def _affected_teams(self, batch: Dict) -> Dict[int, int]:
+        """Earliest changed slot per team for a change batch"""
+        
+        affected = {}
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            for change in batch['changes']:
+                slot = change['season_year'] * 100 + change['week']
+                cursor.execute("SELECT home_team_id, away_team_id FROM games WHERE id = ?",
+                               (change['game_id'],))
+                teams = cursor.fetchone()
+                if teams is None:
+                    # Deleted game: its teams are unknown, so every team is redone from that week
+                    cursor.execute("SELECT id FROM teams")
+                    teams = [team_id for (team_id,) in cursor.fetchall()]
+                for team_id in teams:
+                    affected[team_id] = min(slot, affected.get(team_id, slot))
+        return affected
+    
+    def _rewrite(self, affected: Dict[int, int]) -> Dict:
+        """Delete and recompute affected teams' rows from their from_slot onward"""
+        
+        started = time.perf_counter()
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("CREATE TEMP TABLE affected_teams (team_id INTEGER PRIMARY KEY, from_slot INTEGER)")
+            cursor.executemany("INSERT INTO affected_teams VALUES (?, ?)", affected.items())
+            cursor.execute("""
+                DELETE FROM team_performance
+                WHERE team_id IN (SELECT team_id FROM affected_teams)
+                AND season_year * 100 + week >= (
+                    SELECT from_slot FROM affected_teams a WHERE a.team_id = team_performance.team_id)
+            """)
+            cursor.execute(ROLLUP_SQL)
+            rows = cursor.rowcount
+            cursor.execute("DROP TABLE affected_teams")
+            conn.commit()
+        
+        return {'teams': len(affected), 'rows': rows, 'seconds': time.perf_counter() - started}
+
+def main():
+    """Team performance rollup CLI"""
+    
+    parser = argparse.ArgumentParser(description="Populate team_performance from scored games")
+    parser.add_argument("--rebuild", action="store_true", help="Recompute every season")
+    args = parser.parse_args()
+    
+    rollup = TeamPerformanceRollup(DatabaseManager(version="v2"))
+    summary = rollup.rebuild() if args.rebuild else rollup.update()
+    if summary['rows']:
+        print(f"📊 Wrote {summary['rows']} team-weeks for {summary['teams']} teams "
+              f"in {summary['seconds'] * 1000:.0f} ms")
+    else:
+        print("✅ team_performance is current")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Rest, travel and time-zone features for every game in the schedule.
+Each game becomes one row per team, and grouped shift/window operations over
+each team's season give days of rest, short weeks, byes and consecutive road
+games; the static stadium table gives time zones crossed and travel miles.
+Results live in game_travel_features (one row per game, home_/away_ columns)
+and only seasons with new schedule rows are recomputed.
+"""
+
+import argparse
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from database_manager import DatabaseManager
+from elo_ratings import WINNER_LISTED_SEASONS
+
+# Home stadiums: latitude, longitude, standard UTC offset
+STADIUMS = {
+    'ARI': (33.528, -112.263, -7), 'ATL': (33.755, -84.401, -5), 'BAL': (39.278, -76.623, -5),
+    'BUF': (42.774, -78.787, -5), 'CAR': (35.226, -80.853, -5), 'CHI': (41.862, -87.617, -6),
+    'CIN': (39.095, -84.516, -5), 'CLE': (41.506, -81.700, -5), 'DAL': (32.748, -97.093, -6),
+    'DEN': (39.744, -105.020, -7), 'DET': (42.340, -83.046, -5), 'GB': (44.501, -88.062, -6),
+    'HOU': (29.685, -95.411, -6), 'IND': (39.760, -86.164, -5), 'JAX': (30.324, -81.637, -5),
+    'KC': (39.049, -94.484, -6), 'LAC': (33.953, -118.339, -8), 'LAR': (33.953, -118.339, -8),
+    'LV': (36.091, -115.184, -8), 'MIA': (25.958, -80.239, -5), 'MIN': (44.974, -93.258, -6),
+    'NE': (42.091, -71.264, -5), 'NO': (29.951, -90.081, -6), 'NYG': (40.813, -74.074, -5),
+    'NYJ': (40.813, -74.074, -5), 'PHI': (39.901, -75.168, -5), 'PIT': (40.447, -80.016, -5),
+    'SEA': (47.595, -122.332, -8), 'SF': (37.403, -121.970, -8), 'TB': (27.976, -82.503, -5),
+    'TEN': (36.166, -86.771, -6), 'WSH': (38.908, -76.864, -5)
+}
+
+# International venues
+INTERNATIONAL_VENUES = {
+    'London': (51.556, -0.280, 0), 'Dublin': (53.335, -6.228, 0), 'Munich': (48.219, 11.625, 1),
+    'Frankfurt': (50.069, 8.645, 1), 'Berlin': (52.515, 13.239, 1), 'Madrid': (40.453, -3.688, 1),
+    'Mexico City': (19.303, -99.151, -6), 'Sao Paulo': (-23.545, -46.474, -3)
+}
+
+# International games not flagged in the games table: (season, week, teams) -> venue
+KNOWN_INTERNATIONAL_GAMES = {
+    (2025, 1, frozenset({'KC', 'LAC'})): 'Sao Paulo',
+    (2025, 4, frozenset({'MIN', 'PIT'})): 'Dublin',
+    (2025, 5, frozenset({'MIN', 'CLE'})): 'London',
+    (2025, 6, frozenset({'DEN', 'NYJ'})): 'London',
+    (2025, 7, frozenset({'LAR', 'JAX'})): 'London',
+    (2025, 10, frozenset({'ATL', 'IND'})): 'Berlin',
+    (2025, 11, frozenset({'WSH', 'MIA'})): 'Madrid'
+}
+
+SHORT_WEEK_DAYS = 5   # Thursday after Sunday, or tighter
+BYE_REST_DAYS = 13    # Two weeks between games
+EARTH_RADIUS_MILES = 3958.8
+
+FEATURE_COLUMNS = [
+    'game_id', 'season_year', 'week', 'venue', 'is_international', 'is_neutral_site', 'venue_known',
+    'date_estimated', 'home_rest_days', 'away_rest_days', 'rest_advantage', 'home_short_week',
+    'away_short_week', 'home_off_bye', 'away_off_bye', 'home_road_streak', 'away_road_streak',
+    'home_tz_crossed', 'away_tz_crossed', 'home_travel_miles', 'away_travel_miles'
+]
+
+def load_schedule(db_manager: DatabaseManager, seasons: Optional[List[int]] = None) -> pd.DataFrame:
+    """All games (or those of some seasons) with team abbreviations and venue flags"""
+    
+    season_filter = f"WHERE g.season_year IN ({','.join('?' * len(seasons))})" if seasons else ""
+    with db_manager.get_connection() as conn:
+        return pd.read_sql_query(f"""
+            SELECT g.id AS game_id, g.season_year, g.week, g.game_date,
+                   g.home_team_id, g.away_team_id, ht.abbreviation AS home_abbr, at.abbreviation AS away_abbr,
+                   COALESCE(g.is_international, 0) AS is_international, g.international_location,
+                   g.season_year NOT IN ({WINNER_LISTED_SEASONS}) AS venue_known
+            FROM games g
+            JOIN teams ht ON g.home_team_id = ht.id
+            JOIN teams at ON g.away_team_id = at.id
+            {season_filter}
+            ORDER BY g.season_year, g.week, g.id
+        """, conn, params=seasons or [])
+
+def kickoff_sunday(season_year: int) -> pd.Timestamp:
+    """Sunday of week 1: the Sunday after Labor Day (first Monday of September)"""
+    
+    september_first = pd.Timestamp(year=season_year, month=9, day=1)
+    labor_day = september_first + pd.Timedelta(days=(7 - september_first.weekday()) % 7)
+    return labor_day + pd.Timedelta(days=6)
+
+def game_dates(schedule: pd.DataFrame) -> tuple:
+    """(dates, estimated) with placeholder dates replaced by the week's nominal Sunday"""
+    
+    dates = pd.to_datetime(schedule['game_date'], errors='coerce')
+    # Imported seasons carry a January 1 placeholder instead of the real date
+    placeholder = dates.isna() | ((dates.dt.month == 1) & (dates.dt.day == 1) &
+                                  (dates.dt.year == schedule['season_year']))
+    
+    kickoffs = schedule['season_year'].map({season: kickoff_sunday(season)
+                                            for season in schedule['season_year'].unique()})
+    nominal = kickoffs + pd.to_timedelta((schedule['week'] - 1) * 7, unit='D')
+    return dates.where(~placeholder, nominal), placeholder
+
+def haversine_miles(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Great-circle distance in miles (vectorized)"""
+    
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(value, dtype=float)) for value in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(a))
+
+def compute_travel_features(schedule: pd.DataFrame) -> pd.DataFrame:
+    """One feature row per game from full-season schedules"""
+    
+    games = schedule.copy()
+    games['date'], games['date_estimated'] = game_dates(games)
+    
+    # Venue: international location, else the listed home stadium when home/away is a real venue
+    known_location = [KNOWN_INTERNATIONAL_GAMES.get((season, week, frozenset({home, away})))
+                      for season, week, home, away in
+                      zip(games['season_year'], games['week'], games['home_abbr'], games['away_abbr'])]
+    games['international_location'] = games['international_location'].fillna(pd.Series(known_location,
+                                                                                        index=games.index))
+    games['is_international'] = (games['is_international'].astype(bool) |
+                                 games['international_location'].notna()).astype(int)
+    games['venue'] = np.where(games['is_international'] == 1, games['international_location'],
+                              np.where(games['venue_known'] == 1, games['home_abbr'], None))
+    
+    # The Super Bowl (last game of a season with playoff weeks) is neutral too
+    last_week = games.groupby('season_year')['week'].transform('max')
+    super_bowl = (games['week'] == last_week) & (last_week >= 21)
+    games['is_neutral_site'] = ((games['is_international'] == 1) | super_bowl).astype(int)
+    
+    # Stale copies of a game (same teams within a few days, filed under another week)
+    # stay out of the windows and take the features of the later-week copy
+    matchup = ['season_year', 'home_team_id', 'away_team_id']
+    ordered = games.sort_values(matchup + ['week', 'game_id'])
+    following = ordered.groupby(matchup)[['game_id', 'date']].shift(-1)
+    is_copy = following['game_id'].notna() & ((following['date'] - ordered['date']).abs() <= pd.Timedelta(days=3))
+    twin_of = dict(zip(ordered.loc[is_copy, 'game_id'], following.loc[is_copy, 'game_id'].astype(int)))
+    duplicate = games['game_id'].isin(twin_of)
+    
+    # One row per team per game
+    sides = []
+    for side in ('home', 'away'):
+        team_rows = games.loc[~duplicate, ['game_id', 'season_year', 'week', 'date', 'venue']].copy()
+        team_rows['side'] = side
+        team_rows['team_id'] = games.loc[~duplicate, f'{side}_team_id']
+        team_rows['team_abbr'] = games.loc[~duplicate, f'{side}_abbr']
+        sides.append(team_rows)
+    long = pd.concat(sides, ignore_index=True)
+    
+    locations = {**STADIUMS, **INTERNATIONAL_VENUES}
+    venue_lat, venue_lon, venue_tz = (long['venue'].map({name: loc[i] for name, loc in locations.items()})
+                                      for i in range(3))
+    team_lat, team_lon, team_tz = (long['team_abbr'].map({name: loc[i] for name, loc in STADIUMS.items()})
+                                   for i in range(3))
+    long['tz_crossed'] = (venue_tz - team_tz).abs()
+    long['travel_miles'] = haversine_miles(team_lat, team_lon, venue_lat, venue_lon).round(0)
+    
+    # Road game: anywhere but the team's own stadium (unknown when the venue is)
+    same_stadium = long['travel_miles'] == 0
+    long['is_road'] = np.where(long['venue'].isna(), np.nan, (~same_stadium).astype(float))
+    
+    long = long.sort_values(['team_id', 'season_year', 'date', 'week'], kind='stable')
+    by_team_season = long.groupby(['team_id', 'season_year'], sort=False)
+    long['rest_days'] = by_team_season['date'].diff().dt.days
+    long['short_week'] = (long['rest_days'] <= SHORT_WEEK_DAYS).astype(int)
+    long['off_bye'] = (long['rest_days'] >= BYE_REST_DAYS).astype(int)
+    
+    # Consecutive road games: run length of is_road within each team-season
+    road = long['is_road'].fillna(-1)
+    run_id = (road != by_team_season['is_road'].shift().fillna(-1)).cumsum()
+    long['road_streak'] = np.where(road == 1, long.groupby(run_id).cumcount() + 1, 0)
+    long.loc[long['is_road'].isna(), 'road_streak'] = np.nan
+    
+    # Back to one row per game
+    per_side = long.set_index(['game_id', 'side'])[
+        ['rest_days', 'short_week', 'off_bye', 'road_streak', 'tz_crossed', 'travel_miles']].unstack('side')
+    per_side.columns = [f'{side}_{feature}' for feature, side in per_side.columns]
+    latest_copy = {game_id: twin for game_id, twin in twin_of.items()}
+    for game_id, twin in latest_copy.items():
+        while twin in twin_of:  # Chains of copies resolve to the last one
+            twin = twin_of[twin]
+        latest_copy[game_id] = twin
+    per_side = per_side.reindex(games['game_id'].map(lambda game_id: latest_copy.get(game_id, game_id)))
+    per_side.index = games['game_id']
+    
+    features = games.set_index('game_id')[
+        ['season_year', 'week', 'venue', 'is_international', 'is_neutral_site', 'venue_known', 'date_estimated']
+    ].join(per_side).reset_index()
+    features['date_estimated'] = features['date_estimated'].astype(int)
+    features['rest_advantage'] = features['home_rest_days'] - features['away_rest_days']
+    
+    # Travel is meaningless where the venue is unknown
+    for column in ('home_tz_crossed', 'away_tz_crossed', 'home_travel_miles', 'away_travel_miles'):
+        features.loc[features['venue'].isna(), column] = np.nan
+    return features[FEATURE_COLUMNS]
+
+class TravelFeatureEngine:
+    """Keeps game_travel_features in step with the games table"""
+    
+    def __init__(self, db_manager: DatabaseManager):
+        self.db_manager = db_manager
+        self._international = None
+    
+    def update(self, rebuild: bool = False) -> Dict:
+        """Recompute features for seasons with games that have none yet (or all seasons)"""
+        
+        started = time.perf_counter()
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT DISTINCT season_year FROM games
+                {'' if rebuild else 'WHERE id NOT IN (SELECT game_id FROM game_travel_features)'}
+            """)
+            seasons = sorted(row[0] for row in cursor.fetchall())
+        if not seasons:
+            return {'seasons': [], 'games': 0, 'seconds': time.perf_counter() - started}
+        
+        # Shift features need each team's whole season, so affected seasons are redone together
+        features = compute_travel_features(load_schedule(self.db_manager, seasons))
+        rows = [tuple(None if pd.isna(value) else value.item() if hasattr(value, 'item') else value
+                      for value in row)
+                for row in features.itertuples(index=False)]
+        
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"DELETE FROM game_travel_features WHERE season_year IN ({','.join('?' * len(seasons))})",
+                           seasons)
+            cursor.executemany(f"""
+                INSERT INTO game_travel_features ({', '.join(FEATURE_COLUMNS)})
+                VALUES ({', '.join('?' * len(FEATURE_COLUMNS))})
+            """, rows)
+            conn.commit()
+        
+        self._international = None
+        return {'seasons': seasons, 'games': len(rows), 'seconds': time.perf_counter() - started}
+    
+    def get_features(self, season_year: int, week: Optional[int] = None) -> pd.DataFrame:
+        """Stored features with team names for a season (or one week)"""
+        
+        query = """
+            SELECT ht.name AS home_team, at.name AS away_team, tf.*
+            FROM game_travel_features tf
+            JOIN games g ON tf.game_id = g.id
+            JOIN teams ht ON g.home_team_id = ht.id
+            JOIN teams at ON g.away_team_id = at.id
+            WHERE tf.season_year = ?
+        """
+        params = [season_year]
+        if week is not None:
+            query += " AND tf.week = ?"
+            params.append(week)
+        with self.db_manager.get_connection() as conn:
+            return pd.read_sql_query(query + " ORDER BY tf.week, tf.game_id", conn, params=params)
+    
+    def is_international(self, season_year: int, week: int, home_team: str, away_team: str) -> bool:
+        """Whether a scheduled game is played abroad, from the stored features.
+        
+        Read-only: games added since the last update() (or travel_features.py
+        run) are not known yet and count as domestic.
+        """
+        
+        if self._international is None:
+            with self.db_manager.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT tf.season_year, tf.week, ht.name, at.name
+                    FROM game_travel_features tf
+                    JOIN games g ON tf.game_id = g.id
+                    JOIN teams ht ON g.home_team_id = ht.id
+                    JOIN teams at ON g.away_team_id = at.id
+                    WHERE tf.is_international = 1
+                """)
+                self._international = {(season, week, frozenset({home, away}))
+                                       for season, week, home, away in cursor.fetchall()}
+        return (season_year, week, frozenset({home_team, away_team})) in self._international
+
+def main():
+    """Travel feature CLI"""
+    
+    parser = argparse.ArgumentParser(description="Compute rest, travel and time-zone features for every game")
+    parser.add_argument("--rebuild", action="store_true", help="Recompute every season")
+    parser.add_argument("--season", type=int, help="Show features for a season")
+    parser.add_argument("--week", type=int, help="Restrict --season to one week")
+    args = parser.parse_args()
+    
+    engine = TravelFeatureEngine(DatabaseManager(version="v2"))
+    summary = engine.update(rebuild=args.rebuild)
+    if summary['games']:
+        print(f"✈️  Computed travel features for {summary['games']} games "
+              f"(seasons {', '.join(map(str, summary['seasons']))}) in {summary['seconds'] * 1000:.0f} ms")
+    else:
+        print("✅ Travel features are current")
+    
+    if args.season:
+        features = engine.get_features(args.season, args.week)
+        columns = ['week', 'away_team', 'home_team', 'venue', 'home_rest_days', 'away_rest_days',
+                   'away_road_streak', 'away_tz_crossed', 'away_travel_miles']
+        print(features[columns].to_string(index=False))
+
+if __name__ == "__main__":
+    main()
@@ -2,9 +2,11 @@
 """
 Update picks with actual game results to enable ML training.
 """
+import argparse
 import json
 import os
 from database_manager import DatabaseManager
+from change_data_capture import ChangeLogConsumer
 
 def update_week1_results():
     """Update Week 1 picks with actual results from analysis data"""
@@ -65,8 +67,55 @@ def update_week1_results():
     print(f"✅ Updated {updated_count} picks with results")
     return updated_count > 0
 
+def settle_changed_games(db: DatabaseManager) -> int:
+    """Settle picks and pool results only for games whose rows changed since the last run"""
+    consumer = ChangeLogConsumer(db, "update_pick_results", tables=["games"])
+    batch = consumer.poll()
+    
+    if not batch["game_ids"]:
+        print("✅ No game changes since last run")
+        consumer.commit(batch)
+        return 0
+    
+    print(f"🔄 Settling {len(batch['game_ids'])} changed games...")
+    
+    game_ids = sorted(batch["game_ids"])
+    placeholders = ", ".join("?" for _ in game_ids)
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+        settled = 0
+        for table in ("picks", "pool_results"):
+            cursor.execute(f"""
+                UPDATE {table}
+                SET is_correct = (pick_team_id = (
+                    SELECT winner_team_id FROM games WHERE games.id = {table}.game_id
+                ))
+                WHERE game_id IN ({placeholders})
+                AND game_id IN (SELECT id FROM games WHERE is_completed = 1 AND winner_team_id IS NOT NULL)
+                AND is_correct IS NOT (pick_team_id = (
+                    SELECT winner_team_id FROM games WHERE games.id = {table}.game_id
+                ))
+            """, game_ids)
+            print(f"   {table}: {cursor.rowcount} rows settled")
+            settled += cursor.rowcount
+        conn.commit()
+    
+    consumer.commit(batch)
+    return settled
+
 def main():
     """Update picks with results"""
+    parser = argparse.ArgumentParser(description="Update picks with actual game results")
+    parser.add_argument("--from-changes", action="store_true",
+                        help="Only settle games changed since the last run (change log)")
+    args = parser.parse_args()
+    
+    if args.from_changes:
+        db = DatabaseManager(version="v2")
+        settle_changed_games(db)
+        db.refresh_pool_standings()
+        return
+    
     success = update_week1_results()
     
     if success:
@@ -24,6 +24,9 @@ def update_pool_results_with_outcomes():
     update_week2_outcomes(db_manager)
     update_week3_outcomes(db_manager)
     
+    # Settle materialized standings for the weeks touched above
+    db_manager.refresh_pool_standings()
+    
     print("\n✅ All pool results updated with actual outcomes!")
 
 def update_week1_outcomes(db_manager):
@@ -59,27 +59,14 @@ def generate_participant_summaries(db_manager):
     
     print("\n👥 Generating Participant Summaries...")
     
-    with db_manager.get_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT 
-                participant_name,
-                COUNT(*) as total_picks,
-                SUM(confidence_points) as total_points,
-                AVG(confidence_points) as avg_confidence
-            FROM pool_results 
-            WHERE season_year = 2025
-            GROUP BY participant_name
-            ORDER BY total_points DESC
-        """)
-        
-        results = cursor.fetchall()
-        
-        print(f"  📊 {len(results)} participants across all weeks")
-        print(f"  🏆 Top 10 Overall:")
-        
-        for i, (participant, total_picks, total_points, avg_confidence) in enumerate(results[:10]):
-            print(f"    {i+1}. {participant}: {total_points} pts ({total_picks} picks, {avg_confidence:.1f} avg)")
+    standings = db_manager.get_season_standings(2025)
+    
+    print(f"  📊 {len(standings)} participants across all weeks")
+    print(f"  🏆 Top 10 Overall:")
+    
+    for row in standings[:10]:
+        print(f"    {row['season_rank']}. {row['participant_name']}: {row['cumulative_score']} pts "
+              f"({row['cumulative_correct']}/{row['cumulative_picks']} correct, {row['cumulative_accuracy']}%)")
 
 def generate_spot_check_reports(db_manager):
     """Generate spot-check reports for validation"""
@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+Walk-forward backtesting harness for all pick models.
+For every (season, week) each model is trained only on picks from strictly
+earlier weeks, then picks and stack-ranks that week's games. Folds are scored
+on accuracy and confidence points and run in parallel across processes.
+
+Training features are computed once over all picks and sliced per fold,
+which is leak-free only because every lookup they make is as of the pick's
+own game: team form (get_team_form) covers games before that week, and
+expert consensus, latest odds and travel features (game_travel_features)
+belong to the game itself and are known before kickoff. Label encoders see
+every team name but no outcomes; expert weights in the current-season and
+hybrid models are fixed constants, not fitted per fold. A new feature that
+aggregates across games must be made as-of the fold week before it is
+added to these models.
+
+Forest models train with the winners of hyperparameter_search.py, which were
+tuned on these same folds, so their scores are optimistic; --untuned
+backtests them with their built-in defaults instead.
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from datetime import datetime
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from database_manager import DatabaseManager
+from slate_inference import split_oriented_scores
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+from main import american_to_implied_prob, devig_two_way
+
+MODEL_NAMES = ['odds_baseline', 'nfl_confidence', 'improved', 'current_season', 'hybrid_expert']
+MIN_TRAINING_ROWS = 50
+# Hyperparameter search each model's forest trains with (see hyperparameter_search.py)
+TUNED_SEARCH = {'nfl_confidence': 'nfl_confidence', 'improved': 'improved',
+                'current_season': 'current_season', 'hybrid_expert': 'current_season'}
+CACHE_TABLES = ['games', 'teams', 'odds', 'picks', 'expert_picks', 'team_performance', 'game_travel_features']
+
+# ----------------------- Fold data -----------------------
+
+def load_backtest_data(db_manager: DatabaseManager, cache_dir: str = "data/cache/backtest") -> dict:
+    """Load the training picks and per-week game slates, cached on disk by table versions"""
+    
+    versions = db_manager.get_table_versions(CACHE_TABLES)
+    key = hashlib.sha1(f"{os.path.abspath(db_manager.db_path)}|{versions}".encode()).hexdigest()[:16]
+    cache_path = os.path.join(cache_dir, f"backtest-data-{key}.joblib")
+    
+    if os.path.exists(cache_path):
+        return joblib.load(cache_path)
+    
+    picks = db_manager.get_all_picks_for_ml()
+    
+    with db_manager.get_connection() as conn:
+        games = pd.read_sql_query("""
+            SELECT
+                g.id as game_id,
+                g.season_year,
+                g.week,
+                g.game_date,
+                ht.name as home_team,
+                at.name as away_team,
+                wt.name as winner,
+                o.home_ml,
+                o.away_ml,
+                o.total_points
+            FROM games g
+            JOIN teams ht ON g.home_team_id = ht.id
+            JOIN teams at ON g.away_team_id = at.id
+            JOIN teams wt ON g.winner_team_id = wt.id
+            LEFT JOIN odds o ON o.id = (
+                SELECT id FROM odds WHERE game_id = g.id ORDER BY timestamp DESC LIMIT 1
+            )
+            WHERE g.is_completed = 1
+            ORDER BY g.season_year, g.week, g.game_date
+        """, conn)
+    
+    data = {'picks': picks, 'games': games, 'cache_path': cache_path, 'key': key}
+    os.makedirs(cache_dir, exist_ok=True)
+    joblib.dump(data, cache_path)
+    return data
+
+def training_mask(picks: pd.DataFrame, season_year: int, week: int) -> pd.Series:
+    """Rows strictly before (season_year, week)"""
+    
+    return (picks['season_year'] < season_year) | (
+        (picks['season_year'] == season_year) & (picks['week'] < week))
+
+def trainable(picks: pd.DataFrame, mask: pd.Series) -> bool:
+    """Enough rows, and both outcomes, to fit a model on this fold"""
+    
+    return mask.sum() >= MIN_TRAINING_ROWS and picks.loc[mask, 'is_correct'].nunique() == 2
+
+def games_to_slate(games: pd.DataFrame) -> list:
+    """Convert a week's games frame to the games_data dicts the models take"""
+    
+    slate = []
+    for row in games.itertuples(index=False):
+        game = {
+            'game_id': row.game_id,
+            'home_team': row.home_team,
+            'away_team': row.away_team,
+            'week': row.week,
+            'season_year': row.season_year
+        }
+        # Leave missing odds out so each model applies its own defaults
+        if pd.notna(row.home_ml) and pd.notna(row.away_ml):
+            game['home_ml'] = int(row.home_ml)
+            game['away_ml'] = int(row.away_ml)
+        if pd.notna(row.total_points):
+            game['total_points'] = float(row.total_points)
+        slate.append(game)
+    return slate
+
+# ----------------------- Model adapters -----------------------
+
+class OddsBaselineAdapter:
+    """Odds-only picks from src/main.py: de-vigged moneyline favorite, no training"""
+    
+    needs_training = False
+    
+    def __init__(self, db_manager: DatabaseManager):
+        self.db_manager = db_manager
+    
+    def fit(self, train_df: pd.DataFrame, mask: pd.Series, **regressor_params):
+        pass
+    
+    def predict(self, slate: list) -> list:
+        predictions = []
+        for game in slate:
+            away_prob, home_prob = devig_two_way(
+                american_to_implied_prob(game.get('away_ml')),
+                american_to_implied_prob(game.get('home_ml'))
+            )
+            home_prob = home_prob if home_prob is not None else 0.5
+            away_prob = away_prob if away_prob is not None else 0.5
+            if home_prob >= away_prob:
+                predictions.append((game['home_team'], home_prob))
+            else:
+                predictions.append((game['away_team'], away_prob))
+        return predictions
+
+class SlateModelAdapter:
+    """Models exposing fit(df, X) and predict_slate_scores(games)"""
+    
+    needs_training = True
+    
+    def __init__(self, db_manager: DatabaseManager, model_class):
+        self.model = model_class(db_manager)
+        self.features = None
+    
+    def fit(self, train_df: pd.DataFrame, mask: pd.Series, **regressor_params):
+        if self.features is None:
+            # Every feature lookup is as of the pick's own game (see module docstring),
+            # so compute once over all picks and slice per fold
+            self.features = self.model.prepare_features(train_df)
+        fold_rows = np.asarray(mask)
+        self.model.fit(train_df[fold_rows].reset_index(drop=True),
+                       self.features[fold_rows].reset_index(drop=True),
+                       **{'n_jobs': 1, **regressor_params})
+    
+    def slate_features(self, slate: list) -> pd.DataFrame:
+        """Unscaled 2N feature rows for a slate (independent of hyperparameters)"""
+        return self.model.prepare_slate_features(slate)
+    
+    def score_features(self, X: pd.DataFrame) -> tuple:
+        """(home_scores, away_scores) from slate_features rows"""
+        return split_oriented_scores(self.model.model.predict(self.model.scaler.transform(X)))
+    
+    def predict(self, slate: list) -> list:
+        return pick_sides(slate, *self.score_features(self.slate_features(slate)))
+
+class NFLConfidenceAdapter(SlateModelAdapter):
+    """NFLConfidenceMLModel scores (game, pick_team) rows, so score both sides"""
+    
+    def __init__(self, db_manager: DatabaseManager):
+        from ml_model import NFLConfidenceMLModel
+        self.model = NFLConfidenceMLModel(db_manager)
+        self.features = None
+    
+    def slate_features(self, slate: list) -> pd.DataFrame:
+        rows = []
+        for side in ('home_team', 'away_team'):
+            for game in slate:
+                rows.append({
+                    'home_team': game['home_team'],
+                    'away_team': game['away_team'],
+                    'pick_team': game[side],
+                    'home_ml': game.get('home_ml', -110),
+                    'away_ml': game.get('away_ml', -110),
+                    'week': game['week'],
+                    'season_year': game['season_year']
+                })
+        
+        # prepare_features resets feature_columns to what this frame has
+        fitted_columns = list(self.model.feature_columns)
+        X = self.model.prepare_features(pd.DataFrame(rows)).reindex(columns=fitted_columns)
+        self.model.feature_columns = fitted_columns
+        return X.fillna(X.mean()).fillna(0)
+
+class HybridExpertAdapter(SlateModelAdapter):
+    """HybridExpertModel with its ML fallback retrained per fold"""
+    
+    def __init__(self, db_manager: DatabaseManager):
+        from current_season_model import CurrentSeasonNFLModel
+        from hybrid_expert_model import HybridExpertModel
+        self.hybrid = HybridExpertModel(db_manager)
+        self.model = CurrentSeasonNFLModel(db_manager)
+        self.features = None
+    
+    def fit(self, train_df: pd.DataFrame, mask: pd.Series, **regressor_params):
+        super().fit(train_df, mask, **regressor_params)
+        self.hybrid.ml_model = self.model
+        self.hybrid.ml_available = True
+    
+    def predict(self, slate: list) -> list:
+        # predict_confidence returns its predictions stack-ranked; put them back in slate order
+        by_game = {prediction['game']: prediction for prediction in self.hybrid.predict_confidence(slate)}
+        predictions = [by_game[f"{game['away_team']} @ {game['home_team']}"] for game in slate]
+        return [(prediction['pick'], prediction['win_probability']) for prediction in predictions]
+
+def build_adapter(model_name: str, db_manager: DatabaseManager):
+    """Create the adapter for a model name"""
+    
+    if model_name == 'odds_baseline':
+        return OddsBaselineAdapter(db_manager)
+    if model_name == 'nfl_confidence':
+        return NFLConfidenceAdapter(db_manager)
+    if model_name == 'improved':
+        from improved_ml_model import ImprovedNFLConfidenceMLModel
+        return SlateModelAdapter(db_manager, ImprovedNFLConfidenceMLModel)
+    if model_name == 'current_season':
+        from current_season_model import CurrentSeasonNFLModel
+        return SlateModelAdapter(db_manager, CurrentSeasonNFLModel)
+    if model_name == 'hybrid_expert':
+        return HybridExpertAdapter(db_manager)
+    raise ValueError(f"Unknown model: {model_name}")
+
+# ----------------------- Scoring -----------------------
+
+def pick_sides(slate: list, home_scores: np.ndarray, away_scores: np.ndarray) -> list:
+    """(pick, score) per game, home winning ties as in pair_predictions"""
+    
+    return [(game['home_team'], home) if home >= away else (game['away_team'], away)
+            for game, home, away in zip(slate, home_scores, away_scores)]
+
+def check_predictions(slate: list, predictions: list, model_name: str):
+    """Raise unless predictions are one (pick, score) per game, in slate order"""
+    
+    if len(predictions) != len(slate):
+        raise ValueError(f"{model_name}: {len(predictions)} predictions for {len(slate)} games")
+    for game, (pick, _) in zip(slate, predictions):
+        if pick not in (game['home_team'], game['away_team']):
+            raise ValueError(f"{model_name}: pick {pick} does not belong to "
+                             f"{game['away_team']} @ {game['home_team']} (predictions out of slate order)")
+
+def score_week(slate: list, winners: list, predictions: list) -> dict:
+    """Stack-rank picks by win probability (N..1) and score them"""
+    
+    n_games = len(slate)
+    order = np.argsort([-probability for _, probability in predictions], kind='stable')
+    points = np.empty(n_games, dtype=int)
+    points[order] = np.arange(n_games, 0, -1)
+    
+    correct = np.array([pick == winner for (pick, _), winner in zip(predictions, winners)])
+    return {
+        'games': n_games,
+        'correct': int(correct.sum()),
+        'accuracy': float(correct.mean()) if n_games else 0.0,
+        'points': int(points[correct].sum()),
+        'max_points': int(n_games * (n_games + 1) // 2)
+    }
+
+# ----------------------- Fold execution -----------------------
+
+def run_model_season(task: tuple) -> list:
+    """Worker: walk one model through one season's weeks"""
+    
+    model_name, season_year, db_path, cache_path, quiet, tuned = task
+    
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull if quiet else sys.stdout):
+        db_manager = DatabaseManager(db_path=db_path)
+        data = joblib.load(cache_path)
+        picks = data['picks']
+        games = data['games']
+        season_games = games[games['season_year'] == season_year]
+        
+        adapter = build_adapter(model_name, db_manager)
+        if hasattr(adapter, 'model'):
+            adapter.model.use_tuned_hyperparameters = tuned
+        rows = []
+        for week, week_games in season_games.groupby('week', sort=True):
+            mask = training_mask(picks, season_year, week)
+            if adapter.needs_training:
+                if not trainable(picks, mask):
+                    continue
+                adapter.fit(picks, mask)
+            
+            slate = games_to_slate(week_games)
+            predictions = adapter.predict(slate)
+            check_predictions(slate, predictions, model_name)
+            result = score_week(slate, list(week_games['winner']), predictions)
+            result.update({
+                'model': model_name,
+                'season_year': season_year,
+                'week': int(week),
+                'training_rows': int(mask.sum())
+            })
+            rows.append(result)
+    
+    return rows
+
+def run_backtest(db_manager: DatabaseManager, models: list = None, start_season: int = 2018,
+                 end_season: int = None, workers: int = None, quiet: bool = True,
+                 tuned: bool = True) -> pd.DataFrame:
+    """Run walk-forward folds for the given models and return one row per (model, week)
+    (tuned=False trains the forests with their defaults instead of the search winners)"""
+    
+    models = models or MODEL_NAMES
+    data = load_backtest_data(db_manager)
+    seasons = sorted(s for s in data['games']['season_year'].unique()
+                     if s >= start_season and (end_season is None or s <= end_season))
+    
+    tasks = [(model_name, int(season), db_manager.db_path, data['cache_path'], quiet, tuned)
+             for model_name in models for season in seasons]
+    
+    workers = workers or os.cpu_count() or 1
+    rows = []
+    if workers == 1:
+        for task in tasks:
+            rows.extend(run_model_season(task))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for task_rows in executor.map(run_model_season, tasks):
+                rows.extend(task_rows)
+    
+    columns = ['model', 'season_year', 'week', 'training_rows', 'games', 'correct',
+               'accuracy', 'points', 'max_points']
+    return pd.DataFrame(rows, columns=columns).sort_values(['model', 'season_year', 'week'])
+
+def summarize_backtest(results: pd.DataFrame) -> pd.DataFrame:
+    """Aggregate per model over the folds every model completed"""
+    
+    fold_counts = results.groupby(['season_year', 'week'])['model'].nunique()
+    common_folds = fold_counts[fold_counts == results['model'].nunique()].index
+    common = results.set_index(['season_year', 'week']).loc[common_folds].reset_index()
+    
+    summary = common.groupby('model').agg(
+        folds=('week', 'size'),
+        games=('games', 'sum'),
+        correct=('correct', 'sum'),
+        points=('points', 'sum'),
+        max_points=('max_points', 'sum')
+    )
+    summary['accuracy'] = summary['correct'] / summary['games']
+    summary['points_pct'] = summary['points'] / summary['max_points']
+    summary['avg_weekly_points'] = summary['points'] / summary['folds']
+    return summary.sort_values('points', ascending=False)
+
+def main():
+    """Walk-forward backtest CLI"""
+    
+    parser = argparse.ArgumentParser(description="Walk-forward backtest of all pick models")
+    parser.add_argument("--models", nargs="+", choices=MODEL_NAMES, default=MODEL_NAMES)
+    parser.add_argument("--start-season", type=int, default=2018)
+    parser.add_argument("--end-season", type=int)
+    parser.add_argument("--workers", type=int, help="Worker processes (default: all cores)")
+    parser.add_argument("--output", default="data/outputs/backtest/walk-forward-results.csv")
+    parser.add_argument("--verbose", action="store_true", help="Show model output from workers")
+    parser.add_argument("--untuned", action="store_true",
+                        help="Train forests with their defaults, not hyperparameters tuned on these folds")
+    args = parser.parse_args()
+    
+    db_manager = DatabaseManager(version="v2")
+    
+    print(f"🔁 Walk-forward backtest: {', '.join(args.models)} from {args.start_season}")
+    started = datetime.now()
+    results = run_backtest(db_manager, args.models, args.start_season, args.end_season,
+                           args.workers, quiet=not args.verbose, tuned=not args.untuned)
+    elapsed = (datetime.now() - started).total_seconds()
+    
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    results.to_csv(args.output, index=False)
+    
+    summary = summarize_backtest(results)
+    print(f"\n📊 Results over {int(summary['folds'].max()) if not summary.empty else 0} common folds "
+          f"({elapsed:.1f}s):")
+    for model_name, row in summary.iterrows():
+        print(f"   {model_name:<16} accuracy {row['accuracy']:.3f}   "
+              f"points {int(row['points'])}/{int(row['max_points'])} ({row['points_pct']:.3f})   "
+              f"avg/week {row['avg_weekly_points']:.1f}")
+    tuned_models = [model_name for model_name in args.models if model_name in TUNED_SEARCH
+                    and db_manager.get_best_hyperparameters(TUNED_SEARCH[model_name])]
+    if tuned_models and not args.untuned:
+        print(f"\n⚠️  {', '.join(tuned_models)} trained with hyperparameters tuned on these same folds, "
+              f"so their scores are optimistic (rerun with --untuned for the defaults)")
+    print(f"\n💾 Per-week results saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
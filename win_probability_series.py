@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Full ESPN in-game win-probability series, stored one row per game.
+Every probability point of a game (home win and tie chance, seconds left and
+the play it follows) is packed into one delta-encoded, zlib-compressed blob
+in win_probability_series, a few hundred bytes per game instead of a few
+hundred rows. Probability pages for all games are fetched concurrently
+through the $ref resolver (so every page also lands in the raw payload
+archive), and backfill walks completed seasons, skipping games whose final
+series is already stored.
+"""
+
+import argparse
+import re
+import struct
+import time
+import zlib
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from database_manager import DatabaseManager
+from espn_ref_resolver import RefResolver
+from raw_payload_archive import RawPayloadArchive
+
+SITE_SCOREBOARD = "https://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard"
+CORE_BASE = "https://sports.core.api.espn.com/v2/sports/football/leagues/nfl"
+PAGE_SIZE = 200
+REGULAR_SEASON_WEEKS = list(range(1, 19))
+# ESPN postseason week -> games.week (ESPN week 4 is the Pro Bowl)
+POSTSEASON_WEEKS = {1: 19, 2: 20, 3: 21, 5: 22}
+
+SERIES_FORMAT = 1
+PROB_SCALE = 10000  # Probabilities are stored in basis points
+# format version, number of points, first play id
+SERIES_HEADER = struct.Struct("<BIq")
+PLAY_ID_RE = re.compile(r'/plays/(\d+)')
+
+def encode_series(points: pd.DataFrame) -> bytes:
+    """
+    Pack a game's points (columns play_id, seconds_left, home_win_prob,
+    tie_prob, in game order) into one blob: a small header, then each column
+    as little-endian deltas (int16, play ids int64), zlib-compressed.
+    A missing play id is 0 and missing seconds_left is -1.
+    """
+    seconds = points['seconds_left'].to_numpy(dtype=np.int64)
+    home = np.rint(points['home_win_prob'].to_numpy(dtype=float) * PROB_SCALE).astype(np.int64)
+    tie = np.rint(points['tie_prob'].to_numpy(dtype=float) * PROB_SCALE).astype(np.int64)
+    play_ids = points['play_id'].to_numpy(dtype=np.int64)
+    first_play_id = int(play_ids[0]) if len(play_ids) else 0
+    
+    body = b"".join([
+        np.diff(seconds, prepend=0).astype("<i2").tobytes(),
+        np.diff(home, prepend=0).astype("<i2").tobytes(),
+        np.diff(tie, prepend=0).astype("<i2").tobytes(),
+        np.diff(play_ids, prepend=first_play_id).astype("<i8").tobytes(),
+    ])
+    return SERIES_HEADER.pack(SERIES_FORMAT, len(points), first_play_id) + zlib.compress(body, 9)
+
+def _decode_columns(blob: bytes) -> Dict[str, np.ndarray]:
+    series_format, n_points, first_play_id = SERIES_HEADER.unpack_from(blob)
+    if series_format != SERIES_FORMAT:
+        raise ValueError(f"Unknown win probability series format {series_format}")
+    body = zlib.decompress(blob[SERIES_HEADER.size:])
+    
+    seconds, home, tie = np.cumsum(np.frombuffer(body, dtype="<i2", count=3 * n_points).reshape(3, n_points),
+                                   axis=1, dtype=np.int64)
+    play_ids = first_play_id + np.cumsum(np.frombuffer(body, dtype="<i8", offset=6 * n_points, count=n_points))
+    return {'play_id': play_ids, 'seconds_left': seconds, 'home': home, 'tie': tie}
+
+def _points_frame(columns: Dict[str, np.ndarray]) -> pd.DataFrame:
+    home_win_prob, tie_prob = columns['home'] / PROB_SCALE, columns['tie'] / PROB_SCALE
+    return pd.DataFrame({
+        'play_id': columns['play_id'],
+        'seconds_left': columns['seconds_left'],
+        'home_win_prob': home_win_prob,
+        'away_win_prob': 1.0 - home_win_prob - tie_prob,
+        'tie_prob': tie_prob
+    })
+
+def decode_series(blob: bytes) -> pd.DataFrame:
+    """Unpack a blob from encode_series (away_win_prob is derived as 1 - home - tie)"""
+    
+    return _points_frame(_decode_columns(blob))
+
+def _probability(value) -> Optional[float]:
+    """ESPN reports fractions, occasionally percentages"""
+    
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return value / 100.0 if value > 1.0 else value
+
+def series_points(items: List[Dict]) -> pd.DataFrame:
+    """Probability items of one game (any page order) as points in game order"""
+    
+    rows = []
+    for position, item in enumerate(items):
+        home_win_prob = _probability(item.get('homeWinPercentage'))
+        if home_win_prob is None:
+            continue
+        play_match = PLAY_ID_RE.search((item.get('play') or {}).get('$ref', ''))
+        seconds_left = item.get('secondsLeft')
+        rows.append({
+            'sequence': int(item.get('sequenceNumber') or position),
+            'play_id': int(play_match.group(1)) if play_match else 0,
+            'seconds_left': int(seconds_left) if seconds_left is not None else -1,
+            'home_win_prob': home_win_prob,
+            'tie_prob': _probability(item.get('tiePercentage')) or 0.0
+        })
+    
+    columns = ['sequence', 'play_id', 'seconds_left', 'home_win_prob', 'tie_prob']
+    points = pd.DataFrame(rows, columns=columns)
+    return points.sort_values('sequence', kind='stable').drop(columns='sequence').reset_index(drop=True)
+
+def probabilities_url(event_id: str) -> str:
+    return f"{CORE_BASE}/events/{event_id}/competitions/{event_id}/probabilities"
+
+def fetch_series(resolver: RefResolver, event_ids: List[str]) -> Dict[str, pd.DataFrame]:
+    """
+    Probability points for many events. First pages are requested together,
+    then every remaining page of every event together, then any items that
+    are bare $ref links; failed events are left out.
+    """
+    first_pages = {event_id: resolver.submit(probabilities_url(event_id), {'limit': PAGE_SIZE, 'page': 1})
+                   for event_id in event_ids}
+    pages = {}
+    for event_id, future in first_pages.items():
+        try:
+            first_page = future.result()
+        except Exception as e:
+            print(f"❌ Error fetching win probabilities for event {event_id}: {e}")
+            continue
+        pages[event_id] = [future] + [
+            resolver.submit(probabilities_url(event_id), {'limit': PAGE_SIZE, 'page': page})
+            for page in range(2, int(first_page.get('pageCount') or 1) + 1)
+        ]
+    
+    items = {}
+    for event_id, futures in pages.items():
+        try:
+            items[event_id] = [item for future in futures for item in future.result().get('items', [])]
+        except Exception as e:
+            print(f"❌ Error fetching win probabilities for event {event_id}: {e}")
+    
+    # Items may be bare links rather than inline objects; resolve all games' links in one batch
+    # (only the items themselves: following their play links would cost a request per play)
+    resolved = resolver.resolve_many(item['$ref'] for event_items in items.values()
+                                     for item in event_items if list(item) == ['$ref'])
+    series = {}
+    for event_id, event_items in items.items():
+        inline = [resolved[item['$ref']] or {} if list(item) == ['$ref'] else item for item in event_items]
+        series[event_id] = series_points(inline)
+    return series
+
+def week_events(resolver: RefResolver, season_year: int, weeks: List[int], postseason: bool = False) -> List[Dict]:
+    """Scoreboard events for several weeks of a season, requested together"""
+    
+    season_type = 3 if postseason else 2
+    scoreboards = {week: resolver.submit(SITE_SCOREBOARD, {'dates': season_year, 'seasontype': season_type,
+                                                           'week': week, 'limit': 100})
+                   for week in weeks}
+    events = []
+    for week, future in scoreboards.items():
+        try:
+            scoreboard = future.result()
+        except Exception as e:
+            print(f"❌ Error fetching scoreboard for {season_year} week {week}: {e}")
+            continue
+        for event in scoreboard.get('events', []):
+            competitors = (event.get('competitions') or [{}])[0].get('competitors', [])
+            teams = {c.get('homeAway'): c.get('team', {}) for c in competitors}
+            if not teams.get('home', {}).get('abbreviation') or not teams.get('away', {}).get('abbreviation'):
+                continue
+            events.append({
+                'espn_event_id': str(event['id']),
+                'season_year': season_year,
+                'week': POSTSEASON_WEEKS.get(week, week) if postseason else week,
+                'home_team': teams['home']['abbreviation'],
+                'away_team': teams['away']['abbreviation'],
+                # ESPN team id -> abbreviation, for core-API refs that only carry the id
+                'espn_teams': {str(team.get('id')): team['abbreviation'] for team in teams.values()},
+                'is_final': bool(event.get('status', {}).get('type', {}).get('completed'))
+            })
+    return events
+
+def ingest_series(db_manager: DatabaseManager, resolver: RefResolver, season_year: int,
+                  weeks: List[int], postseason: bool = False, force: bool = False) -> Dict:
+    """Fetch and store the series of every game in some weeks of a season"""
+    
+    started = time.perf_counter()
+    events = week_events(resolver, season_year, weeks, postseason)
+    
+    # Completed games whose series is stored already cannot change
+    stored = set() if force else db_manager.get_final_win_probability_events(season_year)
+    pending = [event for event in events if event['espn_event_id'] not in stored]
+    series = fetch_series(resolver, [event['espn_event_id'] for event in pending])
+    
+    # Neutral-site games may be stored in games either way round
+    keys = [(event['season_year'], event['week'], event['home_team'], event['away_team']) for event in pending]
+    game_ids = db_manager.get_game_ids(keys + [(season, week, away, home) for season, week, home, away in keys])
+    
+    fetched_at = datetime.now().isoformat()
+    rows = []
+    for event, game_id, swapped_id in zip(pending, game_ids, game_ids[len(keys):]):
+        points = series.get(event['espn_event_id'])
+        if points is None or points.empty:
+            continue
+        rows.append({
+            **event,
+            'game_id': game_id or swapped_id,
+            'n_points': len(points),
+            'first_home_win_prob': float(points['home_win_prob'].iloc[0]),
+            'final_home_win_prob': float(points['home_win_prob'].iloc[-1]),
+            'series': encode_series(points),
+            'fetched_at': fetched_at
+        })
+    if rows:
+        db_manager.upsert_win_probability_series(rows)
+    
+    return {
+        'season_year': season_year,
+        'postseason': postseason,
+        'events': len(events),
+        'skipped': len(events) - len(pending),
+        'stored': len(rows),
+        'unmatched': sum(row['game_id'] is None for row in rows),
+        'points': sum(row['n_points'] for row in rows),
+        'bytes': sum(len(row['series']) for row in rows),
+        'seconds': time.perf_counter() - started
+    }
+
+def backfill_seasons(db_manager: DatabaseManager, resolver: RefResolver, seasons: List[int],
+                     postseason: bool = True, force: bool = False) -> List[Dict]:
+    """Ingest completed seasons (regular season, then postseason)"""
+    
+    summaries = []
+    for season_year in seasons:
+        summaries.append(ingest_series(db_manager, resolver, season_year, REGULAR_SEASON_WEEKS, force=force))
+        if postseason:
+            summaries.append(ingest_series(db_manager, resolver, season_year, sorted(POSTSEASON_WEEKS),
+                                           postseason=True, force=force))
+    return summaries
+
+def load_series(db_manager: DatabaseManager, season_year: int, week: Optional[int] = None) -> pd.DataFrame:
+    """Stored series unpacked into one long frame (one row per point), e.g. for calibration studies"""
+    
+    rows = db_manager.get_win_probability_series(season_year, week)
+    if not rows:
+        return pd.DataFrame()
+    
+    # Decode every game to arrays and build the frame once
+    decoded = [_decode_columns(row['series']) for row in rows]
+    lengths = np.array([len(columns['play_id']) for columns in decoded])
+    games = pd.DataFrame(rows, columns=['espn_event_id', 'game_id', 'week', 'home_team', 'away_team', 'is_final'])
+    frame = games.iloc[np.repeat(np.arange(len(rows)), lengths)].reset_index(drop=True)
+    frame['point'] = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    points = _points_frame({name: np.concatenate([columns[name] for columns in decoded])
+                            for name in decoded[0]})
+    return pd.concat([frame, points], axis=1)
+
+def print_summary(summary: Dict):
+    label = f"{summary['season_year']}{' postseason' if summary['postseason'] else ''}"
+    if summary['stored']:
+        print(f"  💾 {label}: {summary['stored']} games, {summary['points']} points in "
+              f"{summary['bytes'] / 1e3:.1f} KB ({summary['skipped']} already stored, "
+              f"{summary['unmatched']} not in games) in {summary['seconds']:.2f}s")
+    else:
+        print(f"  ⏭️ {label}: nothing new ({summary['events']} events, {summary['skipped']} already stored)")
+
+def main():
+    """Ingest ESPN win-probability series for a week or backfill whole seasons"""
+    
+    parser = argparse.ArgumentParser(description="ESPN in-game win probability series")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--week", type=int, help="Ingest one week (in-progress games are refreshed on every run)")
+    mode.add_argument("--backfill", type=int, nargs=2, metavar=("FIRST", "LAST"),
+                      help="Ingest completed seasons FIRST..LAST")
+    parser.add_argument("--season", type=int, default=2025)
+    parser.add_argument("--postseason", action="store_true", help="--week is an ESPN postseason week")
+    parser.add_argument("--no-postseason", action="store_true", help="Backfill regular seasons only")
+    parser.add_argument("--workers", type=int, default=16, help="Concurrent ESPN requests")
+    parser.add_argument("--force", action="store_true", help="Refetch games whose final series is stored")
+    parser.add_argument("--replay", action="store_true", help="Read ESPN pages from the raw payload archive")
+    parser.add_argument("--no-archive", action="store_true", help="Do not record fetched pages in the archive")
+    parser.add_argument("--db", default="data/nfl_pool_v2.db")
+    args = parser.parse_args()
+    
+    db_manager = DatabaseManager(db_path=args.db)
+    archive = RawPayloadArchive(db_manager, replay=args.replay, enabled=False if args.no_archive else None)
+    resolver = RefResolver(max_workers=args.workers, archive=archive)
+    try:
+        if args.backfill:
+            first, last = args.backfill
+            print(f"📈 Backfilling win probability series for {first}-{last}...")
+            summaries = backfill_seasons(db_manager, resolver, list(range(first, last + 1)),
+                                         postseason=not args.no_postseason, force=args.force)
+        else:
+            print(f"📈 Ingesting win probability series for {args.season} week {args.week}...")
+            summaries = [ingest_series(db_manager, resolver, args.season, [args.week],
+                                       postseason=args.postseason, force=args.force)]
+    finally:
+        resolver.close()
+    
+    for summary in summaries:
+        print_summary(summary)
+
+if __name__ == "__main__":
+    main()
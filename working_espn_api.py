@@ -3,18 +3,21 @@
 Working ESPN API integration based on actual endpoint testing.
 This focuses on the endpoints that actually work and provide useful data.
 """
-import requests
 import json
 from typing import Dict, List, Optional, Tuple
 import datetime as dt
 
+from espn_ref_resolver import RefResolver
+from raw_payload_archive import RawPayloadArchive
+
 class WorkingESPNAPI:
     """ESPN API client using verified working endpoints"""
     
-    def __init__(self):
+    def __init__(self, archive: Optional[RawPayloadArchive] = None):
         self.site_base = "https://site.api.espn.com/apis/site/v2/sports/football/nfl"
         self.core_base = "https://sports.core.api.espn.com/v2/sports/football/leagues/nfl"
         self.timeout = 30
+        self.resolver = RefResolver(timeout=self.timeout, archive=archive)
     
     def get_week_games_with_details(self, year: int, week: int) -> List[Dict]:
         """
@@ -29,8 +32,10 @@ class WorkingESPNAPI:
         """
         print(f"📅 Getting Week {week} games with details...")
         
-        # Get games from scoreboard
+        # Get games from scoreboard, then request every game's details at once
+        self.resolver.clear()
         games = self._get_week_games_from_scoreboard(year, week)
+        self._prefetch_week(games)
         
         detailed_games = []
         for game in games:
@@ -43,6 +48,23 @@ class WorkingESPNAPI:
         
         return detailed_games
     
+    def _prefetch_week(self, games: List[Dict]):
+        """Fetch events, predictions and injury reports for all games concurrently"""
+        urls = []
+        injury_urls = []
+        for game in games:
+            game_id = game.get("id")
+            if not game_id:
+                continue
+            urls += [f"{self.core_base}/events/{game_id}",
+                     f"{self.core_base}/events/{game_id}/competitions/{game_id}/predictor"]
+            for team in game.get("teams", {}).values():
+                if team.get("id"):
+                    injury_urls.append(f"{self.core_base}/teams/{team['id']}/injuries")
+        
+        responses = self.resolver.resolve_many(urls + injury_urls)
+        self.resolver.resolve_graph([responses[url] for url in injury_urls if responses[url]], depth=2)
+    
     def get_game_details(self, game_id: str) -> Optional[Dict]:
         """
         Get detailed information for a specific game.
@@ -59,9 +81,7 @@ class WorkingESPNAPI:
         url = f"{self.core_base}/events/{game_id}"
         
         try:
-            response = requests.get(url, timeout=self.timeout)
-            response.raise_for_status()
-            data = response.json()
+            data = self.resolver.get(url)
             
             game_details = self._parse_game_details(data)
             
@@ -86,9 +106,7 @@ class WorkingESPNAPI:
         url = f"{self.core_base}/events/{game_id}/competitions/{game_id}/predictor"
         
         try:
-            response = requests.get(url, timeout=self.timeout)
-            response.raise_for_status()
-            data = response.json()
+            data = self.resolver.get(url)
             
             return self._parse_predictions(data)
             
@@ -114,9 +132,7 @@ class WorkingESPNAPI:
         url = f"{self.core_base}/teams/{team_id}/injuries"
         
         try:
-            response = requests.get(url, timeout=self.timeout)
-            response.raise_for_status()
-            data = response.json()
+            data = self.resolver.get(url)
             
             return self._parse_injury_data(data)
             
@@ -129,9 +145,7 @@ class WorkingESPNAPI:
         url = f"{self.core_base}/teams/{team_id}"
         
         try:
-            response = requests.get(url, timeout=self.timeout)
-            response.raise_for_status()
-            data = response.json()
+            data = self.resolver.get(url)
             
             return self._parse_team_info(data)
             
@@ -151,9 +165,7 @@ class WorkingESPNAPI:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=self.timeout)
-            response.raise_for_status()
-            data = response.json()
+            data = self.resolver.get(url, params=params)
             
             games = []
             for event in data.get("events", []):
@@ -261,39 +273,29 @@ class WorkingESPNAPI:
         injuries = []
         
         try:
-            items = data.get("items", [])
+            # Get detailed injury info (and the athlete) for every reference concurrently
+            items = self.resolver.resolve_graph(data.get("items", []), depth=2)
             for item in items:
-                # Get detailed injury info from the reference
-                injury_ref = item.get("$ref")
-                if injury_ref:
-                    injury_details = self._fetch_injury_details(injury_ref)
-                    if injury_details:
-                        injuries.append(injury_details)
+                if list(item) == ["$ref"]:
+                    print(f"❌ Error fetching injury details: {item['$ref']}")
+                    continue
+                injuries.append(self._parse_injury_details(item))
             
         except Exception as e:
             print(f"❌ Error parsing injury data: {e}")
         
         return injuries
     
-    def _fetch_injury_details(self, injury_ref: str) -> Optional[Dict]:
-        """Fetch detailed injury information from reference"""
-        try:
-            response = requests.get(injury_ref, timeout=self.timeout)
-            response.raise_for_status()
-            data = response.json()
-            
-            return {
-                "player_name": data.get("athlete", {}).get("displayName"),
-                "position": data.get("athlete", {}).get("position", {}).get("displayName"),
-                "status": data.get("status"),
-                "injury_type": data.get("injury", {}).get("type"),
-                "injury_description": data.get("injury", {}).get("description"),
-                "date_updated": data.get("dateUpdated")
-            }
-            
-        except Exception as e:
-            print(f"❌ Error fetching injury details: {e}")
-            return None
+    def _parse_injury_details(self, data: Dict) -> Dict:
+        """Parse one resolved injury reference"""
+        return {
+            "player_name": data.get("athlete", {}).get("displayName"),
+            "position": data.get("athlete", {}).get("position", {}).get("displayName"),
+            "status": data.get("status"),
+            "injury_type": data.get("injury", {}).get("type"),
+            "injury_description": data.get("injury", {}).get("description"),
+            "date_updated": data.get("dateUpdated")
+        }
     
     def _parse_team_info(self, data: Dict) -> Dict:
         """Parse team information"""